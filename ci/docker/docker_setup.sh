@@ -50,6 +50,7 @@ install_python() {
   python3.12 -m venv "${VENV_PATH}"
   "${VENV_PATH}/bin/python" -m pip install --upgrade \
     pip \
+    numpy \
     pre-commit \
     regex \
     setuptools \
@@ -0,0 +1,592 @@
+#!/usr/bin/env python3
+# Copyright (c) 2026, ARM Limited.
+# SPDX-License-Identifier: Apache-2.0
+# Table driven NumPy codec for the low precision and block scaled types.
+# Codes are decoded through 256 entry lookup tables and encoded with
+# vectorized rounding in each fpround_mode_t of
+# numeric_conversion_helpers.tosac. CAST_TO_BLOCK_SCALED and
+# CAST_FROM_BLOCK_SCALED are emulated over packed uint8 buffers, so
+# block scaled test data is generated without a Python loop per element.
+import re
+
+import numpy as np
+from reference_check import FLOAT_FORMATS
+from tosa import BLOCK_SCALE_VALUE_TYPE_MAPPING
+
+ROUND_MODES = ("nearest_even", "towards_zero", "away_from_zero")
+
+# Element types accepted by CAST_TO_BLOCK_SCALED and produced by
+# CAST_FROM_BLOCK_SCALED, given as float32 values
+BLOCK_SCALE_FLOAT_TYPES = ("fp32_t", "bf16_t")
+
+# Elements converted at a time when casting to or from a block scaled type
+DEFAULT_CHUNK = 1 << 20
+
+
+class BlockScaleCodecError(RuntimeError):
+    pass
+
+
+# Encoding of one element type. Codes hold one element each in the low
+# bits of a uint8, lut decodes all 256 byte values (the unused high bits
+# are ignored) and mags lists the non-negative finite values in code
+# order, followed by the value the next code would have without the
+# special encodings.
+class CodeFormat:
+    def __init__(self, name, bits, lut, signed, nan_code, inf_code, twos=False):
+        self.name = name
+        self.bits = bits
+        self.lut = lut
+        self.signed = signed
+        self.nan_code = nan_code
+        self.inf_code = inf_code
+        self.twos_complement = twos
+        self.has_inf = inf_code is not None
+        self.has_nan = nan_code is not None
+        self.lut32 = lut.astype(np.float32)
+        self.mags = None
+        self.mids = None
+        self.max_code = None
+
+
+def float_value(exponent, mantissa, mant_bits, bias, subnormal=True):
+    if exponent == 0 and subnormal:
+        return mantissa / 2.0**mant_bits * 2.0 ** (1 - bias)
+    return (1 + mantissa / 2.0**mant_bits) * 2.0 ** (exponent - bias)
+
+
+# Builds the format of an OCP floating point type. special is "ieee" when
+# the top exponent encodes Inf and NaN, "nan" when only the all ones
+# pattern is NaN, "nan_exp" when the all ones exponent is NaN and None
+# when every code is a finite value.
+def float_format(name, exp_bits, mant_bits, bias, signed=True, special=None):
+    bits = exp_bits + mant_bits + int(signed)
+    size = 1 << bits
+    top = (1 << exp_bits) - 1
+    subnormal = mant_bits > 0
+    lut = np.zeros(256, dtype=np.float64)
+    nan_code = inf_code = None
+    for byte in range(256):
+        code = byte & (size - 1)
+        mantissa = code & ((1 << mant_bits) - 1)
+        exponent = (code >> mant_bits) & top
+        sign = -1.0 if signed and code >> (bits - 1) else 1.0
+        value = float_value(exponent, mantissa, mant_bits, bias, subnormal)
+        if special == "ieee" and exponent == top:
+            value = np.inf if mantissa == 0 else np.nan
+        elif special == "nan" and exponent == top and mantissa == (1 << mant_bits) - 1:
+            value = np.nan
+        elif special == "nan_exp" and exponent == top:
+            value = np.nan
+        lut[byte] = sign * value
+    positive = lut[: size >> int(signed)]
+    finite = np.isfinite(positive)
+    max_code = len(positive) - 1 if finite.all() else int(np.argmin(finite)) - 1
+    if special is not None:
+        nan_code = int(np.flatnonzero(np.isnan(positive))[-1])
+    if special == "ieee":
+        inf_code = int(np.flatnonzero(np.isinf(positive))[0])
+    fmt = CodeFormat(name, bits, lut, signed, nan_code, inf_code)
+    # The value past normal_max that rounding overflows to
+    following = max_code + 1
+    beyond = float_value(
+        following >> mant_bits,
+        following & ((1 << mant_bits) - 1),
+        mant_bits,
+        bias,
+        subnormal,
+    )
+    fmt.max_code = max_code
+    fmt.mags = np.append(positive[: max_code + 1], beyond)
+    fmt.mids = (fmt.mags[:-1] + fmt.mags[1:]) / 2
+    return fmt
+
+
+# mxint8_t is an 8-bit two's complement integer with an implicit 1/64 scale
+def mxint8_format():
+    lut = np.arange(256, dtype=np.uint8).view(np.int8) / 64.0
+    fmt = CodeFormat("mxint8_t", 8, lut, True, None, None, twos=True)
+    fmt.max_code = 127
+    return fmt
+
+
+CODE_FORMATS = {
+    f.name: f
+    for f in [
+        float_format("fp8e4m3_t", 4, 3, 7, special="nan"),
+        float_format("fp8e5m2_t", 5, 2, 15, special="ieee"),
+        float_format("fp6e3m2_t", 3, 2, 3),
+        float_format("fp6e2m3_t", 2, 3, 1),
+        float_format("fp4e2m1_t", 2, 1, 1),
+        float_format("fp8ue8m0_t", 8, 0, 127, signed=False, special="nan_exp"),
+        mxint8_format(),
+    ]
+}
+
+
+def code_format(ty):
+    if ty not in CODE_FORMATS:
+        raise BlockScaleCodecError(f"No codec for type {ty}")
+    return CODE_FORMATS[ty]
+
+
+def check_mode(mode):
+    if mode not in ROUND_MODES:
+        raise BlockScaleCodecError(f"Unknown rounding mode {mode}")
+
+
+# Decodes one code per byte through the lookup table of ty
+def decode(codes, ty, dtype=np.float32):
+    fmt = code_format(ty)
+    lut = fmt.lut32 if dtype == np.float32 else fmt.lut.astype(dtype)
+    return lut[np.asarray(codes, dtype=np.uint8)]
+
+
+# Rounds non-negative finite magnitudes to the index of a value in
+# fmt.mags. Index max_code + 1 means the rounded value is beyond
+# normal_max, which is out of the representable range in every mode: for
+# round to nearest that is from get_largest_value_rounding_to_normal_max.
+def round_magnitude(fmt, mag, mode):
+    lower = np.searchsorted(fmt.mags, mag, side="right") - 1
+    # Only fp8ue8m0_t has values below its smallest code
+    lower = np.clip(lower, 0, fmt.max_code + 1)
+    if mode == "towards_zero":
+        return lower
+    upper = mag > fmt.mags[lower]
+    if mode == "nearest_even":
+        mid = fmt.mids[np.minimum(lower, fmt.max_code)]
+        upper = (mag > mid) | ((mag == mid) & (lower % 2 == 1))
+    return np.minimum(lower + upper, fmt.max_code + 1)
+
+
+def round_mxint8(value, mode):
+    scaled = value * 64.0
+    if mode == "nearest_even":
+        return np.rint(scaled)
+    if mode == "towards_zero":
+        return np.trunc(scaled)
+    return np.copysign(np.ceil(np.abs(scaled)), scaled)
+
+
+# Codes and invalid mask of values rounded to a floating point format
+def search_codes(fmt, value, mode):
+    nan = np.isnan(value)
+    mag = np.abs(value)
+    finite = np.isfinite(value)
+    index = round_magnitude(fmt, np.where(finite, mag, 0.0), mode)
+    overflow = ~nan & ((index > fmt.max_code) | ~finite)
+    code = index.astype(np.uint8)
+    if fmt.has_inf:
+        code = np.where(overflow, np.uint8(fmt.inf_code), code)
+    elif fmt.has_nan:
+        code = np.where(overflow, np.uint8(fmt.nan_code), code)
+    invalid = overflow & (not fmt.has_inf and not fmt.has_nan)
+    if fmt.has_nan:
+        code = np.where(nan, np.uint8(fmt.nan_code), code)
+    else:
+        invalid |= nan
+    negative = np.signbit(value)
+    if fmt.signed:
+        code |= np.where(negative, np.uint8(1 << (fmt.bits - 1)), np.uint8(0))
+    else:
+        negative &= ~nan & (mag > 0)
+        code = np.where(negative, np.uint8(fmt.nan_code), code)
+    code = np.where(invalid, np.uint8(0), code)
+    return code.astype(np.uint8, copy=False), invalid
+
+
+# Encode tables indexed by the top 16 bits of a float32 and a sticky bit
+# for the 16 bits below. With at most three mantissa bits in the format
+# the rounding bit is always in the top 16, so the table gives the exact
+# result in every mode.
+ENCODE_TABLES = {}
+
+
+def encode_table(fmt, mode):
+    if (fmt.name, mode) not in ENCODE_TABLES:
+        key = np.arange(1 << 17, dtype=np.uint32)
+        bits = (key >> 1) << 16 | (key & 1)
+        with np.errstate(invalid="ignore"):
+            table = search_codes(fmt, bits.view(np.float32).astype(np.float64), mode)
+        ENCODE_TABLES[(fmt.name, mode)] = table
+    return ENCODE_TABLES[(fmt.name, mode)]
+
+
+# Returns the codes of values rounded to ty in the given mode, and a mask
+# of the values that have no encoding in ty. The codes of those are 0.
+def encode_codes(values, ty, mode="nearest_even"):
+    fmt = code_format(ty)
+    check_mode(mode)
+    values = np.asarray(values)
+    if fmt.twos_complement:
+        with np.errstate(invalid="ignore"):
+            scaled = round_mxint8(values.astype(np.float64), mode)
+            invalid = ~((scaled >= -128) & (scaled <= 127))
+        scaled = np.where(invalid, 0, scaled)
+        return scaled.astype(np.int8).view(np.uint8), invalid
+    if values.dtype == np.float32:
+        codes, invalid = encode_table(fmt, mode)
+        bits = values.view(np.uint32)
+        key = (bits >> 16) << 1 | ((bits & 0xFFFF) != 0)
+        return codes[key], invalid[key]
+    return search_codes(fmt, values.astype(np.float64), mode)
+
+
+# Encodes values to one code of ty per byte
+def encode(values, ty, mode="nearest_even"):
+    codes, invalid = encode_codes(values, ty, mode)
+    if invalid.any():
+        index = np.unravel_index(np.argmax(invalid), invalid.shape)
+        value = np.asarray(values)[index]
+        raise BlockScaleCodecError(
+            f"Value {value} at {tuple(int(i) for i in index)} has no encoding in {ty}"
+        )
+    return codes
+
+
+# round<in_t, out_t>(value, mode) for the types of the codec. Values that
+# are out of range of a type without Inf, or NaN, become NaN.
+def round_float(values, ty, mode="nearest_even", dtype=np.float32):
+    codes, invalid = encode_codes(values, ty, mode)
+    return np.where(invalid, np.nan, decode(codes, ty, dtype)).astype(dtype)
+
+
+def round_to_nearest_float(values, ty, dtype=np.float32):
+    return round_float(values, ty, "nearest_even", dtype)
+
+
+def round_towards_zero(values, ty, dtype=np.float32):
+    return round_float(values, ty, "towards_zero", dtype)
+
+
+def round_away_from_zero(values, ty, dtype=np.float32):
+    return round_float(values, ty, "away_from_zero", dtype)
+
+
+# Rounds float32 values to bf16_t with round to nearest even, keeping them
+# as float32
+def round_bf16(values):
+    values = np.asarray(values, dtype=np.float32)
+    bits = values.view(np.uint32)
+    rounded = (bits + (np.uint32(0x7FFF) + ((bits >> 16) & 1))) & np.uint32(0xFFFF0000)
+    rounded = np.where(np.isnan(values), bits | np.uint32(0x400000), rounded)
+    return rounded.astype(np.uint32).view(np.float32)
+
+
+def round_input(values, ty):
+    values = np.asarray(values, dtype=np.float32)
+    if ty == "bf16_t":
+        return round_bf16(values)
+    if ty != "fp32_t":
+        raise BlockScaleCodecError(f"Unsupported block scale float type {ty}")
+    return values
+
+
+# Number of bytes holding count codes of bits each. fp6 packs four codes
+# into three bytes and fp4 two codes into one byte, the first code in the
+# least significant bits.
+def packed_size(count, bits):
+    if (count * bits) % 8:
+        raise BlockScaleCodecError(f"{count} codes of {bits} bits are not whole bytes")
+    return count * bits // 8
+
+
+def pack(codes, bits):
+    codes = np.asarray(codes, dtype=np.uint8)
+    if bits == 8:
+        return codes
+    packed_size(codes.shape[-1], bits)
+    if bits == 4:
+        pairs = codes.reshape(codes.shape[:-1] + (-1, 2))
+        return (pairs[..., 0] & 0xF) | (pairs[..., 1] << 4)
+    quads = codes.reshape(codes.shape[:-1] + (-1, 4)).astype(np.uint32) & 0x3F
+    word = (
+        quads[..., 0] | quads[..., 1] << 6 | quads[..., 2] << 12 | quads[..., 3] << 18
+    )
+    packed = np.stack([word, word >> 8, word >> 16], axis=-1).astype(np.uint8)
+    return packed.reshape(codes.shape[:-1] + (-1,))
+
+
+# Table of the two fp4 codes held by each byte
+NIBBLES = np.stack([np.arange(256) & 0xF, np.arange(256) >> 4], axis=-1).astype(
+    np.uint8
+)
+
+
+def unpack(packed, bits):
+    packed = np.asarray(packed, dtype=np.uint8)
+    if bits == 8:
+        return packed
+    if bits == 4:
+        return NIBBLES[packed].reshape(packed.shape[:-1] + (-1,))
+    triples = packed.reshape(packed.shape[:-1] + (-1, 3)).astype(np.uint32)
+    word = triples[..., 0] | triples[..., 1] << 8 | triples[..., 2] << 16
+    quads = np.stack([word, word >> 6, word >> 12, word >> 18], axis=-1) & 0x3F
+    return quads.astype(np.uint8).reshape(packed.shape[:-1] + (-1,))
+
+
+def block_scale_types(ty):
+    if ty not in BLOCK_SCALE_VALUE_TYPE_MAPPING:
+        raise BlockScaleCodecError(f"{ty} is not a block scaled type")
+    match = re.match(r"bs(\d+)_(\w+?)_", ty)
+    scale_t = f"{match.group(2)}_t"
+    return int(match.group(1)), scale_t, BLOCK_SCALE_VALUE_TYPE_MAPPING[ty]
+
+
+# A tensor of a block scaled type held as two uint8 buffers: data with
+# the packed value codes of each row of the innermost dimension, and
+# scale with one scale_t code per block. The buffers may be views of a
+# larger buffer, such as a memory-mapped file, and are never copied.
+class BlockScaledTensor:
+    def __init__(self, ty, shape, data, scale, block_size=None):
+        _, self.scale_t, self.value_t = block_scale_types(ty)
+        self.ty = ty
+        self.shape = tuple(int(s) for s in shape)
+        self.block_size, data_shape, scale_shape = block_layout(ty, shape, block_size)
+        self.bits = code_format(self.value_t).bits
+        data = np.asarray(data)
+        scale = np.asarray(scale)
+        if data.dtype != np.uint8 or scale.dtype != np.uint8:
+            raise BlockScaleCodecError("Block scaled buffers must be uint8")
+        if data.shape != data_shape:
+            raise BlockScaleCodecError(
+                f"Data shape {data.shape} does not match {data_shape}"
+            )
+        if scale.shape != scale_shape:
+            raise BlockScaleCodecError(
+                f"Scale shape {scale.shape} does not match {scale_shape}"
+            )
+        self.data = data
+        self.scale = scale
+
+    def nbytes(self):
+        return self.data.size + self.scale.size
+
+    # Views of a buffer holding the data followed by the scales
+    @classmethod
+    def from_buffer(cls, ty, shape, buffer, offset=0, block_size=None):
+        block_size, data_shape, scale_shape = block_layout(ty, shape, block_size)
+        data_size = int(np.prod(data_shape))
+        data = np.frombuffer(buffer, np.uint8, data_size, offset)
+        scale = np.frombuffer(
+            buffer, np.uint8, int(np.prod(scale_shape)), offset + data_size
+        )
+        return cls(
+            ty, shape, data.reshape(data_shape), scale.reshape(scale_shape), block_size
+        )
+
+    @classmethod
+    def empty(cls, ty, shape, block_size=None):
+        buffer = bytearray(block_scaled_nbytes(ty, shape, block_size))
+        return cls.from_buffer(ty, shape, buffer, 0, block_size)
+
+    def tobytes(self):
+        return self.data.tobytes() + self.scale.tobytes()
+
+    def codes(self):
+        return unpack(self.data, self.bits)
+
+    def values(self, dtype=np.float32):
+        return decode(self.codes(), self.value_t, dtype)
+
+    def scales(self, dtype=np.float32):
+        return decode(self.scale, self.scale_t, dtype)
+
+
+# Block size and the shapes of the data and scale buffers of a tensor
+def block_layout(ty, shape, block_size=None):
+    type_block_size, _, value_t = block_scale_types(ty)
+    block_size = type_block_size if block_size is None else block_size
+    shape = tuple(int(s) for s in shape)
+    check_block_shape(shape, block_size)
+    bits = code_format(value_t).bits
+    data_shape = shape[:-1] + (packed_size(shape[-1], bits),)
+    return block_size, data_shape, shape[:-1] + (shape[-1] // block_size,)
+
+
+def block_scaled_nbytes(ty, shape, block_size=None):
+    _, data_shape, scale_shape = block_layout(ty, shape, block_size)
+    return int(np.prod(data_shape)) + int(np.prod(scale_shape))
+
+
+def check_block_shape(shape, block_size):
+    if len(shape) == 0 or shape[-1] % block_size != 0:
+        raise BlockScaleCodecError(
+            f"ERROR_IF: shape {list(shape)} is not a whole number of blocks "
+            f"of {block_size}"
+        )
+    if block_size == 1:
+        raise BlockScaleCodecError("ERROR_IF: block_size is 1")
+
+
+# Largest magnitude of a block that calc_block_scale keeps from overflow
+def largest_value_rounding_to_normal_max(ty):
+    fmt = FLOAT_FORMATS[ty]
+    if ty == "mxint8_t":
+        max_ulp = 1 / 64.0
+    else:
+        max_ulp = 2.0 ** (np.frexp(fmt.normal_max)[1] - 1 - fmt.frac)
+    return fmt.normal_max + 0.5 * max_ulp
+
+
+# calc_block_scale<in_t, fp8ue8m0_t, out_t> for the maximum magnitude of
+# each block, returning the fp8ue8m0_t codes
+def calc_block_scale(max_abs, in_t, out_t):
+    max_abs = round_input(max_abs, in_t)
+    out_max = np.float32(largest_value_rounding_to_normal_max(out_t))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.log2(round_input(max_abs / out_max, in_t).astype(np.float64))
+        if out_t == "fp8e4m3_t":
+            scale_exp = np.ceil(ratio)
+        else:
+            scale_exp = np.floor(ratio) + 1
+    # scale_exp is -inf when the ratio underflows, which clips to normal_min
+    code = np.clip(np.nan_to_num(scale_exp, nan=0.0), -127, 127) + 127
+    code = code.astype(np.uint8)
+    code = np.where(max_abs == 0, np.uint8(0), code)
+    return np.where(np.isfinite(max_abs), code, np.uint8(0xFF))
+
+
+def row_chunks(rows, row_elements, chunk):
+    step = max(1, chunk // max(1, row_elements))
+    for start in range(0, rows, step):
+        yield start, min(rows, start + step)
+
+
+# CAST_TO_BLOCK_SCALED of float values of in_t to the block scaled type ty.
+# The element codes of blocks with a NaN scale are 0 when value_t has no
+# NaN encoding.
+def cast_to_block_scaled(
+    values, ty, in_t="fp32_t", block_size=None, out=None, chunk=DEFAULT_CHUNK
+):
+    values = np.asarray(values)
+    if out is None:
+        out = BlockScaledTensor.empty(ty, values.shape, block_size)
+    elif out.ty != ty or out.shape != values.shape:
+        raise BlockScaleCodecError(f"Output is not a {ty} tensor of {values.shape}")
+    block_size = out.block_size
+    width = values.shape[-1]
+    rows = values.reshape(-1, width)
+    data = out.data.reshape(rows.shape[0], -1)
+    scale = out.scale.reshape(rows.shape[0], -1)
+    for start, stop in row_chunks(rows.shape[0], width, chunk):
+        block = round_input(rows[start:stop], in_t).reshape(
+            stop - start, -1, block_size
+        )
+        with np.errstate(invalid="ignore"):
+            max_abs = np.max(np.abs(block), axis=-1)
+        codes = calc_block_scale(max_abs, in_t, out.value_t)
+        factor = decode(codes, out.scale_t)[..., np.newaxis]
+        with np.errstate(invalid="ignore", over="ignore", under="ignore"):
+            scaled = round_input(block / factor, in_t)
+        value_codes, invalid = encode_codes(scaled, out.value_t)
+        if (invalid & ~(codes == 0xFF)[..., np.newaxis]).any():
+            raise BlockScaleCodecError(f"Scaled value overflows {out.value_t}")
+        scale[start:stop] = codes
+        data[start:stop] = pack(value_codes.reshape(stop - start, width), out.bits)
+    return out
+
+
+# CAST_FROM_BLOCK_SCALED of a block scaled tensor to out_t, given as
+# float32 values
+def cast_from_block_scaled(tensor, out_t="fp32_t", chunk=DEFAULT_CHUNK):
+    if out_t not in BLOCK_SCALE_FLOAT_TYPES:
+        raise BlockScaleCodecError(f"Unsupported block scale float type {out_t}")
+    width = tensor.shape[-1]
+    data = tensor.data.reshape(-1, tensor.data.shape[-1])
+    scale = tensor.scale.reshape(data.shape[0], -1)
+    result = np.empty((data.shape[0], width), dtype=np.float32)
+    for start, stop in row_chunks(data.shape[0], width, chunk):
+        values = decode(unpack(data[start:stop], tensor.bits), tensor.value_t)
+        values = values.reshape(stop - start, -1, tensor.block_size)
+        factor = decode(scale[start:stop], tensor.scale_t)[..., np.newaxis]
+        with np.errstate(invalid="ignore", over="ignore", under="ignore"):
+            acc = values * factor
+        result[start:stop] = round_input(acc, out_t).reshape(stop - start, width)
+    return result.reshape(tensor.shape)
+
+
+def parse_shape(text):
+    return tuple(int(s) for s in text.split(",") if s.strip())
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--type",
+        required=True,
+        choices=sorted(list(CODE_FORMATS) + list(BLOCK_SCALE_VALUE_TYPE_MAPPING)),
+        help="Element type or block scaled type of the codes",
+    )
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument(
+        "--encode",
+        help="Path to the values to encode (.npy). Block scaled types are "
+        "written as the packed data followed by the scales",
+    )
+    group.add_argument(
+        "--decode",
+        help="Path to the codes to decode, a .npy file or a raw block scaled " "buffer",
+    )
+    parser.add_argument("--output", required=True, help="Path to write")
+    parser.add_argument(
+        "--mode",
+        required=False,
+        choices=ROUND_MODES,
+        default="nearest_even",
+        help="Rounding mode used to encode element types",
+    )
+    parser.add_argument(
+        "--float-type",
+        required=False,
+        choices=BLOCK_SCALE_FLOAT_TYPES,
+        default="fp32_t",
+        help="Type of the values cast to or from a block scaled type",
+    )
+    parser.add_argument(
+        "--shape",
+        required=False,
+        type=parse_shape,
+        help="Shape of a raw block scaled buffer to decode, such as 4,64",
+    )
+    parser.add_argument(
+        "--chunk",
+        required=False,
+        type=int,
+        default=DEFAULT_CHUNK,
+        help="Number of elements converted at a time",
+    )
+    args = parser.parse_args()
+
+    try:
+        if args.type in CODE_FORMATS and args.encode:
+            values = np.load(args.encode, mmap_mode="r")
+            np.save(args.output, encode(values, args.type, args.mode))
+        elif args.type in CODE_FORMATS:
+            codes = np.load(args.decode, mmap_mode="r")
+            np.save(args.output, decode(codes, args.type))
+        elif args.encode:
+            values = np.load(args.encode, mmap_mode="r")
+            size = block_scaled_nbytes(args.type, values.shape)
+            buffer = np.memmap(args.output, np.uint8, "w+", shape=(size,))
+            cast_to_block_scaled(
+                values,
+                args.type,
+                args.float_type,
+                out=BlockScaledTensor.from_buffer(args.type, values.shape, buffer),
+                chunk=args.chunk,
+            )
+            buffer.flush()
+        else:
+            if args.shape is None:
+                raise BlockScaleCodecError("--shape is required to decode")
+            buffer = np.memmap(args.decode, np.uint8, "r")
+            tensor = BlockScaledTensor.from_buffer(args.type, args.shape, buffer)
+            np.save(
+                args.output, cast_from_block_scaled(tensor, args.float_type, args.chunk)
+            )
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"Failure running block scale codec: {str(e)}")
+        exit(1)
@@ -2,6 +2,8 @@
 # SPDX-License-Identifier: Apache-2.0
 import os
 
+import spec_trace
+import specdiff
 from tosa import deduce_extensions
 from tosa import TOSAOperator
 from tosa import TOSAOperatorArgument
@@ -318,16 +320,77 @@ def export_operator(operator: TOSAOperator, file, print_mode: str) -> None:
     print_operator(operator.name, args, profile_compliance_depot, print_mode, file)
 
 
-def print_profiles_extensions(spec, outdir):
-    with open(os.path.join(outdir, "compliance.meta"), "w") as f:
-        f.write("profileComplianceMap = {\n")
-        for group in spec.operatorgroups:
-            for op in group.operators:
-                export_operator(op, f, "Profile")
-        f.write("};\n\n")
-
-        f.write("extensionComplianceMap = {\n")
-        for group in spec.operatorgroups:
-            for op in group.operators:
-                export_operator(op, f, "Extension")
-        f.write("};\n")
+# Fingerprints of the spec compliance.meta was exported from
+COMPLIANCE_MANIFEST = "compliance.manifest.json"
+
+COMPLIANCE_MAPS = [
+    ("profileComplianceMap", "Profile"),
+    ("extensionComplianceMap", "Extension"),
+]
+
+
+# Split an existing compliance.meta into per operator blocks, keyed by map
+# name and then by exported operator name
+def read_compliance_blocks(path):
+    blocks = {}
+    current_map = None
+    current_block = None
+    with open(path, "r") as f:
+        for line in f:
+            if line.endswith(" = {\n"):
+                current_map = blocks.setdefault(line.split()[0], {})
+            elif line.startswith('{"'):
+                current_block = [line]
+            elif current_block is not None:
+                current_block.append(line)
+                if line == "},\n":
+                    name = current_block[0].split('"')[1]
+                    current_map[name] = "".join(current_block)
+                    current_block = None
+    return blocks
+
+
+# When incremental, operators that did not change since the spec recorded in
+# the outdir manifest keep their block from the existing compliance.meta and
+# only changed operators are exported again
+def print_profiles_extensions(spec, outdir, incremental=False):
+    path = os.path.join(outdir, "compliance.meta")
+    manifest = os.path.join(outdir, COMPLIANCE_MANIFEST)
+    fingerprints = None
+    if spec.xmlroot is not None:
+        fingerprints = specdiff.element_fingerprints(spec.xmlroot)
+    previous = {}
+    changes = None
+    if incremental and fingerprints is not None and os.path.exists(path):
+        changes = specdiff.changes_since_manifest(manifest, fingerprints)
+    elif os.path.exists(manifest):
+        os.remove(manifest)
+    if changes is not None and not changes.is_global:
+        previous = read_compliance_blocks(path)
+    else:
+        changes = None
+
+    with open(path, "w") as f:
+        for i, (map_name, print_mode) in enumerate(COMPLIANCE_MAPS):
+            if i > 0:
+                f.write("\n")
+            f.write(f"{map_name} = {{\n")
+            old_blocks = previous.get(map_name, {})
+            for group in spec.operatorgroups:
+                for op in group.operators:
+                    # An operator the old file has no block for, such as one
+                    # with no typesupport in this map, is exported again
+                    if changes is not None and not changes.operator_changed(op.name):
+                        block = old_blocks.get(convert_to_export_format_op(op.name))
+                        if block is not None:
+                            f.write(block)
+                            spec_trace.count("blocks_reused")
+                            continue
+                    with spec_trace.span(
+                        "export_operator", operator=op.name, mode=print_mode
+                    ):
+                        export_operator(op, f, print_mode)
+            f.write("};\n")
+        spec_trace.count("bytes_written", f.tell())
+    if fingerprints is not None:
+        specdiff.write_manifest(manifest, fingerprints)
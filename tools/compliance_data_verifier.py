@@ -4,6 +4,13 @@
 import re
 
 import regex
+import spec_trace
+from compliance_data_exporter import COMPLIANCE_MAPS
+from compliance_data_exporter import convert_to_export_format_op
+from compliance_data_exporter import get_profile_compliance_info
+from compliance_data_exporter import get_required_arguments_info
+from compliance_data_exporter import validation_term_mapping_profile
+from compliance_data_exporter import validation_term_mapping_type
 
 op_list = [
     "argmax",
@@ -253,6 +260,56 @@ def verify_operation_compliance_syntax(op) -> None:
                     raise RuntimeError(f"invalid type name {ty}")
 
 
+"""
+The compliance data of an operator as the exporter holds it before printing
+maps each profile set to its type support maps and versions:
+    {'PRO-FP': [({'in_t': 'fp16_t', 'out_t': 'fp16_t'}, '1.0'), ...], ...}
+
+Checking it directly gives the same checks as reading back the printed text
+without writing the file first.
+"""
+
+
+def verify_operation_compliance(name: str, args: list, depot: dict) -> None:
+    op_name = convert_to_export_format_op(name)
+    if op_name.split(".", 1)[1] not in op_list:
+        raise RuntimeError(f"invalid tosa operation name {op_name}")
+
+    for profiles, compliances in depot.items():
+        for prof in profiles.split(" "):
+            if validation_term_mapping_profile.get(prof) not in profile_list:
+                raise RuntimeError(f"invalid profile name {prof}")
+
+        for tsmap, version_added in compliances:
+            if not re.fullmatch(r"[0-9]+\.[0-9]+", version_added):
+                raise RuntimeError(f"invalid version {version_added} for {op_name}")
+            for arg in args:
+                sym_ty = arg.tensor_element_type
+                if sym_ty == "-":
+                    if arg.type != "acc_type_t":
+                        raise RuntimeError(
+                            f"Type {arg.type} is not considered in the validation"
+                        )
+                    sym_ty = "acc_t"
+                ty = tsmap.get(sym_ty)
+                if ty is None:
+                    continue
+                if validation_term_mapping_type.get(ty) not in type_list:
+                    raise RuntimeError(f"invalid type name {ty}")
+
+
+# Verify the compliance data of every operator of a loaded specification
+def verify_spec_compliance(spec) -> None:
+    for _, print_mode in COMPLIANCE_MAPS:
+        for group in spec.operatorgroups:
+            for op in group.operators:
+                args = get_required_arguments_info(op)
+                depot = get_profile_compliance_info(op, args, print_mode)
+                if len(depot) > 0:
+                    with spec_trace.span("verify_operator", operator=op.name):
+                        verify_operation_compliance(op.name, args, depot)
+
+
 def test_unknown_op():
     unknown_op = '"tosa.dummy",{{{Profile::pro_int},{{i8T,i32T}}}}'
     try:
@@ -325,9 +382,11 @@ if __name__ == "__main__":
     parser.add_argument(
         "--input", required=True, help="Path to the generated compliance file"
     )
+    spec_trace.add_trace_argument(parser)
     args = parser.parse_args()
+    spec_trace.trace_from_arguments(args)
 
-    with open(args.input, "r") as file:
+    with open(args.input, "r") as file, spec_trace.span("parse_compliance"):
         file_content = file.read()
 
         # Concatenate multiple lines into single line.
@@ -342,5 +401,8 @@ if __name__ == "__main__":
         core_text = clean_text[start_idx:end_idx]
         ops = capture_data_between_curly_brackets(core_text)
 
-        for op in ops:
+        spec_trace.count("bytes_read", len(file_content))
+
+    for op in ops:
+        with spec_trace.span("verify_operator_syntax"):
             verify_operation_compliance_syntax(op)
@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+# Copyright (c) 2026, ARM Limited.
+# SPDX-License-Identifier: Apache-2.0
+# Vectorized dot product compliance check, as defined by
+# pseudocode/library/tosa_reference_check_dotproduct.tosac. The fp64
+# reference and the fp64 bound on absolute values are computed together,
+# tile by tile, from the same gathered input patches. The error statistics
+# are accumulated across the tiles.
+import json
+import math
+
+import numpy as np
+from reference_check import FLOAT_FORMATS
+from reference_check import float_format
+from reference_check import ilog2
+from tensor_ops_numpy import DEFAULT_MAX_BYTES
+from tensor_ops_numpy import gather_patches
+from tensor_ops_numpy import operator_geometry
+from tensor_ops_numpy import reduce_patches
+from tensor_ops_numpy import tile_rows
+
+DOT_PRODUCT_OPERATORS = [
+    "CONV2D",
+    "CONV3D",
+    "DEPTHWISE_CONV2D",
+    "TRANSPOSE_CONV2D",
+    "MATMUL",
+]
+
+# Input types allowed the relaxed bounds with an fp32 accumulator
+LOW_PRECISION_TYPES = [
+    "fp8e5m2_t",
+    "fp8e4m3_t",
+    "fp6e3m2_t",
+    "fp6e2m3_t",
+    "fp4e2m1_t",
+    "mxint8_t",
+]
+
+
+class DotProductCheckError(RuntimeError):
+    pass
+
+
+# Kernel size KS of each operator, from Appendix A
+def kernel_size(opname, weight_shape):
+    if opname == "DEPTHWISE_CONV2D":
+        return weight_shape[0] * weight_shape[1]
+    if opname == "MATMUL":
+        return weight_shape[1]
+    return int(np.prod(weight_shape[1:]))
+
+
+# ksb, ABS_BOUND and VARIANCE_ERROR_BOUND of the dot product accuracy
+# requirements
+class DotProductBounds:
+    def __init__(self, in_t, out_t, acc_t, ks, bias_abs_max):
+        self.out_fmt = float_format(out_t)
+        acc_frac = float_format(acc_t).frac
+        # Integer division as in the pseudocode
+        shift = int((acc_frac - self.out_fmt.frac) / 2)
+        self.ksb = math.ceil(ks / 2.0**shift) + (1 if bias_abs_max > 0 else 0)
+        if in_t in LOW_PRECISION_TYPES and acc_t == "fp32_t":
+            self.abs_bound = 2 * max(self.ksb, min(self.ksb, 64) * (1 << 10))
+            self.variance_bound = 4 * 0.4 * max(self.ksb, min(self.ksb, 64) * (1 << 20))
+        else:
+            self.abs_bound = (3 * 2 if in_t == "fp32_t" else 2) * self.ksb
+            self.variance_bound = 4 * 0.4 * self.ksb
+        # Values at or above this round to infinity in out_t
+        fmt = self.out_fmt
+        max_ulp = 2.0 ** (ilog2(fmt.normal_max) - fmt.frac)
+        self.overflow = fmt.normal_max + 0.5 * max_ulp
+
+
+# Error statistics streamed over the tiles of the output
+class DotProductReport:
+    def __init__(self, bounds, shape, max_indices=100):
+        self.bounds = bounds
+        self.shape = tuple(shape)
+        self.max_indices = max_indices
+        self.count = 0
+        self.failures = 0
+        self.indices = []
+        self.err_sum = 0.0
+        self.err_sumsq = 0.0
+        self.max_abs_err = 0.0
+
+    def update(self, start, imp, ref, bnd):
+        fmt = self.bounds.out_fmt
+        abs_bound = self.bounds.abs_bound
+        imp = np.asarray(imp, dtype=np.float64)
+        with np.errstate(invalid="ignore", over="ignore", divide="ignore"):
+            ref_nan = np.isnan(ref)
+            bnd_nan = ~ref_nan & np.isnan(bnd)
+            scaled = bnd * (1 + abs_bound * 2.0 ** (-1 - fmt.frac))
+            overflow = ~ref_nan & ~bnd_nan & (scaled >= self.bounds.overflow)
+            zero = ~ref_nan & ~bnd_nan & ~overflow & (bnd == 0.0)
+            checked = ~ref_nan & ~bnd_nan & ~overflow & ~zero
+            err_bnd = np.maximum(bnd * 2.0 ** (-1 - fmt.frac), fmt.normal_min)
+            err = np.where(checked, (imp - ref) / err_bnd, 0.0)
+            failed = ref_nan & ~np.isnan(imp)
+            failed |= zero & ((ref != 0.0) | (imp != 0.0))
+            failed |= checked & ~(np.abs(err) <= abs_bound)
+
+        self.count += ref.size
+        self.err_sum += float(err.sum())
+        self.err_sumsq += float((err * err).sum())
+        if err.size:
+            self.max_abs_err = max(self.max_abs_err, float(np.abs(err).max()))
+        bad = np.flatnonzero(failed)
+        self.failures += bad.size
+        room = self.max_indices - len(self.indices)
+        if room > 0 and bad.size:
+            flat = bad[:room] + start
+            position = np.unravel_index(flat, self.shape)
+            self.indices.extend([list(map(int, i)) for i in zip(*position)])
+
+    # Final checks over the whole output for test set S
+    def passed(self, test_set):
+        return not self.failure_reasons(test_set)
+
+    def failure_reasons(self, test_set):
+        reasons = []
+        if self.failures:
+            reasons.append(f"{self.failures} results outside the error bound")
+        variance_bound = self.bounds.variance_bound * self.count
+        if 3 <= test_set <= 5:
+            if abs(self.err_sum) > math.sqrt(10 * variance_bound):
+                reasons.append("error sum exceeds the bias bound")
+        if self.err_sumsq > variance_bound:
+            reasons.append("error sum of squares exceeds the variance bound")
+        return reasons
+
+    def as_dict(self, test_set):
+        return {
+            "shape": list(self.shape),
+            "count": self.count,
+            "ksb": self.bounds.ksb,
+            "abs_bound": self.bounds.abs_bound,
+            "variance_bound": self.bounds.variance_bound,
+            "failures": self.failures,
+            "failure_indices": self.indices,
+            "max_abs_error": self.max_abs_err,
+            "error_sum": self.err_sum,
+            "error_sumsq": self.err_sumsq,
+            "passed": self.passed(test_set),
+            "reasons": self.failure_reasons(test_set),
+        }
+
+
+def abs_min(value, fmt):
+    return np.maximum(np.abs(np.asarray(value, dtype=np.float64)), fmt.normal_min)
+
+
+# max_value(input_abs) of a possibly memory-mapped tensor, in chunks
+def abs_max(value, fmt, chunk=1 << 22):
+    flat = value.reshape(-1)
+    result = fmt.normal_min
+    for start in range(0, flat.shape[0], chunk):
+        stop = min(start + chunk, flat.shape[0])
+        result = np.maximum(result, abs_min(flat[start:stop], fmt).max())
+    return float(result)
+
+
+# The fp64 reference and bound results of tiles of the convolution output.
+# Yields the first flat position of the tile and the [T, outputs] results.
+def convolution_passes(
+    opname, input, weight, bias, attributes, types, local_bound, exact, max_bytes
+):
+    in_fmt = float_format(types["in_t"])
+    coordinates, depthwise = operator_geometry(opname, input, weight, **attributes)
+    weight = np.asarray(weight, dtype=np.float64)
+    weight_abs = abs_min(weight, float_format(types["weight_t"]))
+    if depthwise:
+        weight = weight.reshape(-1, weight.shape[-2], weight.shape[-1])
+        weight_abs = weight_abs.reshape(weight.shape)
+        taps, channels, outputs = weight.shape
+        outputs *= channels
+    else:
+        weight = weight.reshape(weight.shape[0], -1, weight.shape[-1])
+        weight_abs = weight_abs.reshape(weight.shape)
+        outputs, taps, channels = weight.shape
+    bias = np.broadcast_to(np.asarray(bias, dtype=np.float64), (outputs,))
+    bias_abs = abs_min(bias, float_format(types["out_t"]))
+    input_abs_max = None if local_bound else abs_max(input, in_fmt)
+
+    n = input.shape[0]
+    positions = n * int(np.prod([coord.shape[0] for coord, _ in coordinates]))
+    rows = tile_rows((2 * taps * channels + 2 * outputs) * 8, max_bytes)
+    for start in range(0, positions, rows):
+        stop = min(start + rows, positions)
+        patches, valid = gather_patches(input, coordinates, 0.0, "fp64_t", start, stop)
+        # Padding is zero in both passes, other inputs are replaced by their
+        # absolute value or by the global maximum
+        if local_bound:
+            patches_abs = abs_min(patches, in_fmt)
+        else:
+            patches_abs = np.full(patches.shape, input_abs_max)
+        patches_abs = np.where(valid[:, :, None], patches_abs, 0.0)
+        if exact:
+            ref = reduce_patches(
+                patches, valid, weight, "fp64_t", depthwise, True, False
+            )
+            bnd = reduce_patches(
+                patches_abs, valid, weight_abs, "fp64_t", depthwise, True, True
+            )
+        elif depthwise:
+            ref = np.einsum("tkc,kcm->tcm", patches, weight).reshape(stop - start, -1)
+            bnd = np.einsum("tkc,kcm->tcm", patches_abs, weight_abs)
+            bnd = bnd.reshape(stop - start, -1)
+        else:
+            ref = np.tensordot(patches, weight, axes=([1, 2], [1, 2]))
+            bnd = np.tensordot(patches_abs, weight_abs, axes=([1, 2], [1, 2]))
+        yield start, ref + bias, bnd + bias_abs
+
+
+# MATMUL has no bias, which is taken to be zero. The tiles are rows of one
+# batch of the output.
+def matmul_passes(A, B, types, exact, max_bytes):
+    a_fmt = float_format(types["in_t"])
+    bias_abs = float_format(types["out_t"]).normal_min
+    n, h, c = A.shape
+    w = B.shape[2]
+    rows = tile_rows((2 * c + 2 * w) * 8, max_bytes)
+    for i in range(n):
+        b = np.asarray(B[i], dtype=np.float64)
+        b_abs = abs_min(b, float_format(types["weight_t"]))
+        for start in range(0, h, rows):
+            stop = min(start + rows, h)
+            a = np.asarray(A[i, start:stop], dtype=np.float64)
+            a_abs = abs_min(a, a_fmt)
+            if exact:
+                ref = np.zeros((stop - start, w))
+                bnd = np.zeros((stop - start, w))
+                for k in range(c):
+                    ref = ref + a[:, k, None] * b[k][None, :]
+                    bnd = bnd + a_abs[:, k, None] * b_abs[k][None, :]
+            else:
+                ref = a @ b
+                bnd = a_abs @ b_abs
+            yield i * h + start, ref, bnd + bias_abs
+
+
+# Runs the dot product check of a convolution or MATMUL. tensors holds the
+# input, weight and optional bias (A and B for MATMUL) and output is the
+# implementation result. types gives in_t, weight_t, out_t and acc_t, which
+# is out_t for MATMUL.
+def dotproduct_check(
+    opname,
+    tensors,
+    output,
+    types,
+    attributes=None,
+    local_bound=None,
+    exact=False,
+    max_bytes=DEFAULT_MAX_BYTES,
+    max_indices=100,
+):
+    if opname not in DOT_PRODUCT_OPERATORS:
+        raise DotProductCheckError(f"No dot product check for {opname}")
+    for name, ty in types.items():
+        if ty not in FLOAT_FORMATS:
+            raise DotProductCheckError(f"{name} of {ty} is not supported")
+    attributes = attributes or {}
+    output = np.asarray(output) if not isinstance(output, np.ndarray) else output
+    flat_output = output.reshape(-1, output.shape[-1])
+
+    if opname == "MATMUL":
+        weight = tensors["B"]
+        bias_abs_max = float_format(types["out_t"]).normal_min
+        # Operators without a local_bound attribute use a local bound
+        passes = matmul_passes(tensors["A"], weight, types, exact, max_bytes)
+    else:
+        weight = tensors["weight"]
+        bias = tensors.get("bias", np.zeros(1))
+        bias_abs_max = float(abs_min(bias, float_format(types["out_t"])).max())
+        passes = convolution_passes(
+            opname,
+            tensors["input"],
+            weight,
+            bias,
+            attributes,
+            types,
+            bool(local_bound),
+            exact,
+            max_bytes,
+        )
+    bounds = DotProductBounds(
+        types["in_t"],
+        types["out_t"],
+        types["acc_t"],
+        kernel_size(opname, weight.shape),
+        bias_abs_max,
+    )
+    report = DotProductReport(bounds, output.shape, max_indices)
+    for start, ref, bnd in passes:
+        stop = start + ref.shape[0]
+        imp = flat_output[start:stop]
+        if imp.shape != ref.shape:
+            raise DotProductCheckError(
+                f"Output shape {output.shape} does not match the operation"
+            )
+        report.update(start * ref.shape[1], imp.reshape(-1), ref.ravel(), bnd.ravel())
+    if report.count != output.size:
+        raise DotProductCheckError(
+            f"Output shape {output.shape} does not match the operation"
+        )
+    return report
+
+
+def parse_ints(text):
+    return [int(v) for v in text.split(",")] if text else None
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--operator",
+        required=True,
+        choices=DOT_PRODUCT_OPERATORS,
+        help="Operator whose result is checked",
+    )
+    parser.add_argument(
+        "--set",
+        required=True,
+        type=int,
+        dest="test_set",
+        help="Test data set number S",
+    )
+    parser.add_argument(
+        "--input", required=True, help="Path to the input tensor, A for MATMUL (.npy)"
+    )
+    parser.add_argument(
+        "--weight",
+        required=True,
+        help="Path to the weight tensor, B for MATMUL (.npy)",
+    )
+    parser.add_argument("--bias", required=False, help="Path to the bias tensor (.npy)")
+    parser.add_argument(
+        "--output",
+        required=True,
+        help="Path to the implementation result (.npy)",
+    )
+    for name in ("in", "weight", "out", "acc"):
+        parser.add_argument(
+            f"--{name}-type",
+            required=name != "acc",
+            choices=sorted(FLOAT_FORMATS),
+            help=f"Type {name}_t of the operation",
+        )
+    for name in ("pad", "stride", "dilation", "out-pad"):
+        parser.add_argument(
+            f"--{name}",
+            required=False,
+            help=f"Comma separated {name} attribute",
+        )
+    parser.add_argument(
+        "--local-bound",
+        required=False,
+        action="store_true",
+        help="Value of the local_bound attribute",
+    )
+    parser.add_argument(
+        "--exact-order",
+        required=False,
+        action="store_true",
+        help="Accumulate the fp64 passes in the pseudocode order",
+    )
+    parser.add_argument(
+        "--max-bytes",
+        required=False,
+        type=int,
+        default=DEFAULT_MAX_BYTES,
+        help="Memory budget of the temporary arrays of one tile",
+    )
+    parser.add_argument(
+        "--json",
+        required=False,
+        action="store_true",
+        help="Print the report as JSON",
+    )
+    args = parser.parse_args()
+
+    types = {
+        "in_t": args.in_type,
+        "weight_t": args.weight_type,
+        "out_t": args.out_type,
+        "acc_t": args.acc_type or args.out_type,
+    }
+    try:
+        input = np.load(args.input, mmap_mode="r")
+        weight = np.load(args.weight, mmap_mode="r")
+        output = np.load(args.output, mmap_mode="r")
+        if args.operator == "MATMUL":
+            tensors = {"A": input, "B": weight}
+            attributes = {}
+            local_bound = True
+        else:
+            tensors = {"input": input, "weight": weight}
+            if args.bias:
+                tensors["bias"] = np.load(args.bias)
+            attributes = {
+                "pad": parse_ints(args.pad),
+                "stride": parse_ints(args.stride),
+            }
+            if args.operator == "TRANSPOSE_CONV2D":
+                attributes["out_pad"] = parse_ints(args.out_pad)
+                del attributes["pad"]
+            else:
+                attributes["dilation"] = parse_ints(args.dilation)
+            local_bound = args.local_bound
+        report = dotproduct_check(
+            args.operator,
+            tensors,
+            output,
+            types,
+            attributes,
+            local_bound,
+            args.exact_order,
+            args.max_bytes,
+        )
+    except (OSError, ValueError, TypeError, RuntimeError) as e:
+        print(f"Failure running dot product check: {str(e)}")
+        exit(1)
+    result = report.as_dict(args.test_set)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        status = "PASS" if result["passed"] else "FAIL"
+        print(
+            f"{status}: {result['count']} results, ksb {result['ksb']}, "
+            f"max error {result['max_abs_error']:g} of {result['abs_bound']}, "
+            f"error sum {result['error_sum']:g}, "
+            f"sum of squares {result['error_sumsq']:g}"
+        )
+        for reason in result["reasons"]:
+            print(f"    {reason}")
+        for index in result["failure_indices"]:
+            print(f"    {index}")
+    exit(0 if result["passed"] else 1)
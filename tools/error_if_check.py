@@ -0,0 +1,859 @@
+#!/usr/bin/env python3
+# Copyright (c) 2026, ARM Limited.
+# SPDX-License-Identifier: Apache-2.0
+# Batch validators of the ERROR_IF conditions of the operators. The
+# ERROR_IF statements of an operator's pseudocode, with the statements they
+# depend on, and the argument shapes of tosa.xml are compiled into one NumPy
+# function per type binding. It checks a batch of argument records at once:
+# scalars are arrays of one value per record, and shapes and lists have the
+# record axis first. Statements that depend on tensor data or data
+# positions can not be checked before the operator runs and are left out.
+import itertools
+import json
+import os
+import re
+
+import numpy as np
+import pseudocode
+import pseudocode_numpy
+import tosa
+from pseudocode_interpreter import NAME_LIST
+from pseudocode_interpreter import SHAPE
+from pseudocode_numpy import CONSTANTS
+from pseudocode_numpy import find_operator
+from pseudocode_numpy import KernelWriter
+from pseudocode_numpy import mask_and
+from pseudocode_numpy import PseudocodeCompileError
+from pseudocode_numpy import PseudocodeKernelCompiler
+from pseudocode_numpy import python_name
+from pseudocode_numpy import truth
+from tosa import BLOCK_SCALE_VALUE_TYPE_MAPPING
+
+# The types of is_integer<type>() in library/generic_helpers.tosac
+INTEGER_TYPES = ["i8_t", "i16_t", "i32_t", "i48_t", "i64_t"]
+
+# Declared-only helpers evaluated on batches of records, and the runtime
+# functions that do so
+BATCH_FUNCTIONS = {
+    "broadcast_shape": "broadcast_shape",
+    "length": "length",
+    "max": "maximum",
+    "min": "minimum",
+    "power_of_two": "power_of_two",
+    "rank": "rank",
+    "shape_dim": "shape_dim",
+    "tensor_list_shape": "list_shapes",
+    "tensor_size": "tensor_size",
+}
+
+# Argument types holding a list of shapes
+LIST_TYPES = ("tensor_list_t", "shape_list_t")
+
+IDENTIFIER = re.compile(r"[A-Za-z_]\w*")
+
+# Shape of a tensor list given as the shapes of its elements
+SHAPE_TUPLE = re.compile(r"\(\s*(\w+(?:\s*,\s*\w+)*)\s*\)")
+
+
+class ErrorIfCheckError(RuntimeError):
+    pass
+
+
+# Runtime of the generated validators, referenced as rt. An ERROR_IF marks
+# the records whose condition is true against the statement being checked,
+# rather than raising.
+class BatchRuntime:
+    # Bound on the iterations of a loop, in case its variable is not updated
+    MAX_LOOP_ITERATIONS = 1 << 16
+
+    def __init__(self, size, violations, columns):
+        self.size = size
+        self.violations = violations
+        self.columns = columns
+        self.column = None
+
+    def __getattr__(self, name):
+        return getattr(pseudocode_numpy, name)
+
+    def records(self, value):
+        return np.broadcast_to(truth(value), (self.size,))
+
+    def at(self, location):
+        self.column = self.columns[location]
+
+    def error_if(self, mask, cond, where):
+        self.violations[:, self.column] |= self.records(mask_and(mask, cond))
+
+    # REQUIRE conditions are on the tensor data
+    def require(self, mask, cond, where):
+        pass
+
+    # Element of a list of each record. Indices outside the list are clamped,
+    # as the records using them already fail an earlier ERROR_IF.
+    def index(self, value, index):
+        value = np.asarray(value)
+        if value.ndim < 2:
+            raise ErrorIfCheckError("index of a value that is not a list")
+        if value.shape[1] == 0:
+            return np.zeros((self.size,) + value.shape[2:], dtype=value.dtype)
+        index = np.asarray(index)
+        index = np.clip(
+            np.where(index < 0, index + value.shape[1], index), 0, value.shape[1] - 1
+        )
+        if index.ndim == 0:
+            return value[:, int(index)]
+        index = np.broadcast_to(index, (self.size,))
+        index = index.reshape((self.size, 1) + (1,) * (value.ndim - 2))
+        return np.take_along_axis(value, index, axis=1)[:, 0]
+
+    # Sets an element of a list of each record under a mask
+    def set_index(self, mask, value, index, element):
+        value = np.array(value)
+        element = np.broadcast_to(element, (self.size,) + value.shape[2:])
+        selected = np.broadcast_to(truth(mask), (self.size,))
+        for i in range(value.shape[1]):
+            at = selected & ((index == i) | (index == i - value.shape[1]))
+            value[at, i] = element[at]
+        return value
+
+    # List of values of each record
+    def list_of(self, *values):
+        if not values:
+            return np.zeros((self.size, 0), dtype=np.int64)
+        values = np.broadcast_arrays(*[np.asarray(v) for v in values])
+        return np.broadcast_to(np.stack(values, axis=-1), (self.size, len(values)))
+
+    # The shapes of a tensor list are its record values
+    def list_shapes(self, value):
+        return value
+
+    # == of the pseudocode, which compares whole shapes and lists
+    def same(self, a, b):
+        a = np.asarray(a)
+        b = np.asarray(b)
+        if a.ndim < 2 and b.ndim < 2:
+            return a == b
+        if a.ndim >= 2 and b.ndim >= 2 and a.shape[1] == 0 and b.shape[1] == 0:
+            return np.ones(self.size, dtype=bool)
+        if a.ndim < 2 or b.ndim < 2 or a.shape[1:] != b.shape[1:]:
+            return np.zeros(self.size, dtype=bool)
+        return np.all(a == b, axis=tuple(range(1, a.ndim)))
+
+    def rank(self, value):
+        value = np.asarray(value)
+        if value.ndim < 2:
+            raise ErrorIfCheckError("rank of a value that is not a shape")
+        return value.shape[1]
+
+    def length(self, value):
+        return self.rank(value)
+
+    def maximum(self, a, b):
+        return np.maximum(a, b)
+
+    def minimum(self, a, b):
+        return np.minimum(a, b)
+
+    def power_of_two(self, value):
+        value = np.asarray(value)
+        return (value > 0) & ((value & (value - 1)) == 0)
+
+    def tensor_size(self, shape):
+        return np.prod(shape, axis=1)
+
+    def shape_dim(self, shape, axis):
+        if self.rank(shape) == 0:
+            return np.ones(self.size, dtype=np.int64)
+        return np.where(
+            np.asarray(axis) >= self.rank(shape), 1, self.index(shape, axis)
+        )
+
+    def broadcast_shape(self, shape1, shape2):
+        shape1 = np.asarray(shape1)
+        shape2 = np.asarray(shape2)
+        if shape1.shape[1:] != shape2.shape[1:]:
+            self.violations[:, self.column] = True
+            return shape1
+        bad = (shape1 != 1) & (shape2 != 1) & (shape1 != shape2)
+        self.violations[:, self.column] |= bad.any(axis=1)
+        return np.where(shape1 == 1, shape2, shape1)
+
+    def loop_range(self, lower, upper):
+        lower = np.asarray(lower)
+        upper = np.asarray(upper)
+        if lower.size == 0 or upper.size == 0:
+            return range(0)
+        return range(int(lower.min()), int(upper.max()))
+
+
+def names_used(node):
+    return {n.name for n in node.walk() if isinstance(n, pseudocode.Name)}
+
+
+def declared_names(node):
+    if isinstance(node, pseudocode.Declaration):
+        return {node.name}
+    if isinstance(node, pseudocode.DeclarationList):
+        return {d.name for d in node.declarations}
+    if isinstance(node, pseudocode.ExprStatement):
+        expr = node.expr
+        if isinstance(expr, pseudocode.Assign):
+            return assigned_names(expr.target)
+        if isinstance(expr, (pseudocode.Postfix, pseudocode.Unary)):
+            if expr.op in ("++", "--"):
+                return assigned_names(expr.operand)
+    return set()
+
+
+# The variable an assignment sets, or sets an element of
+def assigned_names(target):
+    while isinstance(target, pseudocode.Index):
+        target = target.value
+    return {target.name} if isinstance(target, pseudocode.Name) else set()
+
+
+def is_error_if(node):
+    return (
+        isinstance(node, pseudocode.ExprStatement)
+        and isinstance(node.expr, pseudocode.Call)
+        and node.expr.name == "ERROR_IF"
+    )
+
+
+# The ERROR_IF statements of a block and the statements they depend on.
+# Loops and conditions are kept with only those statements in their body.
+def constraint_statements(statements, needed):
+    kept = []
+    for statement in reversed(statements):
+        if is_error_if(statement):
+            kept.append(statement)
+            needed |= names_used(statement)
+        elif declared_names(statement) & needed:
+            kept.append(statement)
+            needed |= names_used(statement)
+        elif isinstance(statement, pseudocode.Block):
+            body = constraint_statements(statement.body, needed)
+            if body:
+                kept.append(pseudocode.Block(body, line=statement.line))
+        elif isinstance(statement, pseudocode.If):
+            body = constraint_branch(statement.body, needed)
+            orelse = constraint_branch(statement.orelse, needed)
+            if body is not None or orelse is not None:
+                empty = pseudocode.Block([], line=statement.line)
+                node = pseudocode.If(
+                    statement.test, body or empty, orelse, line=statement.line
+                )
+                kept.append(node)
+                needed |= names_used(statement.test)
+        elif isinstance(
+            statement, (pseudocode.For, pseudocode.ForEach, pseudocode.ForEachIn)
+        ):
+            # Twice, for the names a later iteration needs
+            constraint_branch(statement.body, needed)
+            body = constraint_branch(statement.body, needed)
+            if body is not None:
+                values = [getattr(statement, f) for f in statement.fields]
+                values[statement.fields.index("body")] = body
+                node = type(statement)(*values, line=statement.line)
+                kept.append(node)
+                for field in statement.fields:
+                    value = getattr(statement, field)
+                    if field != "body" and isinstance(value, pseudocode.Node):
+                        needed |= names_used(value)
+                    elif isinstance(value, list):
+                        for item in value:
+                            if isinstance(item, pseudocode.Node):
+                                needed |= names_used(item)
+    kept.reverse()
+    return kept
+
+
+def constraint_branch(node, needed):
+    if node is None:
+        return None
+    statements = node.body if isinstance(node, pseudocode.Block) else [node]
+    body = constraint_statements(statements, needed)
+    return pseudocode.Block(body, line=node.line) if body else None
+
+
+def is_value_argument(arg):
+    categories = [c.name for c in arg.categories]
+    return (
+        arg.type not in ("tensor_t", "tensor_list_t")
+        or arg.shape == "[1]"
+        or "attribute" in categories
+    )
+
+
+def declared_dims(arg):
+    m = SHAPE.fullmatch(arg.shape or "")
+    if m is None:
+        m = re.fullmatch(r"\[(.+)\]", arg.shape or "")
+    return [d.strip() for d in m.group(1).split(",")] if m else None
+
+
+def tuple_names(arg):
+    m = SHAPE_TUPLE.fullmatch(arg.shape or "")
+    return [n.strip() for n in m.group(1).split(",")] if m else None
+
+
+# Arguments given by a single value, of shape [1]
+def single_values(op):
+    return {
+        arg.name
+        for arg in op.arguments
+        if is_value_argument(arg) and arg.shape == "[1]"
+    }
+
+
+def element_names(arg):
+    m = NAME_LIST.fullmatch(arg.description.strip())
+    return [n.strip() for n in m.group(1).split(",")] if m else None
+
+
+# Names the argument records bind: the arguments, the dimensions of their
+# shapes, shape names such as shape1 and the named elements of attributes
+def argument_names(op):
+    names = {"profiles"}
+    for arg in op.arguments:
+        names.add(arg.name)
+        dims = declared_dims(arg)
+        if dims is not None and not is_value_argument(arg):
+            names.update(d for d in dims if IDENTIFIER.fullmatch(d))
+        elif IDENTIFIER.fullmatch(arg.shape or ""):
+            names.add(arg.shape)
+        names.update(element_names(arg) or [])
+        names.update(tuple_names(arg) or [])
+    return names
+
+
+# ERROR_IF statements for the shapes of tosa.xml: dimensions named by an
+# earlier argument, constant dimensions and dimensions given by expressions
+def shape_conditions(op):
+    bound = set()
+    conditions = []
+    for arg in op.arguments:
+        dims = declared_dims(arg)
+        if dims is None:
+            continue
+        if is_value_argument(arg):
+            if len(dims) == 1 and not dims[0].isdigit():
+                conditions.append((arg, f"ERROR_IF(length({arg.name}) != {dims[0]});"))
+            continue
+        for i, dim in enumerate(dims):
+            if IDENTIFIER.fullmatch(dim) and dim not in bound:
+                bound.add(dim)
+            else:
+                conditions.append((arg, f"ERROR_IF({arg.name}[{i}] != {dim});"))
+    return conditions
+
+
+# The text of the statement starting at a line of a pseudocode file
+def statement_text(root, relpath, line):
+    with open(os.path.join(root, relpath), "r") as f:
+        lines = f.read().splitlines()
+    text = []
+    depth = 0
+    for source in itertools.islice(lines, line - 1, None):
+        code = source.split("//")[0].strip()
+        text.append(code)
+        depth += code.count("(") - code.count(")")
+        if code.endswith(";") or depth <= 0:
+            break
+    return " ".join(t for t in text if t)
+
+
+# Writes the validator of an operator: its ERROR_IF statements, each marked
+# with the condition it is checked against. Statements that can not be
+# compiled, such as those using data positions, are left out and listed.
+class ErrorIfWriter(KernelWriter):
+    def __init__(self, compiler, relpath, binding, names, values):
+        super().__init__(compiler, relpath, binding)
+        self.names = names
+        self.values = values
+        # Names set by statements that were left out
+        self.unknown = set()
+        self.locations = []
+        self.location = None
+        self.skipped = []
+
+    def fold(self, expr):
+        if isinstance(expr, (pseudocode.Call, pseudocode.TemplateName)):
+            if len(expr.template_args) == 1:
+                ty = self.resolve(expr.template_args[0])
+                if expr.name == "is_block_scale":
+                    return ty in BLOCK_SCALE_VALUE_TYPE_MAPPING
+                if expr.name == "is_integer":
+                    return ty in INTEGER_TYPES
+        return super().fold(expr)
+
+    def expr_Name(self, node, mask):
+        name = node.name
+        if (
+            self.kernel
+            and name not in self.scope
+            and name not in CONSTANTS
+            and name not in self.compiler.enum_values
+            and name not in self.names
+            or name in self.unknown
+        ):
+            raise self.error(node, f"{name} is not known before the operator runs")
+        return super().expr_Name(node, mask)
+
+    def assign(self, target, value, mask):
+        if not isinstance(target, pseudocode.Index):
+            return super().assign(target, value, mask)
+        if not isinstance(target.value, pseudocode.Name):
+            raise self.error(target, "assignment to this target is not supported")
+        var, _ = self.expr(target.value, mask)
+        index, _ = self.expr(target.index, mask)
+        source, _ = self.expr(value, mask)
+        self.emit(f"{var} = rt.set_index({mask}, {var}, {index}, {source})")
+
+    def expr_ListLiteral(self, node, mask):
+        values = [self.expr(element, mask)[0] for element in node.elements]
+        return f"rt.list_of({', '.join(values)})", "shape_t"
+
+    def expr_Index(self, node, mask):
+        value, _ = self.expr(node.value, mask)
+        index, _ = self.expr(node.index, mask)
+        return f"rt.index({value}, {index})", None
+
+    def expr_Call(self, node, mask):
+        name = node.name
+        if name == "get_innermost_block_size" and len(node.template_args) == 1:
+            ty = self.resolve(node.template_args[0])
+            m = re.match(r"bs(\d+)_", ty)
+            if ty not in BLOCK_SCALE_VALUE_TYPE_MAPPING or m is None:
+                raise self.error(node, f"{ty} is not a block scaled type")
+            return m.group(1), "int32_t"
+        if name == "tensor_read" and node.args:
+            tensor = node.args[0]
+            if isinstance(tensor, pseudocode.Name) and tensor.name in self.values:
+                # The value of a single value argument is in the record
+                ty = self.numeric(self.resolve(node.template_args[0]), node)
+                value, _ = self.expr(tensor, mask)
+                return f'rt.cast({value}, "{ty}")', ty
+        if name in ("tensor_read", "tensor_write"):
+            raise self.error(node, f"{name} needs the tensor data")
+        if name in BATCH_FUNCTIONS and not node.template_args:
+            args = ", ".join(self.expr(arg, mask)[0] for arg in node.args)
+            return f"rt.{BATCH_FUNCTIONS[name]}({args})", None
+        return super().expr_Call(node, mask)
+
+    def binary(self, op, left, left_ty, right, right_ty):
+        if op == "==":
+            return f"rt.same({left}, {right})"
+        if op == "!=":
+            return f"np.logical_not(rt.same({left}, {right}))"
+        return super().binary(op, left, left_ty, right, right_ty)
+
+    def block(self, statements, mask, top=False):
+        if not self.kernel:
+            return super().block(statements, mask, top)
+        for statement in statements:
+            state = self.save_function()
+            count = len(self.lines)
+            free_names = list(self.free_names)
+            scope = dict(self.scope)
+            locations = len(self.locations)
+            try:
+                if is_error_if(statement):
+                    location = self.location or f"{self.relpath}:{statement.line}"
+                    if location not in self.locations:
+                        self.locations.append(location)
+                    self.emit(f'rt.at("{location}")')
+                self.statement(statement, mask, top)
+            except PseudocodeCompileError as e:
+                self.restore_function(state)
+                del self.lines[count:]
+                self.free_names[:] = free_names
+                self.scope.clear()
+                self.scope.update(scope)
+                del self.locations[locations:]
+                # Library functions left part written
+                for key in [k for k, v in self.functions.items() if v is None]:
+                    del self.functions[key]
+                self.unknown |= declared_names(statement)
+                self.skipped.append(str(e))
+        return False
+
+    # The data position loops of ERROR_IF statements are not run, the
+    # statements using the positions are left out
+    def stmt_ForEachIn(self, node, mask, top):
+        return self.statement(node.body, mask)
+
+    def stmt_ForEach(self, node, mask, top):
+        for term in node.ranges:
+            if (
+                not isinstance(term, pseudocode.Compare)
+                or term.ops != ["<=", "<"]
+                or not isinstance(term.comparators[0], pseudocode.Name)
+            ):
+                raise self.error(node, "for_each range is not of the form lo <= i < hi")
+        self.for_each_range(node.ranges, node.body, mask)
+        return False
+
+    def for_each_range(self, ranges, body, mask):
+        if not ranges:
+            self.statement(body, mask)
+            return
+        term = ranges[0]
+        lower, _ = self.expr(term.left, mask)
+        upper, _ = self.expr(term.comparators[1], mask)
+        name = term.comparators[0].name
+        var = python_name(name)
+        self.emit(f"for {var} in rt.loop_range({lower}, {upper}):")
+        self.indent += 1
+        self.scope[name] = "int32_t"
+        loop_mask = self.temp()
+        self.emit(
+            f"{loop_mask} = rt.mask_and({mask}, "
+            f"np.logical_and({var} >= {lower}, {var} < {upper}))"
+        )
+        self.for_each_range(ranges[1:], body, loop_mask)
+        self.indent -= 1
+
+    def stmt_For(self, node, mask, top):
+        if node.test is None:
+            raise self.error(node, "for loop without a condition")
+        if node.init is not None:
+            self.statement(node.init, mask)
+        self.emit("for _ in range(rt.MAX_LOOP_ITERATIONS):")
+        self.indent += 1
+        test, _ = self.expr(node.test, mask)
+        loop_mask = self.temp()
+        self.emit(f"{loop_mask} = rt.mask_and({mask}, {test})")
+        self.emit(f"if not rt.any_set({loop_mask}):")
+        self.emit("    break")
+        self.statement(node.body, loop_mask)
+        if node.step is not None:
+            step = pseudocode.ExprStatement(node.step, line=node.line)
+            self.statement(step, loop_mask)
+        self.indent -= 1
+        return False
+
+    # Kernel of the shape conditions, by location, and the ERROR_IF
+    # statements of an operator file
+    def write(self, module, shapes):
+        relpath = self.relpath
+        for location, statements in shapes.items():
+            self.location = location
+            self.relpath = location
+            self.block(statements, "True")
+        self.location = None
+        self.relpath = relpath
+        self.block(constraint_statements(module.statements(), set()), "True")
+        body = self.lines
+        lines = ["def kernel(args):"]
+        for name in self.free_names:
+            lines.append(f'    {python_name(name)} = args["{name}"]')
+        lines.extend(body or ["    pass"])
+        for key in self.function_order:
+            lines = self.functions[key] + [""] + lines
+        return "\n".join(lines) + "\n"
+
+
+# Result of checking a batch of records: violations[i, c] is true when
+# record i fails condition c
+class ErrorIfReport:
+    def __init__(self, conditions, violations):
+        self.conditions = conditions
+        self.violations = violations
+
+    def valid(self):
+        return ~self.violations.any(axis=1)
+
+    # Conditions a record fails. Those after the first can be consequences
+    # of it.
+    def reasons(self, record):
+        return [self.conditions[c] for c in np.flatnonzero(self.violations[record])]
+
+    def counts(self):
+        return {
+            location: int(count)
+            for (location, _), count in zip(
+                self.conditions, self.violations.sum(axis=0)
+            )
+            if count
+        }
+
+
+class ErrorIfValidator:
+    def __init__(self, op, binding, source, conditions, free_names, skipped):
+        self.op = op
+        self.binding = dict(binding)
+        self.source = source
+        self.conditions = conditions
+        self.free_names = free_names
+        self.skipped = skipped
+        self.columns = {location: i for i, (location, _) in enumerate(conditions)}
+        self.namespace = {"np": np, "rt": None}
+        exec(compile(source, f"<{op.name} validator>", "exec"), self.namespace)
+        self.kernel = self.namespace["kernel"]
+
+    # Arguments of the validator from columns of records, with the records
+    # whose argument shapes do not match tosa.xml marked
+    def batch_arguments(self, columns, size, violations):
+        args = {"profiles": None}
+        for arg in self.op.arguments:
+            if arg.name not in columns:
+                continue
+            value = np.asarray(columns[arg.name])
+            if value.shape[:1] != (size,):
+                raise ErrorIfCheckError(f"{arg.name} does not have {size} records")
+            if arg.type in LIST_TYPES and value.shape[1:] == (0,):
+                # An empty list of shapes
+                value = value.reshape(size, 0, 0)
+            dims = declared_dims(arg)
+            column = self.columns.get(f"tosa.xml:{self.op.name}:{arg.name}")
+            if is_value_argument(arg):
+                if arg.shape == "[1]" and value.shape[1:] == (1,):
+                    value = value[:, 0]
+                names = element_names(arg)
+                if names and value.shape[1:] == (len(names),):
+                    for i, name in enumerate(names):
+                        args[name] = value[:, i]
+                fixed = dims is not None and len(dims) == 1 and dims[0].isdigit()
+                if fixed and dims[0] != "1" and value.shape[1:] != (int(dims[0]),):
+                    violations[:, column] = True
+            elif dims is not None:
+                if value.shape[1:] != (len(dims),):
+                    violations[:, column] = True
+                else:
+                    for i, dim in enumerate(dims):
+                        if IDENTIFIER.fullmatch(dim):
+                            args.setdefault(dim, value[:, i])
+            elif IDENTIFIER.fullmatch(arg.shape or ""):
+                args.setdefault(arg.shape, value)
+            elif tuple_names(arg) is not None and value.ndim >= 2:
+                # A list shorter than its shape leaves the last names unbound
+                for name, shape in zip(tuple_names(arg), np.moveaxis(value, 1, 0)):
+                    args.setdefault(name, shape)
+            args[arg.name] = value
+        return args
+
+    # Checks columns of records, each an array with one row per record
+    def check_columns(self, columns):
+        sizes = {np.shape(value)[0] for value in columns.values()}
+        if len(sizes) != 1:
+            raise ErrorIfCheckError("Columns of records have different lengths")
+        size = sizes.pop()
+        violations = np.zeros((size, len(self.conditions)), dtype=bool)
+        args = self.batch_arguments(columns, size, violations)
+        if violations.any():
+            # Shapes that do not match tosa.xml can not be checked further
+            return violations
+        optional = {
+            name for arg in self.op.arguments for name in tuple_names(arg) or []
+        }
+        missing = [
+            name
+            for name in self.free_names
+            if name not in args and name not in optional
+        ]
+        if missing:
+            raise ErrorIfCheckError(
+                f"{self.op.name} records need {', '.join(sorted(missing))}"
+            )
+        self.namespace["rt"] = BatchRuntime(size, violations, self.columns)
+        for name in optional:
+            args.setdefault(name, None)
+        try:
+            with np.errstate(all="ignore"):
+                self.kernel(args)
+        finally:
+            self.namespace["rt"] = None
+        return violations
+
+    # Checks records, each a dict of argument values: shapes for tensors,
+    # values for attributes, shape_t and single element tensors. Records
+    # with the same argument shapes are checked together.
+    def check(self, records):
+        violations = np.zeros((len(records), len(self.conditions)), dtype=bool)
+        groups = {}
+        for i, record in enumerate(records):
+            key = []
+            for name in sorted(record):
+                try:
+                    key.append((name, np.shape(record[name])))
+                except ValueError:
+                    # Lists of shapes of different ranks
+                    key.append((name, None))
+            groups.setdefault(tuple(key), []).append(i)
+        for key, rows in groups.items():
+            for name, shape in key:
+                if shape is None:
+                    raise ErrorIfCheckError(
+                        f"{name} of record {rows[0]} is a list of values of "
+                        "different lengths, which can not be checked in a batch"
+                    )
+            columns = {
+                name: np.array([records[i][name] for i in rows]) for name, _ in key
+            }
+            violations[rows] = self.check_columns(columns)
+        return ErrorIfReport(self.conditions, violations)
+
+
+class ErrorIfCompiler(PseudocodeKernelCompiler):
+    def __init__(self, index, spec):
+        super().__init__(index, spec)
+        self.spec = spec
+        self.validators = {}
+
+    def validator(self, opname, binding):
+        key = (opname, tuple(sorted(binding.items())))
+        if key in self.validators:
+            return self.validators[key]
+        op = find_operator(self.spec, opname)
+        relpath = f"operators/{opname}.tosac"
+        if relpath not in self.index.modules:
+            raise ErrorIfCheckError(f"No pseudocode for {opname}")
+        conditions = []
+        shapes = {}
+        for arg in op.arguments:
+            if declared_dims(arg) is not None:
+                location = f"tosa.xml:{opname}:{arg.name}"
+                conditions.append((location, f"{arg.name} of shape {arg.shape}"))
+                shapes[location] = []
+        for arg, text in shape_conditions(op):
+            location = f"tosa.xml:{opname}:{arg.name}"
+            shapes[location].extend(pseudocode.parse(text, location).statements())
+        writer = ErrorIfWriter(
+            self, relpath, dict(binding), argument_names(op), single_values(op)
+        )
+        with np.errstate(all="ignore"):
+            source = writer.write(self.index.modules[relpath], shapes)
+        located = {location for location, _ in conditions}
+        for location in writer.locations:
+            if location not in located:
+                relpath, line = location.rsplit(":", 1)
+                text = statement_text(self.index.root, relpath, int(line))
+                conditions.append((location, text))
+        validator = ErrorIfValidator(
+            op, binding, source, conditions, list(writer.free_names), writer.skipped
+        )
+        self.validators[key] = validator
+        return validator
+
+
+# Type binding of a record, from its types or the mode of a type support
+def record_binding(op, record):
+    if "types" in record:
+        return dict(record["types"])
+    for typesupport in op.typesupports:
+        if record.get("mode") in (None, typesupport.mode):
+            return dict(typesupport.generated_tuples[0])
+    raise ErrorIfCheckError(f"{op.name} has no type support {record.get('mode')}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--xml",
+        required=False,
+        default=os.path.join(os.path.dirname(__file__), "..", "tosa.xml"),
+        help="Path to specification XML",
+    )
+    parser.add_argument(
+        "--pseudocode",
+        required=False,
+        default=os.path.join(os.path.dirname(__file__), "..", "pseudocode"),
+        help="Path to the pseudocode directory",
+    )
+    parser.add_argument(
+        "--operator",
+        required=False,
+        action="append",
+        default=[],
+        help="Operator to list the conditions of, all operators if not given",
+    )
+    parser.add_argument(
+        "--source",
+        required=False,
+        action="store_true",
+        help="Print the generated validator source",
+    )
+    parser.add_argument(
+        "--records",
+        required=False,
+        help="JSON lines file of records with operator, types or mode, "
+        "and arguments, to check",
+    )
+    parser.add_argument(
+        "--json",
+        required=False,
+        action="store_true",
+        help="Print the record results as JSON",
+    )
+    args = parser.parse_args()
+
+    try:
+        spec = tosa.TOSASpec(args.xml)
+        index = pseudocode.PseudocodeIndex(args.pseudocode)
+    except (OSError, RuntimeError) as e:
+        print(f"Failure reading XML spec or pseudocode: {str(e)}")
+        exit(1)
+    compiler = ErrorIfCompiler(index, spec)
+
+    if args.records is None:
+        opnames = args.operator or [
+            op.name for group in spec.operatorgroups for op in group.operators
+        ]
+        for opname in opnames:
+            try:
+                op = find_operator(spec, opname)
+                binding = record_binding(op, {})
+                validator = compiler.validator(opname, binding)
+            except (OSError, RuntimeError) as e:
+                print(f"{opname}: {str(e)}")
+                continue
+            print(
+                f"{opname}: {len(validator.conditions)} conditions, "
+                f"{len(validator.skipped)} statements left out"
+            )
+            if args.operator:
+                for location, text in validator.conditions:
+                    print(f"    {location}: {text}")
+                for reason in validator.skipped:
+                    print(f"    left out {reason}")
+            if args.source:
+                print(validator.source)
+        exit(0)
+
+    try:
+        with open(args.records, "r") as f:
+            records = [json.loads(line) for line in f if line.strip()]
+        groups = {}
+        for i, record in enumerate(records):
+            op = find_operator(spec, record["operator"])
+            binding = record_binding(op, record)
+            key = (op.name, tuple(sorted(binding.items())))
+            groups.setdefault(key, []).append(i)
+        results = [None] * len(records)
+        for (opname, binding), rows in groups.items():
+            validator = compiler.validator(opname, dict(binding))
+            report = validator.check([records[i]["arguments"] for i in rows])
+            for row, i in enumerate(rows):
+                results[i] = report.reasons(row)
+    except (OSError, ValueError, KeyError, RuntimeError) as e:
+        print(f"Failure checking records: {str(e)}")
+        exit(1)
+    if args.json:
+        print(
+            json.dumps(
+                [
+                    {"valid": not reasons, "reasons": [list(r) for r in reasons]}
+                    for reasons in results
+                ],
+                indent=2,
+            )
+        )
+    else:
+        for i, reasons in enumerate(results):
+            print(f"{i}: {'ERROR_IF' if reasons else 'OK'} {records[i]['operator']}")
+            for location, text in reasons:
+                print(f"    {location}: {text}")
+    exit(1 if any(results) else 0)
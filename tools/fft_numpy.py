@@ -0,0 +1,578 @@
+#!/usr/bin/env python3
+# Copyright (c) 2026, ARM Limited.
+# SPDX-License-Identifier: Apache-2.0
+# FFT2D and RFFT2D backed by numpy.fft, batched over N, with the dot product
+# accuracy check of their precision requirements. The forward transform of
+# the pseudocode is numpy's fft2 and the inverse is the unnormalized ifft2.
+# Each output is a dot product of the whole input with cos and sin weights,
+# so the bound on absolute values is a sum of H*W terms for every output.
+# The bounds are computed from the discrete Fourier series of |cos| and
+# |sin| over the angles the weights take, in O(max(H, W)*H*W) per batch.
+import json
+import os
+
+import numpy as np
+import pseudocode
+import tosa
+from dotproduct_check import abs_max
+from dotproduct_check import abs_min
+from dotproduct_check import DotProductBounds
+from dotproduct_check import DotProductReport
+from pseudocode_interpreter import interpret_operator
+from pseudocode_interpreter import PseudocodeInterpreter
+from pseudocode_numpy import ErrorIfTriggered
+from pseudocode_numpy import find_operator
+from pseudocode_numpy import NUMPY_TYPES
+from reference_check import float_format
+from tensor_ops_numpy import DEFAULT_MAX_BYTES
+from tensor_ops_numpy import error_if
+from tensor_ops_numpy import outcome
+from tensor_ops_numpy import tile_rows
+
+FFT_OPERATORS = ["FFT2D", "RFFT2D"]
+
+# cos and sin at the multiples of pi/2
+QUARTER_COS = np.array([1.0, 0.0, -1.0, 0.0])
+QUARTER_SIN = np.array([0.0, 1.0, 0.0, -1.0])
+
+
+class FFTError(RuntimeError):
+    pass
+
+
+def power_of_two(value):
+    return value > 0 and value & (value - 1) == 0
+
+
+# N, H and W of the input tensors, with the ERROR_IF checks of the operators
+def fft_shape(input_real, input_imag=None):
+    shape = np.shape(input_real)
+    if len(shape) != 3:
+        raise FFTError(f"Input shape {list(shape)} is not [N,H,W]")
+    if input_imag is not None and np.shape(input_imag) != shape:
+        raise FFTError(
+            f"input_imag shape {list(np.shape(input_imag))} "
+            f"does not match input_real {list(shape)}"
+        )
+    n, h, w = shape
+    error_if(not power_of_two(h), f"!power_of_two({h})")
+    error_if(not power_of_two(w), f"!power_of_two({w})")
+    return n, h, w
+
+
+def output_width(opname, w):
+    return w // 2 + 1 if opname == "RFFT2D" else w
+
+
+# Output rows and columns where every sin weight is exactly zero
+def zero_sine(h, w):
+    rows = [0, h // 2] if h > 1 else [0]
+    cols = [0, w // 2] if w > 1 else [0]
+    return np.array(rows), np.array(cols)
+
+
+# cos and sin of 2*pi*p/length, exact at the multiples of pi/2
+def unit_circle(p, length):
+    angle = 2 * np.pi * p / length
+    quarter = (4 * p) % length == 0
+    turn = (4 * p // length) % 4
+    cos = np.where(quarter, QUARTER_COS[turn], np.cos(angle))
+    sin = np.where(quarter, QUARTER_SIN[turn], np.sin(angle))
+    return cos, sin
+
+
+# rfft2 of real input in fp64. The imaginary parts that are sums of
+# products with exactly zero sin weights are zero, as in the dot products.
+def real_spectrum(values):
+    spectrum = np.fft.rfft2(np.asarray(values, dtype=np.float64))
+    rows, cols = zero_sine(*values.shape[1:])
+    spectrum.imag[:, rows[:, None], cols[None, :]] = 0.0
+    return spectrum
+
+
+# The full width spectrum of real input from its Hermitian half
+def full_spectrum(half, w):
+    h = half.shape[1]
+    cols = np.arange(half.shape[2], w)
+    rows = -np.arange(h) % h
+    mirrored = np.conj(half[:, rows[:, None], (w - cols)[None, :]])
+    return np.concatenate([half, mirrored], axis=2)
+
+
+# The fp64 reference of the real and imaginary outputs of batches
+# start to stop. The transforms of the real and imaginary inputs are taken
+# separately, and the inverse uses the conjugates of their spectra.
+def fft_reference(opname, input_real, input_imag, inverse, start, stop):
+    real = real_spectrum(input_real[start:stop])
+    if opname == "RFFT2D":
+        return real.real, real.imag
+    w = input_real.shape[2]
+    real = full_spectrum(real, w)
+    imag = full_spectrum(real_spectrum(input_imag[start:stop]), w)
+    sign = -1.0 if inverse else 1.0
+    return real.real - sign * imag.imag, sign * real.imag + imag.real
+
+
+# FFT2D or RFFT2D of in_out_t values rounded from the fp64 reference.
+# out is an optional pair of output_real and output_imag arrays, which may
+# be memory-mapped.
+def fft_operator(
+    opname,
+    input_real,
+    input_imag=None,
+    inverse=False,
+    in_out_t="fp32_t",
+    out=None,
+    max_bytes=DEFAULT_MAX_BYTES,
+):
+    if opname not in FFT_OPERATORS:
+        raise FFTError(f"No FFT implementation of {opname}")
+    if opname == "FFT2D" and input_imag is None:
+        raise FFTError("FFT2D requires input_imag")
+    if in_out_t not in NUMPY_TYPES or NUMPY_TYPES[in_out_t][2] != "f":
+        raise FFTError(f"in_out_t of {in_out_t} is not supported")
+    n, h, w = fft_shape(input_real, input_imag if opname == "FFT2D" else None)
+    shape = (n, h, output_width(opname, w))
+    if out is None:
+        dtype = NUMPY_TYPES[in_out_t][0]
+        out = (np.empty(shape, dtype=dtype), np.empty(shape, dtype=dtype))
+    for array in out:
+        if array.shape != shape:
+            raise FFTError(f"Output shape {list(array.shape)} is not {list(shape)}")
+    rows = tile_rows(64 * h * w, max_bytes)
+    for start in range(0, n, rows):
+        stop = min(start + rows, n)
+        parts = fft_reference(opname, input_real, input_imag, inverse, start, stop)
+        for array, part in zip(out, parts):
+            array[start:stop] = part
+    return out
+
+
+# max(|cos|, normal_min) and max(|sin|, normal_min) of 2*pi*p/length
+def weight_abs(p, length, fmt):
+    return [np.maximum(np.abs(v), fmt.normal_min) for v in unit_circle(p, length)]
+
+
+# Weights of the discrete Fourier series of an even function g on [0, L),
+# for the frequencies 0 to L/2 of the real parts of a 2D transform
+def series_coefficients(g):
+    length = g.shape[0]
+    coefficients = np.fft.fft(g).real[: length // 2 + 1] / length
+    k = np.arange(coefficients.shape[0])
+    return np.where((k > 0) & (2 * k != length), 2 * coefficients, coefficients)
+
+
+# The sums of values[n, iy, ix] * g(p) over the input positions for each
+# output position and each g of weights, where
+# p = (iy*oy*L/H + ix*ox*L/W) % L. Each term of the Fourier series of g is a
+# gather from the 2D transform of the values at (k*oy % H, k*ox % W).
+def weighted_sums(values, weights, width):
+    n, h, w = values.shape
+    spectrum = np.fft.fft2(values).real
+    coefficients = [series_coefficients(g) for g in weights]
+    rows = np.arange(h)[:, None]
+    cols = np.arange(width)[None, :]
+    sums = [np.zeros((n, h, width)) for _ in weights]
+    for k in range(coefficients[0].shape[0]):
+        term = spectrum[:, k * rows % h, k * cols % w]
+        for total, c in zip(sums, coefficients):
+            total += c[k] * term
+    return sums
+
+
+# The fp64 bound of the real and imaginary outputs of batches start to
+# stop. Without local_bound, every input_abs value is input_max.
+def fft_bound(opname, input_real, input_imag, fmt, input_max, start, stop):
+    h, w = input_real.shape[1:]
+    length = max(h, w)
+    weights = weight_abs(np.arange(length), length, fmt)
+    width = output_width(opname, w)
+    if input_max is not None:
+        values = [np.full((1, h, w), input_max)]
+        if opname == "FFT2D":
+            values.append(values[0])
+    else:
+        values = [abs_min(input_real[start:stop], fmt)]
+        if opname == "FFT2D":
+            values.append(abs_min(input_imag[start:stop], fmt))
+    sums = [weighted_sums(v, weights, width) for v in values]
+    # Where every sin weight is zero the sums of normal_min weights are
+    # far below the rounding error of the series, so they are set exactly
+    rows, cols = zero_sine(h, w)
+    for (_, sin_sum), v in zip(sums, values):
+        total = fmt.normal_min * v.sum(axis=(1, 2))
+        sin_sum[:, rows[:, None], cols[None, :]] = total[:, None, None]
+    if opname == "RFFT2D":
+        bnd = sums[0]
+    else:
+        (real_cos, real_sin), (imag_cos, imag_sin) = sums
+        bnd = (real_cos + imag_sin, real_sin + imag_cos)
+    shape = (stop - start, h, width)
+    return tuple(np.broadcast_to(b, shape) for b in bnd)
+
+
+# The fp64 reference and bound of tiles of the outputs. Yields the first
+# batch of the tile and the (real, imag) references and bounds.
+def fft_passes(opname, input_real, input_imag, inverse, fmt, local_bound, max_bytes):
+    n, h, w = input_real.shape
+    input_max = None
+    if not local_bound:
+        input_max = abs_max(input_real, fmt)
+        if opname == "FFT2D":
+            input_max = max(input_max, abs_max(input_imag, fmt))
+    rows = tile_rows(96 * h * w, max_bytes)
+    for start in range(0, n, rows):
+        stop = min(start + rows, n)
+        ref = fft_reference(opname, input_real, input_imag, inverse, start, stop)
+        bnd = fft_bound(opname, input_real, input_imag, fmt, input_max, start, stop)
+        yield start, ref, bnd
+
+
+# Runs the dot product checks of output_real and output_imag against
+# tosa_reference_check_dotproduct with the KS of Appendix A and no bias.
+# Returns the reports of the real and imaginary outputs.
+def fft_check(
+    opname,
+    input_real,
+    output_real,
+    output_imag,
+    input_imag=None,
+    inverse=False,
+    in_out_t="fp32_t",
+    local_bound=False,
+    max_bytes=DEFAULT_MAX_BYTES,
+    max_indices=100,
+):
+    if opname not in FFT_OPERATORS:
+        raise FFTError(f"No FFT check for {opname}")
+    if opname == "FFT2D" and input_imag is None:
+        raise FFTError("FFT2D requires input_imag")
+    n, h, w = fft_shape(input_real, input_imag if opname == "FFT2D" else None)
+    shape = (n, h, output_width(opname, w))
+    outputs = (output_real, output_imag)
+    for output in outputs:
+        if np.shape(output) != shape:
+            raise FFTError(
+                f"Output shape {list(np.shape(output))} does not match {list(shape)}"
+            )
+    fmt = float_format(in_out_t)
+    ks = 2 * h * w if opname == "FFT2D" else h * w
+    bounds = DotProductBounds(in_out_t, in_out_t, in_out_t, ks, 0.0)
+    reports = [DotProductReport(bounds, shape, max_indices) for _ in outputs]
+    passes = fft_passes(
+        opname, input_real, input_imag, inverse, fmt, local_bound, max_bytes
+    )
+    for start, refs, bnds in passes:
+        stop = start + refs[0].shape[0]
+        for report, output, ref, bnd in zip(reports, outputs, refs, bnds):
+            imp = np.asarray(output[start:stop]).reshape(-1)
+            report.update(start * h * shape[2], imp, ref.ravel(), bnd.ravel())
+    return reports
+
+
+# The reference and bound as the literal dot products of the precision
+# requirements, for the small cases of the cross-check
+def direct_passes(opname, input_real, input_imag, inverse, fmt, local_bound):
+    n, h, w = input_real.shape
+    length = max(h, w)
+    oy, ox, iy, ix = np.ix_(
+        range(h), range(output_width(opname, w)), range(h), range(w)
+    )
+    p = (iy * oy % h * (length // h) + ix * ox % w * (length // w)) % length
+    if inverse:
+        p = -p % length
+    cos, sin = unit_circle(p, length)
+    cos_abs, sin_abs = weight_abs(p, length, fmt)
+    inputs = [np.asarray(input_real, dtype=np.float64)]
+    if opname == "FFT2D":
+        inputs.append(np.asarray(input_imag, dtype=np.float64))
+    values = [abs_min(x, fmt) for x in inputs]
+    if not local_bound:
+        input_max = max(float(v.max()) for v in values)
+        values = [np.full_like(v, input_max) for v in values]
+
+    def dot(x, weight):
+        return np.einsum("nyx,abyx->nab", x, weight)
+
+    if opname == "RFFT2D":
+        ref = (dot(inputs[0], cos), dot(inputs[0], -sin))
+        bnd = (dot(values[0], cos_abs), dot(values[0], sin_abs))
+    else:
+        xr, xi = inputs
+        ref = (dot(xr, cos) + dot(xi, sin), dot(xr, -sin) + dot(xi, cos))
+        ar, ai = values
+        bnd = (
+            dot(ar, cos_abs) + dot(ai, sin_abs),
+            dot(ar, sin_abs) + dot(ai, cos_abs),
+        )
+    return ref, bnd
+
+
+def random_fft_case(rng, opname):
+    n = int(rng.integers(1, 4))
+    h, w = (1 << int(v) for v in rng.integers(0, 4, 2))
+    # Some cases of sizes that are not powers of two
+    if rng.random() < 0.1:
+        h = 3 * h
+    tensors = {"input_real": rng.uniform(-2.0, 2.0, (n, h, w)).astype(np.float32)}
+    attributes = {"local_bound": bool(rng.integers(0, 2))}
+    if opname == "FFT2D":
+        tensors["input_imag"] = rng.uniform(-2.0, 2.0, (n, h, w)).astype(np.float32)
+        attributes["inverse"] = bool(rng.integers(0, 2))
+    shape = [n, h, output_width(opname, w)]
+    return tensors, attributes, {"output_real": shape, "output_imag": shape}
+
+
+# Compares random small cases with the interpreted pseudocode, whose fp32
+# results must pass the check, and the reference and bound of single batch
+# tiles with the literal dot products
+def cross_check(interpreter, op, binding, rng, cases):
+    mismatches = []
+    in_out_t = binding["in_out_t"]
+    fmt = float_format(in_out_t)
+    for case in range(cases):
+        tensors, attributes, output_shapes = random_fft_case(rng, op.name)
+        shapes = {name: list(t.shape) for name, t in tensors.items()}
+        expected = outcome(
+            lambda: interpret_operator(
+                interpreter, op, binding, tensors, attributes, output_shapes
+            )
+        )
+        if isinstance(expected, type):
+            if outcome(lambda: fft_shape(*tensors.values())) is not expected:
+                mismatches.append(f"case {case} {shapes} {attributes}")
+            continue
+        reports = outcome(
+            lambda: fft_check(
+                op.name,
+                output_real=expected["output_real"],
+                output_imag=expected["output_imag"],
+                in_out_t=in_out_t,
+                **tensors,
+                **attributes,
+            )
+        )
+        if isinstance(reports, type) or not all(r.passed(0) for r in reports):
+            mismatches.append(f"case {case} {shapes} {attributes} check failed")
+            continue
+        input_real = tensors["input_real"]
+        input_imag = tensors.get("input_imag")
+        inverse = attributes.get("inverse", False)
+        local_bound = attributes["local_bound"]
+        tiles = list(
+            fft_passes(op.name, input_real, input_imag, inverse, fmt, local_bound, 1)
+        )
+        direct = direct_passes(
+            op.name, input_real, input_imag, inverse, fmt, local_bound
+        )
+        scale = direct[1]
+        for i, name in enumerate(("reference", "bound")):
+            for j, part in enumerate(("real", "imag")):
+                value = np.concatenate([tile[i + 1][j] for tile in tiles])
+                if not np.all(np.abs(value - direct[i][j]) <= 1e-9 * scale[j]):
+                    mismatches.append(f"case {case} {shapes} {name} {part}")
+    return mismatches
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--xml",
+        required=False,
+        default=os.path.join(os.path.dirname(__file__), "..", "tosa.xml"),
+        help="Path to specification XML",
+    )
+    parser.add_argument(
+        "--pseudocode",
+        required=False,
+        default=os.path.join(os.path.dirname(__file__), "..", "pseudocode"),
+        help="Path to the pseudocode directory",
+    )
+    parser.add_argument(
+        "--cross-check",
+        required=False,
+        action="store_true",
+        help="Compare random small cases with the interpreted pseudocode",
+    )
+    parser.add_argument(
+        "--cases",
+        required=False,
+        type=int,
+        default=20,
+        help="Number of random cases per type support",
+    )
+    parser.add_argument(
+        "--seed",
+        required=False,
+        type=int,
+        default=0,
+        help="Random seed of the generated cases",
+    )
+    parser.add_argument(
+        "--operator",
+        required=False,
+        choices=FFT_OPERATORS,
+        default="FFT2D",
+        help="Operator to run or check",
+    )
+    parser.add_argument(
+        "--input-real", required=False, help="Path to the real input tensor (.npy)"
+    )
+    parser.add_argument(
+        "--input-imag",
+        required=False,
+        help="Path to the imaginary input tensor of FFT2D (.npy)",
+    )
+    parser.add_argument(
+        "--inverse",
+        required=False,
+        action="store_true",
+        help="Value of the inverse attribute of FFT2D",
+    )
+    parser.add_argument(
+        "--local-bound",
+        required=False,
+        action="store_true",
+        help="Value of the local_bound attribute",
+    )
+    parser.add_argument(
+        "--type",
+        required=False,
+        default="fp32_t",
+        help="Type in_out_t of the operation",
+    )
+    parser.add_argument(
+        "--check-real",
+        required=False,
+        help="Implementation real output to check (.npy)",
+    )
+    parser.add_argument(
+        "--check-imag",
+        required=False,
+        help="Implementation imaginary output to check (.npy)",
+    )
+    parser.add_argument(
+        "--set",
+        required=False,
+        type=int,
+        default=0,
+        dest="test_set",
+        help="Test data set number S of the checked outputs",
+    )
+    parser.add_argument(
+        "--output-real",
+        required=False,
+        help="Path to write the real output (.npy)",
+    )
+    parser.add_argument(
+        "--output-imag",
+        required=False,
+        help="Path to write the imaginary output (.npy)",
+    )
+    parser.add_argument(
+        "--max-bytes",
+        required=False,
+        type=int,
+        default=DEFAULT_MAX_BYTES,
+        help="Memory budget of the temporary arrays of one tile",
+    )
+    parser.add_argument(
+        "--max-indices",
+        required=False,
+        type=int,
+        default=100,
+        help="Maximum number of failure indices reported",
+    )
+    parser.add_argument(
+        "--json",
+        required=False,
+        action="store_true",
+        help="Print the check reports as JSON",
+    )
+    args = parser.parse_args()
+
+    if args.cross_check:
+        try:
+            spec = tosa.TOSASpec(args.xml)
+            index = pseudocode.PseudocodeIndex(args.pseudocode)
+            interpreter = PseudocodeInterpreter(index, spec)
+        except (OSError, RuntimeError) as e:
+            print(f"Failure reading XML spec or pseudocode: {str(e)}")
+            exit(1)
+        rng = np.random.default_rng(args.seed)
+        failed = False
+        for opname in FFT_OPERATORS:
+            op = find_operator(spec, opname)
+            for typesupport in op.typesupports:
+                for binding in typesupport.generated_tuples:
+                    mismatches = cross_check(interpreter, op, binding, rng, args.cases)
+                    status = "FAIL" if mismatches else "OK"
+                    print(f"{status} {opname} {typesupport.mode} {binding}")
+                    for mismatch in mismatches:
+                        print(f"    {mismatch}")
+                    failed = failed or bool(mismatches)
+        exit(1 if failed else 0)
+
+    if args.input_real is None:
+        print("Nothing to do, use --cross-check or --input-real")
+        exit(0)
+    try:
+        input_real = np.load(args.input_real, mmap_mode="r")
+        input_imag = None
+        if args.input_imag is not None:
+            input_imag = np.load(args.input_imag, mmap_mode="r")
+        if args.check_real is not None or args.check_imag is not None:
+            if args.check_real is None or args.check_imag is None:
+                raise FFTError("Both --check-real and --check-imag are required")
+            reports = fft_check(
+                args.operator,
+                input_real,
+                np.load(args.check_real, mmap_mode="r"),
+                np.load(args.check_imag, mmap_mode="r"),
+                input_imag,
+                args.inverse,
+                args.type,
+                args.local_bound,
+                args.max_bytes,
+                args.max_indices,
+            )
+        else:
+            output_real, output_imag = fft_operator(
+                args.operator,
+                input_real,
+                input_imag,
+                args.inverse,
+                args.type,
+                max_bytes=args.max_bytes,
+            )
+            if args.output_real is not None:
+                np.save(args.output_real, output_real)
+            if args.output_imag is not None:
+                np.save(args.output_imag, output_imag)
+            exit(0)
+    except (OSError, ValueError, RuntimeError, ErrorIfTriggered) as e:
+        print(f"Failure running {args.operator}: {str(e)}")
+        exit(1)
+    results = {
+        part: report.as_dict(args.test_set)
+        for part, report in zip(("output_real", "output_imag"), reports)
+    }
+    passed = all(result["passed"] for result in results.values())
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for part, result in results.items():
+            status = "PASS" if result["passed"] else "FAIL"
+            print(
+                f"{status} {part}: {result['count']} results, ksb {result['ksb']}, "
+                f"max error {result['max_abs_error']:g} of {result['abs_bound']}, "
+                f"error sum {result['error_sum']:g}, "
+                f"sum of squares {result['error_sumsq']:g}"
+            )
+            for reason in result["reasons"]:
+                print(f"    {reason}")
+            for index in result["failure_indices"]:
+                print(f"    {index}")
+    exit(0 if passed else 1)
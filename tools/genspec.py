@@ -1,12 +1,23 @@
 #!/usr/bin/env python3
 # Copyright (c) 2023-2024, 2026, ARM Limited.
 # SPDX-License-Identifier: Apache-2.0
+import json
 import os
 from functools import cmp_to_key
 
 import compliance_data_exporter
+import spec_trace
+import specdiff
+import sqlite_exporter
 import tosa
 
+# Fingerprints of the spec the outdir was generated from
+GENSPEC_MANIFEST = "genspec.manifest.json"
+
+# Appendix lines of each operator, kept for the next incremental generation
+APPENDIX_ROWS = "profile_ops.rows.json"
+APPENDIX_ROWS_FORMAT = 1
+
 
 def compare_profiles(a, b):
     if a.profiles[0] == b.profiles[0]:
@@ -295,10 +306,7 @@ class TOSASpecAsciidocGenerator:
         if len(leveltext) > 0:
             file.write(f"[source,c++]\n----\n{leveltext}\n----\n")
 
-    def generate(self, outdir):
-        os.makedirs(outdir, exist_ok=True)
-
-        # Generate version information
+    def generate_version(self, outdir):
         major = self.spec.version_major
         minor = self.spec.version_minor
         patch = self.spec.version_patch
@@ -308,6 +316,7 @@ class TOSASpecAsciidocGenerator:
                 f.write(" draft")
             f.write("\n")
 
+    def generate_profiles(self, outdir):
         # Generate profile table
         with open(os.path.join(outdir, "profiles.adoc"), "w") as f:
             f.write("|===\n")
@@ -331,6 +340,7 @@ class TOSASpecAsciidocGenerator:
                 )
             f.write("|===\n")
 
+    def generate_levels(self, outdir):
         # Generate level maximums table
         with open(os.path.join(outdir, "levels.adoc"), "w") as f:
             f.write("|===\n")
@@ -349,21 +359,87 @@ class TOSASpecAsciidocGenerator:
                 f.write("\n")
             f.write("|===\n")
 
-        # Generator operators
+    def generate_operators(self, outdir, changes):
         opdir = os.path.join(outdir, "operators")
         os.makedirs(opdir, exist_ok=True)
+        names = set()
         for group in self.spec.operatorgroups:
             for op in group.operators:
-                with open(os.path.join(opdir, op.name + ".adoc"), "w") as f:
-                    self.generate_operator(op, f)
+                names.add(op.name)
+                if not changes.operator_changed(op.name):
+                    spec_trace.count("files_skipped")
+                    continue
+                with spec_trace.span("generate_operator", operator=op.name):
+                    with open(os.path.join(opdir, op.name + ".adoc"), "w") as f:
+                        self.generate_operator(op, f)
+                        spec_trace.count("bytes_written", f.tell())
+        # Drop pages of operators removed since the previous generation
+        for name in changes.operators - names:
+            path = os.path.join(opdir, name + ".adoc")
+            if os.path.exists(path):
+                os.remove(path)
+
+    def generate_enums(self, outdir):
         with open(os.path.join(outdir, "enums.adoc"), "w") as f:
             for enum in self.spec.enums:
                 self.generate_enum(enum, f)
 
-        all_operators = []
+    # The appendix lines of one operator, by profile and by extension name
+    def profile_appendix_rows(self, op):
+        typesupports = op.typesupports or []
+        profiles = {}
+        for profile in self.spec.profiles:
+            lines = [
+                f"|{op.name}|{tysup.mode}|{tysup.version_added}\n"
+                for tysup in typesupports
+                if profile.name in tysup.profiles
+            ]
+            if lines:
+                profiles[profile.name] = lines
+        extensions = {}
+        for pext in self.spec.profile_extensions:
+            lines = []
+            for tysup in typesupports:
+                for mode, other_exts in self.get_profile_extension_rows(
+                    op, tysup, pext.name
+                ):
+                    note = self.format_extension_note(other_exts)
+                    lines.append(f"|{op.name}|{mode}|{tysup.version_added}|{note}\n")
+            for arg in op.arguments:
+                if pext.name in arg.ctc_remove:
+                    lines.append(f"|{op.name}|all||Remove CTC from {arg.name}\n")
+            if lines:
+                extensions[pext.name] = lines
+        return {"profiles": profiles, "extensions": extensions}
+
+    # The appendix lines of every operator. With changes, those of unchanged
+    # operators are read from the rows kept by the previous generation.
+    def profile_appendix_op_rows(self, outdir, changes=None):
+        path = os.path.join(outdir, APPENDIX_ROWS)
+        previous = {}
+        if changes is not None and not changes.is_global and os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    data = json.load(f)
+                if data.get("format") == APPENDIX_ROWS_FORMAT:
+                    previous = data["operators"]
+            except (OSError, ValueError, KeyError):
+                previous = {}
+        rows = {}
         for group in self.spec.operatorgroups:
             for op in group.operators:
-                all_operators.append(op)
+                if op.name in previous and not changes.operator_changed(op.name):
+                    rows[op.name] = previous[op.name]
+                    spec_trace.count("appendix_rows_reused")
+                else:
+                    rows[op.name] = self.profile_appendix_rows(op)
+        with open(path, "w") as f:
+            json.dump({"format": APPENDIX_ROWS_FORMAT, "operators": rows}, f)
+        return rows
+
+    def generate_profile_appendix(self, outdir, changes=None):
+        op_rows = self.profile_appendix_op_rows(outdir, changes)
+        names = sorted(op_rows)
 
         # Generate profile operator appendix
         with open(os.path.join(outdir, "profile_ops.adoc"), "w") as f:
@@ -374,13 +450,8 @@ class TOSASpecAsciidocGenerator:
                 f.write(f"Status: {profile.status}\n")
                 f.write("|===\n")
                 f.write("|Operator|Mode|Version Added\n\n")
-                for op in sorted(all_operators, key=lambda o: o.name):
-                    if op.typesupports:
-                        for tysup in op.typesupports:
-                            if profile.name in tysup.profiles:
-                                f.write(
-                                    f"|{op.name}|{tysup.mode}|{tysup.version_added}\n"
-                                )
+                for name in names:
+                    f.writelines(op_rows[name]["profiles"].get(profile.name, []))
                 f.write("|===\n")
 
             f.write("=== Profile Extensions\n")
@@ -394,22 +465,10 @@ class TOSASpecAsciidocGenerator:
                 f.write("[width=99]\n|===\n")
                 f.write("|Operator|Mode|Version Added|Note\n\n")
                 op_changed = False
-                for op in sorted(all_operators, key=lambda o: o.name):
-                    if op.typesupports:
-                        for tysup in op.typesupports:
-                            for mode, other_exts in self.get_profile_extension_rows(
-                                op, tysup, pext.name
-                            ):
-                                note = self.format_extension_note(other_exts)
-                                f.write(
-                                    f"|{op.name}|{mode}|"
-                                    f"{tysup.version_added}|{note}\n"
-                                )
-                                op_changed = True
-                    for arg in op.arguments:
-                        if pext.name in arg.ctc_remove:
-                            op_changed = True
-                            f.write(f"|{op.name}|all||Remove CTC from {arg.name}\n")
+                for name in names:
+                    lines = op_rows[name]["extensions"].get(pext.name, [])
+                    f.writelines(lines)
+                    op_changed = op_changed or len(lines) > 0
                 if not op_changed:
                     f.write("|No changes|||\n")
                 f.write("|===\n")
@@ -430,6 +489,59 @@ class TOSASpecAsciidocGenerator:
                 if header_text == "":
                     f.write("|===\n")
 
+    # Files that a full generation writes and an incremental one relies on
+    def generated_files(self):
+        return [
+            "version.adoc",
+            "profiles.adoc",
+            "profile_extensions.adoc",
+            "levels.adoc",
+            "enums.adoc",
+            "profile_ops.adoc",
+        ]
+
+    # When incremental, only the outputs that changed since the spec
+    # recorded in the outdir manifest are generated again
+    def generate(self, outdir, incremental=False):
+        os.makedirs(outdir, exist_ok=True)
+        manifest = os.path.join(outdir, GENSPEC_MANIFEST)
+        fingerprints = None
+        if self.spec.xmlroot is not None:
+            fingerprints = specdiff.element_fingerprints(self.spec.xmlroot)
+
+        # Without a previous generation to patch, fall back to a full one
+        changes = None
+        if (
+            incremental
+            and fingerprints is not None
+            and all(
+                os.path.exists(os.path.join(outdir, name))
+                for name in self.generated_files()
+            )
+        ):
+            changes = specdiff.changes_since_manifest(manifest, fingerprints)
+        elif os.path.exists(manifest):
+            os.remove(manifest)
+        if changes is None:
+            changes = specdiff.TOSASpecChanges(is_global=True)
+
+        if changes.is_global:
+            self.generate_version(outdir)
+            self.generate_profiles(outdir)
+        if changes.is_global or changes.levels:
+            self.generate_levels(outdir)
+        self.generate_operators(outdir, changes)
+        if changes.is_global or changes.enums:
+            self.generate_enums(outdir)
+        # The appendix lists every operator per profile and extension. Only
+        # the lines of changed operators are built again, the file is then
+        # written from the lines of all of them.
+        if changes.is_global or changes.operators or changes.enums:
+            with spec_trace.span("generate_profile_appendix"):
+                self.generate_profile_appendix(outdir, changes)
+        if fingerprints is not None:
+            specdiff.write_manifest(manifest, fingerprints)
+
 
 if __name__ == "__main__":
     import argparse
@@ -443,15 +555,27 @@ if __name__ == "__main__":
         action="store_true",
         help="Export the profile compliance data to the location indicated by --outdir",
     )
+    parser.add_argument(
+        "--sqlite",
+        required=False,
+        help="Export the spec model to this SQLite database, updating it in place",
+    )
+    specdiff.add_incremental_argument(parser)
+    spec_trace.add_trace_argument(parser)
     args = parser.parse_args()
+    spec_trace.trace_from_arguments(args)
 
     try:
         spec = tosa.TOSASpec(args.xml)
         if args.profile:
-            compliance_data_exporter.print_profiles_extensions(spec, args.outdir)
+            compliance_data_exporter.print_profiles_extensions(
+                spec, args.outdir, args.incremental
+            )
+        if args.sqlite:
+            sqlite_exporter.export_spec(spec, args.sqlite)
     except RuntimeError as e:
         print(f"Failure reading/validating XML spec: {str(e)}")
         exit(1)
 
     generator = TOSASpecAsciidocGenerator(spec)
-    generator.generate(args.outdir)
+    generator.generate(args.outdir, args.incremental)
@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-# Copyright (c) 2022, ARM Limited.
+# Copyright (c) 2022, 2026, ARM Limited.
 #
 #    Licensed under the Apache License, Version 2.0 (the "License");
 #    you may not use this file except in compliance with the License.
@@ -17,39 +17,54 @@
 import argparse
 import re
 
-parser = argparse.ArgumentParser()
-parser.add_argument(
-    "filenames", nargs="+", help="filename to extract descriptions from"
-)
-args = parser.parse_args()
+# Start of an operator or section
+SECTION_START = re.compile(r"^===")
+# Subsections like *Arguments* or pseudocode in a [source] section
+DESCRIPTION_END = re.compile(r"[\[\*]")
+COMMENT = re.compile(r"\w*\/\/")
+INCLUDE = re.compile(r"include::")
 
-for name in args.filenames:
+
+# Yield the description lines of an asciidoc file that are worth checking
+def extract_descriptions(name, docfile):
     # special case the license as it is all text
     if name == "chapters/tosa_license.adoc":
         always_in = True
     else:
         always_in = False
-    with open(name, "r") as docfile:
-        in_description = False
-        for text in docfile:
-            if always_in:
-                print(text)
+    in_description = False
+    for text in docfile:
+        if always_in:
+            yield text
+            continue
+        if not in_description:
+            # Look for the start of an operator
+            if SECTION_START.match(text):
+                in_description = True
+                yield text
+        else:
+            # Stop when we get to a subsection like *Arguments*
+            # or pseudocode in a [source] section. Spellcheck is
+            # not useful there
+            if DESCRIPTION_END.match(text):
+                in_description = False
+            # skip comments
+            elif COMMENT.match(text):
+                continue
+            elif INCLUDE.match(text):
                 continue
-            if not in_description:
-                # Look for the start of an operator
-                if re.match(r"^===", text):
-                    in_description = True
-                    print(text)
             else:
-                # Stop when we get to a subsection like *Arguments*
-                # or pseudocode in a [source] section. Spellcheck is
-                # not useful there
-                if re.match(r"[\[\*]", text):
-                    in_description = False
-                # skip comments
-                elif re.match(r"\w*\/\/", text):
-                    continue
-                elif re.match(r"include::", text):
-                    continue
-                else:
-                    print(text)
+                yield text
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "filenames", nargs="+", help="filename to extract descriptions from"
+    )
+    args = parser.parse_args()
+
+    for name in args.filenames:
+        with open(name, "r") as docfile:
+            for text in extract_descriptions(name, docfile):
+                print(text)
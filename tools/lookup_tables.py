@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+# Copyright (c) 2026, ARM Limited.
+# SPDX-License-Identifier: Apache-2.0
+# Lookup tables of pseudocode/operators/tables and a vectorized TABLE
+# operator. The 513 entry tables are generated once by interpreting their
+# reference functions and cached by the hash of the pseudocode they use,
+# as are the 256 entry tables derived from the same functions for i8_t.
+# TABLE on i16 input is a gather from the interpolated result of all 65536
+# input values, so large activation tensors need no per-element work.
+import hashlib
+import os
+
+import numpy as np
+import pseudocode
+import tosa
+from pseudocode_interpreter import PseudocodeInterpreter
+from pseudocode_numpy import RequireFailed
+
+# Bump to invalidate cached tables when their generation changes
+LOOKUP_TABLE_VERSION = 1
+
+TABLE_SIZES = {"i8_t": 256, "i16_t": 513}
+
+TABLE_FILES = "operators/tables/"
+
+
+class LookupTableError(RuntimeError):
+    pass
+
+
+# Table and reference function names of each generate_lookup_table call
+def table_references(module):
+    references = []
+    for statement in module.statements():
+        call = getattr(statement, "expr", None)
+        if not isinstance(call, pseudocode.Call):
+            continue
+        if call.name != "generate_lookup_table" or len(call.args) != 2:
+            continue
+        names = [
+            arg.operand.name
+            for arg in call.args
+            if isinstance(arg, pseudocode.Unary)
+            and isinstance(arg.operand, pseudocode.Name)
+        ]
+        if len(names) == 2:
+            references.append(tuple(names))
+    return references
+
+
+# generate_lookup_table for a reference function interpreted from the
+# pseudocode. The reference is called as int32_t (*)(int32_t), so results
+# that overflow int16_t, such as 32768 for the largest sigmoid input, are
+# clipped rather than wrapped by the int16_t return type of the function.
+def generate_lookup_table(interpreter, reference):
+    table = np.zeros(TABLE_SIZES["i16_t"], dtype=np.int16)
+    for i in range(-256, 257):
+        value = int(interpreter.call(reference, [np.int32(i)], return_type="int32_t"))
+        table[i + 256] = min(max(value, -32768), 32767)
+    return table
+
+
+# The 8-bit table of a reference function, from applying it to each of the
+# 256 int8_t input values as introduction.adoc describes. The 16-bit
+# results are scaled to 8 bits by a rounding shift right of 8 and clipped.
+def generate_lookup_table_i8(interpreter, reference):
+    table = np.zeros(TABLE_SIZES["i8_t"], dtype=np.int8)
+    for i in range(-128, 128):
+        value = int(interpreter.call(reference, [np.int32(i)], return_type="int32_t"))
+        table[i + 128] = min(max((value + 128) >> 8, -128), 127)
+    return table
+
+
+class LookupTableCache:
+    def __init__(self, index, spec, directory=None):
+        self.index = index
+        self.interpreter = PseudocodeInterpreter(index, spec)
+        self.directory = directory
+        self.tables = {}
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def operators(self):
+        return sorted(
+            os.path.splitext(os.path.basename(path))[0]
+            for path in self.index.modules
+            if path.startswith(TABLE_FILES)
+        )
+
+    # Cache key of a table: the generator and the source of every
+    # pseudocode file the table file can reach
+    def key(self, relpath):
+        files = {relpath}
+        for name in self.index.reachable(relpath):
+            files.update(path for path, _ in self.index.definitions.get(name, []))
+        digest = hashlib.sha256(str(LOOKUP_TABLE_VERSION).encode())
+        for path in sorted(os.path.join(self.index.root, f) for f in files):
+            with open(path, "rb") as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+        return digest.hexdigest()
+
+    # The table of opname for in_t input: the 513 entry table for i16_t or
+    # the 256 entry table for i8_t
+    def table(self, opname, in_t="i16_t"):
+        if in_t not in TABLE_SIZES:
+            raise LookupTableError(f"TABLE does not support {in_t}")
+        relpath = f"{TABLE_FILES}{opname}.tosac"
+        if relpath not in self.index.modules:
+            raise LookupTableError(f"No lookup table for {opname}")
+        key = self.key(relpath)
+        if (in_t, key) in self.tables:
+            return self.tables[(in_t, key)]
+        table = None
+        path = None
+        if self.directory is not None:
+            suffix = "_i8" if in_t == "i8_t" else ""
+            path = os.path.join(self.directory, f"{opname}{suffix}_{key[:16]}.npy")
+            if os.path.exists(path):
+                try:
+                    table = np.load(path)
+                except (OSError, ValueError):
+                    table = None
+        if table is None:
+            references = table_references(self.index.modules[relpath])
+            if len(references) != 1:
+                raise LookupTableError(f"{relpath} does not generate one table")
+            if in_t == "i8_t":
+                generate = generate_lookup_table_i8
+            else:
+                generate = generate_lookup_table
+            table = generate(self.interpreter, references[0][1])
+            if path is not None:
+                np.save(path, table)
+        table.setflags(write=False)
+        self.tables[(in_t, key)] = table
+        return table
+
+
+def check_table(table, ty):
+    table = np.asarray(table)
+    if table.shape != (TABLE_SIZES[ty],):
+        raise RequireFailed(f"length(table) must be {TABLE_SIZES[ty]} for {ty}")
+    return table
+
+
+# apply_lookup_s for every int16_t value, with a mask of the values whose
+# slope fails the REQUIRE of the interpolation
+def interpolate_table(table):
+    table = check_table(table, "i16_t").astype(np.int32)
+    value = np.arange(-32768, 32768, dtype=np.int32)
+    index = (value + 32768) >> 7
+    fraction = value & 0x7F
+    base = table[index]
+    slope = table[index + 1] - base
+    valid = (slope >= -32768) & (slope <= 32767)
+    return (base << 7) + slope * fraction, valid
+
+
+# The interpolated results of a table, kept for the tables in use
+INTERPOLATED_TABLES = {}
+
+
+def interpolated_table(table):
+    table = check_table(table, "i16_t").astype(np.int16, copy=False)
+    key = table.tobytes()
+    if key not in INTERPOLATED_TABLES:
+        if len(INTERPOLATED_TABLES) >= 64:
+            INTERPOLATED_TABLES.clear()
+        INTERPOLATED_TABLES[key] = interpolate_table(table)
+    return INTERPOLATED_TABLES[key]
+
+
+# TABLE for i8_t input with an i8_t table, or i16_t input with an i16_t
+# table giving i32_t results
+def table_op(values, table, in_t):
+    if in_t not in TABLE_SIZES:
+        raise LookupTableError(f"TABLE does not support {in_t}")
+    values = np.asarray(values)
+    if in_t == "i8_t":
+        table = check_table(table, in_t).astype(np.int8, copy=False)
+        return table[values.astype(np.int16) + 128]
+    result, valid = interpolated_table(table)
+    index = values.astype(np.int32) + 32768
+    if not valid.all() and not valid[index].all():
+        raise RequireFailed("apply_lookup_s slope is out of the int16_t range")
+    return result[index]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--xml",
+        required=False,
+        default=os.path.join(os.path.dirname(__file__), "..", "tosa.xml"),
+        help="Path to specification XML",
+    )
+    parser.add_argument(
+        "--pseudocode",
+        required=False,
+        default=os.path.join(os.path.dirname(__file__), "..", "pseudocode"),
+        help="Path to the pseudocode directory",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        required=False,
+        help="Directory of cached tables",
+    )
+    parser.add_argument(
+        "--table",
+        required=False,
+        help="Lookup table to use, such as SIGMOID, or a path to a .npy table",
+    )
+    parser.add_argument(
+        "--in-type",
+        required=False,
+        choices=sorted(TABLE_SIZES),
+        help="Input type of the table without --input, i16_t by default",
+    )
+    parser.add_argument(
+        "--input", required=False, help="Path to the TABLE input values (.npy)"
+    )
+    parser.add_argument(
+        "--output",
+        required=False,
+        help="Path to write the TABLE results, or the table without --input",
+    )
+    args = parser.parse_args()
+
+    try:
+        spec = tosa.TOSASpec(args.xml)
+        index = pseudocode.PseudocodeIndex(args.pseudocode)
+        cache = LookupTableCache(index, spec, args.cache_dir)
+    except (OSError, RuntimeError) as e:
+        print(f"Failure reading XML spec or pseudocode: {str(e)}")
+        exit(1)
+    try:
+        if args.table is None:
+            for opname in cache.operators():
+                table = cache.table(opname)
+                print(f"{opname}: {table[0]} .. {table[256]} .. {table[512]}")
+                table = cache.table(opname, "i8_t")
+                print(f"{opname} i8: {table[0]} .. {table[128]} .. {table[255]}")
+            exit(0)
+        values = None
+        in_t = args.in_type or "i16_t"
+        if args.input is not None:
+            values = np.load(args.input, mmap_mode="r")
+            in_t = "i8_t" if values.dtype == np.int8 else "i16_t"
+        if args.table in cache.operators():
+            table = cache.table(args.table, in_t)
+        else:
+            table = np.load(args.table)
+        if values is None:
+            if args.output is not None:
+                np.save(args.output, table)
+            print(" ".join(str(v) for v in table))
+            exit(0)
+        result = table_op(values, table, in_t)
+        if args.output is not None:
+            np.save(args.output, result)
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"Failure running TABLE: {str(e)}")
+        exit(1)
@@ -0,0 +1,1180 @@
+#!/usr/bin/env python3
+# Copyright (c) 2026, ARM Limited.
+# SPDX-License-Identifier: Apache-2.0
+# Parser for the pseudocode dialect of the pseudocode/*.tosac files, and an
+# index of the helper functions they define and call.
+import glob
+import hashlib
+import os
+import pickle
+import re
+
+# Bump when the AST changes, so cached parse results are not reused
+PSEUDOCODE_AST_VERSION = 2
+
+TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<space>[ \t\r\n]+)
+  | (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<number>0[xX][0-9a-fA-F]+|(?:\d+\.\d*|\.\d+|\d+)(?:[eE][+-]?\d+)?)
+  | (?P<name>[A-Za-z_]\w*(?:::[A-Za-z_]\w*)*)
+  | (?P<string>"[^"\n]*")
+  | (?P<op>\*\*|<<=|<=|>=|==|!=|&&|\|\||\+\+|--|->|<<|[-+*/%&|^]=|::
+          |[-+*/%&|^!~<>=?:;,.()\[\]{}])
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+ASSIGNMENT_OPERATORS = [
+    "=",
+    "+=",
+    "-=",
+    "*=",
+    "/=",
+    "%=",
+    "<<=",
+    ">>=",
+    "&=",
+    "|=",
+    "^=",
+]
+
+# Binary operator precedence, loosest first. Comparisons are collected into
+# Compare nodes so that chains like 0 <= y < IH keep their meaning.
+BINARY_PRECEDENCE = [
+    ["||"],
+    ["&&"],
+    ["|"],
+    ["^"],
+    ["&"],
+    ["==", "!="],
+    ["<", "<=", ">", ">="],
+    ["<<", ">>"],
+    ["+", "-"],
+    ["*", "/", "%"],
+]
+COMPARISON_LEVELS = [["==", "!="], ["<", "<=", ">", ">="]]
+
+STATEMENT_LOOPS = ["for_each", "for_each_data_position", "for_data_positions"]
+
+
+class PseudocodeSyntaxError(RuntimeError):
+    def __init__(self, path, line, message):
+        super().__init__(f"{path}:{line}: {message}")
+        self.path = path
+        self.line = line
+
+
+class Token:
+    def __init__(self, kind, text, line, col, spaced):
+        self.kind = kind
+        self.text = text
+        self.line = line
+        self.col = col
+        # Whitespace or a comment precedes the token
+        self.spaced = spaced
+
+    def __repr__(self):
+        return f"Token({self.kind}, {self.text!r}, {self.line}:{self.col})"
+
+
+def tokenize(text, path="<string>"):
+    tokens = []
+    line = 1
+    line_start = 0
+    pos = 0
+    spaced = True
+    while pos < len(text):
+        m = TOKEN_PATTERN.match(text, pos)
+        if not m:
+            raise PseudocodeSyntaxError(path, line, f"unexpected character {text[pos]}")
+        kind = m.lastgroup
+        value = m.group()
+        if kind in ("space", "comment"):
+            spaced = True
+        else:
+            # '>' is always a single token so that nested template arguments
+            # close correctly, shifts are recombined by the parser
+            if kind == "op" and value.startswith(">") and value not in (">=",):
+                value = ">"
+            tokens.append(Token(kind, value, line, pos - line_start + 1, spaced))
+            spaced = False
+        end = m.start() + len(value)
+        newlines = text.count("\n", pos, end)
+        if newlines:
+            line += newlines
+            line_start = text.rindex("\n", pos, end) + 1
+        pos = end
+    tokens.append(Token("eof", "", line, 1, True))
+    return tokens
+
+
+class Node:
+    fields = ()
+
+    def __init__(self, *values, line=0):
+        if len(values) != len(self.fields):
+            raise TypeError(f"{type(self).__name__} takes fields {self.fields}")
+        for name, value in zip(self.fields, values):
+            setattr(self, name, value)
+        self.line = line
+
+    def children(self):
+        for name in self.fields:
+            value = getattr(self, name)
+            if isinstance(value, Node):
+                yield value
+            elif isinstance(value, list):
+                for item in value:
+                    if isinstance(item, Node):
+                        yield item
+
+    def walk(self):
+        yield self
+        for child in self.children():
+            yield from child.walk()
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.fields)
+        return f"{type(self).__name__}({values})"
+
+
+# Expressions
+
+
+class Number(Node):
+    fields = ("text",)
+
+    @property
+    def value(self):
+        if self.text.lower().startswith("0x"):
+            return int(self.text, 16)
+        if re.fullmatch(r"\d+", self.text):
+            return int(self.text)
+        return float(self.text)
+
+
+class String(Node):
+    fields = ("text",)
+
+
+class Name(Node):
+    fields = ("name",)
+
+
+# A template instance used without a call, e.g. maximum<int32_t>
+class TemplateName(Node):
+    fields = ("name", "template_args")
+
+
+class Call(Node):
+    fields = ("func", "template_args", "args")
+
+    # Name of the called function, or None when calling an expression
+    @property
+    def name(self):
+        if isinstance(self.func, Name):
+            return self.func.name
+        return None
+
+
+class Index(Node):
+    fields = ("value", "index")
+
+
+# Slice of a shape, e.g. shape1[0:axis - 1]
+class Slice(Node):
+    fields = ("lower", "upper")
+
+
+class Member(Node):
+    fields = ("value", "name", "op")
+
+
+class Unary(Node):
+    fields = ("op", "operand")
+
+
+class Postfix(Node):
+    fields = ("op", "operand")
+
+
+class Binary(Node):
+    fields = ("op", "left", "right")
+
+
+class Compare(Node):
+    fields = ("left", "ops", "comparators")
+
+
+class Conditional(Node):
+    fields = ("test", "body", "orelse")
+
+
+class Assign(Node):
+    fields = ("op", "target", "value")
+
+
+# Shape literal such as [N,IH,IW,IC]
+class ListLiteral(Node):
+    fields = ("elements",)
+
+
+# Brace initializer such as {v, s}
+class BraceList(Node):
+    fields = ("elements",)
+
+
+class New(Node):
+    fields = ("type", "size")
+
+
+# Statements
+
+
+class Block(Node):
+    fields = ("body",)
+
+
+class If(Node):
+    fields = ("test", "body", "orelse")
+
+
+class For(Node):
+    fields = ("init", "test", "step", "body")
+
+
+# for_each(0 <= n < N, 0 <= oy < OH) style loop over ranges
+class ForEach(Node):
+    fields = ("ranges", "body")
+
+
+# for_each_data_position(index in shape) style loop over a collection
+class ForEachIn(Node):
+    fields = ("loop", "type", "target", "iterable", "options", "body")
+
+
+class While(Node):
+    fields = ("test", "body")
+
+
+class DoWhile(Node):
+    fields = ("body", "test")
+
+
+class Switch(Node):
+    fields = ("value", "cases")
+
+
+# A case of a switch, value is None for the default case
+class Case(Node):
+    fields = ("value", "body")
+
+
+class Return(Node):
+    fields = ("value",)
+
+
+class Break(Node):
+    fields = ()
+
+
+class Continue(Node):
+    fields = ()
+
+
+class Declaration(Node):
+    fields = ("type", "name", "size", "value", "args")
+
+
+# Several names declared by one statement, e.g. int48_t value, extended_in_zp;
+class DeclarationList(Node):
+    fields = ("declarations",)
+
+
+class ExprStatement(Node):
+    fields = ("expr",)
+
+
+class Using(Node):
+    fields = ("name", "text")
+
+
+class Typedef(Node):
+    fields = ("name", "text")
+
+
+class EnumDef(Node):
+    fields = ("name", "values")
+
+
+class Param(Node):
+    fields = ("type", "name", "default")
+
+
+class Function(Node):
+    fields = ("return_type", "name", "template_params", "params", "body")
+
+    @property
+    def is_declaration(self):
+        return self.body is None
+
+
+class Module(Node):
+    fields = ("path", "body", "diagnostics")
+
+    def functions(self):
+        return [item for item in self.body if isinstance(item, Function)]
+
+    # Top level statements, the operation function of an operator file
+    def statements(self):
+        return [item for item in self.body if not isinstance(item, Function)]
+
+
+class PseudocodeParser:
+    def __init__(self, text, path="<string>"):
+        self.path = path
+        self.tokens = tokenize(text, path)
+        self.pos = 0
+        self.diagnostics = []
+        self.function_depth = 0
+
+    # Token helpers
+
+    def peek(self, offset=0):
+        return self.tokens[min(self.pos + offset, len(self.tokens) - 1)]
+
+    def at(self, *texts):
+        token = self.peek()
+        return token.kind in ("op", "name") and token.text in texts
+
+    def advance(self):
+        token = self.peek()
+        self.pos += 1
+        return token
+
+    def accept(self, text):
+        if self.at(text):
+            return self.advance()
+        return None
+
+    def error(self, message, token=None):
+        token = token or self.peek()
+        return PseudocodeSyntaxError(self.path, token.line, message)
+
+    def expect(self, text):
+        if not self.at(text):
+            raise self.error(f"expected '{text}' but found '{self.peek().text}'")
+        return self.advance()
+
+    def expect_name(self):
+        if self.peek().kind != "name":
+            raise self.error(f"expected a name but found '{self.peek().text}'")
+        return self.advance().text
+
+    # '>' tokens are split by the tokenizer, join adjacent ones back into
+    # shift operators. Returns (operator, token count).
+    def peek_operator(self):
+        token = self.peek()
+        if token.kind != "op":
+            return None, 0
+        if token.text == ">":
+            following = self.peek(1)
+            if following.kind == "op" and not following.spaced:
+                if following.text == ">":
+                    if self.peek(2).text == "=" and not self.peek(2).spaced:
+                        return ">>=", 3
+                    return ">>", 2
+                if following.text == ">=":
+                    return ">>=", 2
+        return token.text, 1
+
+    def take_operator(self, count):
+        for _ in range(count):
+            self.advance()
+
+    # Types and template arguments
+
+    def parse_type(self):
+        text = ""
+        if self.at("<"):
+            # Placeholder types such as <type>
+            self.advance()
+            text = f"<{self.expect_name()}>"
+            self.expect(">")
+        else:
+            text = self.expect_name()
+            # Type of a tensor argument, e.g. variable_tensor.type
+            while self.at(".") and self.peek(1).kind == "name":
+                self.advance()
+                text += "." + self.advance().text
+            if self.at("<"):
+                text += "<" + ", ".join(self.parse_template_args()) + ">"
+                while self.at("::"):
+                    self.advance()
+                    text += "::" + self.expect_name()
+        while self.at("*"):
+            self.advance()
+            text += "*"
+        if self.at("[") and self.peek(1).text == "]":
+            self.advance()
+            self.advance()
+            text += "[]"
+        return text
+
+    def parse_template_args(self):
+        self.expect("<")
+        args = []
+        while not self.at(">"):
+            if self.peek().kind == "number":
+                arg = self.advance().text
+            else:
+                arg = self.parse_type()
+                # Template parameter with a name, e.g. size_t sz
+                if self.peek().kind == "name":
+                    arg += " " + self.advance().text
+            args.append(arg)
+            if not self.accept(","):
+                break
+        self.expect(">")
+        return args
+
+    def try_parse(self, method, *args):
+        start = self.pos
+        try:
+            return method(*args)
+        except PseudocodeSyntaxError:
+            self.pos = start
+            return None
+
+    # Expressions
+
+    def parse_expression(self):
+        expr = self.parse_assignment()
+        while self.at(","):
+            line = self.advance().line
+            expr = Binary(",", expr, self.parse_assignment(), line=line)
+        return expr
+
+    def parse_assignment(self):
+        target = self.parse_conditional()
+        op, count = self.peek_operator()
+        if op in ASSIGNMENT_OPERATORS:
+            line = self.peek().line
+            self.take_operator(count)
+            return Assign(op, target, self.parse_assignment(), line=line)
+        return target
+
+    def parse_conditional(self):
+        test = self.parse_binary(0)
+        if self.at("?"):
+            line = self.advance().line
+            body = self.parse_assignment()
+            self.expect(":")
+            orelse = self.parse_assignment()
+            return Conditional(test, body, orelse, line=line)
+        return test
+
+    def parse_binary(self, level):
+        if level == len(BINARY_PRECEDENCE):
+            return self.parse_unary()
+        operators = BINARY_PRECEDENCE[level]
+        left = self.parse_binary(level + 1)
+        if operators in COMPARISON_LEVELS:
+            ops = []
+            comparators = []
+            while True:
+                op, count = self.peek_operator()
+                if op not in operators:
+                    break
+                self.take_operator(count)
+                ops.append(op)
+                comparators.append(self.parse_binary(level + 1))
+            if ops:
+                return Compare(left, ops, comparators, line=left.line)
+            return left
+        while True:
+            op, count = self.peek_operator()
+            if op not in operators:
+                return left
+            self.take_operator(count)
+            right = self.parse_binary(level + 1)
+            left = Binary(op, left, right, line=left.line)
+
+    def parse_unary(self):
+        token = self.peek()
+        if token.kind == "op" and token.text in (
+            "!",
+            "-",
+            "+",
+            "~",
+            "*",
+            "&",
+            "++",
+            "--",
+        ):
+            self.advance()
+            return Unary(token.text, self.parse_unary(), line=token.line)
+        if self.at("new"):
+            self.advance()
+            ty = self.parse_type()
+            size = None
+            if self.accept("["):
+                size = self.parse_expression()
+                self.expect("]")
+            return New(ty, size, line=token.line)
+        base = self.parse_postfix()
+        if self.at("**"):
+            line = self.advance().line
+            return Binary("**", base, self.parse_unary(), line=line)
+        return base
+
+    def parse_postfix(self):
+        expr = self.parse_primary()
+        while True:
+            token = self.peek()
+            if self.at("("):
+                self.advance()
+                expr = Call(expr, [], self.parse_call_args(), line=token.line)
+            elif self.at("["):
+                self.advance()
+                index = self.parse_expression()
+                if self.accept(":"):
+                    index = Slice(index, self.parse_expression(), line=token.line)
+                self.expect("]")
+                expr = Index(expr, index, line=token.line)
+            elif self.at(".", "->"):
+                self.advance()
+                expr = Member(expr, self.expect_name(), token.text, line=token.line)
+            elif self.at("++", "--"):
+                self.advance()
+                expr = Postfix(token.text, expr, line=token.line)
+            else:
+                return expr
+
+    def parse_call_args(self):
+        args = []
+        while not self.at(")"):
+            args.append(self.parse_assignment())
+            if not self.accept(","):
+                break
+        self.expect(")")
+        return args
+
+    def parse_template_name(self):
+        template_args = self.parse_template_args()
+        name_suffix = ""
+        while self.at("::"):
+            self.advance()
+            name_suffix += "::" + self.expect_name()
+        return template_args, name_suffix
+
+    def parse_primary(self):
+        token = self.peek()
+        if token.kind == "number":
+            self.advance()
+            return Number(token.text, line=token.line)
+        if token.kind == "string":
+            self.advance()
+            return String(token.text, line=token.line)
+        if token.kind == "name":
+            self.advance()
+            if self.at("<"):
+                # Template instance if the arguments parse as types and are
+                # closed, otherwise '<' is a comparison
+                result = self.try_parse(self.parse_template_name)
+                if result is not None:
+                    template_args, name_suffix = result
+                    if name_suffix:
+                        name = f"{token.text}<{', '.join(template_args)}>{name_suffix}"
+                        template_args = []
+                    else:
+                        name = token.text
+                    if self.at("("):
+                        self.advance()
+                        args = self.parse_call_args()
+                        return Call(
+                            Name(name, line=token.line),
+                            template_args,
+                            args,
+                            line=token.line,
+                        )
+                    if template_args:
+                        return TemplateName(name, template_args, line=token.line)
+                    return Name(name, line=token.line)
+            return Name(token.text, line=token.line)
+        if self.at("("):
+            self.advance()
+            expr = self.parse_expression()
+            self.expect(")")
+            return expr
+        if self.at("["):
+            self.advance()
+            elements = self.parse_list("]")
+            return ListLiteral(elements, line=token.line)
+        if self.at("{"):
+            self.advance()
+            elements = self.parse_list("}")
+            return BraceList(elements, line=token.line)
+        raise self.error(f"unexpected '{token.text}' in expression")
+
+    def parse_list(self, close):
+        elements = []
+        while not self.at(close):
+            elements.append(self.parse_assignment())
+            if not self.accept(","):
+                break
+        self.expect(close)
+        return elements
+
+    # Statements
+
+    def parse_block(self):
+        token = self.expect("{")
+        body = []
+        while not self.at("}"):
+            if self.peek().kind == "eof":
+                raise self.error("unterminated block", token)
+            if self.function_depth > 0 and self.at_unindented_function():
+                # Missing closing brace, the next function starts here
+                self.diagnostics.append(
+                    f"{self.path}:{token.line}: block is not closed before "
+                    f"line {self.peek().line}"
+                )
+                return Block(body, line=token.line)
+            body.append(self.parse_statement_recovering())
+        self.advance()
+        return Block(body, line=token.line)
+
+    def at_unindented_function(self):
+        if self.peek().col != 1:
+            return False
+        start = self.pos
+        depth = self.function_depth
+        try:
+            self.function_depth = 0
+            self.parse_function_header()
+            return self.at("{", ";")
+        except PseudocodeSyntaxError:
+            return False
+        finally:
+            self.pos = start
+            self.function_depth = depth
+
+    # Parse a statement, skipping to the end of it on a syntax error so
+    # that one malformed line does not lose the rest of the file
+    def parse_statement_recovering(self):
+        start = self.pos
+        try:
+            return self.parse_statement()
+        except PseudocodeSyntaxError as e:
+            self.pos = start
+            # Enclosing statements may retry and fail on the same line
+            if str(e) not in self.diagnostics:
+                self.diagnostics.append(str(e))
+            return self.skip_statement()
+
+    def skip_statement(self):
+        token = self.peek()
+        depth = 0
+        text = []
+        while self.peek().kind != "eof":
+            current = self.peek()
+            if current.text in ("(", "[", "{"):
+                depth += 1
+            elif current.text in (")", "]", "}"):
+                if depth == 0:
+                    break
+                depth -= 1
+                if depth == 0 and current.text == "}":
+                    text.append(self.advance().text)
+                    break
+            elif current.text == ";" and depth == 0:
+                self.advance()
+                break
+            text.append(self.advance().text)
+        if self.pos == self.tokens.index(token) and self.peek().kind != "eof":
+            text.append(self.advance().text)
+        return ExprStatement(Name(" ".join(text), line=token.line), line=token.line)
+
+    def accept_semicolon(self):
+        # Some statements in the pseudocode omit the semicolon
+        self.accept(";")
+
+    def parse_statement(self):
+        token = self.peek()
+        line = token.line
+        if self.at("{"):
+            return self.parse_block()
+        if self.at(";"):
+            self.advance()
+            return Block([], line=line)
+        if token.kind == "name":
+            keyword = token.text
+            if keyword == "if":
+                self.advance()
+                self.expect("(")
+                test = self.parse_expression()
+                self.expect(")")
+                body = self.parse_statement()
+                orelse = None
+                if self.accept("else"):
+                    orelse = self.parse_statement()
+                return If(test, body, orelse, line=line)
+            if keyword == "for" and self.peek(1).text == "(":
+                return self.parse_for()
+            if keyword in STATEMENT_LOOPS and self.peek(1).text == "(":
+                return self.parse_for_each()
+            if keyword == "while":
+                self.advance()
+                self.expect("(")
+                test = self.parse_expression()
+                self.expect(")")
+                return While(test, self.parse_statement(), line=line)
+            if keyword == "do":
+                self.advance()
+                body = self.parse_statement()
+                self.expect("while")
+                self.expect("(")
+                test = self.parse_expression()
+                self.expect(")")
+                self.accept_semicolon()
+                return DoWhile(body, test, line=line)
+            if keyword == "switch":
+                return self.parse_switch()
+            if keyword == "return":
+                self.advance()
+                value = None
+                if not self.at(";", "}"):
+                    value = self.parse_expression()
+                self.accept_semicolon()
+                return Return(value, line=line)
+            if keyword == "break":
+                self.advance()
+                self.accept_semicolon()
+                return Break(line=line)
+            if keyword == "continue":
+                self.advance()
+                self.accept_semicolon()
+                return Continue(line=line)
+            if keyword == "using":
+                self.advance()
+                name = self.parse_type()
+                return Using(name, self.skip_to_semicolon(), line=line)
+            if keyword == "typedef":
+                self.advance()
+                text = self.skip_to_semicolon()
+                return Typedef(text.split()[-1], text, line=line)
+            if keyword == "enum":
+                return self.parse_enum()
+            declaration = self.try_parse(self.parse_declaration)
+            if declaration is not None:
+                return declaration
+        expr = self.parse_expression()
+        self.accept_semicolon()
+        return ExprStatement(expr, line=line)
+
+    def skip_to_semicolon(self):
+        text = []
+        depth = 0
+        while self.peek().kind != "eof":
+            if self.at(";") and depth == 0:
+                self.advance()
+                break
+            token = self.advance()
+            if token.text in ("(", "[", "{"):
+                depth += 1
+            elif token.text in (")", "]", "}"):
+                depth -= 1
+            text.append(token.text)
+        return " ".join(text)
+
+    def parse_declaration(self):
+        line = self.peek().line
+        ty = self.parse_type()
+        declarations = [self.parse_declarator(ty, line)]
+        while self.accept(","):
+            declarations.append(self.parse_declarator(ty, line))
+        if not self.at(";"):
+            raise self.error("expected ';' after declaration")
+        self.advance()
+        if len(declarations) == 1:
+            return declarations[0]
+        return DeclarationList(declarations, line=line)
+
+    def parse_declarator(self, ty, line):
+        name = self.expect_name()
+        size = None
+        value = None
+        args = None
+        if self.accept("["):
+            # An empty size declares an array of unspecified length
+            size = None if self.at("]") else self.parse_expression()
+            self.expect("]")
+        if self.at("("):
+            # Constructor style, e.g. shape_t index(rank(shape))
+            self.advance()
+            args = self.parse_call_args()
+        elif self.accept("="):
+            value = self.parse_assignment()
+        return Declaration(ty, name, size, value, args, line=line)
+
+    def parse_for(self):
+        # Some loops use the for_each range form, e.g. for(0 <= i < N)
+        start = self.pos
+        try:
+            return self.parse_c_for()
+        except PseudocodeSyntaxError:
+            self.pos = start
+        return self.parse_for_each()
+
+    def parse_c_for(self):
+        line = self.advance().line
+        self.expect("(")
+        init = None
+        if not self.at(";"):
+            init = self.try_parse(self.parse_declaration)
+            if init is None:
+                init = ExprStatement(self.parse_expression(), line=line)
+                self.expect(";")
+        else:
+            self.advance()
+        test = None if self.at(";") else self.parse_expression()
+        self.expect(";")
+        step = None if self.at(")") else self.parse_expression()
+        self.expect(")")
+        return For(init, test, step, self.parse_statement(), line=line)
+
+    def parse_for_each(self):
+        token = self.advance()
+        self.expect("(")
+        # Collection form: [type] name in iterable [; options]
+        in_form = None
+        start = self.pos
+        try:
+            ty = None
+            if self.peek(1).text != "in":
+                ty = self.parse_type()
+            target = self.expect_name()
+            self.expect("in")
+            in_form = (ty, target)
+        except PseudocodeSyntaxError:
+            self.pos = start
+        if in_form is not None:
+            iterable = self.parse_assignment()
+            options = []
+            while self.accept(";"):
+                options.append(self.parse_assignment())
+            self.expect(")")
+            body = self.parse_statement()
+            return ForEachIn(
+                token.text, in_form[0], in_form[1], iterable, options, body,
+                line=token.line,
+            )  # fmt: skip
+        ranges = self.parse_call_args()
+        return ForEach(ranges, self.parse_statement(), line=token.line)
+
+    def parse_switch(self):
+        line = self.advance().line
+        self.expect("(")
+        value = self.parse_expression()
+        self.expect(")")
+        self.expect("{")
+        cases = []
+        while not self.accept("}"):
+            case_line = self.peek().line
+            if self.accept("default"):
+                case_value = None
+            else:
+                self.expect("case")
+                case_value = self.parse_conditional()
+            self.expect(":")
+            body = []
+            while not self.at("case", "default", "}"):
+                body.append(self.parse_statement_recovering())
+            cases.append(Case(case_value, body, line=case_line))
+        return Switch(value, cases, line=line)
+
+    def parse_enum(self):
+        line = self.advance().line
+        name = self.expect_name()
+        self.accept("=")
+        self.expect("{")
+        values = []
+        while not self.at("}"):
+            values.append(self.expect_name())
+            if self.accept("="):
+                self.parse_conditional()
+            if not self.accept(","):
+                break
+        self.expect("}")
+        self.accept_semicolon()
+        return EnumDef(name, values, line=line)
+
+    # Functions
+
+    def parse_function_header(self):
+        line = self.peek().line
+        return_type = self.parse_type()
+        name = self.expect_name()
+        template_params = []
+        if self.at("<"):
+            template_params = self.parse_template_args()
+        self.expect("(")
+        params = []
+        while not self.at(")"):
+            param_line = self.peek().line
+            ty = self.parse_type()
+            param_name = None
+            default = None
+            if self.peek().kind == "name":
+                param_name = self.advance().text
+                if self.at("[") and self.peek(1).text == "]":
+                    self.advance()
+                    self.advance()
+                    ty += "[]"
+            if self.accept("="):
+                default = self.parse_conditional()
+            params.append(Param(ty, param_name, default, line=param_line))
+            if not self.accept(","):
+                break
+        self.expect(")")
+        return line, return_type, name, template_params, params
+
+    def parse_function(self):
+        header = self.parse_function_header()
+        if not self.at("{", ";"):
+            raise self.error("expected function body")
+        line, return_type, name, template_params, params = header
+        body = None
+        if self.accept(";") is None:
+            self.function_depth += 1
+            try:
+                body = self.parse_block()
+            finally:
+                self.function_depth -= 1
+        return Function(return_type, name, template_params, params, body, line=line)
+
+    def parse_module(self):
+        body = []
+        while self.peek().kind != "eof":
+            start = self.pos
+            try:
+                self.parse_function_header()
+                is_function = self.at("{", ";")
+            except PseudocodeSyntaxError:
+                is_function = False
+            self.pos = start
+            if is_function:
+                body.append(self.parse_function())
+            elif self.at("}"):
+                # Stray closing brace, e.g. after a recovered function
+                self.diagnostics.append(
+                    f"{self.path}:{self.peek().line}: unexpected '}}'"
+                )
+                self.advance()
+            else:
+                body.append(self.parse_statement_recovering())
+        return Module(self.path, body, self.diagnostics)
+
+
+def parse(text, path="<string>"):
+    return PseudocodeParser(text, path).parse_module()
+
+
+class PseudocodeCache:
+    def __init__(self, directory=None):
+        self.directory = directory
+        self.modules = {}
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def key(self, text):
+        digest = hashlib.sha256(str(PSEUDOCODE_AST_VERSION).encode())
+        digest.update(b"\0")
+        digest.update(text.encode())
+        return digest.hexdigest()
+
+    def parse(self, text, path):
+        key = self.key(text)
+        module = self.modules.get(key)
+        if module is None and self.directory is not None:
+            cache_path = os.path.join(self.directory, key + ".pickle")
+            if os.path.exists(cache_path):
+                try:
+                    with open(cache_path, "rb") as f:
+                        module = pickle.load(f)
+                except (OSError, pickle.UnpicklingError, EOFError):
+                    module = None
+            if module is None:
+                module = parse(text, path)
+                with open(cache_path, "wb") as f:
+                    pickle.dump(module, f)
+        elif module is None:
+            module = parse(text, path)
+        module.path = path
+        self.modules[key] = module
+        return module
+
+
+def parse_file(path, cache=None):
+    with open(path, "r") as f:
+        text = f.read()
+    if cache is None:
+        return parse(text, path)
+    return cache.parse(text, path)
+
+
+# Names of all functions called anywhere below a node
+def called_names(node):
+    return {n.name for n in node.walk() if isinstance(n, Call) and n.name}
+
+
+class PseudocodeIndex:
+    def __init__(self, root, cache=None):
+        self.root = root
+        self.modules = {}
+        # Function name to a list of (file, Function), one per overload
+        self.definitions = {}
+        # Function name, or file for top level code, to the names it calls
+        self.calls = {}
+        self.__load(cache)
+
+    def __load(self, cache):
+        patterns = ["library/*.tosac", "operators/*.tosac", "operators/tables/*.tosac"]
+        for pattern in patterns:
+            for path in sorted(glob.glob(os.path.join(self.root, pattern))):
+                relpath = os.path.relpath(path, self.root).replace(os.sep, "/")
+                module = parse_file(path, cache)
+                self.modules[relpath] = module
+                for function in module.functions():
+                    self.definitions.setdefault(function.name, []).append(
+                        (relpath, function)
+                    )
+                    self.calls.setdefault(function.name, set()).update(
+                        called_names(function)
+                    )
+                top_level_calls = set()
+                for statement in module.statements():
+                    top_level_calls.update(called_names(statement))
+                self.calls[relpath] = top_level_calls
+
+    def operator_files(self):
+        return [path for path in self.modules if path.startswith("operators/")]
+
+    def defined_in(self, relpath):
+        return {function.name for function in self.modules[relpath].functions()}
+
+    # Functions reachable from a function name or file
+    def reachable(self, caller):
+        seen = set()
+        pending = list(self.calls.get(caller, ()))
+        while pending:
+            name = pending.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            pending.extend(self.calls.get(name, ()))
+        return seen
+
+    # Operator files whose pseudocode depends on functions from relpath
+    def affected_operators(self, relpath):
+        defined = self.defined_in(relpath)
+        affected = []
+        for path in self.operator_files():
+            if path == relpath:
+                affected.append(path)
+                continue
+            reached = self.reachable(path)
+            for function in self.modules[path].functions():
+                reached.update(self.reachable(function.name))
+            if reached & defined:
+                affected.append(path)
+        return affected
+
+
+INCLUDE_PATTERN = re.compile(r"include::\{pseudocode\}/([\w/]+\.tosac)")
+
+
+# Map each pseudocode file to the chapters that include it
+def pseudocode_pages(chapters_dir):
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(chapters_dir, "*.adoc"))):
+        with open(path, "r") as f:
+            for line in f:
+                m = INCLUDE_PATTERN.search(line)
+                name = os.path.basename(path)
+                if m and name not in pages.get(m.group(1), []):
+                    pages.setdefault(m.group(1), []).append(name)
+    return pages
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--root",
+        required=False,
+        default=os.path.join(os.path.dirname(__file__), "..", "pseudocode"),
+        help="Path to the pseudocode directory",
+    )
+    parser.add_argument(
+        "--chapters",
+        required=False,
+        default=os.path.join(os.path.dirname(__file__), "..", "chapters"),
+        help="Path to the chapters directory",
+    )
+    parser.add_argument(
+        "--cache",
+        required=False,
+        help="Directory used to cache parsed files by content hash",
+    )
+    parser.add_argument(
+        "--impact",
+        required=False,
+        action="append",
+        default=[],
+        help="Pseudocode file, relative to --root, to list the affected operators of",
+    )
+    parser.add_argument(
+        "--calls",
+        required=False,
+        action="append",
+        default=[],
+        help="Function or operator file to list the reachable functions of",
+    )
+    parser.add_argument(
+        "--check",
+        required=False,
+        action="store_true",
+        help="Report pseudocode that could not be parsed",
+    )
+    args = parser.parse_args()
+
+    try:
+        cache = PseudocodeCache(args.cache)
+        index = PseudocodeIndex(args.root, cache)
+    except (OSError, RuntimeError) as e:
+        print(f"Failure reading pseudocode: {str(e)}")
+        exit(1)
+
+    if args.check:
+        diagnostics = [d for m in index.modules.values() for d in m.diagnostics]
+        for diagnostic in diagnostics:
+            print(diagnostic)
+        if diagnostics:
+            exit(1)
+
+    pages = pseudocode_pages(args.chapters)
+    for relpath in args.impact:
+        if relpath not in index.modules:
+            print(f"Unknown pseudocode file {relpath}")
+            exit(1)
+        affected = index.affected_operators(relpath)
+        print(f"{relpath}: {len(affected)} operators affected")
+        for path in affected:
+            print(f"  {path} ({', '.join(pages.get(path, [])) or 'not included'})")
+
+    for caller in args.calls:
+        print(f"{caller}: {', '.join(sorted(index.reachable(caller)))}")
@@ -0,0 +1,616 @@
+#!/usr/bin/env python3
+# Copyright (c) 2026, ARM Limited.
+# SPDX-License-Identifier: Apache-2.0
+# Literal interpreter for the operator pseudocode. Every loop, helper call
+# and tensor access is executed one scalar at a time, as written, so it is
+# only usable on small tensors. It is the reference the vectorized
+# executors are checked against.
+import itertools
+import math
+import re
+
+import numpy as np
+import pseudocode
+from pseudocode_numpy import ErrorIfTriggered
+from pseudocode_numpy import NUMPY_TYPES
+from pseudocode_numpy import RequireFailed
+from pseudocode_numpy import TYPE_ALIASES
+
+# Shape attributes such as "[N,IH,IW,IC]" and vector attribute descriptions
+# such as "[pad_top, pad_bottom, pad_left, pad_right]"
+NAME_LIST = re.compile(r"\[\s*(\w+(?:\s*,\s*\w+)*)\s*\]")
+SHAPE = re.compile(r"\[([\w\s,*+-]+)\]")
+
+CONSTANTS = {
+    "true": True,
+    "false": False,
+    "NaN": math.nan,
+    "INFINITY": math.inf,
+    "infinity": math.inf,
+}
+
+# Functions used by the pseudocode without a declaration
+BUILTINS = {"abs": abs, "max": max, "min": min}
+
+# Declared-only library functions, evaluated with NumPy scalars
+SCALAR_INTRINSICS = {
+    "apply_ceil": np.ceil,
+    "apply_exp": np.exp,
+    "apply_floor": np.floor,
+    "apply_log_positive_input": np.log,
+    "apply_sqrt": np.sqrt,
+    "cos": np.cos,
+    "erf": math.erf,
+    "exp": np.exp,
+    "round_to_nearest_int": np.rint,
+    "sin": np.sin,
+    "tanh": np.tanh,
+}
+
+
+class PseudocodeInterpreterError(RuntimeError):
+    pass
+
+
+class _Return(Exception):
+    def __init__(self, value):
+        self.value = value
+
+
+# Convert a scalar to a pseudocode type. Integers wrap to the width of the
+# type, floating point values round to the NumPy type.
+def convert(value, ty):
+    if ty not in NUMPY_TYPES or isinstance(value, (list, np.ndarray)):
+        return value
+    dtype, width, kind = NUMPY_TYPES[ty]
+    if kind == "b":
+        return bool(value)
+    if kind == "f":
+        return np.dtype(dtype).type(value)
+    if isinstance(value, (float, np.floating)):
+        if not math.isfinite(value):
+            raise RequireFailed(f"conversion of {value} to {ty}")
+        value = math.trunc(value)
+    value = int(value) & ((1 << width) - 1)
+    if kind == "s" and value >= 1 << (width - 1):
+        value -= 1 << width
+    return value
+
+
+def type_limit(ty, limit):
+    dtype, width, kind = NUMPY_TYPES[ty]
+    if kind == "f":
+        value = np.finfo(dtype).max
+        return -value if limit.startswith("min") else value
+    if limit.endswith("_u") or kind == "u":
+        return 0 if limit.startswith("min") else (1 << width) - 1
+    return -(1 << (width - 1)) if limit.startswith("min") else (1 << (width - 1)) - 1
+
+
+def c_divide(a, b):
+    if isinstance(a, int) and isinstance(b, int):
+        if b == 0:
+            raise RequireFailed("integer division by zero")
+        quotient = abs(a) // abs(b)
+        return -quotient if (a < 0) != (b < 0) else quotient
+    return a / b
+
+
+def c_remainder(a, b):
+    if isinstance(a, int) and isinstance(b, int):
+        return a - b * c_divide(a, b)
+    return math.fmod(a, b)
+
+
+BINARY_OPERATORS = {
+    "+": lambda a, b: a + b,
+    "-": lambda a, b: a - b,
+    "*": lambda a, b: a * b,
+    "/": c_divide,
+    "%": c_remainder,
+    "**": lambda a, b: a**b,
+    "&": lambda a, b: a & b,
+    "|": lambda a, b: a | b,
+    "^": lambda a, b: a ^ b,
+    "<<": lambda a, b: a << b,
+    ">>": lambda a, b: a >> b,
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+}
+
+
+class Frame:
+    def __init__(self, path, binding):
+        self.path = path
+        self.binding = binding
+        # Innermost scope last, each maps a name to [type, value]
+        self.scopes = [{}]
+
+
+class PseudocodeInterpreter:
+    def __init__(self, index, spec):
+        self.index = index
+        self.enum_values = {value[0] for enum in spec.enums for value in enum.values}
+        self.args = {}
+        # Element types of the single value tensor arguments, such as zero
+        # points, for zero_extend of an argument
+        self.arg_types = {}
+        self.frame = None
+
+    # Arguments of an operator call: tensors, shape dimensions bound from the
+    # argument shapes, and vector attributes split into their named parts
+    def operator_arguments(self, op, binding, tensors, attributes=None):
+        attributes = attributes or {}
+        args = {}
+        self.arg_types = {}
+        for arg in op.arguments:
+            if arg.name in tensors:
+                value = np.asarray(tensors[arg.name])
+                args[arg.name] = value
+                m = SHAPE.fullmatch(arg.shape or "")
+                if m and arg.shape != "[1]":
+                    names = [n.strip() for n in m.group(1).split(",")]
+                    if len(names) == value.ndim:
+                        for name, dim in zip(names, value.shape):
+                            # Dimensions such as C*M are not bound
+                            if re.fullmatch(r"[A-Za-z_]\w*", name):
+                                args.setdefault(name, dim)
+                elif arg.shape and arg.shape != "-":
+                    args.setdefault(arg.shape, list(value.shape))
+                if arg.shape == "[1]":
+                    elty = binding.get(arg.tensor_element_type)
+                    args[arg.name] = convert(value.reshape(-1)[0].item(), elty)
+                    self.arg_types[arg.name] = elty
+                m = NAME_LIST.fullmatch(arg.description.strip())
+                if m and value.ndim == 1:
+                    names = [n.strip() for n in m.group(1).split(",")]
+                    if len(names) == value.shape[0]:
+                        for name, element in zip(names, value.tolist()):
+                            args[name] = element
+            elif arg.name in attributes:
+                args[arg.name] = attributes[arg.name]
+        return args
+
+    def run(self, opname, binding, args):
+        relpath = f"operators/{opname}.tosac"
+        module = self.index.modules.get(relpath)
+        if module is None:
+            raise PseudocodeInterpreterError(f"No pseudocode for {opname}")
+        self.args = args
+        self.frame = Frame(relpath, dict(binding))
+        for statement in module.statements():
+            self.execute(statement)
+
+    def error(self, node, message):
+        return PseudocodeInterpreterError(f"{self.frame.path}:{node.line}: {message}")
+
+    # Types
+
+    def resolve(self, ty, binding=None):
+        binding = self.frame.binding if binding is None else binding
+        ty = ty.rstrip("*").rstrip("[]")
+        if ty.startswith("<") and ty.endswith(">"):
+            ty = ty[1:-1]
+        if ty not in binding:
+            ty = TYPE_ALIASES.get(ty, ty)
+        return binding.get(ty, ty)
+
+    def is_floating_point(self, ty):
+        ty = self.resolve(ty)
+        if ty in NUMPY_TYPES:
+            return NUMPY_TYPES[ty][2] == "f"
+        return ty.startswith("fp") or ty.startswith("bf")
+
+    def is_same(self, ty1, ty2):
+        ty1 = self.resolve(ty1)
+        ty2 = self.resolve(ty2)
+        if ty1 in NUMPY_TYPES and ty2 in NUMPY_TYPES:
+            return NUMPY_TYPES[ty1] == NUMPY_TYPES[ty2]
+        return ty1 == ty2
+
+    def numeric(self, ty, node):
+        ty = self.resolve(ty)
+        if ty not in NUMPY_TYPES:
+            raise self.error(node, f"{ty} is not supported")
+        return ty
+
+    def type_of(self, node):
+        if isinstance(node, pseudocode.Name):
+            entry = self.lookup(node.name)
+            if entry is None:
+                return self.arg_types.get(node.name)
+            return entry[0]
+        if isinstance(node, pseudocode.Call) and node.template_args:
+            return self.resolve(node.template_args[-1])
+        return None
+
+    # Variables
+
+    def lookup(self, name):
+        for scope in reversed(self.frame.scopes):
+            if name in scope:
+                return scope[name]
+        return None
+
+    def declare(self, name, ty, value):
+        if isinstance(value, list):
+            value = list(value)
+        self.frame.scopes[-1][name] = [ty, convert(value, ty)]
+
+    # Expressions
+
+    def evaluate(self, node):
+        method = getattr(self, "eval_" + type(node).__name__, None)
+        if method is None:
+            raise self.error(node, f"{type(node).__name__} is not supported")
+        return method(node)
+
+    def eval_Number(self, node):
+        return node.value
+
+    def eval_String(self, node):
+        return node.text[1:-1]
+
+    def eval_Name(self, node):
+        entry = self.lookup(node.name)
+        if entry is not None:
+            return entry[1]
+        if node.name in CONSTANTS:
+            return CONSTANTS[node.name]
+        if node.name in self.enum_values:
+            return node.name
+        if node.name in self.args:
+            return self.args[node.name]
+        if node.name == "tosa_extra_multiplies":
+            return False
+        raise self.error(node, f"undefined name {node.name}")
+
+    def eval_TemplateName(self, node):
+        if node.name in ("maximum", "minimum"):
+            ty = self.numeric(node.template_args[0], node)
+            return type_limit(ty, node.name + "_s")
+        return self.eval_Call(node)
+
+    def eval_ListLiteral(self, node):
+        return [self.evaluate(element) for element in node.elements]
+
+    def eval_Index(self, node):
+        value = self.evaluate(node.value)
+        if isinstance(node.index, pseudocode.Slice):
+            # The upper bound of a slice is inclusive, e.g. shape[0:axis-1]
+            lower = self.evaluate(node.index.lower)
+            stop = self.evaluate(node.index.upper) + 1
+            return list(value[lower:stop])
+        index = self.evaluate(node.index)
+        if isinstance(value, np.ndarray):
+            return value.reshape(-1)[index].item()
+        return value[index]
+
+    def eval_Unary(self, node):
+        if node.op in ("++", "--"):
+            return self.update(node.operand, node.op[0], node)
+        value = self.evaluate(node.operand)
+        if node.op == "!":
+            return not value
+        if node.op == "-":
+            return -value
+        if node.op == "~":
+            return ~value
+        return value
+
+    def eval_Postfix(self, node):
+        value = self.evaluate(node.operand)
+        self.update(node.operand, node.op[0], node)
+        return value
+
+    def update(self, target, op, node):
+        one = pseudocode.Number("1", line=node.line)
+        value = pseudocode.Binary(op, target, one, line=node.line)
+        return self.assign(target, self.evaluate(value))
+
+    def eval_Binary(self, node):
+        if node.op == "&&":
+            return bool(self.evaluate(node.left)) and bool(self.evaluate(node.right))
+        if node.op == "||":
+            return bool(self.evaluate(node.left)) or bool(self.evaluate(node.right))
+        if node.op == ",":
+            self.evaluate(node.left)
+            return self.evaluate(node.right)
+        left = self.evaluate(node.left)
+        right = self.evaluate(node.right)
+        return BINARY_OPERATORS[node.op](left, right)
+
+    def eval_Compare(self, node):
+        left = self.evaluate(node.left)
+        for op, comparator in zip(node.ops, node.comparators):
+            right = self.evaluate(comparator)
+            if not BINARY_OPERATORS[op](left, right):
+                return False
+            left = right
+        return True
+
+    def eval_Conditional(self, node):
+        if self.evaluate(node.test):
+            return self.evaluate(node.body)
+        return self.evaluate(node.orelse)
+
+    def eval_Assign(self, node):
+        value = self.evaluate(node.value)
+        if node.op != "=":
+            value = BINARY_OPERATORS[node.op[:-1]](self.evaluate(node.target), value)
+        return self.assign(node.target, value)
+
+    def assign(self, target, value):
+        if isinstance(target, pseudocode.Name):
+            entry = self.lookup(target.name)
+            if entry is None:
+                raise self.error(target, f"assignment to undeclared {target.name}")
+            entry[1] = convert(value, entry[0])
+            return entry[1]
+        if isinstance(target, pseudocode.Index):
+            container = self.evaluate(target.value)
+            index = self.evaluate(target.index)
+            if isinstance(container, np.ndarray):
+                container.reshape(-1)[index] = value
+            else:
+                container[index] = value
+            return value
+        raise self.error(target, "assignment to this target is not supported")
+
+    def eval_Call(self, node):
+        name = node.name
+        template_args = [self.resolve(ty) for ty in node.template_args]
+        if name == "is_floating_point":
+            return self.is_floating_point(template_args[0])
+        if name == "is_same":
+            return self.is_same(*template_args)
+        if name in ("has_value_t", "has_scale_t", "is_block_scale"):
+            self.numeric(template_args[0], node)
+            return False
+        if name in ("ERROR_IF", "REQUIRE"):
+            value = bool(self.evaluate(node.args[0]))
+            where = f"{self.frame.path}:{node.line}"
+            if name == "ERROR_IF" and value:
+                raise ErrorIfTriggered(f"{where}: ERROR_IF condition is true")
+            if name == "REQUIRE" and not value:
+                raise RequireFailed(f"{where}: REQUIRE condition failed")
+            return None
+        args = [self.evaluate(arg) for arg in node.args]
+        if name in ("sign_extend", "static_cast", "truncate"):
+            return convert(args[0], self.numeric(template_args[0], node))
+        if name == "zero_extend":
+            source = self.type_of(node.args[0])
+            value = args[0]
+            if source in NUMPY_TYPES and NUMPY_TYPES[source][2] != "f":
+                value &= (1 << NUMPY_TYPES[source][1]) - 1
+            return convert(value, self.numeric(template_args[0], node))
+        if name in ("maximum_s", "minimum_s", "maximum_u", "minimum_u"):
+            return type_limit(self.numeric(template_args[0], node), name)
+        if name == "nan" and template_args:
+            return convert(math.nan, self.numeric(template_args[0], node))
+        if name in ("maximum", "minimum") and template_args:
+            return type_limit(self.numeric(template_args[0], node), name + "_s")
+        m = re.fullmatch(r"std::numeric_limits<(\w+)>::(min|max)", name or "")
+        if m:
+            limit = "minimum_s" if m.group(2) == "min" else "maximum_s"
+            return type_limit(self.numeric(m.group(1), node), limit)
+        if name == "is_a_NaN":
+            return isinstance(args[0], (float, np.floating)) and math.isnan(args[0])
+        if name == "is_an_Inf":
+            return isinstance(args[0], (float, np.floating)) and math.isinf(args[0])
+        if name == "is_finite":
+            return not isinstance(args[0], (float, np.floating)) or math.isfinite(
+                args[0]
+            )
+        if name == "pi":
+            return math.pi
+        if name == "power_of_two":
+            value = int(args[0])
+            return value > 0 and value & (value - 1) == 0
+        if name == "rank" and isinstance(args[0], np.ndarray):
+            return args[0].ndim
+        if name in ("rank", "length"):
+            return len(args[0])
+        if name == "flatten":
+            # Operators pass the shapes to join as separate arguments
+            return [element for shape in args for element in shape]
+        if name in BUILTINS and name not in self.index.definitions:
+            return BUILTINS[name](*args)
+        if name in SCALAR_INTRINSICS:
+            ty = template_args[0] if template_args else self.type_of(node.args[0])
+            value = SCALAR_INTRINSICS[name](args[0])
+            return convert(value, ty) if ty is not None else value
+        return self.call_function(node, template_args, args)
+
+    def call_function(self, node, template_args, args):
+        candidates = [
+            (path, function)
+            for path, function in self.index.definitions.get(node.name, [])
+            if function.body is not None
+            and len([p for p in function.params if p.default is None]) <= len(args)
+            and len(args) <= len(function.params)
+        ]
+        # Overloads such as tensor_read<in_t> and tensor_read<in_t, out_t>
+        # differ in their template parameters
+        exact = [
+            c for c in candidates if len(c[1].template_params) == len(template_args)
+        ]
+        candidates = exact or candidates
+        if not candidates:
+            raise self.error(node, f"no definition of {node.name} for this call")
+        path, function = candidates[0]
+        binding = dict(zip(function.template_params, template_args))
+        for param, arg in zip(function.params, node.args):
+            ty = param.type.rstrip("*").rstrip("[]").strip("<>")
+            if ty in function.template_params and ty not in binding:
+                arg_ty = self.type_of(arg)
+                if arg_ty is not None:
+                    binding[ty] = arg_ty
+        for param in function.template_params:
+            if param not in binding and param in self.frame.binding:
+                binding[param] = self.frame.binding[param]
+
+        return self.invoke(path, function, binding, args)
+
+    # Runs a function body with argument values. return_type overrides the
+    # declared type the result is converted to.
+    def invoke(self, path, function, binding, args, return_type=None):
+        defaults = []
+        frame = Frame(path, binding)
+        caller = self.frame
+        self.frame = frame
+        try:
+            for i, param in enumerate(function.params):
+                if i >= len(args):
+                    defaults.append(self.evaluate(param.default))
+            for param, value in zip(function.params, args + defaults):
+                self.declare(param.name, self.resolve(param.type), value)
+            self.execute(function.body)
+            result = None
+        except _Return as r:
+            result = r.value
+        finally:
+            self.frame = caller
+        return_type = return_type or function.return_type
+        if return_type != "void" and result is not None:
+            result = convert(result, self.resolve(return_type, binding))
+        return result
+
+    # Calls a function defined in the pseudocode with argument values, such
+    # as the reference function of a lookup table
+    def call(self, name, args, binding=None, return_type=None):
+        definitions = [
+            (path, function)
+            for path, function in self.index.definitions.get(name, [])
+            if function.body is not None and len(function.params) == len(args)
+        ]
+        if not definitions:
+            raise PseudocodeInterpreterError(f"No definition of {name}")
+        path, function = definitions[0]
+        return self.invoke(path, function, dict(binding or {}), args, return_type)
+
+    # Statements
+
+    def execute(self, node):
+        method = getattr(self, "exec_" + type(node).__name__, None)
+        if method is None:
+            raise self.error(node, f"{type(node).__name__} is not supported")
+        method(node)
+
+    def exec_Block(self, node):
+        self.frame.scopes.append({})
+        try:
+            for statement in node.body:
+                self.execute(statement)
+        finally:
+            self.frame.scopes.pop()
+
+    def exec_ExprStatement(self, node):
+        self.evaluate(node.expr)
+
+    def exec_Declaration(self, node):
+        ty = self.resolve(node.type)
+        if node.args is not None:
+            # Constructor style shape, e.g. shape_t index(rank(shape))
+            value = [0] * self.evaluate(node.args[0])
+        elif node.size is not None:
+            value = [None] * self.evaluate(node.size)
+        elif node.value is not None:
+            value = self.evaluate(node.value)
+        else:
+            value = 0
+        self.declare(node.name, ty, value)
+
+    def exec_DeclarationList(self, node):
+        for declaration in node.declarations:
+            self.exec_Declaration(declaration)
+
+    def exec_Using(self, node):
+        pass
+
+    def exec_If(self, node):
+        if self.evaluate(node.test):
+            self.execute(node.body)
+        elif node.orelse is not None:
+            self.execute(node.orelse)
+
+    def exec_For(self, node):
+        self.frame.scopes.append({})
+        try:
+            if node.init is not None:
+                self.execute(node.init)
+            while node.test is None or self.evaluate(node.test):
+                self.execute(node.body)
+                if node.step is not None:
+                    self.evaluate(node.step)
+        finally:
+            self.frame.scopes.pop()
+
+    def exec_While(self, node):
+        while self.evaluate(node.test):
+            self.execute(node.body)
+
+    # for_each(0 <= n < N, ...) nests the ranges, the first one outermost
+    def exec_ForEach(self, node):
+        ranges = []
+        for term in node.ranges:
+            if (
+                not isinstance(term, pseudocode.Compare)
+                or term.ops != ["<=", "<"]
+                or not isinstance(term.comparators[0], pseudocode.Name)
+            ):
+                raise self.error(node, "for_each range is not of the form lo <= i < hi")
+            ranges.append(term)
+        self.for_each_range(ranges, node.body)
+
+    def for_each_range(self, ranges, body):
+        if not ranges:
+            self.execute(body)
+            return
+        term = ranges[0]
+        lower = self.evaluate(term.left)
+        upper = self.evaluate(term.comparators[1])
+        for value in range(lower, upper):
+            self.frame.scopes.append({})
+            try:
+                self.declare(term.comparators[0].name, "int32_t", value)
+                self.for_each_range(ranges[1:], body)
+            finally:
+                self.frame.scopes.pop()
+
+    def exec_ForEachIn(self, node):
+        if node.loop != "for_each_data_position" or node.options:
+            raise self.error(node, f"{node.loop} loop is not supported")
+        shape = self.evaluate(node.iterable)
+        for index in itertools.product(*[range(dim) for dim in shape]):
+            self.frame.scopes.append({})
+            try:
+                self.declare(node.target, "shape_t", list(index))
+                self.execute(node.body)
+            finally:
+                self.frame.scopes.pop()
+
+    def exec_Return(self, node):
+        raise _Return(None if node.value is None else self.evaluate(node.value))
+
+
+# Run an operator on tensors, returning the output tensors by name. Output
+# shapes must be given as they are not derived from the inputs.
+def interpret_operator(
+    interpreter, op, binding, tensors, attributes=None, output_shapes=None
+):
+    tensors = dict(tensors)
+    outputs = {}
+    for arg in op.arguments:
+        if "output" in [c.name for c in arg.categories]:
+            elty = binding.get(arg.tensor_element_type, arg.tensor_element_type)
+            outputs[arg.name] = np.zeros(output_shapes[arg.name], NUMPY_TYPES[elty][0])
+            tensors[arg.name] = outputs[arg.name]
+    args = interpreter.operator_arguments(op, binding, tensors, attributes)
+    with np.errstate(all="ignore"):
+        interpreter.run(op.name, binding, args)
+    return outputs
@@ -0,0 +1,962 @@
+#!/usr/bin/env python3
+# Copyright (c) 2026, ARM Limited.
+# SPDX-License-Identifier: Apache-2.0
+# Compiles element-wise operator pseudocode into vectorized NumPy kernels.
+# The body of the data position loop is evaluated for every position at
+# once. Conditional code runs under a mask of the positions taking the
+# branch, and library helpers are specialized for their template types.
+import hashlib
+import keyword
+import os
+import re
+import sys
+
+import numpy as np
+import pseudocode
+import tosa
+
+# Bump when the generated code changes, so cached kernels are not reused
+PSEUDOCODE_NUMPY_VERSION = 1
+
+# NumPy storage type, bit width and kind ("s" signed, "u" unsigned, "f"
+# floating point, "b" boolean) of the pseudocode types
+NUMPY_TYPES = {
+    "bool_t": ("bool", 1, "b"),
+    "i4_t": ("int8", 4, "s"),
+    "i8_t": ("int8", 8, "s"),
+    "i16_t": ("int16", 16, "s"),
+    "i32_t": ("int32", 32, "s"),
+    "i48_t": ("int64", 48, "s"),
+    "i64_t": ("int64", 64, "s"),
+    "int8_t": ("int8", 8, "s"),
+    "int16_t": ("int16", 16, "s"),
+    "int32_t": ("int32", 32, "s"),
+    "int48_t": ("int64", 48, "s"),
+    "int64_t": ("int64", 64, "s"),
+    "int": ("int32", 32, "s"),
+    "tensor_size_t": ("int64", 64, "s"),
+    "uint8_t": ("uint8", 8, "u"),
+    "uint16_t": ("uint16", 16, "u"),
+    "uint32_t": ("uint32", 32, "u"),
+    "uint64_t": ("uint64", 64, "u"),
+    "fp16_t": ("float16", 16, "f"),
+    "fp32_t": ("float32", 32, "f"),
+    "fp64_t": ("float64", 64, "f"),
+}
+
+# Types that are passed through without conversion
+OPAQUE_TYPES = ["shape_t", "tensor_t"]
+
+# apply_sub_s writes int_t for its template type
+TYPE_ALIASES = {"int_t": "in_t"}
+
+# Declared-only library functions with a NumPy equivalent
+NUMPY_INTRINSICS = {
+    "apply_ceil": "np.ceil",
+    "apply_exp": "np.exp",
+    "apply_floor": "np.floor",
+    "apply_log_positive_input": "np.log",
+    "apply_sqrt": "np.sqrt",
+    "cos": "np.cos",
+    "sigmoid": "rt.sigmoid",
+    "sin": "np.sin",
+    "tanh": "np.tanh",
+}
+
+NUMPY_PREDICATES = {
+    "is_a_NaN": "np.isnan",
+    "is_an_Inf": "np.isinf",
+    "is_finite": "np.isfinite",
+}
+
+NUMPY_UFUNCS = {
+    "+": "np.add",
+    "-": "np.subtract",
+    "*": "np.multiply",
+    "&": "np.bitwise_and",
+    "|": "np.bitwise_or",
+    "^": "np.bitwise_xor",
+    "<<": "np.left_shift",
+    ">>": "np.right_shift",
+    "==": "np.equal",
+    "!=": "np.not_equal",
+    "<": "np.less",
+    "<=": "np.less_equal",
+    ">": "np.greater",
+    ">=": "np.greater_equal",
+}
+
+CONSTANTS = {
+    "true": ("True", "bool_t"),
+    "false": ("False", "bool_t"),
+    "NaN": ("np.nan", None),
+    "INFINITY": ("np.inf", None),
+}
+
+LIMIT_FUNCTIONS = ["maximum_s", "minimum_s", "maximum_u", "minimum_u"]
+NUMERIC_LIMITS = re.compile(r"std::numeric_limits<(\w+)>::(min|max)")
+
+
+class PseudocodeCompileError(RuntimeError):
+    pass
+
+
+# A REQUIRE condition failed, the result of the operator is unpredictable
+class RequireFailed(RuntimeError):
+    pass
+
+
+# An ERROR_IF condition is true, the operator must not be executed
+class ErrorIfTriggered(RuntimeError):
+    pass
+
+
+# Runtime support for the generated kernels, referenced as rt
+
+
+def numpy_type(ty):
+    if ty not in NUMPY_TYPES:
+        raise PseudocodeCompileError(f"No NumPy type for {ty}")
+    return NUMPY_TYPES[ty]
+
+
+# static_cast<ty>: integers wrap to the width of the type, floating point
+# values are rounded towards zero when converted to integers
+def cast(value, ty):
+    dtype, width, kind = NUMPY_TYPES[ty]
+    value = np.asarray(value)
+    if kind == "b":
+        return value if value.dtype == np.bool_ else value != 0
+    if kind != "f" and value.dtype.kind == "f":
+        value = np.trunc(value).astype(np.int64)
+    # Types narrower than their storage, i4_t and i48_t, wrap to their width
+    if kind == "s" and width < np.dtype(dtype).itemsize * 8:
+        value = value.astype(np.int64)
+        half = 1 << (width - 1)
+        return (((value + half) & ((1 << width) - 1)) - half).astype(dtype)
+    return value.astype(dtype, copy=False)
+
+
+def zero_extend(value, ty, from_ty=None):
+    value = np.asarray(value)
+    if from_ty in NUMPY_TYPES and NUMPY_TYPES[from_ty][2] != "f":
+        width = NUMPY_TYPES[from_ty][1]
+    else:
+        width = value.dtype.itemsize * 8
+    return cast(value.astype(np.uint64) & np.uint64((1 << width) - 1), ty)
+
+
+# Binary operation with the C conversion rules: an unsigned 64-bit operand
+# makes the operation unsigned
+def c_binary(ufunc, a, b):
+    a = np.asarray(a)
+    b = np.asarray(b)
+    if np.uint64 in (a.dtype, b.dtype) and a.dtype.kind != "f" and b.dtype.kind != "f":
+        a = a.astype(np.uint64)
+        b = b.astype(np.uint64)
+    return ufunc(a, b)
+
+
+# Division and remainder round towards zero for integers
+def divide(a, b):
+    a = np.asarray(a)
+    b = np.asarray(b)
+    if a.dtype.kind in "iub" and b.dtype.kind in "iub":
+        quotient = np.abs(a) // np.abs(b)
+        return np.where((a < 0) != (b < 0), -quotient, quotient)
+    return a / b
+
+
+def remainder(a, b):
+    return np.fmod(a, b)
+
+
+def sigmoid(value):
+    return 1 / (1 + np.exp(-value))
+
+
+def truth(value):
+    value = np.asarray(value)
+    return value if value.dtype == np.bool_ else value != 0
+
+
+def mask_and(mask, cond):
+    cond = truth(cond)
+    return cond if mask is True else mask & cond
+
+
+def mask_and_not(mask, cond):
+    return mask_and(mask, np.logical_not(truth(cond)))
+
+
+def any_set(mask):
+    return mask is True or bool(np.any(mask))
+
+
+# Assignment under a mask, positions outside the mask keep the old value
+def select(mask, value, old):
+    if mask is True or old is None:
+        return value
+    return np.where(mask, value, old)
+
+
+def require(mask, cond, where):
+    if np.any(mask_and_not(mask, cond)):
+        raise RequireFailed(f"{where}: REQUIRE condition failed")
+
+
+def error_if(mask, cond, where):
+    if np.any(mask_and(mask, cond)):
+        raise ErrorIfTriggered(f"{where}: ERROR_IF condition is true")
+
+
+def profile_enabled(args, name):
+    profiles = args.get("profiles")
+    return profiles is None or name in profiles
+
+
+# Every data position of a shape, read from a tensor of source_shape
+class Positions:
+    def __init__(self, shape, source_shape=None):
+        self.shape = tuple(shape)
+        self.source_shape = self.shape if source_shape is None else source_shape
+
+
+def broadcast_shape(shape1, shape2):
+    if len(shape1) != len(shape2):
+        raise ErrorIfTriggered(f"broadcast_shape: rank of {shape1} and {shape2}")
+    shape = []
+    for dim1, dim2 in zip(shape1, shape2):
+        if dim1 != 1 and dim2 != 1 and dim1 != dim2:
+            raise ErrorIfTriggered(f"broadcast_shape: {shape1} and {shape2}")
+        shape.append(dim2 if dim1 == 1 else dim1)
+    return tuple(shape)
+
+
+def apply_broadcast(out_shape, in_shape, index):
+    if len(out_shape) != len(in_shape):
+        raise ErrorIfTriggered(f"apply_broadcast: rank of {out_shape} and {in_shape}")
+    for out_dim, in_dim in zip(out_shape, in_shape):
+        if out_dim != in_dim and in_dim != 1:
+            raise ErrorIfTriggered(f"apply_broadcast: {in_shape} to {out_shape}")
+    return Positions(index.shape, tuple(in_shape))
+
+
+def tensor_read(tensor, shape, index, ty):
+    value = np.asarray(tensor).reshape(index.source_shape)
+    return cast(np.broadcast_to(value, index.shape), ty)
+
+
+def tensor_write(tensor, shape, index, value, ty, mask):
+    if not any_set(mask):
+        return
+    value = np.broadcast_to(cast(value, ty), index.shape)
+    np.copyto(tensor, value, where=True if mask is True else truth(mask))
+
+
+def type_limit(ty, limit):
+    dtype, width, kind = numpy_type(ty)
+    if kind == "f":
+        value = float(np.finfo(dtype).max)
+        return repr(-value if limit.startswith("min") else value)
+    if limit in ("minimum_u", "maximum_u") or kind == "u":
+        value = 0 if limit.startswith("min") else (1 << width) - 1
+        return f"np.uint64({value})"
+    value = -(1 << (width - 1)) if limit.startswith("min") else (1 << (width - 1)) - 1
+    return f"np.int64({value})"
+
+
+def result_type(ty1, ty2):
+    if ty1 is None or ty1 == ty2:
+        return ty2
+    if ty2 is None:
+        return ty1
+    info1 = NUMPY_TYPES.get(ty1)
+    info2 = NUMPY_TYPES.get(ty2)
+    if info1 is None or info2 is None:
+        return None
+    rank1 = (info1[2] == "f", info1[1])
+    rank2 = (info2[2] == "f", info2[1])
+    return ty1 if rank1 >= rank2 else ty2
+
+
+def python_name(name):
+    if keyword.iskeyword(name) or name in ("np", "rt", "args"):
+        return name + "_"
+    return name
+
+
+# Writes one kernel: the operator code and the library functions it calls,
+# specialized for the type binding
+class KernelWriter:
+    def __init__(self, compiler, relpath, binding):
+        self.compiler = compiler
+        self.index = compiler.index
+        self.functions = {}
+        self.function_order = []
+        self.temp_count = 0
+        self.enter_function(relpath, binding, {}, None, kernel=True)
+
+    def enter_function(self, relpath, binding, scope, return_type, kernel=False):
+        self.relpath = relpath
+        self.binding = binding
+        self.scope = scope
+        self.return_type = return_type
+        self.kernel = kernel
+        self.free_names = []
+        self.lines = []
+        self.indent = 1
+        self.returns = 0
+
+    def save_function(self):
+        return (
+            self.relpath,
+            self.binding,
+            self.scope,
+            self.return_type,
+            self.kernel,
+            self.free_names,
+            self.lines,
+            self.indent,
+            self.returns,
+        )
+
+    def restore_function(self, state):
+        (
+            self.relpath,
+            self.binding,
+            self.scope,
+            self.return_type,
+            self.kernel,
+            self.free_names,
+            self.lines,
+            self.indent,
+            self.returns,
+        ) = state
+
+    def emit(self, line):
+        self.lines.append("    " * self.indent + line)
+
+    def temp(self):
+        self.temp_count += 1
+        return f"_m{self.temp_count}"
+
+    def error(self, node, message):
+        return PseudocodeCompileError(f"{self.relpath}:{node.line}: {message}")
+
+    # Types
+
+    def resolve(self, ty):
+        ty = TYPE_ALIASES.get(ty, ty) if ty not in self.binding else ty
+        return self.binding.get(ty, ty)
+
+    def numeric(self, ty, node):
+        ty = self.resolve(ty)
+        if ty not in NUMPY_TYPES:
+            raise self.error(node, f"no NumPy type for {ty}")
+        return ty
+
+    def is_floating_point(self, ty):
+        ty = self.resolve(ty)
+        if ty in NUMPY_TYPES:
+            return NUMPY_TYPES[ty][2] == "f"
+        return ty.startswith("fp") or ty.startswith("bf")
+
+    def is_same(self, ty1, ty2):
+        ty1 = self.resolve(ty1)
+        ty2 = self.resolve(ty2)
+        if ty1 in NUMPY_TYPES and ty2 in NUMPY_TYPES:
+            return NUMPY_TYPES[ty1] == NUMPY_TYPES[ty2]
+        return ty1 == ty2
+
+    # Compile time evaluation of conditions on template types. Returns
+    # None when the value is only known at run time.
+    def fold(self, expr):
+        if isinstance(expr, (pseudocode.Call, pseudocode.TemplateName)):
+            name = expr.name
+            if name == "is_floating_point" and len(expr.template_args) == 1:
+                return self.is_floating_point(expr.template_args[0])
+            if name == "is_same" and len(expr.template_args) == 2:
+                return self.is_same(*expr.template_args)
+        elif isinstance(expr, pseudocode.Name) and expr.name in ("true", "false"):
+            return expr.name == "true"
+        elif isinstance(expr, pseudocode.Unary) and expr.op == "!":
+            value = self.fold(expr.operand)
+            return None if value is None else not value
+        elif isinstance(expr, pseudocode.Binary) and expr.op in ("&&", "||"):
+            left = self.fold(expr.left)
+            right = self.fold(expr.right)
+            stop = expr.op == "||"
+            if stop in (left, right):
+                return stop
+            if left is not None and right is not None:
+                return not stop
+        return None
+
+    # Expressions, translated to (source, type) where type is the resolved
+    # pseudocode type or None when unknown
+
+    def expr(self, node, mask):
+        method = getattr(self, "expr_" + type(node).__name__, None)
+        if method is None:
+            raise self.error(node, f"{type(node).__name__} is not supported")
+        return method(node, mask)
+
+    def expr_Number(self, node, mask):
+        return repr(node.value), None
+
+    def expr_Name(self, node, mask):
+        name = node.name
+        if name in self.scope:
+            return python_name(name), self.scope[name]
+        if name in CONSTANTS:
+            return CONSTANTS[name]
+        if name in self.compiler.enum_values:
+            return repr(name), None
+        if self.kernel:
+            if name not in self.free_names:
+                self.free_names.append(name)
+            return python_name(name), None
+        raise self.error(node, f"undefined name {name}")
+
+    def expr_TemplateName(self, node, mask):
+        value = self.fold(node)
+        if value is None:
+            raise self.error(node, f"{node.name} used without a call")
+        return repr(value), "bool_t"
+
+    def expr_Unary(self, node, mask):
+        if node.op == "!":
+            value = self.fold(node)
+            if value is not None:
+                return repr(value), "bool_t"
+            source, _ = self.expr(node.operand, mask)
+            return f"np.logical_not({source})", "bool_t"
+        if node.op in ("-", "+", "~"):
+            source, ty = self.expr(node.operand, mask)
+            return f"({node.op}{source})", ty
+        raise self.error(node, f"unary {node.op} is not supported")
+
+    def expr_Binary(self, node, mask):
+        op = node.op
+        check = self.profile_check(node) if op == "-" else None
+        if check is not None:
+            return check, "bool_t"
+        if op in ("&&", "||"):
+            value = self.fold(node)
+            if value is not None:
+                return repr(value), "bool_t"
+            left_value = self.fold(node.left)
+            if left_value is not None:
+                return self.expr(node.right, mask)[0], "bool_t"
+            left, _ = self.expr(node.left, mask)
+            right, _ = self.expr(node.right, mask)
+            ufunc = "np.logical_and" if op == "&&" else "np.logical_or"
+            return f"{ufunc}({left}, {right})", "bool_t"
+        left, left_ty = self.expr(node.left, mask)
+        right, right_ty = self.expr(node.right, mask)
+        ty = result_type(left_ty, right_ty)
+        if op == "/":
+            return f"rt.divide({left}, {right})", ty
+        if op == "%":
+            return f"rt.remainder({left}, {right})", ty
+        if op == "**":
+            return f"np.power({left}, {right})", ty
+        if op not in NUMPY_UFUNCS:
+            raise self.error(node, f"operator {op} is not supported")
+        return self.binary(op, left, left_ty, right, right_ty), ty
+
+    def binary(self, op, left, left_ty, right, right_ty):
+        unsigned = [
+            ty
+            for ty in (left_ty, right_ty)
+            if ty in NUMPY_TYPES and NUMPY_TYPES[ty][2] == "u"
+        ]
+        if unsigned:
+            return f"rt.c_binary({NUMPY_UFUNCS[op]}, {left}, {right})"
+        return f"({left} {op} {right})"
+
+    # PRO-INT and similar profile names parse as a subtraction, with a
+    # leading ! applying to the first part
+    def profile_check(self, node):
+        left = node.left
+        negate = isinstance(left, pseudocode.Unary) and left.op == "!"
+        if negate:
+            left = left.operand
+        if not isinstance(left, pseudocode.Name) or not isinstance(
+            node.right, pseudocode.Name
+        ):
+            return None
+        name = f"{left.name}-{node.right.name}"
+        if name not in self.compiler.profile_names:
+            return None
+        if self.kernel is False:
+            raise self.error(node, "profile check outside the operator code")
+        check = f'rt.profile_enabled(args, "{name}")'
+        return f"np.logical_not({check})" if negate else check
+
+    def expr_Compare(self, node, mask):
+        terms = []
+        left, left_ty = self.expr(node.left, mask)
+        for op, comparator in zip(node.ops, node.comparators):
+            right, right_ty = self.expr(comparator, mask)
+            terms.append(self.binary(op, left, left_ty, right, right_ty))
+            left, left_ty = right, right_ty
+        source = terms[0]
+        for term in terms[1:]:
+            source = f"np.logical_and({source}, {term})"
+        return source, "bool_t"
+
+    def expr_Conditional(self, node, mask):
+        value = self.fold(node.test)
+        if value is not None:
+            return self.expr(node.body if value else node.orelse, mask)
+        test, _ = self.expr(node.test, mask)
+        body, body_ty = self.expr(node.body, mask)
+        orelse, orelse_ty = self.expr(node.orelse, mask)
+        return (
+            f"np.where(rt.truth({test}), {body}, {orelse})",
+            result_type(body_ty, orelse_ty),
+        )
+
+    def expr_Call(self, node, mask):
+        name = node.name
+        if name is None:
+            raise self.error(node, "call of an expression is not supported")
+        value = self.fold(node)
+        if value is not None:
+            return repr(value), "bool_t"
+        where = f"{self.relpath}:{node.line}"
+        if name in ("ERROR_IF", "REQUIRE"):
+            cond, _ = self.expr(node.args[0], mask)
+            check = "error_if" if name == "ERROR_IF" else "require"
+            return f'rt.{check}({mask}, {cond}, "{where}")', None
+        args = [self.expr(arg, mask) for arg in node.args]
+        template_args = [self.resolve(ty) for ty in node.template_args]
+        if name in ("sign_extend", "static_cast", "truncate"):
+            ty = self.numeric(template_args[0], node)
+            return f'rt.cast({args[0][0]}, "{ty}")', ty
+        if name == "zero_extend":
+            ty = self.numeric(template_args[0], node)
+            return f'rt.zero_extend({args[0][0]}, "{ty}", {args[0][1]!r})', ty
+        if name in LIMIT_FUNCTIONS:
+            ty = self.numeric(template_args[0], node)
+            return type_limit(ty, name), ty
+        m = NUMERIC_LIMITS.fullmatch(name)
+        if m:
+            ty = self.numeric(self.resolve(m.group(1)), node)
+            limit = "minimum_s" if m.group(2) == "min" else "maximum_s"
+            return type_limit(ty, limit), ty
+        if name in NUMPY_PREDICATES:
+            return f"{NUMPY_PREDICATES[name]}({args[0][0]})", "bool_t"
+        if name == "tensor_read":
+            ty = self.numeric(template_args[0], node)
+            source = ", ".join(arg for arg, _ in args)
+            return f'rt.tensor_read({source}, "{ty}")', ty
+        if name == "tensor_write":
+            ty = self.numeric(template_args[0], node)
+            source = ", ".join(arg for arg, _ in args)
+            return f'rt.tensor_write({source}, "{ty}", {mask})', None
+        if name in ("apply_broadcast", "broadcast_shape"):
+            return f"rt.{name}({', '.join(arg for arg, _ in args)})", "shape_t"
+        if name in NUMPY_INTRINSICS:
+            ty = template_args[0] if template_args else args[0][1]
+            if ty is None:
+                raise self.error(node, f"type of {name} argument is not known")
+            ty = self.numeric(ty, node)
+            return f'{NUMPY_INTRINSICS[name]}(rt.cast({args[0][0]}, "{ty}"))', ty
+        return self.call_function(node, template_args, args, mask)
+
+    def call_function(self, node, template_args, args, mask):
+        definitions = [
+            (path, function)
+            for path, function in self.index.definitions.get(node.name, [])
+            if function.body is not None
+            and len([p for p in function.params if p.default is None]) <= len(args)
+            and len(args) <= len(function.params)
+        ]
+        if not definitions:
+            raise self.error(node, f"no NumPy translation for {node.name}")
+        path, function = definitions[0]
+        binding = dict(zip(function.template_params, template_args))
+        for param, (_, ty) in zip(function.params, args):
+            if param.type in function.template_params and param.type not in binding:
+                if ty is None:
+                    raise self.error(node, f"can not deduce {param.type}")
+                binding[param.type] = ty
+        for param in function.template_params:
+            if param not in binding:
+                if param not in self.binding:
+                    raise self.error(node, f"can not deduce {param} of {node.name}")
+                binding[param] = self.binding[param]
+        name = self.specialize(path, function, binding)
+        sources = [source for source, _ in args]
+        defaulted = [p for i, p in enumerate(function.params) if i >= len(args)]
+        for param in defaulted:
+            state = self.save_function()
+            self.enter_function(path, binding, {}, None)
+            sources.append(self.expr(param.default, "True")[0])
+            self.restore_function(state)
+        return f"{name}({', '.join([mask] + sources)})", self.resolve_in(
+            binding, function.return_type
+        )
+
+    def resolve_in(self, binding, ty):
+        ty = TYPE_ALIASES.get(ty, ty) if ty not in binding else ty
+        return binding.get(ty, ty)
+
+    # Library functions
+
+    def specialize(self, path, function, binding):
+        key = (function.name, tuple(sorted(binding.items())))
+        name = "_f_" + "__".join(
+            [function.name] + [binding[p] for p in sorted(binding)]
+        )
+        if key in self.functions:
+            return name
+        self.functions[key] = None
+        state = self.save_function()
+        scope = {p.name: self.resolve_in(binding, p.type) for p in function.params}
+        return_type = self.resolve_in(binding, function.return_type)
+        self.enter_function(path, binding, scope, return_type)
+        params = ", ".join(python_name(p.name) for p in function.params)
+        self.lines.append(f"def {name}(_mask, {params}):")
+        for param in function.params:
+            if scope[param.name] in NUMPY_TYPES:
+                var = python_name(param.name)
+                self.emit(f'{var} = rt.cast({var}, "{scope[param.name]}")')
+        self.emit("_live = _mask")
+        self.emit("_ret = None")
+        self.block(function.body.body, "_mask", top=True)
+        if not self.lines[-1].startswith("    return "):
+            # Every position returned in a conditional branch
+            self.emit("return _ret")
+        self.functions[key] = self.lines
+        self.function_order.append(key)
+        self.restore_function(state)
+        return name
+
+    # Statements. Each returns True when every position has returned.
+
+    def block(self, statements, mask, top=False):
+        returns = self.returns
+        current = mask
+        for statement in statements:
+            if self.returns != returns:
+                # Positions that returned take no further part
+                returns = self.returns
+                current = self.temp()
+                self.emit(f"{current} = rt.mask_and({mask}, _live)")
+            if self.statement(statement, current, top):
+                return True
+        return False
+
+    def statement(self, node, mask, top=False):
+        method = getattr(self, "stmt_" + type(node).__name__, None)
+        if method is None:
+            raise self.error(node, f"{type(node).__name__} is not supported")
+        return method(node, mask, top)
+
+    def stmt_Block(self, node, mask, top):
+        return self.block(node.body, mask, top)
+
+    def stmt_Declaration(self, node, mask, top):
+        if node.size is not None or node.args is not None:
+            raise self.error(
+                node, "array and constructor declarations are not supported"
+            )
+        ty = self.resolve(node.type)
+        var = python_name(node.name)
+        if node.value is None:
+            self.emit(f"{var} = None")
+        else:
+            value, value_ty = self.expr(node.value, mask)
+            if ty in OPAQUE_TYPES or ty == value_ty:
+                self.emit(f"{var} = {value}")
+            else:
+                self.emit(f'{var} = rt.cast({value}, "{self.numeric(ty, node)}")')
+        self.scope[node.name] = ty
+        return False
+
+    def stmt_DeclarationList(self, node, mask, top):
+        for declaration in node.declarations:
+            self.stmt_Declaration(declaration, mask, top)
+        return False
+
+    def stmt_ExprStatement(self, node, mask, top):
+        expr = node.expr
+        if isinstance(expr, pseudocode.Assign):
+            value = expr.value
+            if expr.op != "=":
+                value = pseudocode.Binary(expr.op[:-1], expr.target, value)
+            self.assign(expr.target, value, mask)
+        elif isinstance(expr, (pseudocode.Postfix, pseudocode.Unary)) and expr.op in (
+            "++",
+            "--",
+        ):
+            one = pseudocode.Number("1", line=expr.line)
+            value = pseudocode.Binary(expr.op[0], expr.operand, one, line=expr.line)
+            self.assign(expr.operand, value, mask)
+        else:
+            self.emit(self.expr(expr, mask)[0])
+        return False
+
+    def assign(self, target, value, mask):
+        if not isinstance(target, pseudocode.Name) or target.name not in self.scope:
+            raise self.error(target, "assignment to this target is not supported")
+        ty = self.scope[target.name]
+        var = python_name(target.name)
+        source, value_ty = self.expr(value, mask)
+        if ty not in OPAQUE_TYPES and ty != value_ty:
+            source = f'rt.cast({source}, "{self.numeric(ty, target)}")'
+        if mask == "True":
+            self.emit(f"{var} = {source}")
+        else:
+            self.emit(f"{var} = rt.select({mask}, {source}, {var})")
+
+    def stmt_If(self, node, mask, top):
+        value = self.fold(node.test)
+        if value is not None:
+            branch = node.body if value else node.orelse
+            return branch is not None and self.statement(branch, mask, top)
+        test, _ = self.expr(node.test, mask)
+        cond = self.temp()
+        self.emit(f"{cond} = rt.truth({test})")
+        done = True
+        for branch, function in [
+            (node.body, "mask_and"),
+            (node.orelse, "mask_and_not"),
+        ]:
+            if branch is None:
+                done = False
+                continue
+            branch_mask = self.temp()
+            self.emit(f"{branch_mask} = rt.{function}({mask}, {cond})")
+            self.emit(f"if rt.any_set({branch_mask}):")
+            self.indent += 1
+            count = len(self.lines)
+            done = self.statement(branch, branch_mask) and done
+            if len(self.lines) == count:
+                self.emit("pass")
+            self.indent -= 1
+        return done
+
+    def stmt_While(self, node, mask, top):
+        self.emit("while True:")
+        self.indent += 1
+        test, _ = self.expr(node.test, mask)
+        loop_mask = self.temp()
+        self.emit(f"{loop_mask} = rt.mask_and({mask}, {test})")
+        self.emit(f"if not rt.any_set({loop_mask}):")
+        self.emit("    break")
+        self.statement(node.body, loop_mask)
+        self.indent -= 1
+        return False
+
+    def stmt_Return(self, node, mask, top):
+        if self.kernel:
+            raise self.error(node, "return outside a function")
+        value, value_ty = self.expr(node.value, mask)
+        if self.return_type not in OPAQUE_TYPES and self.return_type != value_ty:
+            value = f'rt.cast({value}, "{self.numeric(self.return_type, node)}")'
+        if top:
+            self.emit(f"return rt.select({mask}, {value}, _ret)")
+        else:
+            self.emit(f"_ret = rt.select({mask}, {value}, _ret)")
+            self.emit(f"_live = rt.mask_and_not(_live, {mask})")
+            self.returns += 1
+        return True
+
+    def stmt_ForEachIn(self, node, mask, top):
+        if not self.kernel or node.loop != "for_each_data_position" or node.options:
+            raise self.error(node, f"{node.loop} loop is not supported")
+        shape, _ = self.expr(node.iterable, mask)
+        self.emit(f"{python_name(node.target)} = rt.Positions({shape})")
+        self.scope[node.target] = "shape_t"
+        return self.statement(node.body, mask)
+
+    # Kernel of an operator file, as Python source
+    def write(self, module):
+        for item in module.functions():
+            raise self.error(item, "operator functions are not supported")
+        self.block(module.statements(), "True")
+        body = self.lines
+        lines = ["def kernel(args):"]
+        for name in self.free_names:
+            lines.append(f'    {python_name(name)} = args["{name}"]')
+        lines.extend(body or ["    pass"])
+        for key in self.function_order:
+            lines = self.functions[key] + [""] + lines
+        return "\n".join(lines) + "\n"
+
+
+class PseudocodeKernelCompiler:
+    def __init__(self, index, spec, cache_dir=None):
+        self.index = index
+        self.enum_values = {value[0] for enum in spec.enums for value in enum.values}
+        self.profile_names = {p.name for p in spec.profiles} | {
+            e.name for e in spec.profile_extensions
+        }
+        self.cache_dir = cache_dir
+        self.kernels = {}
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def kernel_source(self, opname, binding):
+        relpath = f"operators/{opname}.tosac"
+        if relpath not in self.index.modules:
+            raise PseudocodeCompileError(f"No pseudocode for {opname}")
+        writer = KernelWriter(self, relpath, dict(binding))
+        with np.errstate(all="ignore"):
+            return writer.write(self.index.modules[relpath])
+
+    # Cache key of a kernel: the compiler, the type binding and the source
+    # of every pseudocode file the operator can reach
+    def kernel_key(self, opname, binding):
+        relpath = f"operators/{opname}.tosac"
+        if relpath not in self.index.modules:
+            raise PseudocodeCompileError(f"No pseudocode for {opname}")
+        files = {relpath}
+        for name in self.index.reachable(relpath):
+            files.update(path for path, _ in self.index.definitions.get(name, []))
+        digest = hashlib.sha256(str(PSEUDOCODE_NUMPY_VERSION).encode())
+        for path in [__file__, pseudocode.__file__] + sorted(
+            os.path.join(self.index.root, f) for f in files
+        ):
+            with open(path, "rb") as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+        digest.update(repr(sorted(binding.items())).encode())
+        return digest.hexdigest()
+
+    def kernel(self, opname, binding):
+        key = self.kernel_key(opname, binding)
+        if key in self.kernels:
+            return self.kernels[key]
+        source = None
+        path = None
+        if self.cache_dir is not None:
+            path = os.path.join(self.cache_dir, f"{opname}_{key[:16]}.py")
+            if os.path.exists(path):
+                with open(path, "r") as f:
+                    source = f.read()
+        if source is None:
+            source = self.kernel_source(opname, binding)
+            if path is not None:
+                with open(path, "w") as f:
+                    f.write(source)
+        namespace = {"np": np, "rt": sys.modules[__name__]}
+        exec(compile(source, path or f"<{opname} kernel>", "exec"), namespace)
+        self.kernels[key] = namespace["kernel"]
+        return namespace["kernel"]
+
+
+# Run a kernel on input tensors and attributes, returning the output tensors
+# by argument name. Output shapes default to the broadcast input shape.
+def run_kernel(
+    kernel, op, binding, tensors, attributes=None, output_shapes=None, profiles=None
+):
+    attributes = attributes or {}
+    output_shapes = output_shapes or {}
+    args = {"profiles": profiles}
+    input_shapes = []
+    outputs = {}
+    for arg in op.arguments:
+        elty = binding.get(arg.tensor_element_type, arg.tensor_element_type)
+        if arg.type == "tensor_t" and "output" not in [c.name for c in arg.categories]:
+            numpy_type(elty)
+            value = cast(tensors[arg.name], elty)
+            if arg.shape == "[1]":
+                # Single element tensors such as zero points are read as
+                # scalars by the pseudocode
+                value = value.reshape(())
+            else:
+                args[arg.shape] = value.shape
+                input_shapes.append(value.shape)
+            args[arg.name] = value
+        elif arg.type == "tensor_t":
+            outputs[arg.name] = arg
+        elif arg.name in attributes:
+            value = attributes[arg.name]
+            ty = binding.get(arg.type, arg.type)
+            args[arg.name] = cast(value, ty) if ty in NUMPY_TYPES else value
+    for name, arg in outputs.items():
+        elty = binding.get(arg.tensor_element_type, arg.tensor_element_type)
+        shape = output_shapes.get(name, args.get(arg.shape))
+        if shape is None:
+            shape = np.broadcast_shapes(*input_shapes)
+        args[arg.shape] = tuple(shape)
+        args[name] = np.zeros(shape, dtype=numpy_type(elty)[0])
+    with np.errstate(all="ignore"):
+        kernel(args)
+    return {name: args[name] for name in outputs}
+
+
+def find_operator(spec, name):
+    for group in spec.operatorgroups:
+        for op in group.operators:
+            if op.name == name:
+                return op
+    raise PseudocodeCompileError(f"Unknown operator {name}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--xml",
+        required=False,
+        default=os.path.join(os.path.dirname(__file__), "..", "tosa.xml"),
+        help="Path to specification XML",
+    )
+    parser.add_argument(
+        "--pseudocode",
+        required=False,
+        default=os.path.join(os.path.dirname(__file__), "..", "pseudocode"),
+        help="Path to the pseudocode directory",
+    )
+    parser.add_argument(
+        "--cache",
+        required=False,
+        help="Directory used to cache compiled kernels by source hash",
+    )
+    parser.add_argument(
+        "--operator",
+        required=False,
+        action="append",
+        default=[],
+        help="Operator to compile, all operators if not given",
+    )
+    parser.add_argument(
+        "--source",
+        required=False,
+        action="store_true",
+        help="Print the generated kernel source",
+    )
+    args = parser.parse_args()
+
+    try:
+        spec = tosa.TOSASpec(args.xml)
+        index = pseudocode.PseudocodeIndex(args.pseudocode)
+    except (OSError, RuntimeError) as e:
+        print(f"Failure reading XML spec or pseudocode: {str(e)}")
+        exit(1)
+    compiler = PseudocodeKernelCompiler(index, spec, args.cache)
+    opnames = args.operator or [
+        op.name for group in spec.operatorgroups for op in group.operators
+    ]
+    compiled = 0
+    for opname in opnames:
+        op = find_operator(spec, opname)
+        for typesupport in op.typesupports:
+            for binding in typesupport.generated_tuples:
+                try:
+                    if args.source:
+                        print(f"# {opname} {typesupport.mode}")
+                        print(compiler.kernel_source(opname, binding))
+                    compiler.kernel(opname, binding)
+                    compiled += 1
+                except PseudocodeCompileError as e:
+                    if args.operator:
+                        print(f"{opname} {typesupport.mode}: {str(e)}")
+    print(f"Compiled {compiled} kernels")
@@ -0,0 +1,668 @@
+#!/usr/bin/env python3
+# Copyright (c) 2026, ARM Limited.
+# SPDX-License-Identifier: Apache-2.0
+# Streaming NumPy implementation of the REDUCE operators and ARGMAX. The
+# input is viewed as [left, axis, right] and read in blocks, so tensors of
+# any size can be reduced from memory-mapped .npy files. Each output tile
+# carries the loop state of the pseudocode along the axis: sums and
+# products accumulate in the pseudocode order, so REQUIRE failures and
+# floating point rounding are exact. MAX, MIN, ALL, ANY and ARGMAX combine
+# exactly, so their axis can also be split between worker processes.
+# Values of types without a NumPy dtype, such as bf16 or fp8, are given as
+# their decoded values.
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pseudocode
+import tosa
+from block_scale_codec import round_bf16
+from pseudocode_interpreter import interpret_operator
+from pseudocode_interpreter import PseudocodeInterpreter
+from pseudocode_numpy import ErrorIfTriggered
+from pseudocode_numpy import find_operator
+from pseudocode_numpy import NUMPY_TYPES
+from pseudocode_numpy import RequireFailed
+from reference_check import FLOAT_FORMATS
+from tensor_ops_numpy import DEFAULT_MAX_BYTES
+from tensor_ops_numpy import error_if
+from tensor_ops_numpy import outcome
+from tensor_ops_numpy import random_values
+from tensor_ops_numpy import type_range
+
+REDUCE_OPERATORS = (
+    "ARGMAX",
+    "REDUCE_ALL",
+    "REDUCE_ANY",
+    "REDUCE_MAX",
+    "REDUCE_MIN",
+    "REDUCE_PRODUCT",
+    "REDUCE_SUM",
+)
+
+NAN_MODES = ("PROPAGATE", "IGNORE")
+
+# Bytes of temporary storage allowed per element of an input block
+BLOCK_ELEMENT_BYTES = 32
+
+# Axis positions read per block when the output tile allows it
+MIN_AXIS_BLOCK = 256
+
+# Blocks with at least this many elements after the axis are updated one
+# axis position at a time
+WIDE_BLOCK = 256
+
+
+class ReduceError(RuntimeError):
+    pass
+
+
+def is_float(ty):
+    return ty in FLOAT_FORMATS
+
+
+def storage_dtype(ty):
+    if ty in NUMPY_TYPES:
+        return np.dtype(NUMPY_TYPES[ty][0])
+    if is_float(ty):
+        return np.dtype(np.float32)
+    raise ReduceError(f"{ty} is not supported")
+
+
+# static_cast of floating point values to ty
+def round_to(values, ty):
+    if ty == "bf16_t":
+        return round_bf16(values)
+    return values.astype(storage_dtype(ty), copy=False)
+
+
+# minimum_s and maximum_s, the largest finite values for floating point
+def type_limits(ty):
+    if is_float(ty):
+        value = FLOAT_FORMATS[ty].normal_max
+        return -value, value
+    return type_range(ty)
+
+
+def check_axis(shape, axis):
+    error_if(axis < 0 or axis >= len(shape), f"axis {axis} >= rank {len(shape)}")
+
+
+# Sizes of the dimensions before, along and after the axis
+def reduce_layout(shape, axis):
+    check_axis(shape, axis)
+    after = axis + 1
+    left = int(np.prod(shape[:axis], dtype=np.int64))
+    right = int(np.prod(shape[after:], dtype=np.int64))
+    return left, int(shape[axis]), right
+
+
+# REDUCE_ALL and REDUCE_ANY
+class LogicalReduction:
+    splittable = True
+
+    def __init__(self, opname):
+        self.all = opname == "REDUCE_ALL"
+        self.in_t = "bool_t"
+
+    def identity(self, shape):
+        return np.full(shape, self.all)
+
+    def update(self, state, block, start):
+        if self.all:
+            return state & block.all(axis=1)
+        return state | block.any(axis=1)
+
+    def combine(self, first, second):
+        return self.update(first, second[:, None, :], 0)
+
+    def result(self, state):
+        return state
+
+
+# REDUCE_MAX, REDUCE_MIN and ARGMAX. The state is the value and index of
+# the extreme element, as max_value and max_index of ARGMAX. A NaN replaces
+# every number with PROPAGATE and no number with IGNORE. Of equal values,
+# such as signed zeros, apply_max_s keeps the first and apply_min_s the
+# last.
+class ExtremeReduction:
+    splittable = True
+
+    def __init__(self, opname, in_t, nan_mode, out_t=None):
+        self.minimum = opname == "REDUCE_MIN"
+        self.argmax = opname == "ARGMAX"
+        self.in_t = in_t
+        self.out_t = out_t
+        self.propagate = nan_mode == "PROPAGATE"
+        self.float = is_float(in_t)
+        lowest, highest = type_limits(in_t)
+        if self.float and not self.propagate:
+            self.initial = np.nan
+        else:
+            self.initial = highest if self.minimum else lowest
+
+    def identity(self, shape):
+        value = np.full(shape, self.initial, dtype=storage_dtype(self.in_t))
+        return value, np.zeros(shape, dtype=np.int64)
+
+    # Value and block index of the extreme element of each column
+    def summary(self, block):
+        reduce = np.min if self.minimum else np.max
+        if self.float and not self.propagate:
+            reduce = np.fmin.reduce if self.minimum else np.fmax.reduce
+        with np.errstate(invalid="ignore"):
+            extreme = reduce(block, axis=1)
+            equal = block == extreme[:, None, :]
+        if self.minimum:
+            last = block.shape[1] - 1
+            index = last - np.argmax(equal[:, ::-1, :], axis=1)
+        else:
+            index = np.argmax(equal, axis=1)
+        if self.float and self.propagate:
+            nan = np.isnan(block)
+            index = np.where(nan.any(axis=1), np.argmax(nan, axis=1), index)
+        value = np.take_along_axis(block, index[:, None, :], axis=1)[:, 0, :]
+        return value, index
+
+    # Where the candidate replaces the current value
+    def replaces(self, value, current):
+        with np.errstate(invalid="ignore"):
+            better = value <= current if self.minimum else value > current
+        if self.float:
+            if self.propagate:
+                better |= np.isnan(value) & ~np.isnan(current)
+            else:
+                better |= np.isnan(current) & ~np.isnan(value)
+        return better
+
+    def update(self, state, block, start):
+        value, index = self.summary(block)
+        return self.combine(state, (value, index + start))
+
+    def combine(self, first, second):
+        replace = self.replaces(second[0], first[0])
+        return (
+            np.where(replace, second[0], first[0]),
+            np.where(replace, second[1], first[1]),
+        )
+
+    def result(self, state):
+        value, index = state
+        if not self.argmax:
+            return value
+        if index.size and index.max() > type_range(self.out_t)[1]:
+            raise RequireFailed(f"ARGMAX index does not fit in {self.out_t}")
+        return index.astype(storage_dtype(self.out_t))
+
+
+# Results of ufunc applied in order along the axis of a block, starting
+# from state. Both ways are sequential rather than pairwise: wide blocks
+# loop over the axis, as accumulate along a widely strided axis is slow.
+def running(ufunc, state, block):
+    if block.shape[2] < WIDE_BLOCK:
+        terms = np.concatenate([state[:, None, :], block], axis=1)
+        return ufunc.accumulate(terms, axis=1, dtype=state.dtype)[:, 1:, :]
+    out = np.empty(block.shape, dtype=np.result_type(state, block))
+    for i in range(block.shape[1]):
+        state = ufunc(state, block[:, i, :], out=out[:, i, :])
+    return out
+
+
+# REDUCE_SUM accumulates in acc_t in the order of the axis. Integer sums
+# REQUIRE every partial sum to fit in acc_t, which depends on the running
+# total, so sums are only divided between workers by output position.
+class SumReduction:
+    splittable = False
+
+    def __init__(self, in_t, acc_t):
+        self.in_t = in_t
+        self.acc_t = acc_t
+        self.dtype = storage_dtype(acc_t)
+
+    def identity(self, shape):
+        return np.zeros(shape, dtype=self.dtype)
+
+    def update(self, state, block, start):
+        block = block.astype(self.dtype, copy=False)
+        if is_float(self.acc_t):
+            with np.errstate(invalid="ignore", over="ignore"):
+                return running(np.add, state, block)[:, -1, :]
+        # The partial sums wrap, and a wrap is an overflow of acc_t
+        partial = running(np.add, state, block)
+        previous = np.concatenate([state[:, None, :], partial[:, :-1, :]], axis=1)
+        overflow = ((block > 0) & (partial < previous)) | (
+            (block < 0) & (partial > previous)
+        )
+        if overflow.any():
+            raise RequireFailed(f"partial sum overflows {self.acc_t}")
+        return partial[:, -1, :]
+
+    def result(self, state):
+        if is_float(self.acc_t):
+            return round_to(state, self.in_t)
+        return state.astype(storage_dtype(self.in_t))
+
+
+# REDUCE_PRODUCT multiplies in in_out_t in the order of the axis
+class ProductReduction:
+    splittable = False
+
+    def __init__(self, in_t):
+        if not is_float(in_t):
+            raise ReduceError(f"REDUCE_PRODUCT of {in_t} is not supported")
+        self.in_t = in_t
+        self.dtype = storage_dtype(in_t)
+
+    def identity(self, shape):
+        return np.ones(shape, dtype=self.dtype)
+
+    def update(self, state, block, start):
+        block = block.astype(self.dtype, copy=False)
+        if self.in_t != "bf16_t":
+            # The product of two fp16 values is exact in the fp32 that NumPy
+            # computes fp16 in, so each step rounds once
+            with np.errstate(invalid="ignore", over="ignore", under="ignore"):
+                return running(np.multiply, state, block)[:, -1, :]
+        # Products of bf16 values are exact in fp32 and rounded per step
+        with np.errstate(invalid="ignore", over="ignore", under="ignore"):
+            for i in range(block.shape[1]):
+                state = round_bf16(state * block[:, i, :])
+        return state
+
+    def result(self, state):
+        return state
+
+
+def make_reduction(opname, binding, nan_mode="PROPAGATE"):
+    if nan_mode not in NAN_MODES:
+        raise ReduceError(f"Unknown nan_mode {nan_mode}")
+    if opname in ("REDUCE_ALL", "REDUCE_ANY"):
+        return LogicalReduction(opname)
+    if opname in ("REDUCE_MAX", "REDUCE_MIN"):
+        return ExtremeReduction(opname, binding["in_out_t"], nan_mode)
+    if opname == "ARGMAX":
+        return ExtremeReduction(opname, binding["in_t"], nan_mode, binding["out_t"])
+    if opname == "REDUCE_SUM":
+        in_t = binding["in_out_t"]
+        return SumReduction(in_t, binding.get("acc_t", in_t))
+    if opname == "REDUCE_PRODUCT":
+        return ProductReduction(binding["in_out_t"])
+    raise ReduceError(f"{opname} is not a reduction")
+
+
+def reduce_output_shape(opname, shape, axis):
+    check_axis(shape, axis)
+    shape = list(shape)
+    if opname == "ARGMAX":
+        del shape[axis]
+        return shape
+    shape[axis] = 1
+    return shape
+
+
+# Tasks of (left range, right range, axis range). Output tiles hold at most
+# the elements of a block of MIN_AXIS_BLOCK axis positions, and the axis of
+# each tile is split into parts when there are fewer tiles than parts.
+def plan_tasks(layout, parts, max_bytes):
+    left, size, right = layout
+    elements = max(1, max_bytes // BLOCK_ELEMENT_BYTES)
+    tile = max(1, elements // max(1, min(size, MIN_AXIS_BLOCK)))
+    rb = min(right, tile)
+    lb = min(left, max(1, tile // max(1, rb)))
+    tiles = [
+        (l0, min(l0 + lb, left), r0, min(r0 + rb, right))
+        for l0 in range(0, left, max(1, lb))
+        for r0 in range(0, right, max(1, rb))
+    ]
+    parts = max(1, min(parts, size)) if len(tiles) < parts else 1
+    bounds = [size * p // parts for p in range(parts + 1)]
+    return [
+        (tile_range, (bounds[p], bounds[p + 1]))
+        for tile_range in tiles
+        for p in range(parts)
+    ]
+
+
+# Axis positions per block read for an output tile
+def axis_block(tile_size, max_bytes):
+    return max(1, max_bytes // BLOCK_ELEMENT_BYTES // max(1, tile_size))
+
+
+def open_input(source):
+    if isinstance(source, str):
+        return np.load(source, mmap_mode="r")
+    return np.asarray(source)
+
+
+# Input of the worker processes, opened once per worker
+WORKER_INPUT = None
+
+
+def init_worker(source):
+    global WORKER_INPUT
+    WORKER_INPUT = open_input(source)
+
+
+# State of a reduction over one task, streaming the axis range in blocks
+def reduce_task(reduction, layout, task, max_bytes, input=None):
+    input = WORKER_INPUT if input is None else input
+    view = input.reshape(layout)
+    (l0, l1, r0, r1), (n0, n1) = task
+    state = reduction.identity((l1 - l0, r1 - r0))
+    step = axis_block((l1 - l0) * (r1 - r0), max_bytes)
+    for start in range(n0, n1, step):
+        stop = min(start + step, n1)
+        block = np.asarray(view[l0:l1, start:stop, r0:r1])
+        block = block.astype(storage_dtype(reduction.in_t), copy=False)
+        state = reduction.update(state, block, start)
+    return state
+
+
+# Run ARGMAX or a REDUCE operator on an array or a path to a .npy file.
+# jobs > 1 runs the tasks in worker processes, which map a file input
+# themselves. parts, the jobs by default, splits the axis of operators that
+# combine exactly when there are fewer output tiles than parts.
+def reduce_operator(
+    opname,
+    input,
+    binding,
+    axis,
+    nan_mode="PROPAGATE",
+    out=None,
+    max_bytes=DEFAULT_MAX_BYTES,
+    jobs=1,
+    parts=None,
+):
+    reduction = make_reduction(opname, binding, nan_mode)
+    source = input
+    input = open_input(input)
+    layout = reduce_layout(input.shape, axis)
+    shape = reduce_output_shape(opname, input.shape, axis)
+    if out is None:
+        out = np.empty(shape, dtype=result_dtype(reduction))
+    elif list(out.shape) != shape:
+        raise ReduceError(f"output shape {list(out.shape)} is not {shape}")
+    parts = jobs if parts is None else parts
+    if not reduction.splittable:
+        parts = 1
+    tasks = plan_tasks(layout, parts, max_bytes)
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(
+            max_workers=jobs, initializer=init_worker, initargs=(source,)
+        ) as executor:
+            states = executor.map(
+                reduce_task,
+                [reduction] * len(tasks),
+                [layout] * len(tasks),
+                tasks,
+                [max_bytes] * len(tasks),
+            )
+            write_results(reduction, layout, tasks, states, out)
+    else:
+        states = (
+            reduce_task(reduction, layout, task, max_bytes, input) for task in tasks
+        )
+        write_results(reduction, layout, tasks, states, out)
+    return out
+
+
+def result_dtype(reduction):
+    if isinstance(reduction, ExtremeReduction) and reduction.argmax:
+        return storage_dtype(reduction.out_t)
+    return storage_dtype(reduction.in_t)
+
+
+# Combine the partial states of each tile in axis order and write the
+# results. Tasks of a tile are consecutive in the plan.
+def write_results(reduction, layout, tasks, states, out):
+    left, _, right = layout
+    view = out.reshape(left, right)
+    current = None
+    state = None
+    for task, partial in zip(tasks, states):
+        if task[0] != current:
+            if current is not None:
+                write_tile(reduction, view, current, state)
+            current, state = task[0], partial
+        else:
+            state = reduction.combine(state, partial)
+    if current is not None:
+        write_tile(reduction, view, current, state)
+
+
+def write_tile(reduction, view, tile, state):
+    l0, l1, r0, r1 = tile
+    view[l0:l1, r0:r1] = reduction.result(state)
+
+
+# Random values with repeats, signed zeros, infinities and NaN for floats
+def random_reduce_values(rng, ty, shape):
+    dtype = storage_dtype(ty)
+    if ty == "bool_t":
+        return rng.random(shape) < 0.8
+    if NUMPY_TYPES[ty][2] == "f":
+        if rng.random() < 0.5:
+            return random_values(rng, ty, shape)
+        choices = np.array([-2.0, -1.0, -0.0, 0.0, 0.5, 1.0, 2.0, np.inf, -np.inf])
+        values = rng.choice(choices, shape).astype(dtype)
+        values[rng.random(shape) < 0.1] = np.nan
+        return values
+    if rng.random() < 0.5:
+        return random_values(rng, ty, shape)
+    lo, hi = type_range(ty)
+    return rng.choice([lo, -1, 0, 1, 2, hi], shape).astype(dtype)
+
+
+def random_reduce_case(rng, opname, binding):
+    in_t = binding.get("in_out_t", binding.get("in_t"))
+    shape = [int(s) for s in rng.integers(1, 5, int(rng.integers(1, 4)), endpoint=True)]
+    axis = int(rng.integers(0, len(shape)))
+    attributes = {"axis": axis}
+    if opname in ("ARGMAX", "REDUCE_MAX", "REDUCE_MIN"):
+        attributes["nan_mode"] = str(rng.choice(NAN_MODES))
+    input = random_reduce_values(rng, in_t, shape)
+    return input, attributes, reduce_output_shape(opname, shape, axis)
+
+
+# Equal values, including the sign of zero results. NaN payloads may differ.
+def same_values(expected, actual):
+    if list(expected.shape) != list(actual.shape):
+        return False
+    if not np.array_equal(expected, actual, equal_nan=expected.dtype.kind == "f"):
+        return False
+    if expected.dtype.kind != "f":
+        return True
+    zero = expected == 0
+    return np.array_equal(np.signbit(expected[zero]), np.signbit(actual[zero]))
+
+
+# Compare random cases with the interpreted pseudocode. Each case is also
+# run in blocks of one axis position, and with the axis split into parts,
+# to check the streaming and the combination of partial results.
+def cross_check(interpreter, op, binding, rng, cases):
+    mismatches = []
+    for case in range(cases):
+        input, attributes, shape = random_reduce_case(rng, op.name, binding)
+        expected = outcome(
+            lambda: interpret_operator(
+                interpreter,
+                op,
+                binding,
+                {"input": input},
+                attributes,
+                {"output": shape},
+            )["output"]
+        )
+        for max_bytes, parts in (
+            (DEFAULT_MAX_BYTES, 1),
+            (BLOCK_ELEMENT_BYTES, 1),
+            (DEFAULT_MAX_BYTES, 3),
+        ):
+            actual = outcome(
+                lambda: reduce_operator(
+                    op.name,
+                    input,
+                    binding,
+                    max_bytes=max_bytes,
+                    parts=parts,
+                    **attributes,
+                )
+            )
+            if isinstance(expected, type) or isinstance(actual, type):
+                same = expected is actual
+            else:
+                same = same_values(expected, actual)
+            if not same:
+                mismatches.append(
+                    f"case {case} {list(input.shape)} {attributes} "
+                    f"max_bytes {max_bytes} parts {parts}"
+                )
+                break
+    return mismatches
+
+
+def reduce_binding(opname, ty, acc_type=None, index_type="i32_t"):
+    if opname == "ARGMAX":
+        return {"in_t": ty, "out_t": index_type}
+    binding = {"in_out_t": ty}
+    if opname == "REDUCE_SUM":
+        binding["acc_t"] = acc_type or ("fp32_t" if ty == "bf16_t" else ty)
+    return binding
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--xml",
+        required=False,
+        default=os.path.join(os.path.dirname(__file__), "..", "tosa.xml"),
+        help="Path to specification XML",
+    )
+    parser.add_argument(
+        "--pseudocode",
+        required=False,
+        default=os.path.join(os.path.dirname(__file__), "..", "pseudocode"),
+        help="Path to the pseudocode directory",
+    )
+    parser.add_argument(
+        "--cross-check",
+        required=False,
+        action="store_true",
+        help="Compare random small cases with the interpreted pseudocode",
+    )
+    parser.add_argument(
+        "--cases",
+        required=False,
+        type=int,
+        default=20,
+        help="Number of random cases per type support",
+    )
+    parser.add_argument(
+        "--seed",
+        required=False,
+        type=int,
+        default=0,
+        help="Random seed of the generated cases",
+    )
+    parser.add_argument(
+        "--operator",
+        required=False,
+        action="append",
+        default=[],
+        help="Operator to run or check, all reductions for --cross-check",
+    )
+    parser.add_argument(
+        "--input", required=False, help="Path to the input tensor (.npy)"
+    )
+    parser.add_argument(
+        "--output", required=False, help="Path to write the output tensor (.npy)"
+    )
+    parser.add_argument("--type", required=False, help="Input element type")
+    parser.add_argument(
+        "--acc-type", required=False, help="Accumulator type of REDUCE_SUM"
+    )
+    parser.add_argument(
+        "--index-type",
+        required=False,
+        default="i32_t",
+        help="Output type of ARGMAX",
+    )
+    parser.add_argument(
+        "--axis", required=False, type=int, default=0, help="Axis to reduce"
+    )
+    parser.add_argument(
+        "--nan-mode",
+        required=False,
+        default="PROPAGATE",
+        choices=NAN_MODES,
+        help="NaN propagation mode of ARGMAX, REDUCE_MAX and REDUCE_MIN",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        required=False,
+        type=int,
+        default=1,
+        help="Number of worker processes",
+    )
+    args = parser.parse_args()
+
+    if args.cross_check:
+        try:
+            spec = tosa.TOSASpec(args.xml)
+            index = pseudocode.PseudocodeIndex(args.pseudocode)
+            interpreter = PseudocodeInterpreter(index, spec)
+        except (OSError, RuntimeError) as e:
+            print(f"Failure reading XML spec or pseudocode: {str(e)}")
+            exit(1)
+        rng = np.random.default_rng(args.seed)
+        failed = False
+        for opname in args.operator or REDUCE_OPERATORS:
+            op = find_operator(spec, opname)
+            for typesupport in op.typesupports:
+                for binding in typesupport.generated_tuples:
+                    if any(ty not in NUMPY_TYPES for ty in binding.values()):
+                        continue
+                    mismatches = cross_check(interpreter, op, binding, rng, args.cases)
+                    status = "FAIL" if mismatches else "OK"
+                    print(f"{status} {opname} {typesupport.mode} {binding}")
+                    for mismatch in mismatches:
+                        print(f"    {mismatch}")
+                    failed = failed or bool(mismatches)
+        exit(1 if failed else 0)
+
+    if args.input is None or args.type is None or len(args.operator) != 1:
+        print("Nothing to do, use --cross-check or --operator, --type and --input")
+        exit(0)
+    opname = args.operator[0]
+    try:
+        input = np.load(args.input, mmap_mode="r")
+        binding = reduce_binding(opname, args.type, args.acc_type, args.index_type)
+        shape = reduce_output_shape(opname, input.shape, args.axis)
+        dtype = result_dtype(make_reduction(opname, binding, args.nan_mode))
+        out = None
+        if args.output is not None:
+            out = np.lib.format.open_memmap(
+                args.output, mode="w+", dtype=dtype, shape=tuple(shape)
+            )
+        result = reduce_operator(
+            opname,
+            args.input,
+            binding,
+            args.axis,
+            args.nan_mode,
+            out=out,
+            jobs=args.jobs,
+        )
+        if out is not None:
+            out.flush()
+        else:
+            print(result)
+    except (RequireFailed, ErrorIfTriggered) as e:
+        print(f"{opname}: {str(e)}")
+        exit(1)
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"Failure running {opname}: {str(e)}")
+        exit(1)
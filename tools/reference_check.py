@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+# Copyright (c) 2026, ARM Limited.
+# SPDX-License-Identifier: Apache-2.0
+# Vectorized implementation of the floating point compliance checks in
+# pseudocode/library/tosa_reference_check.tosac. Whole output tensors are
+# checked at once, in chunks, so memory-mapped .npy files of any size can
+# be validated against the fp64 reference results. Values of types without
+# a NumPy dtype, such as bf16 or fp8, are given as their decoded values.
+import json
+import math
+
+import numpy as np
+from pseudocode_numpy import RequireFailed
+
+
+# Format parameters from numeric_accuracy_helpers.tosac and
+# generic_helpers.tosac: normal_min, normal_max, normal_lowest,
+# normal_frac, has_Inf and has_NaN
+class FloatFormat:
+    def __init__(self, name, normal_min, normal_max, frac, has_inf, has_nan, lowest):
+        self.name = name
+        self.normal_min = normal_min
+        self.normal_max = normal_max
+        self.normal_lowest = -normal_max if lowest is None else lowest
+        self.frac = frac
+        self.has_inf = has_inf
+        self.has_nan = has_nan
+        # Subnormal results may be flushed to zero for these types
+        self.flush_to_zero = name in ("bf16_t", "fp16_t", "fp32_t")
+
+
+FLOAT_FORMATS = {
+    f.name: f
+    for f in [
+        FloatFormat(
+            "fp32_t", 2.0**-126, 2.0**128 - 2.0**104, 23, True, True, None
+        ),
+        FloatFormat(
+            "bf16_t", 2.0**-126, 2.0**128 - 2.0**120, 7, True, True, None
+        ),
+        FloatFormat("fp16_t", 2.0**-14, 2.0**16 - 2.0**5, 10, True, True, None),
+        FloatFormat("fp8e4m3_t", 2.0**-6, 2.0**9 - 2.0**6, 3, False, True, None),
+        FloatFormat(
+            "fp8e5m2_t", 2.0**-14, 2.0**16 - 2.0**13, 2, True, True, None
+        ),
+        FloatFormat("fp6e2m3_t", 1.0, 7.5, 3, False, False, None),
+        FloatFormat("fp6e3m2_t", 0.25, 28.0, 2, False, False, None),
+        FloatFormat("fp4e2m1_t", 1.0, 6.0, 1, False, False, None),
+        FloatFormat("mxint8_t", 1 / 64.0, 1.0 + 63.0 / 64.0, 0, False, False, -2.0),
+        # normal_frac has no case for the scale type, which has no
+        # fractional bits
+        FloatFormat("fp8ue8m0_t", 2.0**-127, 2.0**127, 0, True, True, None),
+    ]
+}
+
+# Elements per chunk when checking memory-mapped arrays
+DEFAULT_CHUNK = 1 << 20
+
+
+class ReferenceCheckError(RuntimeError):
+    pass
+
+
+def float_format(ty):
+    if ty not in FLOAT_FORMATS:
+        raise ReferenceCheckError(f"No reference check for type {ty}")
+    return FLOAT_FORMATS[ty]
+
+
+def as_fp64(value):
+    value = np.asarray(value)
+    if value.dtype.kind not in "fiub":
+        raise ReferenceCheckError(f"Values of dtype {value.dtype} are not numeric")
+    return value.astype(np.float64, copy=False)
+
+
+# ilog2 for positive finite values: frexp returns a mantissa in [0.5, 1)
+def ilog2(value):
+    return np.frexp(value)[1] - 1
+
+
+# Unit of least precision of the reference values, zero where the
+# reference is zero or not finite
+def reference_ulp(fmt, ref_value):
+    ref_value = np.abs(ref_value)
+    usable = np.isfinite(ref_value) & (ref_value != 0)
+    exponent = ilog2(np.where(usable, ref_value, 1.0))
+    ref_pow2 = np.maximum(np.ldexp(1.0, exponent), fmt.normal_min)
+    return np.where(usable, ref_pow2 * 2.0**-fmt.frac, 0.0)
+
+
+# tosa_reference_check_fp_bnd<in_t>
+def check_fp_bnd(ty, test_value, ref_value, err_bnd):
+    fmt = float_format(ty)
+    test_value = as_fp64(test_value)
+    ref_value, err_bnd = np.broadcast_arrays(as_fp64(ref_value), as_fp64(err_bnd))
+    with np.errstate(invalid="ignore", over="ignore"):
+        ref_nan = np.isnan(ref_value)
+        unbounded = ~ref_nan & ~np.isfinite(err_bnd)
+        checked = ~ref_nan & ~unbounded
+        if np.any(checked & ~(err_bnd >= 0.0)):
+            raise RequireFailed("tosa_reference_check_fp_bnd: err_bnd < 0")
+
+        negative = ref_value < 0.0
+        high_cap = np.where(negative, -fmt.normal_lowest, fmt.normal_max)
+        low_cap = np.where(negative, -fmt.normal_max, fmt.normal_lowest)
+        ref_abs = np.where(negative, -ref_value, ref_value)
+        test_abs = np.where(negative, -test_value, test_value)
+        ref_max = ref_abs + err_bnd
+        ref_min = ref_abs - err_bnd
+        if not fmt.has_inf and not fmt.has_nan:
+            ref_max = np.minimum(ref_max, high_cap)
+            ref_min = np.maximum(np.minimum(ref_min, high_cap), low_cap)
+        else:
+            ref_max = np.where(ref_max > high_cap, math.inf, ref_max)
+            ref_min = np.where(ref_min > high_cap, math.inf, ref_min)
+            ref_min = np.where(ref_min < low_cap, -math.inf, ref_min)
+
+        result = (test_abs >= ref_min) & (test_abs <= ref_max)
+        if not fmt.has_inf:
+            result = np.where(np.isnan(test_value), ref_max == math.inf, result)
+        if fmt.flush_to_zero:
+            result = np.where(test_value == 0, ref_min < fmt.normal_min, result)
+        result = result | unbounded
+        if fmt.has_nan:
+            result = np.where(ref_nan, np.isnan(test_value), result)
+        else:
+            result = result | ref_nan
+    return result
+
+
+# tosa_reference_check_fp<in_t>
+def check_fp(ty, test_value, ref_value, num_ulp):
+    fmt = float_format(ty)
+    ref_value = as_fp64(ref_value)
+    if ty == "mxint8_t":
+        val_ulp = np.full(ref_value.shape, 1 / 64.0)
+    else:
+        val_ulp = reference_ulp(fmt, ref_value)
+    return check_fp_bnd(ty, test_value, ref_value, val_ulp * as_fp64(num_ulp))
+
+
+# Error bound of tosa_reference_check_from_block<in_t, out_t>
+def block_error_bound(fmt, ref_value, scale):
+    with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+        usable = np.isfinite(ref_value) & (ref_value != 0) & ~np.isnan(scale)
+        scaled = np.abs(ref_value / scale)
+        if np.any(usable & ~((scaled > 0) & (scaled < math.inf))):
+            raise RequireFailed("tosa_reference_check_from_block: ilog2 of 0 or Inf")
+        err_bnd = reference_ulp(fmt, np.where(usable, scaled, 0.0)) * scale
+        return np.where(usable, np.maximum(err_bnd, fmt.normal_min), 0.0)
+
+
+# tosa_reference_check_from_block<in_t, out_t>
+def check_from_block(ty, test_value, ref_value, scale):
+    fmt = float_format(ty)
+    ref_value, scale = np.broadcast_arrays(as_fp64(ref_value), as_fp64(scale))
+    err_bnd = block_error_bound(fmt, ref_value, scale)
+    return check_fp_bnd(ty, test_value, ref_value, err_bnd)
+
+
+# tosa_reference_check_scale<scale_t, out_t>
+def check_scale(scale_ty, ty, test_scale, test_value, ref_scale, ref_value):
+    test_scale = as_fp64(test_scale)
+    ref_scale = as_fp64(ref_scale)
+    scale_ok = check_fp(scale_ty, test_scale, ref_scale, 1)
+    with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+        reference_value = (ref_scale * as_fp64(ref_value)) / test_scale
+    num_ulp = 2 if ty == "fp8e4m3_t" else 1
+    # The pseudocode passes the rescaled reference as the test value
+    value_ok = check_fp(ty, reference_value, test_value, num_ulp)
+    return np.isnan(ref_scale) | (scale_ok & value_ok)
+
+
+# Statistics of a check over all chunks
+class ReferenceCheckReport:
+    def __init__(self, shape, max_indices=100):
+        self.shape = tuple(shape)
+        self.max_indices = max_indices
+        self.count = 0
+        self.mismatches = 0
+        self.indices = []
+        self.max_abs_error = 0.0
+        self.max_ulp_error = 0.0
+        self.sum_abs_error = 0.0
+        self.finite = 0
+        self.nan = 0
+
+    def update(self, start, ok, test_value, ref_value, ulp=None):
+        self.count += ok.size
+        failed = np.flatnonzero(~ok)
+        self.mismatches += failed.size
+        room = self.max_indices - len(self.indices)
+        if room > 0 and failed.size:
+            flat = failed[:room] + start
+            self.indices.extend(
+                [int(i) for i in flat]
+                if len(self.shape) <= 1
+                else [
+                    list(map(int, i)) for i in zip(*np.unravel_index(flat, self.shape))
+                ]
+            )
+        test_value = as_fp64(test_value)
+        self.nan += int(np.count_nonzero(np.isnan(test_value)))
+        with np.errstate(invalid="ignore", over="ignore", divide="ignore"):
+            error = np.abs(test_value - ref_value)
+            finite = np.isfinite(error)
+            if np.any(finite):
+                self.finite += int(np.count_nonzero(finite))
+                self.sum_abs_error += float(error[finite].sum())
+                self.max_abs_error = max(self.max_abs_error, float(error[finite].max()))
+                if ulp is not None:
+                    ulp = np.broadcast_to(ulp, error.shape)
+                    use = finite & (ulp > 0)
+                    if np.any(use):
+                        worst = float((error[use] / ulp[use]).max())
+                        self.max_ulp_error = max(self.max_ulp_error, worst)
+
+    def passed(self):
+        return self.mismatches == 0
+
+    def as_dict(self):
+        return {
+            "shape": list(self.shape),
+            "count": self.count,
+            "mismatches": self.mismatches,
+            "mismatch_indices": self.indices,
+            "max_abs_error": self.max_abs_error,
+            "max_ulp_error": self.max_ulp_error,
+            "mean_abs_error": self.sum_abs_error / self.finite if self.finite else 0.0,
+            "nan": self.nan,
+        }
+
+
+def flat(value, size):
+    value = np.asarray(value)
+    if value.size == 1:
+        return value.reshape(())
+    if value.size != size:
+        raise ReferenceCheckError(f"Array of {value.size} elements, expected {size}")
+    return value.reshape(-1)
+
+
+def chunk_of(value, start, stop):
+    return value if value.ndim == 0 else value[start:stop]
+
+
+# Checks test values against reference values chunk by chunk. mode is "ulp"
+# (tosa_reference_check_fp, bound is the number of ULP), "bound"
+# (tosa_reference_check_fp_bnd, bound is the error bound) or "block"
+# (tosa_reference_check_from_block, bound is the block scale).
+def reference_check(
+    ty, test_value, ref_value, bound, mode="ulp", chunk=DEFAULT_CHUNK, max_indices=100
+):
+    float_format(ty)
+    shape = np.shape(ref_value)
+    size = int(np.prod(shape))
+    if np.shape(test_value) != shape:
+        raise ReferenceCheckError(
+            f"Test shape {np.shape(test_value)} does not match reference {shape}"
+        )
+    test_value = flat(test_value, size)
+    ref_value = flat(ref_value, size)
+    bound = flat(bound, size)
+    report = ReferenceCheckReport(shape, max_indices)
+    for start in range(0, size, chunk):
+        stop = min(start + chunk, size)
+        test = chunk_of(test_value, start, stop)
+        ref = as_fp64(chunk_of(ref_value, start, stop))
+        value = as_fp64(chunk_of(bound, start, stop))
+        ulp = None
+        if mode == "ulp":
+            ok = check_fp(ty, test, ref, value)
+            ulp = reference_ulp(float_format(ty), ref)
+        elif mode == "bound":
+            ok = check_fp_bnd(ty, test, ref, value)
+        elif mode == "block":
+            ok = check_from_block(ty, test, ref, value)
+        else:
+            raise ReferenceCheckError(f"Unknown check mode {mode}")
+        report.update(start, np.broadcast_to(ok, (stop - start,)), test, ref, ulp)
+    return report
+
+
+def load_array(path_or_value):
+    try:
+        return float(path_or_value)
+    except ValueError:
+        return np.load(path_or_value, mmap_mode="r")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--type",
+        required=True,
+        choices=sorted(FLOAT_FORMATS),
+        help="Element type the results are checked for",
+    )
+    parser.add_argument(
+        "--test", required=True, help="Path to the implementation results (.npy)"
+    )
+    parser.add_argument(
+        "--ref", required=True, help="Path to the fp64 reference results (.npy)"
+    )
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument(
+        "--ulp",
+        help="Number of ULP allowed, a number or a path to a .npy array",
+    )
+    group.add_argument(
+        "--bound",
+        help="Absolute error bound, a number or a path to a .npy array",
+    )
+    group.add_argument(
+        "--block-scale",
+        help="Block scale of a conversion from a block scaled type, "
+        "a number or a path to a .npy array",
+    )
+    parser.add_argument(
+        "--chunk",
+        required=False,
+        type=int,
+        default=DEFAULT_CHUNK,
+        help="Number of elements checked at a time",
+    )
+    parser.add_argument(
+        "--max-indices",
+        required=False,
+        type=int,
+        default=100,
+        help="Maximum number of mismatch indices reported",
+    )
+    parser.add_argument(
+        "--json",
+        required=False,
+        action="store_true",
+        help="Print the report as JSON",
+    )
+    args = parser.parse_args()
+
+    if args.ulp is not None:
+        mode, bound = "ulp", args.ulp
+    elif args.bound is not None:
+        mode, bound = "bound", args.bound
+    else:
+        mode, bound = "block", args.block_scale
+    try:
+        report = reference_check(
+            args.type,
+            np.load(args.test, mmap_mode="r"),
+            np.load(args.ref, mmap_mode="r"),
+            load_array(bound),
+            mode,
+            args.chunk,
+            args.max_indices,
+        )
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"Failure running reference check: {str(e)}")
+        exit(1)
+    result = report.as_dict()
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        status = "PASS" if report.passed() else "FAIL"
+        print(
+            f"{status}: {result['mismatches']} of {result['count']} mismatches, "
+            f"max error {result['max_abs_error']:g} "
+            f"({result['max_ulp_error']:g} ULP), "
+            f"mean error {result['mean_abs_error']:g}, {result['nan']} NaN"
+        )
+        for index in result["mismatch_indices"]:
+            print(f"    {index}")
+    exit(0 if report.passed() else 1)
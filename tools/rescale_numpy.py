@@ -0,0 +1,560 @@
+#!/usr/bin/env python3
+# Copyright (c) 2026, ARM Limited.
+# SPDX-License-Identifier: Apache-2.0
+# Vectorized NumPy implementation of RESCALE. The ERROR_IF conditions of
+# the operator depend only on the types and attributes, so they are
+# checked once per call. The scaling is done on whole tensors in int64,
+# which holds the 48-bit values and the products of apply_scale_32 and
+# apply_scale_16 exactly. Hardware results can be checked against the
+# exact result, or against the error bound of INEXACT_ROUND.
+import json
+import os
+
+import numpy as np
+import pseudocode
+import tosa
+from pseudocode_interpreter import interpret_operator
+from pseudocode_interpreter import PseudocodeInterpreter
+from pseudocode_numpy import ErrorIfTriggered
+from pseudocode_numpy import find_operator
+from pseudocode_numpy import NUMPY_TYPES
+from pseudocode_numpy import RequireFailed
+from tensor_ops_numpy import DEFAULT_MAX_BYTES
+from tensor_ops_numpy import error_if
+from tensor_ops_numpy import outcome
+from tensor_ops_numpy import random_values
+from tensor_ops_numpy import scalar
+from tensor_ops_numpy import tile_rows
+from tensor_ops_numpy import type_range
+
+ROUNDING_MODES = ("SINGLE_ROUND", "INEXACT_ROUND", "DOUBLE_ROUND")
+
+# normal_frac<fp32_t>() used by the INEXACT_ROUND error bound
+FP32_FRAC = 23
+
+
+class RescaleError(RuntimeError):
+    pass
+
+
+def width(ty):
+    return NUMPY_TYPES[ty][1]
+
+
+def wrap(value, bits):
+    half = 1 << (bits - 1)
+    return ((value + half) & ((1 << bits) - 1)) - half
+
+
+def zero_extend(value, ty):
+    return value & ((1 << width(ty)) - 1)
+
+
+# The ERROR_IF conditions of RESCALE, which are the same for every element
+def check_rescale(
+    in_t,
+    out_t,
+    input_zp,
+    output_zp,
+    scale32,
+    rounding_mode,
+    per_channel,
+    input_unsigned,
+    output_unsigned,
+    rank,
+):
+    if rounding_mode not in ROUNDING_MODES:
+        raise RescaleError(f"Unknown rounding mode {rounding_mode}")
+    # uint16 zero points are compared as unsigned values
+    in_zp = zero_extend(input_zp, in_t) if input_unsigned else input_zp
+    out_zp = zero_extend(output_zp, out_t) if output_unsigned else output_zp
+    error_if(
+        in_t != "i8_t" and (in_t != "i16_t" or not input_unsigned) and in_zp != 0,
+        f"input_zp {in_zp} != 0 for {in_t}",
+    )
+    error_if(
+        out_t != "i8_t" and (out_t != "i16_t" or not output_unsigned) and out_zp != 0,
+        f"output_zp {out_zp} != 0 for {out_t}",
+    )
+    error_if(
+        in_t == "i16_t" and input_unsigned and in_zp not in (0, 32768),
+        f"unsigned i16_t input_zp {in_zp} is not 0 or 32768",
+    )
+    error_if(
+        out_t == "i16_t" and output_unsigned and out_zp not in (0, 32768),
+        f"unsigned i16_t output_zp {out_zp} is not 0 or 32768",
+    )
+    error_if(scale32 and in_t == "i48_t", "scale32 with i48_t input")
+    error_if(
+        not scale32 and rounding_mode == "DOUBLE_ROUND",
+        "DOUBLE_ROUND without scale32",
+    )
+    error_if(input_unsigned and output_unsigned, "input and output unsigned")
+    error_if(out_t == "i32_t" and input_unsigned, "i32_t output of unsigned input")
+    error_if(in_t == "i32_t" and output_unsigned, "unsigned output of i32_t input")
+    error_if(in_t == "i48_t" and output_unsigned, "unsigned output of i48_t input")
+    error_if(in_t == "i48_t" and input_unsigned, "unsigned i48_t input")
+    error_if(in_t == "i32_t" and input_unsigned, "unsigned i32_t input")
+    error_if(out_t == "i32_t" and output_unsigned, "unsigned i32_t output")
+    error_if(per_channel and rank < 1, "per_channel with rank 0 input")
+
+
+def scale_arrays(multiplier, shift, channels):
+    multiplier = np.asarray(multiplier).reshape(-1).astype(np.int64)
+    shift = np.asarray(shift).reshape(-1).astype(np.int64)
+    if len(multiplier) < channels or len(shift) < channels:
+        raise RescaleError(
+            f"{channels} multiplier and shift values needed, "
+            f"got {len(multiplier)} and {len(shift)}"
+        )
+    return multiplier[:channels], shift[:channels]
+
+
+# apply_scale_32 and apply_scale_16 on int64 values, with their REQUIRE
+# conditions. The products are below 2^62, so int64 is exact.
+def apply_scale(value, multiplier, shift, scale32, double_round):
+    if np.any(multiplier < 0):
+        raise RequireFailed("apply_scale multiplier must not be negative")
+    if np.any((shift < 2) | (shift > 62)):
+        raise RequireFailed("apply_scale shift must be in the range 2 to 62")
+    round = np.int64(1) << (shift - 1)
+    if scale32:
+        # The value is passed as int32_t
+        value = wrap(value, 32)
+        if np.any((value < -round) | (value >= round)):
+            raise RequireFailed("apply_scale_32 value is out of range for shift")
+        if double_round:
+            adjust = np.where(shift > 31, np.int64(1) << 30, 0)
+            round = round + np.where(value >= 0, adjust, -adjust)
+    else:
+        # The multiplier is passed as int16_t
+        multiplier = wrap(multiplier, 16)
+    result = (value * multiplier + round) >> shift
+    if not scale32:
+        lo, hi = type_range("i32_t")
+        if np.any((result < lo) | (result > hi)):
+            raise RequireFailed("apply_scale_16 result overflows int32_t")
+    return wrap(result, 32)
+
+
+def rescale_rows(rows, multiplier, shift, in_zp, out_zp, binding, attributes):
+    in_t, out_t = binding["in_t"], binding["out_t"]
+    value = rows.astype(np.int64)
+    if attributes["input_unsigned"]:
+        value = zero_extend(value, in_t)
+    value = wrap(value - in_zp, 48)
+    result = apply_scale(
+        value,
+        multiplier,
+        shift,
+        attributes["scale32"],
+        attributes["rounding_mode"] == "DOUBLE_ROUND",
+    )
+    lo, hi = type_range("i32_t")
+    result = result + out_zp
+    if np.any((result < lo) | (result > hi)):
+        raise RequireFailed("apply_add_s output_zp addition overflows int32_t")
+    if attributes["output_unsigned"]:
+        # apply_clip_u compares the int32_t result as an unsigned value, so
+        # negative results saturate to maximum_u
+        result = np.where(result < 0, result + (1 << 32), result)
+        result = np.clip(result, 0, (1 << width(out_t)) - 1)
+    else:
+        result = np.clip(result, *type_range(out_t))
+    return wrap(result, width(out_t)).astype(NUMPY_TYPES[out_t][0])
+
+
+def rescale_attributes(attributes):
+    return {
+        "scale32": bool(attributes.get("scale32", True)),
+        "rounding_mode": attributes.get("rounding_mode", "SINGLE_ROUND"),
+        "per_channel": bool(attributes.get("per_channel", False)),
+        "input_unsigned": bool(attributes.get("input_unsigned", False)),
+        "output_unsigned": bool(attributes.get("output_unsigned", False)),
+    }
+
+
+# Zero points as int64 values in the interpretation of the attributes
+def zero_points(input_zp, output_zp, binding, attributes, rank):
+    in_zp = int(scalar(input_zp))
+    out_zp = int(scalar(output_zp))
+    check_rescale(
+        binding["in_t"], binding["out_t"], in_zp, out_zp, rank=rank, **attributes
+    )
+    if attributes["input_unsigned"]:
+        in_zp = zero_extend(in_zp, binding["in_t"])
+    if attributes["output_unsigned"]:
+        out_zp = zero_extend(out_zp, binding["out_t"])
+    return in_zp, out_zp
+
+
+# Splits a tensor into rows of the innermost dimension, so the channel of
+# per-channel scaling is the column
+def channel_rows(input, per_channel):
+    if per_channel:
+        return input.reshape(-1, input.shape[-1]), input.shape[-1]
+    return input.reshape(-1, 1), 1
+
+
+def rescale(
+    input,
+    multiplier,
+    shift,
+    input_zp,
+    output_zp,
+    binding,
+    max_bytes=DEFAULT_MAX_BYTES,
+    **attributes,
+):
+    input = np.asarray(input)
+    attributes = rescale_attributes(attributes)
+    out_dtype = NUMPY_TYPES[binding["out_t"]][0]
+    if input.size == 0:
+        # The ERROR_IF conditions are inside the loop over the elements
+        return np.zeros(input.shape, dtype=out_dtype)
+    in_zp, out_zp = zero_points(input_zp, output_zp, binding, attributes, input.ndim)
+    rows, channels = channel_rows(input, attributes["per_channel"])
+    multiplier, shift = scale_arrays(multiplier, shift, channels)
+    output = np.empty(rows.shape, dtype=out_dtype)
+    step = tile_rows(channels * 8 * 4, max_bytes)
+    for start in range(0, rows.shape[0], step):
+        stop = min(rows.shape[0], start + step)
+        output[start:stop] = rescale_rows(
+            rows[start:stop], multiplier, shift, in_zp, out_zp, binding, attributes
+        )
+    return output.reshape(input.shape)
+
+
+# Range of results allowed for INEXACT_ROUND by the precision requirements
+# of RESCALE. The bounds are in the interpretation of the output, so for an
+# unsigned output they are unsigned values.
+def inexact_bounds(rows, multiplier, shift, in_zp, out_zp, binding, attributes):
+    in_t, out_t = binding["in_t"], binding["out_t"]
+    value = rows.astype(np.int64)
+    if attributes["input_unsigned"]:
+        value = zero_extend(value, in_t)
+    out_ref = (value - in_zp).astype(np.float64) * multiplier * np.exp2(-shift)
+    err_bnd = 0.5 + (3 * np.abs(out_ref) + np.abs(out_ref + out_zp)) * np.exp2(
+        -FP32_FRAC - 1
+    )
+    if attributes["output_unsigned"]:
+        lo, hi = 0, (1 << width(out_t)) - 1
+    else:
+        lo, hi = type_range(out_t)
+    out_min = np.clip(np.ceil(out_ref - err_bnd + out_zp), lo, hi)
+    out_max = np.clip(np.floor(out_ref + err_bnd + out_zp), lo, hi)
+    return out_min.astype(np.int64), out_max.astype(np.int64)
+
+
+class RescaleReport:
+    def __init__(self, max_indices):
+        self.count = 0
+        self.mismatches = 0
+        self.max_error = 0
+        self.indices = []
+        self.max_indices = max_indices
+
+    def update(self, start, mismatch, error, shape):
+        self.count += mismatch.size
+        self.mismatches += int(mismatch.sum())
+        if error.size:
+            self.max_error = max(self.max_error, int(error.max()))
+        room = self.max_indices - len(self.indices)
+        if room > 0 and mismatch.any():
+            flat = start * mismatch.shape[-1] + np.flatnonzero(mismatch)[:room]
+            self.indices.extend(
+                [int(i) for i in index] for index in zip(*np.unravel_index(flat, shape))
+            )
+
+    def passed(self):
+        return self.mismatches == 0
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "mismatches": self.mismatches,
+            "max_error": self.max_error,
+            "mismatch_indices": self.indices,
+        }
+
+
+# Checks an implementation output of RESCALE. SINGLE_ROUND and
+# DOUBLE_ROUND results must be exact; INEXACT_ROUND results must be within
+# the error bound of the precision requirements.
+def rescale_check(
+    input,
+    multiplier,
+    shift,
+    input_zp,
+    output_zp,
+    output,
+    binding,
+    max_bytes=DEFAULT_MAX_BYTES,
+    max_indices=100,
+    **attributes,
+):
+    input = np.asarray(input)
+    output = np.asarray(output)
+    if output.shape != input.shape:
+        raise RescaleError(f"Output shape {output.shape} is not {input.shape}")
+    attributes = rescale_attributes(attributes)
+    report = RescaleReport(max_indices)
+    if input.size == 0:
+        return report
+    in_zp, out_zp = zero_points(input_zp, output_zp, binding, attributes, input.ndim)
+    rows, channels = channel_rows(input, attributes["per_channel"])
+    out_rows = output.reshape(rows.shape)
+    multiplier, shift = scale_arrays(multiplier, shift, channels)
+    out_t = binding["out_t"]
+    step = tile_rows(channels * 8 * 8, max_bytes)
+    for start in range(0, rows.shape[0], step):
+        stop = min(rows.shape[0], start + step)
+        actual = out_rows[start:stop].astype(np.int64)
+        if attributes["output_unsigned"]:
+            actual = zero_extend(actual, out_t)
+        if attributes["rounding_mode"] == "INEXACT_ROUND":
+            lo, hi = inexact_bounds(
+                rows[start:stop], multiplier, shift, in_zp, out_zp, binding, attributes
+            )
+            error = np.maximum(lo - actual, actual - hi)
+            mismatch = error > 0
+        else:
+            expected = rescale_rows(
+                rows[start:stop], multiplier, shift, in_zp, out_zp, binding, attributes
+            ).astype(np.int64)
+            if attributes["output_unsigned"]:
+                expected = zero_extend(expected, out_t)
+            error = np.abs(expected - actual)
+            mismatch = error != 0
+        report.update(start, mismatch, error, input.shape)
+    return report
+
+
+# Cross check against the literal interpretation of the pseudocode
+
+
+def random_rescale_case(rng, binding):
+    in_t, out_t = binding["in_t"], binding["out_t"]
+    scale32 = in_t != "i48_t" and bool(rng.integers(0, 2))
+    attributes = {
+        "scale32": scale32,
+        "rounding_mode": str(
+            rng.choice(ROUNDING_MODES if scale32 else ROUNDING_MODES[:2])
+        ),
+        "per_channel": bool(rng.integers(0, 2)),
+        "input_unsigned": False,
+        "output_unsigned": False,
+    }
+    unsigned = rng.integers(0, 3)
+    if unsigned == 1 and in_t in ("i8_t", "i16_t") and out_t != "i32_t":
+        attributes["input_unsigned"] = True
+    elif unsigned == 2 and out_t in ("i8_t", "i16_t") and in_t in ("i8_t", "i16_t"):
+        attributes["output_unsigned"] = True
+    shape = [int(s) for s in rng.integers(1, 4, int(rng.integers(1, 4)), endpoint=True)]
+    channels = shape[-1] if attributes["per_channel"] else 1
+    mul_bits = 30 if scale32 else 14
+    shift_base = 30 if scale32 else 14
+    multiplier = rng.integers(1 << mul_bits, 1 << (mul_bits + 1), channels)
+    # Scalings from about 2^+2 down to 2^-12
+    shift = rng.integers(shift_base - 2, shift_base + 12, channels, endpoint=True)
+    tensors = {
+        "input": random_values(rng, in_t, shape),
+        "multiplier": multiplier.astype(np.int32 if scale32 else np.int16),
+        "shift": shift.astype(np.int8),
+        "input_zp": random_rescale_zero_point(rng, in_t, attributes["input_unsigned"]),
+        "output_zp": random_rescale_zero_point(
+            rng, out_t, attributes["output_unsigned"]
+        ),
+    }
+    if in_t == "i48_t":
+        tensors["input"] = tensors["input"] >> 16
+    return tensors, attributes, {"output": shape}
+
+
+def random_rescale_zero_point(rng, ty, unsigned):
+    dtype = NUMPY_TYPES[ty][0]
+    if ty == "i8_t":
+        return random_values(rng, ty, [1])
+    if ty == "i16_t" and unsigned:
+        return np.array([rng.choice([0, -32768])], dtype=dtype)
+    return np.zeros([1], dtype=dtype)
+
+
+def cross_check(interpreter, op, binding, rng, cases):
+    mismatches = []
+    for case in range(cases):
+        tensors, attributes, output_shapes = random_rescale_case(rng, binding)
+        expected = outcome(
+            lambda: interpret_operator(
+                interpreter, op, binding, tensors, attributes, output_shapes
+            )["output"]
+        )
+        actual = outcome(lambda: rescale(binding=binding, **tensors, **attributes))
+        if isinstance(expected, type) or isinstance(actual, type):
+            same = expected is actual
+        else:
+            same = np.array_equal(expected, actual)
+        if not same:
+            mismatches.append(f"case {case} {attributes}")
+    return mismatches
+
+
+def load_rescale_arguments(args):
+    binding = {"in_t": args.in_type, "out_t": args.out_type}
+    tensors = {
+        "input": np.load(args.input, mmap_mode="r"),
+        "multiplier": np.array([int(v) for v in args.multiplier.split(",")]),
+        "shift": np.array([int(v) for v in args.shift.split(",")]),
+        "input_zp": np.array([args.input_zp]),
+        "output_zp": np.array([args.output_zp]),
+    }
+    attributes = {
+        "scale32": not args.scale16,
+        "rounding_mode": args.rounding_mode,
+        "per_channel": args.per_channel,
+        "input_unsigned": args.input_unsigned,
+        "output_unsigned": args.output_unsigned,
+    }
+    return binding, tensors, attributes
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--xml",
+        required=False,
+        default=os.path.join(os.path.dirname(__file__), "..", "tosa.xml"),
+        help="Path to specification XML",
+    )
+    parser.add_argument(
+        "--pseudocode",
+        required=False,
+        default=os.path.join(os.path.dirname(__file__), "..", "pseudocode"),
+        help="Path to the pseudocode directory",
+    )
+    parser.add_argument(
+        "--cross-check",
+        required=False,
+        action="store_true",
+        help="Compare random small cases with the interpreted pseudocode",
+    )
+    parser.add_argument(
+        "--cases",
+        required=False,
+        type=int,
+        default=20,
+        help="Number of random cases per type support",
+    )
+    parser.add_argument(
+        "--seed",
+        required=False,
+        type=int,
+        default=0,
+        help="Random seed of the generated cases",
+    )
+    parser.add_argument("--input", required=False, help="Input tensor (.npy)")
+    parser.add_argument(
+        "--check", required=False, help="Implementation output to check (.npy)"
+    )
+    parser.add_argument(
+        "--output", required=False, help="Path to write the RESCALE result (.npy)"
+    )
+    parser.add_argument(
+        "--in-type", required=False, default="i8_t", help="Input element type"
+    )
+    parser.add_argument(
+        "--out-type", required=False, default="i8_t", help="Output element type"
+    )
+    parser.add_argument(
+        "--multiplier", required=False, default="1073741824", help="Multipliers"
+    )
+    parser.add_argument("--shift", required=False, default="30", help="Shifts")
+    parser.add_argument("--input-zp", required=False, type=int, default=0)
+    parser.add_argument("--output-zp", required=False, type=int, default=0)
+    parser.add_argument(
+        "--scale16",
+        required=False,
+        action="store_true",
+        help="Use 16-bit multipliers (scale32 false)",
+    )
+    parser.add_argument(
+        "--rounding-mode",
+        required=False,
+        choices=ROUNDING_MODES,
+        default="SINGLE_ROUND",
+    )
+    parser.add_argument("--per-channel", required=False, action="store_true")
+    parser.add_argument("--input-unsigned", required=False, action="store_true")
+    parser.add_argument("--output-unsigned", required=False, action="store_true")
+    parser.add_argument(
+        "--max-indices",
+        required=False,
+        type=int,
+        default=100,
+        help="Maximum number of mismatch indices reported",
+    )
+    parser.add_argument(
+        "--json",
+        required=False,
+        action="store_true",
+        help="Print the check report as JSON",
+    )
+    args = parser.parse_args()
+
+    if args.cross_check:
+        try:
+            spec = tosa.TOSASpec(args.xml)
+            index = pseudocode.PseudocodeIndex(args.pseudocode)
+            interpreter = PseudocodeInterpreter(index, spec)
+        except (OSError, RuntimeError) as e:
+            print(f"Failure reading XML spec or pseudocode: {str(e)}")
+            exit(1)
+        rng = np.random.default_rng(args.seed)
+        op = find_operator(spec, "RESCALE")
+        failed = False
+        for typesupport in op.typesupports:
+            for binding in typesupport.generated_tuples:
+                mismatches = cross_check(interpreter, op, binding, rng, args.cases)
+                status = "FAIL" if mismatches else "OK"
+                print(f"{status} RESCALE {typesupport.mode} {binding}")
+                for mismatch in mismatches:
+                    print(f"    {mismatch}")
+                failed = failed or bool(mismatches)
+        exit(1 if failed else 0)
+
+    if args.input is None:
+        print("Nothing to do, use --cross-check or --input")
+        exit(0)
+    try:
+        binding, tensors, attributes = load_rescale_arguments(args)
+        if args.check is not None:
+            report = rescale_check(
+                output=np.load(args.check, mmap_mode="r"),
+                binding=binding,
+                max_indices=args.max_indices,
+                **tensors,
+                **attributes,
+            )
+        else:
+            result = rescale(binding=binding, **tensors, **attributes)
+    except (OSError, ValueError, RuntimeError, ErrorIfTriggered) as e:
+        print(f"Failure running RESCALE: {str(e)}")
+        exit(1)
+    if args.check is None:
+        if args.output is not None:
+            np.save(args.output, result)
+        exit(0)
+    result = report.as_dict()
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        status = "PASS" if report.passed() else "FAIL"
+        print(
+            f"{status}: {result['mismatches']} of {result['count']} mismatches, "
+            f"max error {result['max_error']}"
+        )
+        for index in result["mismatch_indices"]:
+            print(f"    {index}")
+    exit(0 if report.passed() else 1)
@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+# Copyright (c) 2026, ARM Limited.
+# SPDX-License-Identifier: Apache-2.0
+# Benchmarks of the specification tools on synthetic specifications scaled
+# up from tosa.xml. Each scale times spec loading, asciidoc generation,
+# compliance export and compliance verification and measures their peak
+# memory. Results are stored as JSON and compared with a baseline, and the
+# growth of each phase from one scale to the next is checked so that a tool
+# whose cost grows faster than the spec is reported.
+import copy
+import json
+import math
+import os
+import platform
+import re
+import tempfile
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+import compliance_data_exporter
+import compliance_data_verifier
+import tosa
+from genspec import TOSASpecAsciidocGenerator
+
+RESULTS_VERSION = 1
+
+# How each scale grows the specification. Every operator appears copies
+# times, each type_set gains up to widen more types, explicit typesupport
+# types become single value type_binds, and extensions and enums get copies.
+SCALES = {
+    "1x": {"copies": 1, "widen": 0, "bind": False, "extensions": 0, "enums": 0},
+    "10x": {"copies": 10, "widen": 1, "bind": True, "extensions": 10, "enums": 10},
+    "100x": {
+        "copies": 100,
+        "widen": 2,
+        "bind": True,
+        "extensions": 100,
+        "enums": 100,
+    },
+}
+
+# Scales run unless others are asked for. 100x takes minutes and is run on
+# request.
+DEFAULT_SCALES = ("1x", "10x")
+
+# Types added to type_sets, all of them known to the compliance export
+WIDEN_TYPES = list(compliance_data_exporter.validation_term_mapping_type)
+
+
+# Suffix of the name of an operator copy
+COPY_SUFFIX = re.compile(r"_X[0-9]+$")
+
+
+class BenchmarkError(RuntimeError):
+    pass
+
+
+def widen_type_set(type_set, widen):
+    values = type_set.get("values").split()
+    present = set(tosa.expand_type_set_values(values))
+    extra = [ty for ty in WIDEN_TYPES if ty not in present][:widen]
+    type_set.set("values", " ".join(values + extra))
+
+
+# Turn the explicit types of a typesupport into bindings to type sets of
+# one value, which adds type_bind columns without changing the tuples. The
+# sets are named after their value as an operator must give a set name the
+# same values in all of its typesupports.
+def bind_explicit_types(tysup, types):
+    position = len(tysup.findall("op_profile")) + len(tysup.findall("type_set"))
+    added = set()
+    for ty_name in types:
+        value = tysup.get(ty_name)
+        if value not in compliance_data_exporter.validation_term_mapping_type:
+            continue
+        set_name = f"B_{value}"
+        del tysup.attrib[ty_name]
+        if set_name not in added:
+            element = ET.Element("type_set", name=set_name, values=value)
+            tysup.insert(position, element)
+            position += 1
+            added.add(set_name)
+        tysup.append(ET.Element("type_bind", type=ty_name, set=set_name))
+
+
+def scale_operator(op, scale):
+    types = [ty.get("name") for ty in op.findall("types/type")]
+    for tysup in op.findall("typesupport"):
+        for type_set in tysup.findall("type_set"):
+            widen_type_set(type_set, scale["widen"])
+        if scale["bind"]:
+            bind_explicit_types(tysup, types)
+
+
+# A synthetic specification scaled up from xmlroot. Copies of operators are
+# named NAME_Xi so that genspec writes a file for each of them.
+def scale_spec(xmlroot, scale):
+    root = copy.deepcopy(xmlroot)
+    operators = root.find("operators")
+    groups = list(operators)
+    for group in groups:
+        for op in group.findall("operator"):
+            scale_operator(op, scale)
+    for i in range(1, scale["copies"]):
+        for group in groups:
+            group_copy = copy.deepcopy(group)
+            group_copy.set("name", f"{group.get('name')}_x{i}")
+            for op in group_copy.findall("operator"):
+                name = op.find("name")
+                name.text = f"{name.text}_X{i}"
+            operators.append(group_copy)
+
+    extensions = root.find("profile_extensions")
+    originals = list(extensions)
+    for i in range(scale["extensions"]):
+        ext = copy.deepcopy(originals[i % len(originals)])
+        ext.set("name", f"{ext.get('name')}-X{i}")
+        extensions.append(ext)
+
+    enums = root.findall("enum")
+    for i in range(scale["enums"]):
+        enum = copy.deepcopy(enums[i % len(enums)])
+        enum.set("name", f"{enum.get('name')}_x{i}")
+        root.append(enum)
+    return root
+
+
+def write_scaled_spec(xmlroot, scale, path):
+    ET.ElementTree(scale_spec(xmlroot, scale)).write(
+        path, encoding="utf-8", xml_declaration=True
+    )
+
+
+def spec_metrics(spec, xmlpath):
+    ops = [op for group in spec.operatorgroups for op in group.operators]
+    return {
+        "xml_bytes": os.path.getsize(xmlpath),
+        "operators": len(ops),
+        "typesupports": sum(len(op.typesupports) for op in ops),
+        "tuples": sum(len(ts.generated_tuples) for op in ops for ts in op.typesupports),
+        "extensions": len(spec.profile_extensions),
+        "enums": len(spec.enums),
+    }
+
+
+# The benchmarked phases, each given the spec file, the spec loaded from it
+# and an output directory
+def phase_load(xmlpath, spec, outdir):
+    tosa.TOSASpec(xmlpath)
+
+
+def phase_genspec(xmlpath, spec, outdir):
+    TOSASpecAsciidocGenerator(spec).generate(outdir)
+
+
+def phase_compliance(xmlpath, spec, outdir):
+    compliance_data_exporter.print_profiles_extensions(spec, outdir)
+
+
+# As verify_spec_compliance, with each copy checked under the name of the
+# operator it copies as the verifier only accepts the operators of TOSA
+def phase_verify(xmlpath, spec, outdir):
+    exporter = compliance_data_exporter
+    for _, print_mode in exporter.COMPLIANCE_MAPS:
+        for group in spec.operatorgroups:
+            for op in group.operators:
+                args = exporter.get_required_arguments_info(op)
+                depot = exporter.get_profile_compliance_info(op, args, print_mode)
+                if len(depot) > 0:
+                    compliance_data_verifier.verify_operation_compliance(
+                        COPY_SUFFIX.sub("", op.name), args, depot
+                    )
+
+
+PHASES = {
+    "load": phase_load,
+    "genspec": phase_genspec,
+    "compliance": phase_compliance,
+    "verify": phase_verify,
+}
+
+
+# Fastest of repeat timed runs, then one run under tracemalloc for the peak
+# memory, kept apart as tracing allocations slows the run down
+def measure_phase(phase, xmlpath, spec, outdir, repeat):
+    seconds = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        phase(xmlpath, spec, outdir)
+        elapsed = time.perf_counter() - start
+        seconds = elapsed if seconds is None else min(seconds, elapsed)
+    tracemalloc.start()
+    try:
+        phase(xmlpath, spec, outdir)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": seconds, "peak_bytes": peak}
+
+
+def run_benchmarks(
+    xmlpath, scales=DEFAULT_SCALES, repeat=1, phases=PHASES, workdir=None
+):
+    xmlroot = ET.parse(xmlpath).getroot()
+    results = {}
+    with tempfile.TemporaryDirectory(dir=workdir) as tmpdir:
+        for name in scales:
+            if name not in SCALES:
+                raise BenchmarkError(f"Unknown benchmark scale {name}")
+            scaled_path = os.path.join(tmpdir, f"tosa_{name}.xml")
+            write_scaled_spec(xmlroot, SCALES[name], scaled_path)
+            outdir = os.path.join(tmpdir, f"out_{name}")
+            os.makedirs(outdir)
+            spec = tosa.TOSASpec(scaled_path)
+            results[name] = {
+                "spec": spec_metrics(spec, scaled_path),
+                "phases": {
+                    phase_name: measure_phase(phase, scaled_path, spec, outdir, repeat)
+                    for phase_name, phase in phases.items()
+                },
+            }
+    return {
+        "version": RESULTS_VERSION,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+# Phases slower or larger than the baseline by more than the thresholds.
+# Differences under the floors are noise on small phases and not reported.
+def compare_results(
+    results,
+    baseline,
+    time_threshold=1.25,
+    memory_threshold=1.25,
+    time_floor=0.05,
+    memory_floor=1 << 20,
+):
+    if baseline.get("version") != RESULTS_VERSION:
+        raise BenchmarkError(
+            f"Baseline results version {baseline.get('version')} "
+            f"is not {RESULTS_VERSION}"
+        )
+    regressions = []
+    for scale, result in results["results"].items():
+        base_phases = baseline["results"].get(scale, {}).get("phases", {})
+        for phase, measured in result["phases"].items():
+            base = base_phases.get(phase)
+            if base is None:
+                continue
+            checks = [
+                ("seconds", time_threshold, time_floor),
+                ("peak_bytes", memory_threshold, memory_floor),
+            ]
+            for key, threshold, floor in checks:
+                if measured[key] - base[key] < floor:
+                    continue
+                if measured[key] > base[key] * threshold:
+                    regressions.append(
+                        f"{scale} {phase} {key} {measured[key]:.6g} "
+                        f"exceeds baseline {base[key]:.6g} by more than "
+                        f"{threshold:g}x"
+                    )
+    return regressions
+
+
+# Phases whose time grows faster than the number of type tuples between
+# consecutive scales, as the exponent k in time ~ tuples^k. Every phase
+# grows as tuples^1.0 to 1.2 from 1x to 10x, the default max_exponent
+# leaves room for the noise of timing the short 1x runs.
+def superlinear_phases(results, max_exponent=1.3, time_floor=0.01):
+    warnings = []
+    scales = list(results["results"].items())
+    for (small_name, small), (large_name, large) in zip(scales, scales[1:]):
+        size_ratio = large["spec"]["tuples"] / small["spec"]["tuples"]
+        if size_ratio <= 1:
+            continue
+        for phase, measured in large["phases"].items():
+            base = small["phases"].get(phase)
+            if base is None or base["seconds"] < time_floor:
+                continue
+            exponent = math.log(measured["seconds"] / base["seconds"]) / math.log(
+                size_ratio
+            )
+            if exponent > max_exponent:
+                warnings.append(
+                    f"{phase} grows as tuples^{exponent:.2f} "
+                    f"from {small_name} to {large_name}"
+                )
+    return warnings
+
+
+def print_results(results):
+    print(f"{'Scale':<6} {'Phase':<12} {'Seconds':>9} {'Peak MiB':>9}")
+    for scale, result in results["results"].items():
+        for phase, measured in result["phases"].items():
+            print(
+                f"{scale:<6} {phase:<12} {measured['seconds']:9.3f} "
+                f"{measured['peak_bytes'] / (1 << 20):9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--xml",
+        required=False,
+        default=os.path.join(os.path.dirname(__file__), "..", "tosa.xml"),
+        help="Path to the specification XML the synthetic specs are scaled from",
+    )
+    parser.add_argument(
+        "--scales",
+        required=False,
+        default=",".join(DEFAULT_SCALES),
+        help=f"Comma separated scales to run, from {', '.join(SCALES)}",
+    )
+    parser.add_argument(
+        "--repeat",
+        required=False,
+        type=int,
+        default=1,
+        help="Timed runs of each phase, the fastest is kept",
+    )
+    parser.add_argument(
+        "--output", required=False, help="Write the results as JSON to this path"
+    )
+    parser.add_argument(
+        "--baseline", required=False, help="Results JSON to compare against"
+    )
+    parser.add_argument(
+        "--time-threshold",
+        required=False,
+        type=float,
+        default=1.25,
+        help="Ratio to the baseline time reported as a regression",
+    )
+    parser.add_argument(
+        "--memory-threshold",
+        required=False,
+        type=float,
+        default=1.25,
+        help="Ratio to the baseline peak memory reported as a regression",
+    )
+    parser.add_argument(
+        "--max-exponent",
+        required=False,
+        type=float,
+        default=1.3,
+        help="Growth exponent of a phase against the tuple count to warn about",
+    )
+    parser.add_argument(
+        "--write-specs",
+        required=False,
+        help="Only write the scaled specifications to this directory",
+    )
+    args = parser.parse_args()
+    scales = [name for name in args.scales.split(",") if name]
+
+    try:
+        if args.write_specs:
+            os.makedirs(args.write_specs, exist_ok=True)
+            xmlroot = ET.parse(args.xml).getroot()
+            for name in scales:
+                if name not in SCALES:
+                    raise BenchmarkError(f"Unknown benchmark scale {name}")
+                path = os.path.join(args.write_specs, f"tosa_{name}.xml")
+                write_scaled_spec(xmlroot, SCALES[name], path)
+            exit(0)
+        results = run_benchmarks(args.xml, scales, args.repeat)
+        baseline = None
+        if args.baseline:
+            with open(args.baseline, "r") as f:
+                baseline = json.load(f)
+    except (OSError, ValueError, RuntimeError, ET.ParseError) as e:
+        print(f"Failure running the benchmarks: {str(e)}")
+        exit(1)
+
+    print_results(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+
+    problems = superlinear_phases(results, args.max_exponent)
+    if baseline is not None:
+        try:
+            problems += compare_results(
+                results, baseline, args.time_threshold, args.memory_threshold
+            )
+        except (KeyError, RuntimeError) as e:
+            print(f"Failure comparing with the baseline: {str(e)}")
+            exit(1)
+    for problem in problems:
+        print(problem)
+    exit(1 if problems else 0)
@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+# Copyright (c) 2026, ARM Limited.
+# SPDX-License-Identifier: Apache-2.0
+# Resident spec query service. The daemon loads spec files once, indexes
+# them and answers queries over a Unix domain socket, reloading a file when
+# it changes. Requests and responses are JSON objects, one per line. The
+# client sends its queries to the daemon when one is running and otherwise
+# loads the spec in process, with the same results either way.
+import asyncio
+import collections
+import json
+import os
+import signal
+import socket
+import sys
+import tempfile
+
+import tosa
+from tosa import deduce_extensions
+from tosa import tuple_requirements
+
+DEFAULT_XML = os.path.join(os.path.dirname(__file__), "..", "tosa.xml")
+
+# Seconds between checks of the spec files for changes
+WATCH_INTERVAL = 1.0
+
+# Spec files kept loaded, the least recently queried are dropped first
+MAX_SPECS = 4
+
+# Longest request line the daemon reads
+MAX_REQUEST_BYTES = 1 << 20
+
+
+class SpecQueryError(RuntimeError):
+    pass
+
+
+def default_socket_path():
+    return os.environ.get(
+        "TOSA_SPEC_SOCKET",
+        os.path.join(tempfile.gettempdir(), f"tosa-spec-{os.getuid()}.sock"),
+    )
+
+
+# The queries on one spec file, over indexes built when it is loaded
+class TOSASpecIndex:
+    def __init__(self, xmlpath):
+        self.xmlpath = xmlpath
+        self.mtime = os.stat(xmlpath).st_mtime_ns
+        self.spec = tosa.TOSASpec(xmlpath, keep_xml=False)
+        self.operators = {}
+        self.groups = {}
+        # (operator, type name, type) -> indices into the operator's tuples
+        self.tuples_by_type = {}
+        # operator -> [(typesupport, type tuple)]
+        self.tuples = {}
+        for group in self.spec.operatorgroups:
+            for op in group.operators:
+                self.operators[op.name] = op
+                self.groups[op.name] = group.name
+                tuples = []
+                for ts in op.typesupports:
+                    for tytuple in ts.generated_tuples:
+                        for ty_name, ty in tytuple.items():
+                            key = (op.name, ty_name, ty)
+                            self.tuples_by_type.setdefault(key, []).append(len(tuples))
+                        tuples.append((ts, tytuple))
+                self.tuples[op.name] = tuples
+        self.levels = {level.name: level for level in self.spec.levels}
+
+    def operator(self, name):
+        op = self.operators.get(name)
+        if op is None:
+            raise SpecQueryError(f"Unknown operator {name}")
+        return op
+
+    def matching_tuples(self, opname, types):
+        tuples = self.tuples[self.operator(opname).name]
+        if not types:
+            return tuples
+        indices = None
+        for ty_name, ty in types.items():
+            found = set(self.tuples_by_type.get((opname, ty_name, ty), []))
+            indices = found if indices is None else indices & found
+        return [tuples[i] for i in sorted(indices)]
+
+    def query_operator(self, request):
+        op = self.operator(request["operator"])
+        return {
+            "name": op.name,
+            "group": self.groups[op.name],
+            "types": op.types,
+            "arguments": [
+                {
+                    "name": arg.name,
+                    "categories": [cat.name for cat in arg.categories],
+                    "type": arg.type,
+                    "element_type": arg.tensor_element_type,
+                    "shape": arg.shape,
+                    "rank": arg.rank,
+                    "optional": arg.optional,
+                }
+                for arg in op.arguments
+            ],
+            "typesupports": [
+                {
+                    "mode": ts.mode,
+                    "version_added": ts.version_added,
+                    "profiles": ts.profiles,
+                    "tuples": len(ts.generated_tuples),
+                }
+                for ts in op.typesupports
+            ],
+        }
+
+    # Typesupports whose tuples give the types of the request, which can
+    # name only some of the operator's types
+    def query_type_legal(self, request):
+        return [
+            {
+                "mode": ts.mode,
+                "version_added": ts.version_added,
+                "profiles": ts.profiles,
+                "types": dict(tytuple),
+            }
+            for ts, tytuple in self.matching_tuples(
+                request["operator"], request.get("types", {})
+            )
+        ]
+
+    # Extensions the types need, or with an operator, the sets of profiles
+    # and extensions any matching typesupport requires
+    def query_extensions(self, request):
+        types = request.get("types", {})
+        if "operator" not in request:
+            return sorted(deduce_extensions(types))
+        requirements = []
+        for ts, tytuple in self.matching_tuples(request["operator"], types):
+            alternatives = {}
+            for alternative, requirement in tuple_requirements(ts, tytuple):
+                alternatives.setdefault(alternative, []).append(requirement)
+            for names in alternatives.values():
+                if names not in requirements:
+                    requirements.append(names)
+        return sorted(requirements)
+
+    def query_level_limits(self, request):
+        level = self.levels.get(request["level"])
+        if level is None:
+            raise SpecQueryError(f"Unknown level {request['level']}")
+        return dict(level.maximums)
+
+    def query_operators(self, request):
+        return list(self.operators)
+
+    def query(self, request):
+        method = getattr(self, f"query_{request.get('query')}", None)
+        if method is None:
+            raise SpecQueryError(f"Unknown query {request.get('query')}")
+        types = request.get("types", {})
+        if not isinstance(types, dict) or not all(
+            isinstance(ty_name, str) and isinstance(ty, str)
+            for ty_name, ty in types.items()
+        ):
+            raise SpecQueryError("types must map type names to type strings")
+        try:
+            return method(request)
+        except KeyError as e:
+            raise SpecQueryError(f"Query {request['query']} needs {str(e)}")
+        except (TypeError, AttributeError) as e:
+            raise SpecQueryError(f"Invalid {request['query']} query: {str(e)}")
+
+
+# Spec indexes by absolute path, loaded on first use
+class SpecIndexes:
+    def __init__(self, max_specs=MAX_SPECS):
+        # Loaded indexes by absolute path, least recently used first
+        self.indexes = collections.OrderedDict()
+        self.max_specs = max_specs
+        # Loads in progress on the event loop's executor, by absolute path
+        self.loading = {}
+
+    def add(self, xmlpath, index):
+        self.indexes[xmlpath] = index
+        self.indexes.move_to_end(xmlpath)
+        while len(self.indexes) > self.max_specs:
+            self.indexes.popitem(last=False)
+        return index
+
+    def get(self, xmlpath):
+        xmlpath = os.path.abspath(xmlpath)
+        if xmlpath not in self.indexes:
+            return self.add(xmlpath, TOSASpecIndex(xmlpath))
+        self.indexes.move_to_end(xmlpath)
+        return self.indexes[xmlpath]
+
+    # As get, loading a spec file off the event loop so the daemon keeps
+    # answering queries on the files it has while it parses a new one
+    async def get_async(self, xmlpath):
+        xmlpath = os.path.abspath(xmlpath)
+        if xmlpath not in self.indexes:
+            if xmlpath not in self.loading:
+                loop = asyncio.get_running_loop()
+                self.loading[xmlpath] = loop.run_in_executor(
+                    None, TOSASpecIndex, xmlpath
+                )
+            loading = self.loading[xmlpath]
+            try:
+                index = await loading
+            finally:
+                self.loading.pop(xmlpath, None)
+            if xmlpath not in self.indexes:
+                return self.add(xmlpath, index)
+        self.indexes.move_to_end(xmlpath)
+        return self.indexes[xmlpath]
+
+    @staticmethod
+    def request_xml(request):
+        xmlpath = request.get("xml", DEFAULT_XML)
+        if not isinstance(xmlpath, str):
+            raise SpecQueryError("xml must be the path of a spec file")
+        return xmlpath
+
+    def answer(self, request):
+        try:
+            index = self.get(self.request_xml(request))
+            return {"result": index.query(request)}
+        except (OSError, RuntimeError) as e:
+            return {"error": str(e)}
+
+    async def answer_async(self, request):
+        try:
+            index = await self.get_async(self.request_xml(request))
+            return {"result": index.query(request)}
+        except (OSError, RuntimeError) as e:
+            return {"error": str(e)}
+
+
+class SpecDaemon:
+    def __init__(self, socket_path, xmlpaths, watch_interval=WATCH_INTERVAL):
+        self.socket_path = socket_path
+        # Room for every file loaded at startup
+        self.indexes = SpecIndexes(max(MAX_SPECS, len(xmlpaths)))
+        self.watch_interval = watch_interval
+        for xmlpath in xmlpaths:
+            self.indexes.get(xmlpath)
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                request = None
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("request is not an object")
+                    response = await self.indexes.answer_async(request)
+                except ValueError as e:
+                    response = {"error": f"Invalid request: {str(e)}"}
+                if isinstance(request, dict) and "id" in request:
+                    response["id"] = request["id"]
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    # Reload spec files that changed, off the event loop so queries keep
+    # being answered from the previous index meanwhile
+    async def watch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.watch_interval)
+            for xmlpath, index in list(self.indexes.indexes.items()):
+                try:
+                    if os.stat(xmlpath).st_mtime_ns == index.mtime:
+                        continue
+                    index = await loop.run_in_executor(None, TOSASpecIndex, xmlpath)
+                    # Replace the index in place unless it was dropped meanwhile
+                    if xmlpath in self.indexes.indexes:
+                        self.indexes.indexes[xmlpath] = index
+                        print(f"Reloaded {xmlpath}", file=sys.stderr)
+                except (OSError, RuntimeError) as e:
+                    # Queries load the file again if it comes back
+                    self.indexes.indexes.pop(xmlpath, None)
+                    print(f"Failure reloading {xmlpath}: {str(e)}", file=sys.stderr)
+
+    async def serve(self):
+        if os.path.exists(self.socket_path):
+            if SpecClient.daemon_running(self.socket_path):
+                raise SpecQueryError(f"A daemon already serves {self.socket_path}")
+            # Left by a daemon that did not exit cleanly
+            os.unlink(self.socket_path)
+        server = await asyncio.start_unix_server(
+            self.handle, self.socket_path, limit=MAX_REQUEST_BYTES
+        )
+        watcher = asyncio.ensure_future(self.watch())
+        stopping = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stopping.set)
+        try:
+            async with server:
+                await stopping.wait()
+        finally:
+            watcher.cancel()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+
+# Queries the daemon at socket_path, or a spec loaded in this process when
+# no daemon is running
+class SpecClient:
+    def __init__(self, socket_path=None, xmlpath=DEFAULT_XML, timeout=30.0):
+        self.socket_path = socket_path or default_socket_path()
+        self.xmlpath = os.path.abspath(xmlpath)
+        self.timeout = timeout
+        self.connection = None
+        self.local = None
+        self.connect()
+
+    @staticmethod
+    def daemon_running(socket_path):
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+                s.connect(socket_path)
+            return True
+        except OSError:
+            return False
+
+    def connect(self):
+        try:
+            connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            connection.settimeout(self.timeout)
+            connection.connect(self.socket_path)
+        except OSError:
+            connection.close()
+            return
+        self.connection = connection
+        self.responses = connection.makefile("rb")
+
+    def close(self):
+        if self.connection is not None:
+            self.responses.close()
+            self.connection.close()
+            self.connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def uses_daemon(self):
+        return self.connection is not None
+
+    def request(self, request):
+        request = dict(request, xml=self.xmlpath)
+        if self.connection is not None:
+            try:
+                self.connection.sendall(json.dumps(request).encode() + b"\n")
+                line = self.responses.readline()
+                if not line:
+                    raise ConnectionError("daemon closed the connection")
+                response = json.loads(line)
+            except OSError:
+                # The daemon went away, answer from here from now on
+                self.close()
+                return self.request(request)
+        else:
+            if self.local is None:
+                self.local = SpecIndexes()
+            # Round trip through JSON for the same types as from the daemon
+            response = json.loads(json.dumps(self.local.answer(request)))
+        if "error" in response:
+            raise SpecQueryError(response["error"])
+        return response["result"]
+
+    def operators(self):
+        return self.request({"query": "operators"})
+
+    def operator(self, name):
+        return self.request({"query": "operator", "operator": name})
+
+    def type_legal(self, operator, types):
+        return self.request(
+            {"query": "type_legal", "operator": operator, "types": types}
+        )
+
+    def extensions(self, types, operator=None):
+        request = {"query": "extensions", "types": types}
+        if operator is not None:
+            request["operator"] = operator
+        return self.request(request)
+
+    def level_limits(self, level):
+        return self.request({"query": "level_limits", "level": level})
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--xml",
+        required=False,
+        action="append",
+        help="Path to specification XML, repeated to serve several",
+    )
+    parser.add_argument(
+        "--socket",
+        required=False,
+        default=default_socket_path(),
+        help="Path of the Unix domain socket",
+    )
+    parser.add_argument(
+        "--query",
+        required=False,
+        help="Send a JSON query, such as "
+        '\'{"query": "operator", "operator": "CONV2D"}\', instead of serving',
+    )
+    args = parser.parse_args()
+    xmlpaths = args.xml or [DEFAULT_XML]
+
+    if args.query is not None:
+        try:
+            with SpecClient(args.socket, xmlpaths[0]) as client:
+                result = client.request(json.loads(args.query))
+        except (OSError, ValueError, RuntimeError) as e:
+            print(f"Failure querying the spec: {str(e)}")
+            exit(1)
+        print(json.dumps(result, indent=2))
+        exit(0)
+
+    try:
+        daemon = SpecDaemon(args.socket, xmlpaths)
+        asyncio.run(daemon.serve())
+    except (OSError, RuntimeError) as e:
+        print(f"Failure serving the spec: {str(e)}")
+        exit(1)
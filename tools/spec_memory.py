@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# Copyright (c) 2026, ARM Limited.
+# SPDX-License-Identifier: Apache-2.0
+# Memory footprint of a loaded specification. tracemalloc measures what
+# loading allocates and keeps, in total and by the source line that
+# allocated it. A walk of the loaded model then attributes its size to
+# model classes and to operators. An object reachable from several places
+# is counted once, for the first owner the walk reaches.
+import gc
+import sys
+import tracemalloc
+
+import tosa
+
+
+# Size of obj and everything it holds not already in seen, by the class of
+# each object. Classes and modules are not part of the model and stop the
+# walk.
+def deep_sizes(obj, seen, sizes=None):
+    sizes = {} if sizes is None else sizes
+    pending = [obj]
+    while pending:
+        item = pending.pop()
+        if id(item) in seen or isinstance(item, type) or type(item) is type(sys):
+            continue
+        seen.add(id(item))
+        name = type(item).__name__
+        sizes[name] = sizes.get(name, 0) + sys.getsizeof(item)
+        if isinstance(item, dict):
+            pending.extend(item.keys())
+            pending.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            pending.extend(item)
+        elif isinstance(item, (str, bytes, int, float, bool)) or item is None:
+            continue
+        else:
+            if hasattr(item, "__dict__"):
+                pending.append(item.__dict__)
+            for cls in type(item).__mro__:
+                for slot in getattr(cls, "__slots__", ()):
+                    if hasattr(item, slot):
+                        pending.append(getattr(item, slot))
+            if isinstance(item, tosa.ET.Element):
+                pending.extend(item.attrib.items())
+                pending.extend((item.tag, item.text, item.tail))
+                pending.extend(item)
+    return sizes
+
+
+class TOSASpecMemoryReport:
+    def __init__(self, xmlpath, top=10):
+        gc.collect()
+        tracemalloc.start()
+        try:
+            before = tracemalloc.take_snapshot()
+            self.spec = tosa.TOSASpec(xmlpath)
+            gc.collect()
+            after = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+        stats = after.compare_to(before, "lineno")
+        self.traced_bytes = sum(stat.size_diff for stat in stats)
+        self.top_lines = [
+            (str(stat.traceback[0]), stat.size_diff, stat.count_diff)
+            for stat in stats[:top]
+        ]
+
+        # The operators are walked before the XML tree and the rest of the
+        # spec, so that they own what they share with either
+        seen = {id(self.spec)}
+        self.by_operator = {}
+        self.by_class = {}
+        for group in self.spec.operatorgroups:
+            seen.add(id(group))
+            for op in group.operators:
+                sizes = deep_sizes(op, seen)
+                self.by_operator[op.name] = self.by_operator.get(op.name, 0) + sum(
+                    sizes.values()
+                )
+                self.add_class_sizes(sizes)
+        self.xml_bytes = sum(deep_sizes(self.spec.xmlroot, seen).values())
+        self.other_bytes = sum(
+            self.add_class_sizes(deep_sizes(self.spec, seen)).values()
+        )
+
+    def add_class_sizes(self, sizes):
+        for name, size in sizes.items():
+            self.by_class[name] = self.by_class.get(name, 0) + size
+        return sizes
+
+    def print(self, file=sys.stdout, top=10):
+        kib = 1024
+        model = sum(self.by_operator.values()) + self.other_bytes
+        print(f"Allocated by loading: {self.traced_bytes / kib:.1f} KiB", file=file)
+        print(f"  model:    {model / kib:.1f} KiB", file=file)
+        print(f"  XML tree: {self.xml_bytes / kib:.1f} KiB", file=file)
+        print("\nBy allocating line:", file=file)
+        for line, size, count in self.top_lines:
+            print(f"  {size / kib:10.1f} KiB {count:8} blocks  {line}", file=file)
+        print("\nModel by class:", file=file)
+        classes = sorted(self.by_class.items(), key=lambda item: -item[1])
+        for name, size in classes[:top]:
+            print(f"  {size / kib:10.1f} KiB  {name}", file=file)
+        print("\nModel by operator:", file=file)
+        operators = sorted(self.by_operator.items(), key=lambda item: -item[1])
+        for name, size in operators[:top]:
+            print(f"  {size / kib:10.1f} KiB  {name}", file=file)
+
+
+if __name__ == "__main__":
+    import argparse
+    import os
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--xml",
+        required=False,
+        default=os.path.join(os.path.dirname(__file__), "..", "tosa.xml"),
+        help="Path to specification XML",
+    )
+    parser.add_argument(
+        "--top",
+        required=False,
+        type=int,
+        default=10,
+        help="Number of lines, classes and operators to list",
+    )
+    args = parser.parse_args()
+
+    try:
+        report = TOSASpecMemoryReport(args.xml, args.top)
+    except (OSError, RuntimeError, tosa.ET.ParseError) as e:
+        print(f"Failure reading/validating XML spec: {str(e)}")
+        exit(1)
+    report.print(top=args.top)
@@ -0,0 +1,521 @@
+#!/usr/bin/env python3
+# Copyright (c) 2026, ARM Limited.
+# SPDX-License-Identifier: Apache-2.0
+# Validation of the specification XML against tosa.xsd without leaving the
+# process. The schema is read from the XSD itself and checked against the
+# element tree that TOSASpec loads from, so the XML is parsed only once.
+# Only the parts of XML Schema that tosa.xsd uses are supported: simple
+# types restricted by enumeration or pattern, unions and lists, and complex
+# types with attributes, simple content, or sequences and choices of
+# elements. Errors name the path of the offending element, with operators
+# and other named elements identified by their name.
+#
+# Verdicts are cached by the content hashes of the XML and the XSD, so an
+# unchanged pair is not validated again.
+import hashlib
+import json
+import os
+import re
+import xml.etree.ElementTree as ET
+
+XS = "{http://www.w3.org/2001/XMLSchema}"
+
+SCHEMA_CACHE_FORMAT = 1
+
+UNBOUNDED = None
+
+
+class SchemaError(RuntimeError):
+    pass
+
+
+class SchemaValidationError(RuntimeError):
+    def __init__(self, xmlpath, errors):
+        self.errors = errors
+        super().__init__(
+            f"{xmlpath} does not match the schema:\n  " + "\n  ".join(errors)
+        )
+
+
+# Simple types. check() returns whether a value is valid.
+class SimpleType:
+    def __init__(self, name):
+        self.name = name
+
+    def check(self, value):
+        return True
+
+
+class BuiltinType(SimpleType):
+    def __init__(self, name, pattern=None, bounds=None):
+        super().__init__(name)
+        self.pattern = None if pattern is None else re.compile(pattern)
+        self.bounds = bounds
+
+    def check(self, value):
+        if self.pattern is None:
+            return True
+        value = value.strip()
+        if not self.pattern.fullmatch(value):
+            return False
+        return self.bounds is None or self.bounds[0] <= int(value) <= self.bounds[1]
+
+
+BUILTIN_TYPES = {
+    f"xs:{ty.name}": ty
+    for ty in [
+        BuiltinType("string"),
+        BuiltinType("integer", r"[+-]?[0-9]+"),
+        BuiltinType("int", r"[+-]?[0-9]+", (-(1 << 31), (1 << 31) - 1)),
+        BuiltinType("boolean", r"true|false|1|0"),
+    ]
+}
+
+
+class RestrictionType(SimpleType):
+    def __init__(self, name, base, enumerations, patterns):
+        super().__init__(name)
+        self.base = base
+        self.enumerations = set(enumerations) if enumerations else None
+        self.patterns = [re.compile(pattern) for pattern in patterns]
+
+    def check(self, value):
+        if not self.base.check(value):
+            return False
+        if self.enumerations is not None and value not in self.enumerations:
+            return False
+        return all(pattern.fullmatch(value) for pattern in self.patterns)
+
+
+class UnionType(SimpleType):
+    def __init__(self, name, members):
+        super().__init__(name)
+        self.members = members
+
+    def check(self, value):
+        return any(member.check(value) for member in self.members)
+
+
+class ListType(SimpleType):
+    def __init__(self, name, item):
+        super().__init__(name)
+        self.item = item
+
+    def check(self, value):
+        return all(self.item.check(item) for item in value.split())
+
+
+# Complex types. Content is None for an empty element, a SimpleType for
+# simple content, or a particle for element content.
+class ComplexType:
+    def __init__(self, attributes, content):
+        self.attributes = attributes
+        self.content = content
+
+
+class ElementDecl:
+    # ty is a SimpleType, a ComplexType, or None for any content
+    def __init__(self, name, ty):
+        self.name = name
+        self.ty = ty
+
+
+class ElementParticle:
+    def __init__(self, decl, min_occurs, max_occurs):
+        self.decl = decl
+        self.min_occurs = min_occurs
+        self.max_occurs = max_occurs
+
+
+class GroupParticle:
+    def __init__(self, kind, particles, min_occurs, max_occurs):
+        self.kind = kind
+        self.particles = particles
+        self.min_occurs = min_occurs
+        self.max_occurs = max_occurs
+
+
+def occurs(node):
+    min_occurs = int(node.get("minOccurs", "1"))
+    max_occurs = node.get("maxOccurs", "1")
+    return min_occurs, UNBOUNDED if max_occurs == "unbounded" else int(max_occurs)
+
+
+# The children of an XSD node, each of which must be one of the kinds the
+# compiler handles there. Anything else changes what the schema accepts, so
+# it is an error rather than being left out of the checks.
+def schema_children(node, kinds):
+    children = []
+    for child in node:
+        kind = child.tag.replace(XS, "")
+        if kind == "annotation":
+            continue
+        if kind not in kinds:
+            parent = node.tag.replace(XS, "")
+            raise SchemaError(f"Unsupported schema construct {kind} in {parent}")
+        children.append(child)
+    return children
+
+
+class XMLSchema:
+    def __init__(self, content):
+        root = ET.fromstring(content)
+        schema_children(root, ("simpleType", "element"))
+        self.simple_nodes = {
+            node.get("name"): node for node in root.findall(f"{XS}simpleType")
+        }
+        self.simple_types = dict(BUILTIN_TYPES)
+        self.elements = {}
+        # Element references are resolved once every global element exists
+        self.references = []
+        for node in root.findall(f"{XS}element"):
+            self.elements[node.get("name")] = self.element_decl(node)
+        for particle, name in self.references:
+            if name not in self.elements:
+                raise SchemaError(f"Schema references unknown element {name}")
+            particle.decl = self.elements[name]
+
+    def simple_type(self, name):
+        if name not in self.simple_types:
+            if name not in self.simple_nodes:
+                raise SchemaError(f"Schema references unknown type {name}")
+            self.simple_types[name] = self.simple_type_node(self.simple_nodes[name])
+        return self.simple_types[name]
+
+    def simple_type_node(self, node):
+        name = node.get("name", "anonymous type")
+        schema_children(node, ("restriction", "union", "list"))
+        restriction = node.find(f"{XS}restriction")
+        if restriction is not None:
+            schema_children(restriction, ("enumeration", "pattern"))
+            return RestrictionType(
+                name,
+                self.simple_type(restriction.get("base")),
+                [
+                    facet.get("value")
+                    for facet in restriction.findall(f"{XS}enumeration")
+                ],
+                [facet.get("value") for facet in restriction.findall(f"{XS}pattern")],
+            )
+        union = node.find(f"{XS}union")
+        if union is not None:
+            schema_children(union, ("simpleType",))
+            members = [
+                self.simple_type(member)
+                for member in union.get("memberTypes", "").split()
+            ]
+            members += [
+                self.simple_type_node(member)
+                for member in union.findall(f"{XS}simpleType")
+            ]
+            return UnionType(name, members)
+        item = node.find(f"{XS}list")
+        if item is not None:
+            schema_children(item, ())
+            return ListType(name, self.simple_type(item.get("itemType")))
+        raise SchemaError(f"Unsupported definition of simple type {name}")
+
+    def element_decl(self, node):
+        name = node.get("name")
+        schema_children(node, ("complexType",))
+        if node.get("type") is not None:
+            return ElementDecl(name, self.simple_type(node.get("type")))
+        complex_node = node.find(f"{XS}complexType")
+        if complex_node is None:
+            return ElementDecl(name, None)
+        return ElementDecl(name, self.complex_type(complex_node))
+
+    def attributes(self, node):
+        for attr in node.findall(f"{XS}attribute"):
+            schema_children(attr, ())
+        return {
+            attr.get("name"): (
+                self.simple_type(attr.get("type", "xs:string")),
+                attr.get("use") == "required",
+            )
+            for attr in node.findall(f"{XS}attribute")
+        }
+
+    def complex_type(self, node):
+        schema_children(node, ("simpleContent", "sequence", "choice", "attribute"))
+        simple = node.find(f"{XS}simpleContent")
+        if simple is not None:
+            schema_children(simple, ("extension",))
+            extension = simple.find(f"{XS}extension")
+            schema_children(extension, ("attribute",))
+            return ComplexType(
+                self.attributes(extension), self.simple_type(extension.get("base"))
+            )
+        content = None
+        for kind in ("sequence", "choice"):
+            group = node.find(f"{XS}{kind}")
+            if group is not None:
+                content = self.particle(group)
+        return ComplexType(self.attributes(node), content)
+
+    def particle(self, node):
+        min_occurs, max_occurs = occurs(node)
+        if node.tag == f"{XS}element":
+            if node.get("ref") is not None:
+                particle = ElementParticle(None, min_occurs, max_occurs)
+                self.references.append((particle, node.get("ref")))
+                return particle
+            return ElementParticle(self.element_decl(node), min_occurs, max_occurs)
+        kind = node.tag.replace(XS, "")
+        if kind not in ("sequence", "choice"):
+            raise SchemaError(f"Unsupported schema particle {kind}")
+        if kind == "sequence" and (min_occurs, max_occurs) != (1, 1):
+            raise SchemaError("Unsupported repeated schema sequence")
+        return GroupParticle(
+            kind, [self.particle(child) for child in node], min_occurs, max_occurs
+        )
+
+    # Paths of the elements in xmlroot that do not match the schema, with
+    # what is wrong with each
+    def validate(self, xmlroot):
+        errors = []
+        decl = self.elements.get(xmlroot.tag)
+        if decl is None:
+            return [f"/{xmlroot.tag}: unknown root element"]
+        SchemaValidator(errors).element(xmlroot, decl, [path_step(xmlroot, None)])
+        return errors
+
+
+def path_step(element, index):
+    name = element.get("name")
+    if name is None and element.find("name") is not None:
+        name = element.find("name").text
+    if name is not None:
+        return f"{element.tag}[{name}]"
+    if index is not None:
+        return f"{element.tag}[{index}]"
+    return element.tag
+
+
+class SchemaValidator:
+    def __init__(self, errors):
+        self.errors = errors
+
+    def error(self, path, message):
+        self.errors.append(f"/{'/'.join(path)}: {message}")
+
+    def element(self, element, decl, path):
+        ty = decl.ty
+        if ty is None:
+            return
+        if isinstance(ty, SimpleType):
+            self.attributes(element, {}, path)
+            self.simple_content(element, ty, path)
+            return
+        self.attributes(element, ty.attributes, path)
+        if isinstance(ty.content, SimpleType):
+            self.simple_content(element, ty.content, path)
+            return
+        children = list(element)
+        if element.text is not None and element.text.strip():
+            self.error(path, "unexpected text")
+        for child in children:
+            if child.tail is not None and child.tail.strip():
+                self.error(path, f"unexpected text after <{child.tag}>")
+        matched = []
+        end = 0
+        if ty.content is not None:
+            missing = []
+            end = self.match(ty.content, children, 0, matched, missing)
+            for message in missing:
+                self.error(path, message)
+        counts = {}
+        for child in children:
+            counts[child.tag] = counts.get(child.tag, 0) + 1
+        seen = {}
+        for i, child in enumerate(children):
+            seen[child.tag] = seen.get(child.tag, 0) + 1
+            index = seen[child.tag] if counts[child.tag] > 1 else None
+            child_path = path + [path_step(child, index)]
+            # Children after the first unexpected one are not reported, as
+            # they would all be unexpected too
+            if i >= end:
+                self.error(child_path, "unexpected element")
+                break
+            self.element(child, matched[i], child_path)
+
+    def attributes(self, element, declared, path):
+        for name, value in element.items():
+            if name not in declared:
+                self.error(path, f"unexpected attribute {name}")
+            elif not declared[name][0].check(value):
+                self.error(
+                    path,
+                    f"attribute {name}={value!r} is not a valid "
+                    f"{declared[name][0].name}",
+                )
+        for name, (_, required) in declared.items():
+            if required and element.get(name) is None:
+                self.error(path, f"missing attribute {name}")
+
+    def simple_content(self, element, ty, path):
+        if len(element) > 0:
+            self.error(path, f"unexpected element <{element[0].tag}>")
+        value = element.text or ""
+        if not ty.check(value):
+            self.error(path, f"value {value!r} is not a valid {ty.name}")
+
+    # Match particle against children from position i, appending the
+    # declaration of each matched child to matched and a message for each
+    # required element not found to missing. Matching is greedy, which the
+    # unique particle attribution rule of XML Schema makes exact. Returns
+    # the position after the matched children.
+    def match(self, particle, children, i, matched, missing):
+        if isinstance(particle, ElementParticle):
+            count = 0
+            while (
+                particle.max_occurs is UNBOUNDED or count < particle.max_occurs
+            ) and (i < len(children) and children[i].tag == particle.decl.name):
+                matched.append(particle.decl)
+                i += 1
+                count += 1
+            if count < particle.min_occurs:
+                missing.append(f"missing element <{particle.decl.name}>")
+            return i
+        if particle.kind == "sequence":
+            for item in particle.particles:
+                i = self.match(item, children, i, matched, missing)
+            return i
+        # A choice repeats while one of its alternatives matches some children
+        count = 0
+        while particle.max_occurs is UNBOUNDED or count < particle.max_occurs:
+            for item in particle.particles:
+                start = len(matched)
+                end = self.match(item, children, i, matched, [])
+                if end > i:
+                    break
+                del matched[start:]
+            else:
+                break
+            i = end
+            count += 1
+        if count < particle.min_occurs:
+            names = ", ".join(f"<{name}>" for name in first_elements(particle))
+            missing.append(f"missing one of {names}")
+        return i
+
+
+def first_elements(particle):
+    if isinstance(particle, ElementParticle):
+        return [particle.decl.name]
+    if particle.kind == "choice":
+        return [name for item in particle.particles for name in first_elements(item)]
+    return first_elements(particle.particles[0]) if particle.particles else []
+
+
+def content_hash(content):
+    return hashlib.sha256(content).hexdigest()
+
+
+# Verdicts by the hashes of the XML and the schema, in a JSON file. Only
+# the verdicts used in a run are kept, as for the lint cache.
+class TOSASchemaCache:
+    def __init__(self, path):
+        self.path = path
+        self.verdicts = {}
+        if path is not None and os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+            if data.get("format") == SCHEMA_CACHE_FORMAT:
+                self.verdicts = data.get("verdicts", {})
+        self.used = {}
+
+    def lookup(self, key):
+        errors = self.verdicts.get(key)
+        if errors is not None:
+            self.used[key] = errors
+        return errors
+
+    def store(self, key, errors):
+        self.used[key] = errors
+
+    def save(self):
+        if self.path is None:
+            return
+        with open(self.path, "w") as f:
+            json.dump({"format": SCHEMA_CACHE_FORMAT, "verdicts": self.used}, f)
+
+
+# Compiled schemas by the hash of their content
+_schemas = {}
+
+
+# Validate the parsed xmlroot, whose file content is content, against the
+# schema at xsdpath, unless cache holds the verdict for the pair already
+def validate_spec_xml(xmlpath, content, xmlroot, xsdpath, cache=None):
+    with open(xsdpath, "rb") as f:
+        xsd_content = f.read()
+    xsd_hash = content_hash(xsd_content)
+    key = f"{content_hash(content)}:{xsd_hash}"
+    errors = cache.lookup(key) if cache is not None else None
+    if errors is None:
+        if xsd_hash not in _schemas:
+            _schemas[xsd_hash] = XMLSchema(xsd_content)
+        errors = _schemas[xsd_hash].validate(xmlroot)
+        if cache is not None:
+            cache.store(key, errors)
+    if cache is not None:
+        cache.save()
+    if errors:
+        raise SchemaValidationError(xmlpath, errors)
+
+
+def add_schema_arguments(parser):
+    parser.add_argument(
+        "--schema",
+        required=False,
+        help="Validate the XML against this XSD while loading it",
+    )
+    parser.add_argument(
+        "--schema-cache",
+        required=False,
+        help="Path to a cache of schema validation verdicts by file content",
+    )
+
+
+def schema_cache_from_arguments(args):
+    return TOSASchemaCache(args.schema_cache) if args.schema else None
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--xml",
+        required=False,
+        default=os.path.join(os.path.dirname(__file__), "..", "tosa.xml"),
+        help="Path to specification XML",
+    )
+    parser.add_argument(
+        "--xsd",
+        required=False,
+        default=os.path.join(os.path.dirname(__file__), "..", "tosa.xsd"),
+        help="Path to the XML schema",
+    )
+    parser.add_argument(
+        "--cache",
+        required=False,
+        help="Path to a cache of validation verdicts by file content",
+    )
+    args = parser.parse_args()
+
+    try:
+        with open(args.xml, "rb") as f:
+            content = f.read()
+        xmlroot = ET.fromstring(content)
+        validate_spec_xml(
+            args.xml, content, xmlroot, args.xsd, TOSASchemaCache(args.cache)
+        )
+    except (OSError, RuntimeError, ET.ParseError) as e:
+        print(f"Failure validating XML spec: {str(e)}")
+        exit(1)
+    print(f"{args.xml} validates")
@@ -0,0 +1,534 @@
+#!/usr/bin/env python3
+# Copyright (c) 2026, ARM Limited.
+# SPDX-License-Identifier: Apache-2.0
+# Serialization of the TOSASpec model for tools that do not parse tosa.xml
+# themselves. The model is written as a document of maps, arrays, strings,
+# integers, booleans and nulls, in JSON or in MessagePack. tosa.py rebuilds
+# the model from either with load_serialized_spec().
+#
+# Document layout, version 1:
+#
+#   format        "tosa-spec"
+#   version       SERIALIZATION_VERSION, raised on any incompatible change
+#   tuples        "columns" or "rows", the form of the type tuples
+#   strings       MessagePack only, the string table described below
+#   spec
+#     version             {major, minor, patch, draft}
+#     profiles            [{profile, name, description, status}]
+#     profile_extensions  [{name, description, status, profiles}]
+#     levels              [{name, description, maximums: {MAX_RANK: ...}}]
+#     operatorgroups      [{name, operators}]
+#     enums               [{name, description, extension, values}]
+#
+#   operator      {name, fingerprint, types, arguments, typesupports}
+#   argument      {name, description, categories: [{name, profiles}], type,
+#                  tensor_element_type, tensor_element_scale_type, shape,
+#                  levellimits: [[value, limit]], rank: [] or [min, max],
+#                  optional, ctc, ctc_remove}
+#   typesupport   {mode, version_added, profiles, tskeys,
+#                  type_sets: [[name, values]], type_bindings,
+#                  type_binding_same_as, type_binding_access_elem_type,
+#                  tuples}
+#   enum value    {name, value, description, extension, or_extension}
+#
+# The tuples of a typesupport are, in the rows form, a list of maps from
+# type name to type, one per tuple. In the columns form they are
+# {keys, length, columns}, where a column is a single type when every tuple
+# has that type and otherwise a list of the type of each tuple.
+#
+# In MessagePack, strings that occur more than once are written once in the
+# strings array, most frequent first, and each occurrence in spec is an
+# extension object of type 1 whose data is the big-endian index of the
+# string in that array, in 1, 2 or 4 bytes.
+import json
+import struct
+
+SERIALIZATION_VERSION = 1
+
+SERIALIZATION_FORMAT = "tosa-spec"
+
+# MessagePack extension type of a reference to the string table
+STRING_REF = 1
+
+
+class SerializationError(RuntimeError):
+    pass
+
+
+def tuples_document(tuples, form):
+    if form == "rows":
+        return [dict(tytuple) for tytuple in tuples]
+    return {
+        "keys": list(tuples.keys),
+        "length": tuples.length,
+        "columns": [
+            list(column) if isinstance(column, tuple) else column
+            for column in tuples.columns
+        ],
+    }
+
+
+def argument_document(arg):
+    return {
+        "name": arg.name,
+        "description": arg.description,
+        "categories": [
+            {"name": cat.name, "profiles": cat.profiles} for cat in arg.categories
+        ],
+        "type": arg.type,
+        "tensor_element_type": arg.tensor_element_type,
+        "tensor_element_scale_type": arg.tensor_element_scale_type,
+        "shape": arg.shape,
+        "levellimits": arg.levellimits,
+        "rank": arg.rank,
+        "optional": arg.optional,
+        "ctc": arg.ctc,
+        "ctc_remove": arg.ctc_remove,
+    }
+
+
+def typesupport_document(ts, form):
+    return {
+        "mode": ts.mode,
+        "version_added": ts.version_added,
+        "profiles": ts.profiles,
+        "tskeys": list(ts.tskeys),
+        "type_sets": [[name, values] for name, values in ts.type_sets],
+        "type_bindings": ts.type_bindings,
+        "type_binding_same_as": ts.type_binding_same_as,
+        "type_binding_access_elem_type": ts.type_binding_access_elem_type,
+        "tuples": tuples_document(ts.generated_tuples, form),
+    }
+
+
+def operator_document(op, form):
+    return {
+        "name": op.name,
+        "fingerprint": op.fingerprint,
+        "types": op.types,
+        "arguments": [argument_document(arg) for arg in op.arguments],
+        "typesupports": [typesupport_document(ts, form) for ts in op.typesupports],
+    }
+
+
+# The document of a loaded spec, with type tuples in the columns or rows form
+def spec_document(spec, form="columns"):
+    if form not in ("columns", "rows"):
+        raise SerializationError(f"Unknown type tuple form {form}")
+    return {
+        "format": SERIALIZATION_FORMAT,
+        "version": SERIALIZATION_VERSION,
+        "tuples": form,
+        "spec": {
+            "version": {
+                "major": spec.version_major,
+                "minor": spec.version_minor,
+                "patch": spec.version_patch,
+                "draft": spec.version_is_draft,
+            },
+            "profiles": [
+                {
+                    "profile": profile.profile,
+                    "name": profile.name,
+                    "description": profile.description,
+                    "status": profile.status,
+                }
+                for profile in spec.profiles
+            ],
+            "profile_extensions": [
+                {
+                    "name": ext.name,
+                    "description": ext.description,
+                    "status": ext.status,
+                    "profiles": ext.profiles,
+                }
+                for ext in spec.profile_extensions
+            ],
+            "levels": [
+                {
+                    "name": level.name,
+                    "description": level.desc,
+                    "maximums": level.maximums,
+                }
+                for level in spec.levels
+            ],
+            "operatorgroups": [
+                {
+                    "name": group.name,
+                    "operators": [
+                        operator_document(op, form) for op in group.operators
+                    ],
+                }
+                for group in spec.operatorgroups
+            ],
+            "enums": [
+                {
+                    "name": enum.name,
+                    "description": enum.description,
+                    "extension": enum.extension,
+                    "values": [
+                        {
+                            "name": name,
+                            "value": value,
+                            "description": description,
+                            "extension": extension[0],
+                            "or_extension": extension[1],
+                        }
+                        for name, value, description, extension in enum.values
+                    ],
+                }
+                for enum in spec.enums
+            ],
+        },
+    }
+
+
+def check_document(document):
+    if not isinstance(document, dict) or document.get("format") != (
+        SERIALIZATION_FORMAT
+    ):
+        raise SerializationError("Not a serialized TOSA specification")
+    if document.get("version") != SERIALIZATION_VERSION:
+        raise SerializationError(
+            f"Serialized specification version {document.get('version')} "
+            f"is not {SERIALIZATION_VERSION}"
+        )
+    return document
+
+
+# MessagePack, limited to the types a document holds
+def string_counts(obj, counts):
+    pending = [obj]
+    while pending:
+        item = pending.pop()
+        if isinstance(item, str):
+            counts[item] = counts.get(item, 0) + 1
+        elif isinstance(item, dict):
+            pending.extend(item.keys())
+            pending.extend(item.values())
+        elif isinstance(item, list):
+            pending.extend(item)
+    return counts
+
+
+class MessagePackEncoder:
+    def __init__(self, strings=()):
+        self.indexes = {string: i for i, string in enumerate(strings)}
+        self.out = bytearray()
+
+    def header(self, size, fix, fix_limit, codes):
+        if size < fix_limit:
+            self.out.append(fix | size)
+        elif codes[0] is not None and size < 1 << 8:
+            self.out += struct.pack(">BB", codes[0], size)
+        elif size < 1 << 16:
+            self.out += struct.pack(">BH", codes[1], size)
+        else:
+            self.out += struct.pack(">BI", codes[2], size)
+
+    def encode(self, obj):
+        out = self.out
+        if obj is None:
+            out.append(0xC0)
+        elif obj is True:
+            out.append(0xC3)
+        elif obj is False:
+            out.append(0xC2)
+        elif isinstance(obj, int):
+            self.encode_int(obj)
+        elif isinstance(obj, str):
+            index = self.indexes.get(obj)
+            if index is None:
+                data = obj.encode("utf-8")
+                self.header(len(data), 0xA0, 32, (0xD9, 0xDA, 0xDB))
+                out += data
+            elif index < 1 << 8:
+                out += struct.pack(">BBB", 0xD4, STRING_REF, index)
+            elif index < 1 << 16:
+                out += struct.pack(">BBH", 0xD5, STRING_REF, index)
+            else:
+                out += struct.pack(">BBI", 0xD6, STRING_REF, index)
+        elif isinstance(obj, (list, tuple)):
+            self.header(len(obj), 0x90, 16, (None, 0xDC, 0xDD))
+            for item in obj:
+                self.encode(item)
+        elif isinstance(obj, dict):
+            self.header(len(obj), 0x80, 16, (None, 0xDE, 0xDF))
+            for key, value in obj.items():
+                self.encode(key)
+                self.encode(value)
+        else:
+            raise SerializationError(f"Cannot serialize {type(obj).__name__}")
+
+    def encode_int(self, value):
+        if 0 <= value < 128:
+            self.out.append(value)
+        elif -32 <= value < 0:
+            self.out.append(value & 0xFF)
+        elif 0 <= value < 1 << 64:
+            for code, fmt, limit in [
+                (0xCC, ">BB", 1 << 8),
+                (0xCD, ">BH", 1 << 16),
+                (0xCE, ">BI", 1 << 32),
+                (0xCF, ">BQ", 1 << 64),
+            ]:
+                if value < limit:
+                    self.out += struct.pack(fmt, code, value)
+                    return
+        elif -(1 << 63) <= value < 0:
+            for code, fmt, limit in [
+                (0xD0, ">Bb", 1 << 7),
+                (0xD1, ">Bh", 1 << 15),
+                (0xD2, ">Bi", 1 << 31),
+                (0xD3, ">Bq", 1 << 63),
+            ]:
+                if value >= -limit:
+                    self.out += struct.pack(fmt, code, value)
+                    return
+        else:
+            raise SerializationError(f"Integer {value} is out of range")
+
+
+class MessagePackDecoder:
+    def __init__(self, data):
+        self.data = data
+        self.pos = 0
+        self.strings = []
+
+    def unpack(self, fmt, size):
+        value = struct.unpack_from(fmt, self.data, self.pos)[0]
+        self.pos += size
+        return value
+
+    def string(self, size):
+        start = self.pos
+        end = start + size
+        self.pos = end
+        return self.data[start:end].decode("utf-8")
+
+    def array(self, size):
+        return [self.decode() for _ in range(size)]
+
+    def map(self, size):
+        result = {}
+        for _ in range(size):
+            key = self.decode()
+            result[key] = self.decode()
+        return result
+
+    def string_ref(self, fmt, size):
+        if self.data[self.pos] != STRING_REF:
+            raise SerializationError(f"Unknown extension type {self.data[self.pos]}")
+        self.pos += 1
+        index = self.unpack(fmt, size)
+        if index >= len(self.strings):
+            raise SerializationError(f"String reference {index} is out of range")
+        return self.strings[index]
+
+    # References to the most frequent strings take one byte and are most of
+    # a document, so they are read here rather than through string_ref
+    def decode(self):
+        data = self.data
+        pos = self.pos
+        code = data[pos]
+        if (
+            code == 0xD4
+            and data[pos + 1] == STRING_REF
+            and data[pos + 2] < len(self.strings)
+        ):
+            self.pos = pos + 3
+            return self.strings[data[pos + 2]]
+        self.pos = pos + 1
+        if code < 0x80:
+            return code
+        if code < 0x90:
+            return self.map(code & 0x0F)
+        if code < 0xA0:
+            return self.array(code & 0x0F)
+        if code < 0xC0:
+            return self.string(code & 0x1F)
+        if code >= 0xE0:
+            return code - 0x100
+        if code in MESSAGEPACK_CODES:
+            method, fmt, size = MESSAGEPACK_CODES[code]
+            return method(self, fmt, size)
+        raise SerializationError(f"Unsupported MessagePack type 0x{code:02x}")
+
+
+def _constant(value):
+    return lambda decoder, fmt, size: value
+
+
+def _number(decoder, fmt, size):
+    return decoder.unpack(fmt, size)
+
+
+def _sized(method):
+    return lambda decoder, fmt, size: method(decoder, decoder.unpack(fmt, size))
+
+
+# Decoding of each MessagePack type code past the fixed size ranges, as the
+# method and its struct format and byte count
+MESSAGEPACK_CODES = {
+    0xC0: (_constant(None), None, 0),
+    0xC2: (_constant(False), None, 0),
+    0xC3: (_constant(True), None, 0),
+    0xCC: (_number, ">B", 1),
+    0xCD: (_number, ">H", 2),
+    0xCE: (_number, ">I", 4),
+    0xCF: (_number, ">Q", 8),
+    0xD0: (_number, ">b", 1),
+    0xD1: (_number, ">h", 2),
+    0xD2: (_number, ">i", 4),
+    0xD3: (_number, ">q", 8),
+    0xD4: (MessagePackDecoder.string_ref, ">B", 1),
+    0xD5: (MessagePackDecoder.string_ref, ">H", 2),
+    0xD6: (MessagePackDecoder.string_ref, ">I", 4),
+    0xD9: (_sized(MessagePackDecoder.string), ">B", 1),
+    0xDA: (_sized(MessagePackDecoder.string), ">H", 2),
+    0xDB: (_sized(MessagePackDecoder.string), ">I", 4),
+    0xDC: (_sized(MessagePackDecoder.array), ">H", 2),
+    0xDD: (_sized(MessagePackDecoder.array), ">I", 4),
+    0xDE: (_sized(MessagePackDecoder.map), ">H", 2),
+    0xDF: (_sized(MessagePackDecoder.map), ">I", 4),
+}
+
+
+def encode_messagepack(document):
+    counts = string_counts(document["spec"], {})
+    strings = sorted(
+        (string for string, count in counts.items() if count > 1),
+        key=lambda string: -counts[string],
+    )
+    header = MessagePackEncoder()
+    header.header(len(document) + 1, 0x80, 16, (None, 0xDE, 0xDF))
+    for key, value in document.items():
+        if key != "spec":
+            header.encode(key)
+            header.encode(value)
+    header.encode("strings")
+    header.encode(strings)
+    body = MessagePackEncoder(strings)
+    body.encode("spec")
+    body.encode(document["spec"])
+    return bytes(header.out + body.out)
+
+
+# The strings array comes before spec, so each reference is resolved as it
+# is read
+def decode_messagepack(data):
+    decoder = MessagePackDecoder(data)
+    code = data[0] if data else None
+    if code is not None and 0x80 <= code < 0x90:
+        decoder.pos = 1
+        size = code & 0x0F
+    elif code in (0xDE, 0xDF):
+        decoder.pos = 1
+        size = decoder.unpack(*((">H", 2) if code == 0xDE else (">I", 4)))
+    else:
+        raise SerializationError("Not a serialized TOSA specification")
+    document = {}
+    try:
+        for _ in range(size):
+            key = decoder.decode()
+            value = decoder.decode()
+            if key == "strings":
+                decoder.strings = value
+            else:
+                document[key] = value
+    except (IndexError, struct.error):
+        raise SerializationError("Serialized specification is truncated")
+    if decoder.pos != len(data):
+        raise SerializationError("Trailing data after the serialized specification")
+    return document
+
+
+def write_document(document, path, fmt=None):
+    fmt = fmt or ("json" if path.endswith(".json") else "msgpack")
+    if fmt == "json":
+        with open(path, "w") as f:
+            json.dump(document, f, separators=(",", ":"))
+            f.write("\n")
+    elif fmt == "msgpack":
+        with open(path, "wb") as f:
+            f.write(encode_messagepack(document))
+    else:
+        raise SerializationError(f"Unknown serialization format {fmt}")
+
+
+# A document in either format. JSON is told apart by its opening brace,
+# which is not a valid MessagePack map header.
+def read_document(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    if data.lstrip()[:1] == b"{":
+        document = json.loads(data)
+    else:
+        document = decode_messagepack(data)
+    return check_document(document)
+
+
+if __name__ == "__main__":
+    import argparse
+    import os
+    import time
+
+    import tosa
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--xml",
+        required=False,
+        default=os.path.join(os.path.dirname(__file__), "..", "tosa.xml"),
+        help="Path to specification XML",
+    )
+    parser.add_argument(
+        "--output",
+        required=True,
+        help="Path to write, MessagePack unless it ends in .json",
+    )
+    parser.add_argument(
+        "--format",
+        required=False,
+        choices=["json", "msgpack"],
+        help="Format to write, instead of the one the output path implies",
+    )
+    parser.add_argument(
+        "--tuples",
+        required=False,
+        choices=["columns", "rows"],
+        default="columns",
+        help="Write type tuples as columns, or as one map per tuple",
+    )
+    parser.add_argument(
+        "--check",
+        required=False,
+        action="store_true",
+        help="Load the written file back, check it rebuilds the same model and "
+        "compare the load time with parsing the XML",
+    )
+    args = parser.parse_args()
+
+    try:
+        start = time.perf_counter()
+        # The XML is kept for the operator fingerprints the document holds
+        spec = tosa.TOSASpec(args.xml)
+        xml_seconds = time.perf_counter() - start
+        document = spec_document(spec, args.tuples)
+        write_document(document, args.output, args.format)
+        if args.check:
+            start = time.perf_counter()
+            loaded = tosa.load_serialized_spec(args.output)
+            load_seconds = time.perf_counter() - start
+            if spec_document(loaded, args.tuples) != document:
+                raise SerializationError(
+                    f"{args.output} does not rebuild the model of {args.xml}"
+                )
+            print(
+                f"XML parse: {xml_seconds:.3f} s, "
+                f"{args.output}: {load_seconds:.3f} s "
+                f"({os.path.getsize(args.output)} bytes)"
+            )
+    except (OSError, ValueError, RuntimeError, tosa.ET.ParseError) as e:
+        print(f"Failure serializing XML spec: {str(e)}")
+        exit(1)
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# Copyright (c) 2026, ARM Limited.
+# SPDX-License-Identifier: Apache-2.0
+# Several versions of the specification loaded side by side. Operators,
+# arguments and typesupports are identified by the structural hash of their
+# XML, and an element that two versions define the same way is held once
+# and shared between them, so memory grows with the differences between
+# the versions rather than with their number. Legality of an operator with
+# given types is answered per version from an index over the shared
+# typesupports, so it is shared as well.
+import tosa
+from tosa import xml_fingerprint
+
+
+class SpecStoreError(RuntimeError):
+    pass
+
+
+def parse_version(version):
+    try:
+        return tuple(int(part) for part in version.split("."))
+    except ValueError:
+        raise SpecStoreError(f"Invalid version {version}")
+
+
+# Rows of a typesupport as value tuples in the order of its keys, for exact
+# lookups of fully given types
+class TypeSupportRows:
+    def __init__(self, typesupport):
+        tuples = typesupport.generated_tuples
+        self.keys = tuples.keys
+        self.rows = set(zip(*(tuples.column(key) for key in self.keys)))
+
+    def matches(self, typesupport, types):
+        if len(types) == len(self.keys) and all(key in types for key in self.keys):
+            return tuple(types[key] for key in self.keys) in self.rows
+        return any(
+            all(tytuple.get(key) == value for key, value in types.items())
+            for tytuple in typesupport.generated_tuples
+        )
+
+
+class TOSASpecStore:
+    def __init__(self):
+        self.specs = {}
+        # Shared model objects by the fingerprint of their XML
+        self.operators = {}
+        self.arguments = {}
+        self.typesupports = {}
+        # Rows of each shared typesupport by id
+        self.rows = {}
+        # Operators of each loaded spec by name
+        self.index = {}
+
+    def shared(self, pool, fingerprint, obj):
+        return pool.setdefault(fingerprint, obj)
+
+    # Replace the parts of op that an earlier loaded spec already defines by
+    # the objects of that spec
+    def share_operator(self, xml_op, op):
+        shared = self.operators.get(op.fingerprint)
+        if shared is not None:
+            return shared
+        op.arguments = [
+            self.shared(self.arguments, xml_fingerprint(xml_arg), arg)
+            for xml_arg, arg in zip(xml_op.findall("arguments/argument"), op.arguments)
+        ]
+        op.typesupports = [
+            self.shared(self.typesupports, xml_fingerprint(xml_ts), ts)
+            for xml_ts, ts in zip(xml_op.findall("typesupport"), op.typesupports)
+        ]
+        self.operators[op.fingerprint] = op
+        return op
+
+    # Load the spec at xmlpath under label. The XML tree is dropped after
+    # loading, as for any other resident user of the model.
+    def add(self, label, xmlpath):
+        if label in self.specs:
+            raise SpecStoreError(f"Spec {label} is already loaded")
+        spec = tosa.TOSASpec(xmlpath)
+        xml_groups = spec.xmlroot.findall("./operators/operatorgroup")
+        for xml_group, group in zip(xml_groups, spec.operatorgroups):
+            group.operators = [
+                self.share_operator(xml_op, op)
+                for xml_op, op in zip(xml_group.findall("operator"), group.operators)
+            ]
+        spec.drop_xml()
+
+        operators = {}
+        for group in spec.operatorgroups:
+            for op in group.operators:
+                operators[op.name] = op
+                for ts in op.typesupports:
+                    if id(ts) not in self.rows:
+                        self.rows[id(ts)] = TypeSupportRows(ts)
+        self.specs[label] = spec
+        self.index[label] = operators
+        return spec
+
+    def spec(self, label):
+        if label not in self.specs:
+            raise SpecStoreError(f"Unknown spec {label}")
+        return self.specs[label]
+
+    # The typesupports of the spec loaded as label that allow op with the
+    # types given, which may name only some of its types. With as_of, only
+    # typesupports added in that version or earlier count.
+    def legal_typesupports(self, label, opname, types, as_of=None):
+        self.spec(label)
+        if not isinstance(types, dict) or not all(
+            isinstance(value, str) for value in types.values()
+        ):
+            raise SpecStoreError(f"Types must map type names to types, got {types}")
+        op = self.index[label].get(opname)
+        if op is None:
+            return []
+        limit = None if as_of is None else parse_version(as_of)
+        found = []
+        for ts in op.typesupports:
+            if limit is not None and parse_version(ts.version_added) > limit:
+                continue
+            if self.rows[id(ts)].matches(ts, types):
+                found.append(ts)
+        return found
+
+    def is_legal(self, label, opname, types, as_of=None):
+        return len(self.legal_typesupports(label, opname, types, as_of)) > 0
+
+    # Labels of the loaded specs in which op is legal with the types given
+    def legal_in(self, opname, types, as_of=None):
+        return [
+            label for label in self.specs if self.is_legal(label, opname, types, as_of)
+        ]
+
+    def stats(self):
+        loaded = sum(
+            len(group.operators)
+            for spec in self.specs.values()
+            for group in spec.operatorgroups
+        )
+        return {
+            "specs": len(self.specs),
+            "operators loaded": loaded,
+            "operators held": len(self.operators),
+            "arguments held": len(self.arguments),
+            "typesupports held": len(self.typesupports),
+        }
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--xml",
+        required=True,
+        action="append",
+        help="Specification XML to load as label=path, repeated for each version",
+    )
+    parser.add_argument("--operator", required=False, help="Operator to look up")
+    parser.add_argument(
+        "--types",
+        required=False,
+        default="{}",
+        help='Types of the operator as JSON, such as \'{"in_out_t": "i32_t"}\'',
+    )
+    parser.add_argument(
+        "--as-of",
+        required=False,
+        help="Only count typesupports added in this version or earlier",
+    )
+    parser.add_argument(
+        "--stats",
+        required=False,
+        action="store_true",
+        help="Print how many model objects the loaded specs share",
+    )
+    args = parser.parse_args()
+
+    store = TOSASpecStore()
+    try:
+        for item in args.xml:
+            label, sep, path = item.partition("=")
+            if not sep:
+                raise SpecStoreError(f"Expected label=path, got {item}")
+            store.add(label, path)
+        types = json.loads(args.types)
+        if args.stats:
+            for name, value in store.stats().items():
+                print(f"{name}: {value}")
+        if args.operator:
+            for label in store.specs:
+                typesupports = store.legal_typesupports(
+                    label, args.operator, types, args.as_of
+                )
+                modes = ", ".join(ts.mode for ts in typesupports) or "not legal"
+                print(f"{label}: {modes}")
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"Failure reading/validating XML spec: {str(e)}")
+        exit(1)
@@ -0,0 +1,144 @@
+# Copyright (c) 2026, ARM Limited.
+# SPDX-License-Identifier: Apache-2.0
+# Timing instrumentation for the specification tools. Spans and counters
+# are recorded only while a trace is active, and written in the Chrome trace
+# event format that chrome://tracing and Perfetto load. Without an active
+# trace, span() hands back one shared context that does nothing and count()
+# returns straight away.
+import atexit
+import json
+import os
+import threading
+import time
+
+
+class TOSASpecTrace:
+    def __init__(self):
+        self.origin = time.perf_counter_ns()
+        self.pid = os.getpid()
+        self.events = []
+        self.counters = {}
+        self.thread_names = {}
+        self.lock = threading.Lock()
+
+    # Microseconds since the trace started, the unit of trace timestamps
+    def timestamp(self):
+        return (time.perf_counter_ns() - self.origin) / 1000
+
+    def add_span(self, name, category, begin, args):
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": begin,
+            "dur": self.timestamp() - begin,
+            "pid": self.pid,
+            "tid": thread.ident,
+        }
+        if args:
+            event["args"] = args
+        with self.lock:
+            self.events.append(event)
+            self.thread_names[thread.ident] = thread.name
+
+    def add_count(self, name, value):
+        with self.lock:
+            total = self.counters.get(name, 0) + value
+            self.counters[name] = total
+            self.events.append(
+                {
+                    "name": name,
+                    "ph": "C",
+                    "ts": self.timestamp(),
+                    "pid": self.pid,
+                    "args": {name: total},
+                }
+            )
+
+    def write(self, path):
+        metadata = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": self.pid,
+                "tid": tid,
+                "args": {"name": name},
+            }
+            for tid, name in self.thread_names.items()
+        ]
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    "traceEvents": metadata + self.events,
+                    "displayTimeUnit": "ms",
+                    "otherData": {"counters": self.counters},
+                },
+                f,
+            )
+
+
+class TraceSpan:
+    __slots__ = ("trace", "name", "category", "args", "begin")
+
+    def __init__(self, trace, name, category, args):
+        self.trace = trace
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.begin = self.trace.timestamp()
+        return self
+
+    def __exit__(self, *exc):
+        self.trace.add_span(self.name, self.category, self.begin, self.args)
+        return False
+
+
+class NoTraceSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NO_TRACE_SPAN = NoTraceSpan()
+
+# The active trace, None when tracing is off
+active_trace = None
+
+
+def span(name, category="spec", **args):
+    if active_trace is None:
+        return NO_TRACE_SPAN
+    return TraceSpan(active_trace, name, category, args)
+
+
+def count(name, value=1):
+    if active_trace is not None:
+        active_trace.add_count(name, value)
+
+
+# Start tracing, writing the trace to path when the process exits so that
+# every exit path of a tool keeps its trace
+def start(path):
+    global active_trace
+    active_trace = TOSASpecTrace()
+    trace = active_trace
+    atexit.register(trace.write, path)
+    return trace
+
+
+def add_trace_argument(parser):
+    parser.add_argument(
+        "--trace",
+        required=False,
+        help="Write a Chrome trace of where the run spent its time to this path",
+    )
+
+
+def trace_from_arguments(args):
+    if args.trace:
+        start(args.trace)
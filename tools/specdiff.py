@@ -0,0 +1,710 @@
+#!/usr/bin/env python3
+# Copyright (c) 2026, ARM Limited.
+# SPDX-License-Identifier: Apache-2.0
+import hashlib
+import json
+import os
+import re
+import subprocess
+import xml.etree.ElementTree as ET
+
+from tosa import xml_fingerprint
+
+# Top level elements without a per-item breakdown. A change to any of these
+# affects every generated output.
+GLOBAL_ELEMENTS = ["version", "profiles", "profile_extensions"]
+
+
+class TOSASpecChanges:
+    def __init__(self, operators=None, enums=None, levels=None, is_global=False):
+        self.operators = set(operators or [])
+        self.enums = set(enums or [])
+        self.levels = set(levels or [])
+        self.is_global = is_global
+
+    def is_empty(self):
+        return not (self.is_global or self.operators or self.enums or self.levels)
+
+    def operator_changed(self, name):
+        return self.is_global or name in self.operators
+
+    def enum_changed(self, name):
+        return self.is_global or name in self.enums
+
+    def __str__(self):
+        if self.is_global:
+            return "global change"
+        parts = []
+        for kind, names in [
+            ("operators", self.operators),
+            ("enums", self.enums),
+            ("levels", self.levels),
+        ]:
+            if names:
+                parts.append(f"{kind}: {', '.join(sorted(names))}")
+        return "; ".join(parts) if parts else "no changes"
+
+
+# Fingerprints of every operator, enum and level, keyed by (kind, name)
+def element_fingerprints(xmlroot):
+    fingerprints = {}
+    for element in GLOBAL_ELEMENTS:
+        node = xmlroot.find(f"./{element}")
+        fingerprints[("global", element)] = (
+            xml_fingerprint(node) if node is not None else None
+        )
+    for op in xmlroot.findall("./operators/operatorgroup/operator"):
+        fingerprints[("operator", op.find("name").text)] = xml_fingerprint(op)
+    for enum in xmlroot.findall("./enum"):
+        fingerprints[("enum", enum.get("name"))] = xml_fingerprint(enum)
+    for level in xmlroot.findall("./levels/level"):
+        fingerprints[("level", level.get("name"))] = xml_fingerprint(level)
+    return fingerprints
+
+
+def diff_xml_roots(old_root, new_root):
+    return diff_fingerprints(
+        element_fingerprints(old_root), element_fingerprints(new_root)
+    )
+
+
+# Changes between two sets of element_fingerprints
+def diff_fingerprints(old, new):
+    changes = TOSASpecChanges()
+    for key in old.keys() | new.keys():
+        if old.get(key) == new.get(key):
+            continue
+        kind, name = key
+        if kind == "global":
+            changes.is_global = True
+        elif kind == "operator":
+            changes.operators.add(name)
+        elif kind == "enum":
+            changes.enums.add(name)
+        else:
+            changes.levels.add(name)
+    return changes
+
+
+def load_xml_revision(xmlpath, revision):
+    return ET.fromstring(read_xml_revision(xmlpath, revision))
+
+
+def diff_against_revision(xmlpath, xmlroot, revision):
+    return diff_xml_roots(load_xml_revision(xmlpath, revision), xmlroot)
+
+
+MANIFEST_FORMAT = 1
+
+
+# The element_fingerprints of the spec an output directory was generated
+# from are kept beside the outputs, so that an incremental run patches the
+# outputs from what they were really generated from.
+def read_manifest(path):
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("format") != MANIFEST_FORMAT:
+        return None
+    return {(kind, name): fp for kind, name, fp in data["fingerprints"]}
+
+
+def write_manifest(path, fingerprints):
+    with open(path, "w") as f:
+        json.dump(
+            {
+                "format": MANIFEST_FORMAT,
+                "fingerprints": [
+                    [kind, name, fp]
+                    for (kind, name), fp in sorted(fingerprints.items())
+                ],
+            },
+            f,
+        )
+
+
+# Changes since the outputs recorded by the manifest at path, or None when
+# there is no usable manifest and the outputs must be generated in full. The
+# manifest is removed, to be written again once the outputs are up to date,
+# so that a run that fails part way does not leave a manifest behind.
+def changes_since_manifest(path, fingerprints):
+    old = read_manifest(path)
+    if os.path.exists(path):
+        os.remove(path)
+    return None if old is None else diff_fingerprints(old, fingerprints)
+
+
+# Version of the summary layout, part of the fingerprint cache
+SUMMARY_VERSION = 2
+
+
+def op_profile_string(op_profile):
+    names = [op_profile.get(key) for key in ("name", "and_name", "and_name2")]
+    return " and ".join(sorted(name for name in names if name is not None))
+
+
+# What a change set reports about each element of a specification, with the
+# fingerprint that tells whether anything else in the element changed. It
+# holds only strings, lists and dicts so that it can be cached as JSON.
+def spec_summary(xmlroot):
+    version = xmlroot.find("./version")
+    version_string = ".".join(version.get(key) for key in ("major", "minor", "patch"))
+    if version.get("draft") == "true":
+        version_string += " draft"
+    summary = {
+        "version": version_string,
+        "profiles": {
+            profile.get("name"): {
+                "fingerprint": xml_fingerprint(profile),
+                "status": profile.get("status"),
+            }
+            for profile in xmlroot.findall("./profiles/profile")
+        },
+        "extensions": {
+            ext.get("name"): {
+                "fingerprint": xml_fingerprint(ext),
+                "status": ext.get("status"),
+                "profiles": [p.text for p in ext.findall("profile_supported")],
+            }
+            for ext in xmlroot.findall("./profile_extensions/profile_extension")
+        },
+        "operators": {},
+        "enums": {},
+        "levels": {},
+    }
+    for group in xmlroot.findall("./operators/operatorgroup"):
+        for op in group.findall("operator"):
+            typesupports = {}
+            for ts in op.findall("typesupport"):
+                typesupports.setdefault(ts.get("mode"), []).append(
+                    {
+                        "fingerprint": xml_fingerprint(ts),
+                        "profiles": [
+                            op_profile_string(p) for p in ts.findall("op_profile")
+                        ],
+                    }
+                )
+            summary["operators"][op.find("name").text] = {
+                "fingerprint": xml_fingerprint(op),
+                "group": group.get("name"),
+                "arguments": {
+                    arg.get("name"): {
+                        "fingerprint": xml_fingerprint(arg),
+                        "shape": arg.get("shape"),
+                        "type": arg.get("type"),
+                        "element_type": arg.get("tensor-element-type"),
+                    }
+                    for arg in op.findall("arguments/argument")
+                },
+                "typesupports": typesupports,
+            }
+    for enum in xmlroot.findall("./enum"):
+        summary["enums"][enum.get("name")] = {
+            "fingerprint": xml_fingerprint(enum),
+            "values": {val.get("name"): val.get("value") for val in enum},
+        }
+    for level in xmlroot.findall("./levels/level"):
+        summary["levels"][level.get("name")] = {
+            "fingerprint": xml_fingerprint(level),
+            "maximums": {
+                key: value for key, value in level.items() if key.startswith("max_")
+            },
+        }
+    return summary
+
+
+# Summaries of specification files by the hash of their content, kept in a
+# JSON file, so that an unchanged file such as a previous release is not
+# parsed again
+class SpecSummaryCache:
+    def __init__(self, path):
+        self.path = path
+        self.summaries = {}
+        self.modified = False
+        if path is not None and os.path.exists(path):
+            with open(path, "r") as f:
+                data = json.load(f)
+            if data.get("version") == SUMMARY_VERSION:
+                self.summaries = data["summaries"]
+
+    def summary(self, content):
+        key = hashlib.sha256(content).hexdigest()
+        if key not in self.summaries:
+            self.summaries[key] = spec_summary(ET.fromstring(content))
+            self.modified = True
+        return self.summaries[key]
+
+    def save(self):
+        if self.path is None or not self.modified:
+            return
+        with open(self.path, "w") as f:
+            json.dump({"version": SUMMARY_VERSION, "summaries": self.summaries}, f)
+        self.modified = False
+
+
+def read_xml_revision(xmlpath, revision):
+    directory, filename = os.path.split(os.path.abspath(xmlpath))
+    try:
+        result = subprocess.run(
+            ["git", "-C", directory, "show", f"{revision}:./{filename}"],
+            check=True,
+            capture_output=True,
+        )
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(
+            f"Unable to read {xmlpath} at revision {revision}: "
+            f"{e.stderr.decode().strip()}"
+        )
+    return result.stdout
+
+
+def added_removed(old, new):
+    return sorted(new.keys() - old.keys()), sorted(old.keys() - new.keys())
+
+
+def operator_extensions(op):
+    return {
+        name
+        for entries in op["typesupports"].values()
+        for entry in entries
+        for profile in entry["profiles"]
+        for name in profile.split(" and ")
+    }
+
+
+# What changed in an operator present in both summaries
+def operator_change(old, new):
+    change = {}
+    added, removed = added_removed(old["typesupports"], new["typesupports"])
+    changed = [
+        mode
+        for mode in new["typesupports"]
+        if mode in old["typesupports"]
+        and old["typesupports"][mode] != new["typesupports"][mode]
+    ]
+    args_added, args_removed = added_removed(old["arguments"], new["arguments"])
+    shapes = [
+        {"argument": name, "old": old["arguments"][name]["shape"], "new": arg["shape"]}
+        for name, arg in new["arguments"].items()
+        if name in old["arguments"] and old["arguments"][name]["shape"] != arg["shape"]
+    ]
+    # Arguments changed in some other way than their shape
+    reshaped = {shape["argument"] for shape in shapes}
+    args_changed = [
+        name
+        for name, arg in new["arguments"].items()
+        if name in old["arguments"]
+        and name not in reshaped
+        and old["arguments"][name]["fingerprint"] != arg["fingerprint"]
+    ]
+    extensions = sorted(operator_extensions(new) - operator_extensions(old))
+    for key, value in [
+        ("modes_added", added),
+        ("modes_removed", removed),
+        ("modes_changed", changed),
+        ("arguments_added", args_added),
+        ("arguments_removed", args_removed),
+        ("arguments_changed", args_changed),
+        ("shapes_changed", shapes),
+        ("extensions_added", extensions),
+    ]:
+        if value:
+            change[key] = value
+    return change
+
+
+# What changed in a profile or extension present in both summaries
+def profile_change(old, new):
+    change = {}
+    if old["status"] != new["status"]:
+        change["status"] = [old["status"], new["status"]]
+    added = sorted(set(new.get("profiles", [])) - set(old.get("profiles", [])))
+    removed = sorted(set(old.get("profiles", [])) - set(new.get("profiles", [])))
+    if added:
+        change["profiles_added"] = added
+    if removed:
+        change["profiles_removed"] = removed
+    return change
+
+
+# Names and changes of the elements of kind present in both summaries whose
+# fingerprints differ. Elements with no change found by element_change
+# still show as changed.
+def changed_elements(old, new, kind, element_change):
+    changed = {}
+    for name, element in new[kind].items():
+        old_element = old[kind].get(name)
+        if old_element is None or old_element["fingerprint"] == element["fingerprint"]:
+            continue
+        changed[name] = element_change(old_element, element) or {"changed": True}
+    return dict(sorted(changed.items()))
+
+
+# Structured changes between two spec summaries. Elements are matched by
+# name and only those whose fingerprints differ are looked into, so the
+# cost is linear in the number of elements.
+def diff_summaries(old, new):
+    ops_added, ops_removed = added_removed(old["operators"], new["operators"])
+    changed = {}
+    for name, op in new["operators"].items():
+        old_op = old["operators"].get(name)
+        if old_op is None or old_op["fingerprint"] == op["fingerprint"]:
+            continue
+        # An edit to the description only still shows as a change
+        changed[name] = operator_change(old_op, op) or {"description_changed": True}
+    profiles_added, profiles_removed = added_removed(old["profiles"], new["profiles"])
+    ext_added, ext_removed = added_removed(old["extensions"], new["extensions"])
+    enums_added, enums_removed = added_removed(old["enums"], new["enums"])
+    values_added = {}
+    values_removed = {}
+    values_changed = {}
+    enums_changed = []
+    for name, enum in new["enums"].items():
+        old_enum = old["enums"].get(name)
+        if old_enum is None or old_enum["fingerprint"] == enum["fingerprint"]:
+            continue
+        added, removed = added_removed(old_enum["values"], enum["values"])
+        values = {
+            key: [old_enum["values"][key], value]
+            for key, value in enum["values"].items()
+            if key in old_enum["values"] and old_enum["values"][key] != value
+        }
+        if added:
+            values_added[name] = added
+        if removed:
+            values_removed[name] = removed
+        if values:
+            values_changed[name] = values
+        if not (added or removed or values):
+            enums_changed.append(name)
+    levels = {}
+    for name, level in new["levels"].items():
+        old_level = old["levels"].get(name)
+        if old_level is None or old_level["fingerprint"] == level["fingerprint"]:
+            continue
+        maximums = set(old_level["maximums"]) | set(level["maximums"])
+        levels[name] = {
+            key: [old_level["maximums"].get(key), level["maximums"].get(key)]
+            for key in sorted(maximums)
+            if old_level["maximums"].get(key) != level["maximums"].get(key)
+        } or {"changed": True}
+    return {
+        "from": old["version"],
+        "to": new["version"],
+        "operators": {
+            "added": [
+                {"name": name, "group": new["operators"][name]["group"]}
+                for name in ops_added
+            ],
+            "removed": ops_removed,
+            "changed": dict(sorted(changed.items())),
+        },
+        "profiles": {
+            "added": profiles_added,
+            "removed": profiles_removed,
+            "changed": changed_elements(old, new, "profiles", profile_change),
+        },
+        "extensions": {
+            "added": ext_added,
+            "removed": ext_removed,
+            "changed": changed_elements(old, new, "extensions", profile_change),
+        },
+        "enums": {
+            "added": enums_added,
+            "removed": enums_removed,
+            "changed": sorted(enums_changed),
+            "values_added": values_added,
+            "values_removed": values_removed,
+            "values_changed": values_changed,
+        },
+        "levels": {"changed": levels},
+    }
+
+
+CHANGE_LABELS = [
+    ("modes_added", "Added modes"),
+    ("modes_removed", "Removed modes"),
+    ("modes_changed", "Changed modes"),
+    ("arguments_added", "Added arguments"),
+    ("arguments_removed", "Removed arguments"),
+    ("arguments_changed", "Changed arguments"),
+    ("extensions_added", "New extensions"),
+    ("description_changed", "Description changed"),
+]
+
+PROFILE_CHANGE_LABELS = [
+    ("profiles_added", "Added profiles"),
+    ("profiles_removed", "Removed profiles"),
+    ("changed", "Changed"),
+]
+
+
+# Rows of the profile or extension table: added, removed and changed
+def profile_rows(changes):
+    rows = [[name, "Added", ""] for name in changes["added"]]
+    rows += [[name, "Removed", ""] for name in changes["removed"]]
+    for name, change in changes["changed"].items():
+        if "status" in change:
+            old, new = change["status"]
+            rows.append([name, "Changed status", f"{old} to {new}"])
+        for key, label in PROFILE_CHANGE_LABELS:
+            if key in change:
+                value = change[key]
+                rows.append([name, label, "" if value is True else ", ".join(value)])
+    return rows
+
+
+def asciidoc_table(file, header, rows):
+    file.write('[cols="' + ",".join(["1"] * len(header)) + '"]\n|===\n')
+    file.write("|" + "|".join(header) + "\n\n")
+    for row in rows:
+        file.write("|" + "|".join(row) + "\n")
+    file.write("|===\n\n")
+
+
+# Render a change set from diff_summaries as asciidoc tables in the layout
+# of chapters/changes.adoc
+def write_change_tables(change_set, file):
+    file.write(
+        "=== Changes to the TOSA specification between version "
+        f"{change_set['from']} and version {change_set['to']}\n\n"
+    )
+    ops = change_set["operators"]
+    if ops["added"]:
+        file.write("==== New operators\n\n")
+        rows = [[op["name"], op["group"]] for op in ops["added"]]
+        asciidoc_table(file, ["Operator", "Group"], rows)
+    if ops["removed"]:
+        file.write("==== Removed operators\n\n")
+        asciidoc_table(file, ["Operator"], [[name] for name in ops["removed"]])
+    if ops["changed"]:
+        rows = []
+        for name, change in sorted(ops["changed"].items()):
+            for key, label in CHANGE_LABELS:
+                if key in change:
+                    value = change[key]
+                    details = "" if value is True else ", ".join(value)
+                    rows.append([name, label, details])
+            for shape in change.get("shapes_changed", []):
+                details = f"{shape['argument']}: {shape['old']} to {shape['new']}"
+                rows.append([name, "Changed shape", details])
+        file.write("==== Changed operators\n\n")
+        asciidoc_table(file, ["Operator", "Change", "Details"], rows)
+    rows = profile_rows(change_set["profiles"])
+    if rows:
+        file.write("==== Profiles\n\n")
+        asciidoc_table(file, ["Profile", "Change", "Details"], rows)
+    rows = profile_rows(change_set["extensions"])
+    if rows:
+        file.write("==== Extensions\n\n")
+        asciidoc_table(file, ["Extension", "Change", "Details"], rows)
+    enums = change_set["enums"]
+    rows = [[name, "Added", ""] for name in enums["added"]]
+    rows += [[name, "Removed", ""] for name in enums["removed"]]
+    rows += [[name, "Changed", ""] for name in enums["changed"]]
+    for name, values in sorted(enums["values_added"].items()):
+        rows.append([name, "Added values", ", ".join(values)])
+    for name, values in sorted(enums["values_removed"].items()):
+        rows.append([name, "Removed values", ", ".join(values)])
+    for name, values in sorted(enums["values_changed"].items()):
+        details = ", ".join(
+            f"{value}: {old} to {new}" for value, (old, new) in values.items()
+        )
+        rows.append([name, "Changed values", details])
+    if rows:
+        file.write("==== Enumerations\n\n")
+        asciidoc_table(file, ["Enumeration", "Change", "Details"], rows)
+    levels = change_set["levels"]["changed"]
+    if levels:
+        rows = []
+        for name, maximums in sorted(levels.items()):
+            if maximums.get("changed") is True:
+                rows.append([name, "", "Changed"])
+                continue
+            for key, (old, new) in maximums.items():
+                rows.append([name, key.upper(), f"{old} to {new}"])
+        file.write("==== Levels\n\n")
+        asciidoc_table(file, ["Level", "Maximum", "Change"], rows)
+
+
+# Parse "12-40,57,90-91" into a list of inclusive (first, last) line ranges
+def parse_line_ranges(text):
+    ranges = []
+    for part in text.split(","):
+        m = re.fullmatch(r"\s*(\d+)(?:-(\d+))?\s*", part)
+        if not m:
+            raise RuntimeError(f"Invalid line range {part}")
+        first = int(m.group(1))
+        last = int(m.group(2)) if m.group(2) else first
+        if last < first:
+            raise RuntimeError(f"Invalid line range {part}")
+        ranges.append((first, last))
+    return ranges
+
+
+# Line spans of operators, enums and levels in the XML text, as a list of
+# (kind, name, first, last) with 1-based inclusive line numbers
+def element_line_spans(xmlpath):
+    start_patterns = [
+        ("operator", re.compile(r"<operator>"), re.compile(r"</operator>")),
+        ("enum", re.compile(r"<enum\s"), re.compile(r"</enum>")),
+        ("level", re.compile(r"<level\s"), re.compile(r"</level>")),
+    ]
+    op_name = re.compile(r"<name>\s*(\w+)\s*</name>")
+    attr_name = re.compile(r"\bname=[\"'](\w+)[\"']")
+
+    spans = []
+    current = None
+    with open(xmlpath, "r") as f:
+        for lineno, line in enumerate(f, start=1):
+            if current is None:
+                for kind, start, end in start_patterns:
+                    if start.search(line):
+                        m = attr_name.search(line) if kind != "operator" else None
+                        current = [kind, m.group(1) if m else None, lineno, end]
+                        break
+            if current is None:
+                continue
+            if current[1] is None and current[0] == "operator":
+                m = op_name.search(line)
+                if m:
+                    current[1] = m.group(1)
+            if current[3].search(line):
+                spans.append((current[0], current[1], current[2], lineno))
+                current = None
+    return spans
+
+
+# Map changed line ranges of the new XML onto elements. Lines outside any
+# operator, enum or level (profiles, version, removed elements) can not be
+# attributed, so they are reported as a global change.
+def changes_from_line_ranges(xmlpath, ranges):
+    spans = element_line_spans(xmlpath)
+    changes = TOSASpecChanges()
+    for first, last in ranges:
+        line = first
+        while line <= last:
+            span = next((s for s in spans if s[2] <= line <= s[3]), None)
+            if span is None or span[1] is None:
+                changes.is_global = True
+                return changes
+            kind, name, _, span_last = span
+            if kind == "operator":
+                changes.operators.add(name)
+            elif kind == "enum":
+                changes.enums.add(name)
+            else:
+                changes.levels.add(name)
+            line = span_last + 1
+    return changes
+
+
+def add_change_arguments(parser):
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(
+        "--base",
+        required=False,
+        help="Only process elements changed since this git revision",
+    )
+    group.add_argument(
+        "--changed-lines",
+        required=False,
+        help="Only process elements touching these XML lines, e.g. 12-40,57",
+    )
+
+
+# For the tools that regenerate their outputs by the manifest written to the
+# output directory rather than by --base or --changed-lines
+def add_incremental_argument(parser):
+    parser.add_argument(
+        "--incremental",
+        required=False,
+        action="store_true",
+        help="Only regenerate the outputs of elements changed since the spec "
+        "recorded in the output directory, or all of them if none is recorded",
+    )
+
+
+# Changes selected by the --base/--changed-lines arguments, or None for a
+# full run
+def changes_from_arguments(args, xmlroot):
+    if args.base is not None:
+        return diff_against_revision(args.xml, xmlroot, args.base)
+    if args.changed_lines is not None:
+        return changes_from_line_ranges(args.xml, parse_line_ranges(args.changed_lines))
+    return None
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--xml", required=True, help="Path to specification XML")
+    add_change_arguments(parser)
+    parser.add_argument(
+        "--old-xml",
+        required=False,
+        help="Path to the earlier specification XML for the json and asciidoc "
+        "formats, instead of --base",
+    )
+    parser.add_argument(
+        "--format",
+        required=False,
+        choices=["summary", "json", "asciidoc"],
+        default="summary",
+        help="Print the changed elements, or the change set as JSON or as "
+        "asciidoc tables",
+    )
+    parser.add_argument(
+        "--output", required=False, help="Write the change set to this path"
+    )
+    parser.add_argument(
+        "--fingerprint-cache",
+        required=False,
+        help="Path to a cache of spec summaries by file content, so that "
+        "unchanged specs are not parsed again",
+    )
+    args = parser.parse_args()
+
+    if args.format == "summary":
+        try:
+            xmlroot = ET.parse(args.xml).getroot()
+            changes = changes_from_arguments(args, xmlroot)
+            if changes is None:
+                changes = TOSASpecChanges(is_global=True)
+        except RuntimeError as e:
+            print(f"Failure comparing XML spec: {str(e)}")
+            exit(1)
+        print(changes)
+        exit(0)
+
+    if (args.old_xml is None) == (args.base is None):
+        print("Failure: the json and asciidoc formats need one of --old-xml, --base")
+        exit(1)
+    cache = SpecSummaryCache(args.fingerprint_cache)
+    try:
+        if args.old_xml is not None:
+            with open(args.old_xml, "rb") as f:
+                old_content = f.read()
+        else:
+            old_content = read_xml_revision(args.xml, args.base)
+        with open(args.xml, "rb") as f:
+            new_content = f.read()
+        change_set = diff_summaries(
+            cache.summary(old_content), cache.summary(new_content)
+        )
+        cache.save()
+    except (OSError, RuntimeError, ET.ParseError) as e:
+        print(f"Failure comparing XML spec: {str(e)}")
+        exit(1)
+    file = open(args.output, "w") if args.output else sys.stdout
+    if args.format == "json":
+        json.dump(change_set, file, indent=2)
+        file.write("\n")
+    else:
+        write_change_tables(change_set, file)
+    if args.output:
+        file.close()
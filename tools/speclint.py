@@ -1,103 +1,356 @@
 #!/usr/bin/env python3
 # Copyright (c) 2023-2026, ARM Limited.
 # SPDX-License-Identifier: Apache-2.0
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import compliance_data_exporter
+import spec_schema
+import spec_trace
+import specdiff
 import tosa
 
+# Lint rules, keyed by the node type they are visited for. Each rule is a
+# generator yielding warning strings:
+#   operator rules:    rule(op)
+#   argument rules:    rule(op, arg)
+#   typesupport rules: rule(op, typesupport)
+#   enum rules:        rule(enum)
+LINT_RULES = {
+    "operator": [],
+    "argument": [],
+    "typesupport": [],
+    "enum": [],
+}
+
+# Settings read by rules, adjustable from the command line
+LINT_CONFIG = {
+    "max_tuples": 256,
+}
+
+LINT_CACHE_FORMAT = 1
+
+
+def lint_rule(node_type):
+    if node_type not in LINT_RULES:
+        raise RuntimeError(f"Unknown lint rule node type {node_type}")
+
+    def register(rule):
+        LINT_RULES[node_type].append(rule)
+        return rule
+
+    return register
+
+
+@lint_rule("operator")
+def check_argument_categories(op):
+    argtypes = ["input", "attribute", "output"]
+    current_argtype = 0
+    for arg in op.arguments:
+        # Arguments should only be in one category
+        cats = arg.categories
+        if len(cats) > 1:
+            yield f"Operator {op.name} argument in more than one category: {arg.name}"
+        i = argtypes.index(cats[0].name)
+
+        # Arguments should be kept as inputs/attributes/outputs
+        if i < current_argtype:
+            yield (
+                f"Operator {op.name} argument {arg.name} is type {cats[0].name}"
+                " out of proper order"
+            )
+        current_argtype = i
+
+
+@lint_rule("argument")
+def check_argument_single_category(op, arg):
+    # Check for an argument in multiple categories. This used to be
+    # supported, but is no longer recommended
+    if len(arg.categories) > 1:
+        yield f"Operator {op.name} argument {arg.name} is in multiple categories"
+
+
+@lint_rule("argument")
+def check_rank0_tensor_attribute(op, arg):
+    # Check for a rank 0 tensor attribute. This is now deprecated usage
+    if (
+        arg.categories[0].name == "attribute"
+        and arg.type == "tensor_t"
+        and arg.rank[0] == "0"
+        and arg.rank[1] == "0"
+    ):
+        yield (
+            f"Operator {op.name} tensor attribute argument {arg.name}"
+            " is always rank 0"
+        )
+
+
+@lint_rule("argument")
+def check_rank_on_non_tensor(op, arg):
+    # Check for non-tensor argument with rank specified
+    if arg.type not in ["shape_t", "tensor_t", "tensor_list_t"] and len(arg.rank) > 0:
+        yield (
+            f"Operator {op.name} argument which is not tensor_t, "
+            f"shape_t, or tensor_list_t {arg.name} "
+            "has rank specified"
+        )
+
+
+@lint_rule("typesupport")
+def check_typesupport_types(op, typesupport):
+    # Check that all types are defined for each typesupport
+    # and that there are no extras
+    for tytuple in typesupport.generated_tuples:
+        for t in tytuple:
+            if tytuple[t] is None:
+                yield f"Operator {op.name} mode {typesupport.mode} type {t} not found"
+    known_keys = ["mode", "version_added"]
+    for k in typesupport.tskeys:
+        if k not in known_keys and k not in op.types:
+            yield (
+                f"Operator {op.name} mode {typesupport.mode}"
+                f" has an unexpected key {k}"
+            )
+
+
+@lint_rule("typesupport")
+def check_typesupport_tuple_count(op, typesupport):
+    # Every generated tuple is carried by the model and exported, so a
+    # large Cartesian product slows down all downstream tools
+    count = tosa.typesupport_tuple_count(typesupport)
+    if count > LINT_CONFIG["max_tuples"]:
+        yield (
+            f"Operator {op.name} mode {typesupport.mode} expands to {count}"
+            f" type tuples, more than {LINT_CONFIG['max_tuples']}"
+        )
+
+
+@lint_rule("enum")
+def check_enum_values_unique(enum):
+    names = set()
+    values = set()
+    for name, value, _, _ in enum.values:
+        if name in names:
+            yield f"Enum {enum.name} repeats value name {name}"
+        if value in values:
+            yield f"Enum {enum.name} value {name} reuses value {value}"
+        names.add(name)
+        values.add(value)
+
+
+# Single traversal of an operator, visiting each registered rule for the
+# operator itself, then its arguments, then its typesupports. Module level
+# so that it can be dispatched to worker processes.
+def lint_operator_rules(op):
+    warnings = []
+    for rule in LINT_RULES["operator"]:
+        warnings.extend(rule(op))
+    for arg in op.arguments:
+        for rule in LINT_RULES["argument"]:
+            warnings.extend(rule(op, arg))
+    for typesupport in op.typesupports:
+        for rule in LINT_RULES["typesupport"]:
+            warnings.extend(rule(op, typesupport))
+    return warnings
+
+
+# Values a type column takes across the tuples of a typesupport
+def typesupport_column_values(typesupport, ty):
+    if ty not in typesupport.type_bindings:
+        value = typesupport.tymap.get(ty)
+        return [] if value is None else [value]
+    type_sets = dict(typesupport.type_sets)
+    values = tosa.expand_type_set_values(type_sets[typesupport.type_bindings[ty]])
+    if ty in typesupport.type_binding_access_elem_type:
+        values = sorted({tosa.access_elem_type(value) for value in values})
+    return values
+
+
+def tuple_bytes(length):
+    return sys.getsizeof(()) + 8 * length
+
+
+# Estimated cost of a typesupport as (tuples, model bytes, export bytes).
+# Sizes are derived from the type sets, the product is not materialized.
+# The model holds the tuples column-major, see TOSATypeTuples: the table,
+# its tuple of columns, one entry per tuple only in the columns that vary
+# and the tymap row view. Keys and type names are shared between
+# typesupports and not counted.
+def estimate_typesupport_cost(op, typesupport):
+    tuples = tosa.typesupport_tuple_count(typesupport)
+    varying = sum(
+        len(typesupport_column_values(typesupport, ty)) > 1 for ty in op.types
+    )
+    model_bytes = (
+        sys.getsizeof(tosa.TOSATypeTuples.__new__(tosa.TOSATypeTuples))
+        + sys.getsizeof(tosa.TOSATypeTuple(None, 0))
+        + tuple_bytes(len(op.types))
+        + varying * tuple_bytes(tuples)
+    )
+
+    # One row per tuple in each compliance map the typesupport appears in,
+    # see print_argument_compliances for the layout
+    row_bytes = len("{{}, SpecificationVersion::V_1_0}, ")
+    for arg in compliance_data_exporter.get_required_arguments_info(op):
+        sym_ty = arg.tensor_element_type if arg.tensor_element_type != "-" else "acc_t"
+        values = typesupport_column_values(typesupport, sym_ty)
+        if len(values) == 0:
+            continue
+        names = [
+            compliance_data_exporter.validation_term_mapping_type.get(v, v)
+            for v in values
+        ]
+        row_bytes += sum(len(name) for name in names) / len(names) + 2
+    profiles = [p for ps in typesupport.profiles for p in ps.split(" and ")]
+    maps = sum(
+        any(compliance_data_exporter.is_matched_print_mode(p, mode) for p in profiles)
+        for mode in ("Profile", "Extension")
+    )
+    export_bytes = int(tuples * row_bytes * maps)
+    return tuples, model_bytes, export_bytes
+
+
+def print_cost_report(spec, file=sys.stdout):
+    rows = []
+    for group in spec.operatorgroups:
+        for op in group.operators:
+            for typesupport in op.typesupports:
+                cost = estimate_typesupport_cost(op, typesupport)
+                rows.append((cost, op.name, typesupport.mode))
+    rows.sort(key=lambda row: (-row[0][0], -row[0][2], row[1], row[2]))
+
+    file.write(f"{'Tuples':>8} {'Model':>10} {'Export':>10}  Operator / mode\n")
+    for (tuples, model_bytes, export_bytes), name, mode in rows:
+        file.write(
+            f"{tuples:>8} {model_bytes:>10} {export_bytes:>10}  {name} / {mode}\n"
+        )
+    total = [sum(row[0][i] for row in rows) for i in range(3)]
+    file.write(f"{total[0]:>8} {total[1]:>10} {total[2]:>10}  Total\n")
+
+
+# Identifies the rule set that produced cached results. Any change to the
+# linter, its settings or to how the model is loaded invalidates the cache.
+def lint_rules_fingerprint():
+    digest = hashlib.sha256(str(LINT_CACHE_FORMAT).encode())
+    digest.update(json.dumps(LINT_CONFIG, sort_keys=True).encode())
+    for path in (__file__, tosa.__file__):
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+class TOSASpecLintCache:
+    def __init__(self, path):
+        self.path = path
+        self.rules = None
+        self.operators = {}
+        if path is not None:
+            self.rules = lint_rules_fingerprint()
+        if path is not None and os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+            if data.get("rules") == self.rules:
+                self.operators = data.get("operators", {})
+        self.used = {}
+
+    def lookup(self, op):
+        warnings = self.operators.get(op.fingerprint)
+        if warnings is not None:
+            self.used[op.fingerprint] = warnings
+        return warnings
+
+    def store(self, op, warnings):
+        self.used[op.fingerprint] = warnings
+
+    def save(self):
+        if self.path is None:
+            return
+        # Only keep entries for operators seen in this run, so the cache
+        # does not grow without bound as operators are edited
+        with open(self.path, "w") as f:
+            json.dump({"rules": self.rules, "operators": self.used}, f)
+
 
 class TOSASpecLinter:
-    def __init__(self, spec):
+    def __init__(self, spec, cache=None, jobs=1):
         self.spec = spec
         self.warnings = 0
+        self.cache = cache if cache is not None else TOSASpecLintCache(None)
+        self.jobs = jobs
 
     def WARN(self, string):
         print(string)
         self.warnings += 1
 
     def lint_enum(self, enum):
-        pass
-
-    def lint_argument(self, operator, arg):
-        # Check for an argument in multiple categories. This used to be
-        # supported, but is no longer recommended
-        if len(arg.categories) > 1:
-            self.WARN(
-                f"Operator {operator.name} argument {arg.name}"
-                " is in multiple categories"
-            )
-        # Check for a rank 0 tensor attribute. This is now deprecated usage
-        if (
-            arg.categories[0].name == "attribute"
-            and arg.type == "tensor_t"
-            and arg.rank[0] == "0"
-            and arg.rank[1] == "0"
-        ):
-            self.WARN(
-                f"Operator {operator.name} tensor attribute argument {arg.name}"
-                " is always rank 0"
-            )
-        # Check for non-tensor argument with rank specified
-        if (
-            arg.type not in ["shape_t", "tensor_t", "tensor_list_t"]
-            and len(arg.rank) > 0
-        ):
-            self.WARN(
-                f"Operator {operator.name} argument which is not tensor_t, "
-                f"shape_t, or tensor_list_t {arg.name} "
-                "has rank specified"
-            )
-
-    def lint_typesupport(self, typesupport, op):
-        # Check that all types are defined for each typesupport
-        # and that there are no extras
-        for tytuple in typesupport.generated_tuples:
-            for t in tytuple:
-                if tytuple[t] is None:
-                    self.WARN(
-                        f"Operator {op.name} mode {typesupport.mode} type {t} not found"
-                    )
-        known_keys = ["mode", "version_added"]
-        for k in typesupport.tskeys:
-            if k not in known_keys and k not in op.types:
-                self.WARN(
-                    f"Operator {op.name} mode {typesupport.mode}"
-                    f" has an unexpected key {k}"
-                )
+        for rule in LINT_RULES["enum"]:
+            for warning in rule(enum):
+                self.WARN(warning)
 
     def lint_operator(self, op):
-        argtypes = ["input", "attribute", "output"]
-        current_argtype = 0
-        for arg in op.arguments:
-            # Arguments should only be in one category
-            cats = arg.categories
-            if len(cats) > 1:
-                self.WARN(
-                    f"Operator {op.name} argument in more than one category: {arg.name}"
-                )
-            i = argtypes.index(cats[0].name)
-
-            # Arguments should be kept as inputs/attributes/outputs
-            if i < current_argtype:
-                self.WARN(
-                    f"Operator {op.name} argument {arg.name} is type {cats[0].name}"
-                    " out of proper order"
-                )
-            current_argtype = i
-            self.lint_argument(op, arg)
-        for typesupport in op.typesupports:
-            self.lint_typesupport(typesupport, op)
-
-    def lint(self, args):
+        for warning in lint_operator_rules(op):
+            self.WARN(warning)
+
+    def lint_operators(self, ops):
+        results = {}
+        pending = []
+        for op in ops:
+            warnings = self.cache.lookup(op)
+            if warnings is None:
+                pending.append(op)
+            else:
+                results[op.name] = warnings
+
+        if self.jobs > 1 and len(pending) > 1:
+            with ProcessPoolExecutor(
+                max_workers=self.jobs,
+                initializer=LINT_CONFIG.update,
+                initargs=(dict(LINT_CONFIG),),
+            ) as executor:
+                computed = list(executor.map(lint_operator_rules, pending))
+        else:
+            computed = [lint_operator_rules(op) for op in pending]
+
+        for op, warnings in zip(pending, computed):
+            self.cache.store(op, warnings)
+            results[op.name] = warnings
+
+        # Report in specification order regardless of where results came from
+        for op in ops:
+            for warning in results[op.name]:
+                self.WARN(warning)
+        return len(pending)
+
+    def lint(self, args, changes=None):
         # Generate version information
         major = self.spec.version_major
         minor = self.spec.version_minor
         patch = self.spec.version_patch
         if args.verbose:
             print(f"Running on specification version {major}.{minor}.{patch}")
-        for group in self.spec.operatorgroups:
-            for op in group.operators:
-                self.lint_operator(op)
+        if changes is None:
+            changes = specdiff.TOSASpecChanges(is_global=True)
+        elif args.verbose:
+            print(f"Linting changed elements only ({changes})")
+        ops = [
+            op
+            for group in self.spec.operatorgroups
+            for op in group.operators
+            if changes.operator_changed(op.name)
+        ]
+        linted = self.lint_operators(ops)
+        if args.verbose:
+            print(f"Linted {linted} of {len(ops)} operators")
         for enum in self.spec.enums:
-            self.lint_enum(enum)
+            if changes.enum_changed(enum.name):
+                self.lint_enum(enum)
+        self.cache.save()
 
 
 if __name__ == "__main__":
@@ -112,16 +365,55 @@ if __name__ == "__main__":
         action="store_true",
         help="Run in verbose mode",
     )
+    parser.add_argument(
+        "--cache",
+        required=False,
+        help="Path to a lint result cache, only changed operators are re-linted",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        required=False,
+        type=int,
+        default=1,
+        help="Number of worker processes used to lint operators",
+    )
+    parser.add_argument(
+        "--max-tuples",
+        required=False,
+        type=int,
+        default=LINT_CONFIG["max_tuples"],
+        help="Warn when a typesupport expands to more type tuples than this",
+    )
+    parser.add_argument(
+        "--cost-report",
+        required=False,
+        action="store_true",
+        help="Print the tuple count and estimated sizes of every typesupport",
+    )
+    specdiff.add_change_arguments(parser)
+    spec_schema.add_schema_arguments(parser)
+    spec_trace.add_trace_argument(parser)
     args = parser.parse_args()
+    spec_trace.trace_from_arguments(args)
+    LINT_CONFIG["max_tuples"] = args.max_tuples
 
     try:
-        spec = tosa.TOSASpec(args.xml)
+        spec = tosa.TOSASpec(
+            args.xml,
+            schema=args.schema,
+            schema_cache=spec_schema.schema_cache_from_arguments(args),
+        )
+        changes = specdiff.changes_from_arguments(args, spec.xmlroot)
     except RuntimeError as e:
         print(f"Failure reading/validating XML spec: {str(e)}")
         exit(1)
 
-    generator = TOSASpecLinter(spec)
-    generator.lint(args)
+    if args.cost_report:
+        print_cost_report(spec)
+
+    generator = TOSASpecLinter(spec, TOSASpecLintCache(args.cache), args.jobs)
+    generator.lint(args, changes)
     if generator.warnings > 0:
         print(f"{generator.warnings} warnings encountered")
         exit(1)
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# Copyright (c) 2026, ARM Limited.
+# SPDX-License-Identifier: Apache-2.0
+# Single entry point for the specification build. The XML is parsed once
+# and the stages that need it, lint, asciidoc generation, compliance export
+# and compliance verification, run in one process on the shared model.
+# Stages form a graph through their dependencies and every stage whose
+# dependencies have finished runs alongside the others in a thread pool.
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+
+import compliance_data_exporter
+import compliance_data_verifier
+import spec_schema
+import spec_trace
+import specdiff
+import sqlite_exporter
+import tosa
+from genspec import TOSASpecAsciidocGenerator
+from speclint import TOSASpecLintCache
+from speclint import TOSASpecLinter
+
+
+class PipelineError(RuntimeError):
+    pass
+
+
+class PipelineStage:
+    def __init__(self, name, run, depends=()):
+        self.name = name
+        self.run = run
+        self.depends = tuple(depends)
+
+
+# What the stages share: the command line arguments, then the parsed
+# specification once the parse stage has run
+class PipelineContext:
+    def __init__(self, args):
+        self.args = args
+        self.spec = None
+
+
+def stage_parse(ctx):
+    ctx.spec = tosa.TOSASpec(
+        ctx.args.xml,
+        schema=ctx.args.schema,
+        schema_cache=spec_schema.schema_cache_from_arguments(ctx.args),
+    )
+
+
+def stage_lint(ctx):
+    linter = TOSASpecLinter(ctx.spec, TOSASpecLintCache(ctx.args.lint_cache))
+    linter.lint(ctx.args)
+    if linter.warnings > 0:
+        raise PipelineError(f"{linter.warnings} warnings encountered")
+
+
+def stage_asciidoc(ctx):
+    TOSASpecAsciidocGenerator(ctx.spec).generate(ctx.args.outdir, ctx.args.incremental)
+
+
+def stage_compliance(ctx):
+    os.makedirs(ctx.args.outdir, exist_ok=True)
+    compliance_data_exporter.print_profiles_extensions(
+        ctx.spec, ctx.args.outdir, ctx.args.incremental
+    )
+
+
+# Checks the compliance data as the exporter builds it rather than the
+# written compliance.meta, so it does not wait for the export
+def stage_verify(ctx):
+    compliance_data_verifier.verify_spec_compliance(ctx.spec)
+
+
+def stage_sqlite(ctx):
+    sqlite_exporter.export_spec(ctx.spec, ctx.args.sqlite)
+
+
+PIPELINE_STAGES = [
+    PipelineStage("parse", stage_parse),
+    PipelineStage("lint", stage_lint, ["parse"]),
+    PipelineStage("asciidoc", stage_asciidoc, ["parse"]),
+    PipelineStage("compliance", stage_compliance, ["parse"]),
+    PipelineStage("verify", stage_verify, ["parse"]),
+    PipelineStage("sqlite", stage_sqlite, ["parse"]),
+]
+
+DEFAULT_STAGES = ["lint", "asciidoc", "compliance", "verify"]
+
+
+class TOSASpecPipeline:
+    def __init__(self, stages=PIPELINE_STAGES, jobs=4):
+        self.stages = {stage.name: stage for stage in stages}
+        self.jobs = jobs
+        self.timings = {}
+        self.failures = {}
+
+    # The named stages and every stage they depend on, in definition order
+    def select(self, names):
+        selected = set()
+        pending = list(names)
+        while pending:
+            name = pending.pop()
+            if name not in self.stages:
+                raise PipelineError(f"Unknown pipeline stage {name}")
+            if name not in selected:
+                selected.add(name)
+                pending.extend(self.stages[name].depends)
+        return [name for name in self.stages if name in selected]
+
+    def run_stage(self, stage, ctx):
+        start = time.perf_counter()
+        try:
+            with spec_trace.span(stage.name, category="stage"):
+                stage.run(ctx)
+        finally:
+            self.timings[stage.name] = time.perf_counter() - start
+
+    # Run the named stages, starting each one as soon as its dependencies
+    # have finished. Stages that depend on a failed stage are skipped.
+    def run(self, ctx, names=DEFAULT_STAGES):
+        waiting = self.select(names)
+        done = set()
+        running = {}
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            while waiting or running:
+                for name in list(waiting):
+                    depends = self.stages[name].depends
+                    if any(dep in self.failures for dep in depends):
+                        self.failures[name] = "skipped"
+                        waiting.remove(name)
+                    elif all(dep in done for dep in depends):
+                        future = executor.submit(self.run_stage, self.stages[name], ctx)
+                        running[future] = name
+                        waiting.remove(name)
+                if not running:
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        future.result()
+                        done.add(name)
+                    except (OSError, RuntimeError) as e:
+                        self.failures[name] = str(e)
+        self.timings["total"] = time.perf_counter() - start
+        return not self.failures
+
+    def print_report(self, file=sys.stdout):
+        print(f"{'Stage':<12} {'Seconds':>8}  Result", file=file)
+        for name in list(self.stages) + ["total"]:
+            if name in self.timings:
+                seconds = f"{self.timings[name]:8.3f}"
+            elif name in self.failures:
+                seconds = f"{'-':>8}"
+            else:
+                continue
+            result = self.failures.get(name, "ok" if name != "total" else "")
+            print(f"{name:<12} {seconds}  {result}".rstrip(), file=file)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--xml", required=True, help="Path to specification XML")
+    parser.add_argument("--outdir", required=True, help="Output directory")
+    parser.add_argument(
+        "--stages",
+        required=False,
+        default=",".join(DEFAULT_STAGES),
+        help="Comma separated stages to run, with the stages they depend on. "
+        f"Available: {', '.join(stage.name for stage in PIPELINE_STAGES)}",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        required=False,
+        type=int,
+        default=4,
+        help="Number of stages to run at the same time",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        required=False,
+        action="store_true",
+        help="Run in verbose mode",
+    )
+    parser.add_argument(
+        "--lint-cache",
+        required=False,
+        help="Path to a lint result cache, only changed operators are re-linted",
+    )
+    parser.add_argument(
+        "--sqlite",
+        required=False,
+        help="Path of the SQLite database the sqlite stage updates",
+    )
+    specdiff.add_incremental_argument(parser)
+    spec_schema.add_schema_arguments(parser)
+    spec_trace.add_trace_argument(parser)
+    args = parser.parse_args()
+    spec_trace.trace_from_arguments(args)
+
+    names = [name for name in args.stages.split(",") if name]
+    if "sqlite" in names and not args.sqlite:
+        print("Failure: the sqlite stage needs --sqlite")
+        exit(1)
+
+    pipeline = TOSASpecPipeline(jobs=args.jobs)
+    try:
+        ok = pipeline.run(PipelineContext(args), names)
+    except RuntimeError as e:
+        print(f"Failure running the pipeline: {str(e)}")
+        exit(1)
+    pipeline.print_report()
+    exit(0 if ok else 1)
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+# Copyright (c) 2026, ARM Limited.
+# SPDX-License-Identifier: Apache-2.0
+# In-process spell check of the specification descriptions. Prints the
+# sorted unique list of unknown words, like
+#   get_descriptions.py | aspell list | sort -u
+import hashlib
+import json
+import os
+import re
+import subprocess
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+
+from get_descriptions import extract_descriptions
+
+SPELL_CACHE_FORMAT = 3
+
+# Letters with apostrophes inside, as aspell splits words. Digits and
+# underscores end a word, so fp32_t is checked as fp and t.
+WORD = re.compile(r"(?<![^\W\d_'])([^\W\d_]+(?:'[^\W\d_]+)*)(?![^\W\d_])")
+# URLs, which aspell's url filter skips. Inline code and attribute
+# references are checked as aspell checks them.
+NOT_PROSE = re.compile(r"https?://\S+")
+
+# Words loaded by each worker process, see init_worker
+_worker_words = None
+
+
+# The words a spell check accepts, with the upper case form of each for
+# aspell's case rules, see is_known_word
+class SpellWords:
+    def __init__(self, words):
+        self.words = frozenset(words)
+        self.upper = frozenset(word.upper() for word in self.words)
+
+
+def load_words(paths):
+    words = set()
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            for lineno, line in enumerate(f):
+                # Skip the aspell personal dictionary header
+                if lineno == 0 and line.startswith("personal_ws-"):
+                    continue
+                # aspell expand prints all forms of a word on one line
+                words.update(line.split())
+    return SpellWords(words)
+
+
+# The case rules of aspell: a word matches a dictionary word as written,
+# in upper case, and in title case when the dictionary word is lower case.
+# Affixed forms are in the word list already, aspell expand writes them.
+def is_known_word(word, words):
+    if len(word) <= 1 or word in words.words:
+        return True
+    if word.isupper():
+        return word in words.upper
+    if word[0].isupper() and word[1:] == word[1:].lower():
+        return word.lower() in words.words
+    return False
+
+
+def tokenize(lines):
+    for line in lines:
+        for m in WORD.finditer(NOT_PROSE.sub(" ", line)):
+            yield m.group(1)
+
+
+def extract_xml_descriptions(text):
+    root = ET.fromstring(text)
+    for element in root.iter():
+        if element.tag == "description" and element.text:
+            yield element.text
+        description = element.get("description")
+        if description:
+            yield description
+
+
+def extract_file_descriptions(name, text):
+    if name.endswith(".xml"):
+        return extract_xml_descriptions(text)
+    return extract_descriptions(name, text.splitlines(keepends=True))
+
+
+def unknown_words(name, text, words):
+    return sorted(
+        {
+            word
+            for word in tokenize(extract_file_descriptions(name, text))
+            if not is_known_word(word, words)
+        }
+    )
+
+
+def init_worker(words):
+    global _worker_words
+    _worker_words = words
+
+
+def worker_unknown_words(name, text):
+    return unknown_words(name, text, _worker_words)
+
+
+# Cache key of a file. The license chapter is extracted differently from
+# other chapters, so the way the file is extracted is part of the key.
+def file_key(name, text):
+    digest = hashlib.sha256(text.encode())
+    digest.update(b"\0")
+    if name.endswith(".xml"):
+        digest.update(b"xml")
+    elif name == "chapters/tosa_license.adoc":
+        digest.update(b"license")
+    return digest.hexdigest()
+
+
+def words_fingerprint(paths):
+    digest = hashlib.sha256(str(SPELL_CACHE_FORMAT).encode())
+    for path in paths:
+        with open(path, "rb") as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    digest.update(WORD.pattern.encode())
+    digest.update(NOT_PROSE.pattern.encode())
+    return digest.hexdigest()
+
+
+class SpellCheckCache:
+    def __init__(self, path, wordlists):
+        self.path = path
+        self.words = words_fingerprint(wordlists) if path is not None else None
+        self.files = {}
+        if path is not None and os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+            if data.get("words") == self.words:
+                self.files = data.get("files", {})
+        self.used = {}
+
+    def lookup(self, key):
+        result = self.files.get(key)
+        if result is not None:
+            self.used[key] = result
+        return result
+
+    def store(self, key, result):
+        self.used[key] = result
+
+    def save(self):
+        if self.path is None:
+            return
+        with open(self.path, "w") as f:
+            json.dump({"words": self.words, "files": self.used}, f)
+
+
+def read_text(name):
+    try:
+        with open(name, "r", encoding="utf-8") as f:
+            return f.read()
+    except UnicodeDecodeError as e:
+        raise RuntimeError(f"{name} is not valid UTF-8: {str(e)}")
+
+
+# The unknown words aspell lists for the descriptions of filenames, as the
+# spell check did before it ran in process. Used to compare the two.
+def aspell_unknown_words(filenames, dictionary, aspell="aspell"):
+    lines = []
+    for name in filenames:
+        lines.extend(
+            line.rstrip("\n")
+            for line in extract_file_descriptions(name, read_text(name))
+        )
+    try:
+        result = subprocess.run(
+            [
+                aspell,
+                "list",
+                "-l",
+                "en-US",
+                "--encoding=UTF-8",
+                f"--add-extra-dicts={os.path.abspath(dictionary)}",
+            ],
+            input="\n".join(lines) + "\n",
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"aspell failed: {e.stderr.strip()}")
+    return sorted(set(result.stdout.split()))
+
+
+# Returns the sorted unknown words over all files. The word lists are only
+# loaded when a file is not in the cache.
+def spellcheck(filenames, wordlists, cache, jobs=1):
+    unknown = set()
+    pending = []
+    for name in filenames:
+        text = read_text(name)
+        key = file_key(name, text)
+        result = cache.lookup(key)
+        if result is None:
+            pending.append((key, name, text))
+        else:
+            unknown.update(result)
+
+    words = load_words(wordlists) if pending else SpellWords(())
+    if jobs > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(
+            max_workers=jobs, initializer=init_worker, initargs=(words,)
+        ) as executor:
+            results = list(
+                executor.map(
+                    worker_unknown_words,
+                    [name for _, name, _ in pending],
+                    [text for _, _, text in pending],
+                )
+            )
+    else:
+        results = [unknown_words(name, text, words) for _, name, text in pending]
+
+    for (key, _, _), result in zip(pending, results):
+        cache.store(key, result)
+        unknown.update(result)
+    cache.save()
+    return sorted(unknown)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "filenames",
+        nargs="+",
+        help="asciidoc files, or specification XML, to spell check",
+    )
+    parser.add_argument(
+        "--dictionary",
+        required=False,
+        default=os.path.join(os.path.dirname(__file__), "dictionary.dic"),
+        help="Path to the project dictionary",
+    )
+    parser.add_argument(
+        "--wordlist",
+        required=True,
+        action="append",
+        help="Path to a base word list, one or more words per line",
+    )
+    parser.add_argument(
+        "--cache",
+        required=False,
+        help="Path to a result cache, unchanged files are not checked again",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        required=False,
+        type=int,
+        default=1,
+        help="Number of worker processes used to check files",
+    )
+    parser.add_argument(
+        "--compare-aspell",
+        required=False,
+        action="store_true",
+        help="Also run aspell list over the same descriptions and print the "
+        "words only one of the two reports",
+    )
+    args = parser.parse_args()
+
+    try:
+        wordlists = [args.dictionary] + args.wordlist
+        result = spellcheck(
+            args.filenames, wordlists, SpellCheckCache(args.cache, wordlists), args.jobs
+        )
+        if args.compare_aspell:
+            aspell_result = aspell_unknown_words(args.filenames, args.dictionary)
+    except (OSError, RuntimeError, ET.ParseError) as e:
+        print(f"Failure running spell check: {str(e)}")
+        exit(1)
+    if args.compare_aspell:
+        differences = [f"aspell only: {w}" for w in aspell_result if w not in result]
+        differences += [
+            f"spellcheck only: {w}" for w in result if w not in aspell_result
+        ]
+        for line in differences:
+            print(line)
+        exit(1 if differences else 0)
+    for word in result:
+        print(word)
@@ -0,0 +1,566 @@
+#!/usr/bin/env python3
+# Copyright (c) 2026, ARM Limited.
+# SPDX-License-Identifier: Apache-2.0
+# Export of the specification model to a normalized SQLite database, and a
+# reader answering queries on it without parsing the XML. The export is
+# incremental: the fingerprints of the exported elements are kept in the
+# database and only the rows of changed operators, enums and levels are
+# written again.
+import os
+import sqlite3
+
+import specdiff
+import tosa
+from tosa import tuple_requirements
+
+# Increased with every change of the tables below, which makes the next
+# export a full one
+SCHEMA_VERSION = 1
+
+SCHEMA = [
+    """CREATE TABLE meta (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    ) WITHOUT ROWID""",
+    """CREATE TABLE fingerprints (
+        kind TEXT,
+        name TEXT,
+        fingerprint TEXT,
+        PRIMARY KEY (kind, name)
+    ) WITHOUT ROWID""",
+    """CREATE TABLE profiles (
+        name TEXT PRIMARY KEY,
+        profile TEXT,
+        description TEXT,
+        status TEXT
+    ) WITHOUT ROWID""",
+    """CREATE TABLE extensions (
+        name TEXT PRIMARY KEY,
+        description TEXT,
+        status TEXT
+    ) WITHOUT ROWID""",
+    """CREATE TABLE extension_profiles (
+        extension TEXT,
+        profile TEXT,
+        PRIMARY KEY (extension, profile)
+    ) WITHOUT ROWID""",
+    """CREATE TABLE levels (
+        name TEXT PRIMARY KEY,
+        position INTEGER,
+        description TEXT
+    ) WITHOUT ROWID""",
+    """CREATE TABLE level_limits (
+        level TEXT,
+        limit_name TEXT,
+        value TEXT,
+        PRIMARY KEY (level, limit_name)
+    ) WITHOUT ROWID""",
+    """CREATE TABLE enums (
+        name TEXT PRIMARY KEY,
+        description TEXT,
+        extension TEXT
+    ) WITHOUT ROWID""",
+    """CREATE TABLE enum_values (
+        enum TEXT,
+        position INTEGER,
+        name TEXT,
+        value TEXT,
+        description TEXT,
+        extension TEXT,
+        or_extension TEXT,
+        PRIMARY KEY (enum, position)
+    ) WITHOUT ROWID""",
+    """CREATE TABLE operators (
+        name TEXT PRIMARY KEY,
+        operator_group TEXT,
+        position INTEGER
+    ) WITHOUT ROWID""",
+    """CREATE TABLE operator_types (
+        operator TEXT,
+        position INTEGER,
+        name TEXT,
+        PRIMARY KEY (operator, position)
+    ) WITHOUT ROWID""",
+    """CREATE TABLE arguments (
+        operator TEXT,
+        position INTEGER,
+        name TEXT,
+        description TEXT,
+        type TEXT,
+        element_type TEXT,
+        scale_type TEXT,
+        shape TEXT,
+        rank_min TEXT,
+        rank_max TEXT,
+        optional INTEGER,
+        PRIMARY KEY (operator, position)
+    ) WITHOUT ROWID""",
+    """CREATE TABLE argument_categories (
+        operator TEXT,
+        argument TEXT,
+        category TEXT,
+        profiles TEXT,
+        PRIMARY KEY (operator, argument, category)
+    ) WITHOUT ROWID""",
+    """CREATE TABLE argument_level_limits (
+        operator TEXT,
+        argument TEXT,
+        position INTEGER,
+        value TEXT,
+        limit_name TEXT,
+        PRIMARY KEY (operator, argument, position)
+    ) WITHOUT ROWID""",
+    # Profiles of the ctc and ctc_remove lists of an argument
+    """CREATE TABLE argument_ctc (
+        operator TEXT,
+        argument TEXT,
+        profile TEXT,
+        removed INTEGER,
+        PRIMARY KEY (operator, argument, removed, profile)
+    ) WITHOUT ROWID""",
+    """CREATE TABLE typesupports (
+        operator TEXT,
+        typesupport INTEGER,
+        mode TEXT,
+        version_added TEXT,
+        PRIMARY KEY (operator, typesupport)
+    ) WITHOUT ROWID""",
+    # One row per name of each op_profile, alternative numbering the
+    # op_profile elements: EXT-INT64 and PRO-FP is two rows of one
+    # alternative
+    """CREATE TABLE typesupport_profiles (
+        operator TEXT,
+        typesupport INTEGER,
+        alternative INTEGER,
+        profile TEXT,
+        PRIMARY KEY (operator, typesupport, alternative, profile)
+    ) WITHOUT ROWID""",
+    """CREATE TABLE type_tuples (
+        operator TEXT,
+        typesupport INTEGER,
+        tuple INTEGER,
+        type_name TEXT,
+        value TEXT,
+        PRIMARY KEY (operator, typesupport, tuple, type_name)
+    ) WITHOUT ROWID""",
+    # Profiles and extensions each alternative of a typesupport requires for
+    # one type tuple, with DEDUCE-EXT replaced by the extensions of its types
+    """CREATE TABLE tuple_requirements (
+        operator TEXT,
+        typesupport INTEGER,
+        tuple INTEGER,
+        alternative INTEGER,
+        requirement TEXT,
+        PRIMARY KEY (operator, typesupport, tuple, alternative, requirement)
+    ) WITHOUT ROWID""",
+    # Covering indexes of the lookups by value
+    """CREATE INDEX type_tuples_by_value
+        ON type_tuples (value, type_name, operator, typesupport, tuple)""",
+    """CREATE INDEX typesupports_by_version
+        ON typesupports (version_added, operator, typesupport, mode)""",
+    """CREATE INDEX typesupport_profiles_by_profile
+        ON typesupport_profiles (profile, operator, typesupport, alternative)""",
+    """CREATE INDEX tuple_requirements_by_requirement
+        ON tuple_requirements
+        (requirement, operator, typesupport, tuple, alternative)""",
+    """CREATE INDEX arguments_by_type
+        ON arguments (type, element_type, operator, name)""",
+    """CREATE INDEX argument_ctc_by_profile
+        ON argument_ctc (profile, removed, operator, argument)""",
+    """CREATE INDEX argument_level_limits_by_limit
+        ON argument_level_limits (limit_name, operator, argument, value)""",
+    """CREATE INDEX operators_by_group
+        ON operators (operator_group, position, name)""",
+]
+
+# Tables holding the rows of one operator, in their operator column
+OPERATOR_TABLES = [
+    "operators",
+    "operator_types",
+    "arguments",
+    "argument_categories",
+    "argument_level_limits",
+    "argument_ctc",
+    "typesupports",
+    "typesupport_profiles",
+    "type_tuples",
+    "tuple_requirements",
+]
+
+
+class SQLiteExportError(RuntimeError):
+    pass
+
+
+def insert(connection, table, rows):
+    rows = list(rows)
+    if rows:
+        marks = ", ".join("?" * len(rows[0]))
+        connection.executemany(f"INSERT INTO {table} VALUES ({marks})", rows)
+
+
+def create_schema(connection):
+    tables = connection.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table'"
+    ).fetchall()
+    for (table,) in tables:
+        connection.execute(f"DROP TABLE {table}")
+    for statement in SCHEMA:
+        connection.execute(statement)
+    connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+
+def write_globals(connection, spec):
+    for table in ["meta", "profiles", "extensions", "extension_profiles"]:
+        connection.execute(f"DELETE FROM {table}")
+    insert(
+        connection,
+        "meta",
+        [
+            ("version_major", str(spec.version_major)),
+            ("version_minor", str(spec.version_minor)),
+            ("version_patch", str(spec.version_patch)),
+            ("version_is_draft", str(spec.version_is_draft)),
+        ],
+    )
+    insert(
+        connection,
+        "profiles",
+        [(p.name, p.profile, p.description, p.status) for p in spec.profiles],
+    )
+    insert(
+        connection,
+        "extensions",
+        [(e.name, e.description, e.status) for e in spec.profile_extensions],
+    )
+    insert(
+        connection,
+        "extension_profiles",
+        [(e.name, p) for e in spec.profile_extensions for p in e.profiles],
+    )
+
+
+def write_level(connection, level, position):
+    connection.execute("DELETE FROM levels WHERE name = ?", (level.name,))
+    connection.execute("DELETE FROM level_limits WHERE level = ?", (level.name,))
+    insert(connection, "levels", [(level.name, position, level.desc)])
+    insert(
+        connection,
+        "level_limits",
+        [(level.name, limit, value) for limit, value in level.maximums.items()],
+    )
+
+
+def write_enum(connection, enum):
+    connection.execute("DELETE FROM enums WHERE name = ?", (enum.name,))
+    connection.execute("DELETE FROM enum_values WHERE enum = ?", (enum.name,))
+    insert(connection, "enums", [(enum.name, enum.description, enum.extension)])
+    insert(
+        connection,
+        "enum_values",
+        [
+            (enum.name, i, name, value, description, *extensions)
+            for i, (name, value, description, extensions) in enumerate(enum.values)
+        ],
+    )
+
+
+def delete_operator(connection, name):
+    for table in OPERATOR_TABLES:
+        column = "name" if table == "operators" else "operator"
+        connection.execute(f"DELETE FROM {table} WHERE {column} = ?", (name,))
+
+
+def write_operator(connection, op, group, position):
+    delete_operator(connection, op.name)
+    name = op.name
+    insert(connection, "operators", [(name, group.name, position)])
+    insert(
+        connection, "operator_types", [(name, i, ty) for i, ty in enumerate(op.types)]
+    )
+    arguments = []
+    categories = []
+    level_limits = []
+    ctc = []
+    for i, arg in enumerate(op.arguments):
+        rank_min, rank_max = arg.rank if arg.rank else (None, None)
+        arguments.append(
+            (
+                name,
+                i,
+                arg.name,
+                arg.description,
+                arg.type,
+                arg.tensor_element_type,
+                arg.tensor_element_scale_type,
+                arg.shape,
+                rank_min,
+                rank_max,
+                int(arg.optional),
+            )
+        )
+        for cat in arg.categories:
+            profiles = ",".join(p for p in cat.profiles if p)
+            categories.append((name, arg.name, cat.name, profiles))
+        for j, (value, limit) in enumerate(arg.levellimits):
+            level_limits.append((name, arg.name, j, value, limit))
+        ctc.extend((name, arg.name, profile, 0) for profile in arg.ctc)
+        ctc.extend((name, arg.name, profile, 1) for profile in arg.ctc_remove)
+    insert(connection, "arguments", arguments)
+    insert(connection, "argument_categories", categories)
+    insert(connection, "argument_level_limits", level_limits)
+    insert(connection, "argument_ctc", ctc)
+
+    typesupports = []
+    profiles = []
+    tuples = []
+    requirements = []
+    for i, ts in enumerate(op.typesupports):
+        typesupports.append((name, i, ts.mode, ts.version_added))
+        for alternative, names in enumerate(ts.profiles):
+            profiles.extend(
+                (name, i, alternative, profile)
+                for profile in sorted(set(names.split(" and ")))
+            )
+        for j, tytuple in enumerate(ts.generated_tuples):
+            tuples.extend(
+                (name, i, j, ty, value)
+                for ty, value in tytuple.items()
+                if value is not None
+            )
+            requirements.extend(
+                (name, i, j, alternative, requirement)
+                for alternative, requirement in tuple_requirements(ts, tytuple)
+            )
+    insert(connection, "typesupports", typesupports)
+    insert(connection, "typesupport_profiles", profiles)
+    insert(connection, "type_tuples", tuples)
+    insert(connection, "tuple_requirements", requirements)
+
+
+def stored_fingerprints(connection):
+    return {
+        (kind, name): fingerprint
+        for kind, name, fingerprint in connection.execute(
+            "SELECT kind, name, fingerprint FROM fingerprints"
+        )
+    }
+
+
+# Export the spec to the database at path, creating it or updating the rows
+# of the elements whose fingerprint changed. Returns the changes written. A
+# spec without its XML tree, such as one from load_serialized_spec, has no
+# element fingerprints to compare. It is exported in full and stores none,
+# so that the next export is a full one too.
+def export_spec(spec, path):
+    fingerprints = {}
+    if spec.xmlroot is not None:
+        fingerprints = specdiff.element_fingerprints(spec.xmlroot)
+    try:
+        connection = sqlite3.connect(path)
+    except sqlite3.Error as e:
+        raise SQLiteExportError(f"Unable to open {path}: {str(e)}")
+    try:
+        with connection:
+            version = connection.execute("PRAGMA user_version").fetchone()[0]
+            if version == SCHEMA_VERSION and spec.xmlroot is not None:
+                old = stored_fingerprints(connection)
+                changes = specdiff.diff_fingerprints(old, fingerprints)
+            else:
+                create_schema(connection)
+                changes = specdiff.TOSASpecChanges(is_global=True)
+
+            if changes.is_global:
+                write_globals(connection, spec)
+            for position, level in enumerate(spec.levels):
+                if changes.is_global or level.name in changes.levels:
+                    write_level(connection, level, position)
+            for enum in spec.enums:
+                if changes.enum_changed(enum.name):
+                    write_enum(connection, enum)
+            position = 0
+            for group in spec.operatorgroups:
+                for op in group.operators:
+                    if changes.operator_changed(op.name):
+                        write_operator(connection, op, group, position)
+                    else:
+                        # Operators keep their rows when others move them
+                        connection.execute(
+                            "UPDATE operators SET operator_group = ?, position = ? "
+                            "WHERE name = ? AND "
+                            "(operator_group != ? OR position != ?)",
+                            (group.name, position, op.name, group.name, position),
+                        )
+                    position += 1
+
+            # Elements no longer in the spec
+            for kind, name in stored_fingerprints(connection):
+                if (kind, name) in fingerprints:
+                    continue
+                if kind == "operator":
+                    delete_operator(connection, name)
+                elif kind == "enum":
+                    connection.execute("DELETE FROM enums WHERE name = ?", (name,))
+                    connection.execute(
+                        "DELETE FROM enum_values WHERE enum = ?", (name,)
+                    )
+                elif kind == "level":
+                    connection.execute("DELETE FROM levels WHERE name = ?", (name,))
+                    connection.execute(
+                        "DELETE FROM level_limits WHERE level = ?", (name,)
+                    )
+
+            connection.execute("DELETE FROM fingerprints")
+            insert(
+                connection,
+                "fingerprints",
+                [(kind, name, fp) for (kind, name), fp in fingerprints.items()],
+            )
+    except sqlite3.Error as e:
+        raise SQLiteExportError(f"Unable to export to {path}: {str(e)}")
+    finally:
+        connection.close()
+    return changes
+
+
+# Queries on an exported database. Rows are sqlite3.Row, indexable by
+# column name.
+class TOSASpecDatabase:
+    def __init__(self, path):
+        if not os.path.exists(path):
+            raise SQLiteExportError(f"No spec database at {path}")
+        self.connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        self.connection.row_factory = sqlite3.Row
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self.connection.close()
+            raise SQLiteExportError(
+                f"{path} has schema version {version}, expected {SCHEMA_VERSION}"
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def query(self, sql, parameters=()):
+        return self.connection.execute(sql, parameters).fetchall()
+
+    def version(self):
+        meta = dict(self.query("SELECT key, value FROM meta"))
+        return tuple(
+            int(meta[f"version_{part}"]) for part in ("major", "minor", "patch")
+        )
+
+    def operators(self, group=None):
+        if group is None:
+            rows = self.query("SELECT name FROM operators ORDER BY position")
+        else:
+            rows = self.query(
+                "SELECT name FROM operators WHERE operator_group = ? "
+                "ORDER BY position",
+                (group,),
+            )
+        return [row["name"] for row in rows]
+
+    def arguments(self, operator):
+        return self.query(
+            "SELECT * FROM arguments WHERE operator = ? ORDER BY position",
+            (operator,),
+        )
+
+    # Typesupports with a type tuple using a type, and optionally added in a
+    # version, as (operator, mode, version_added) rows
+    def typesupports_with_type(self, ty, version_added=None):
+        sql = (
+            "SELECT DISTINCT t.operator, t.mode, t.version_added "
+            "FROM type_tuples AS v JOIN typesupports AS t "
+            "ON t.operator = v.operator AND t.typesupport = v.typesupport "
+            "WHERE v.value = ?"
+        )
+        parameters = [ty]
+        if version_added is not None:
+            sql += " AND t.version_added = ?"
+            parameters.append(version_added)
+        return self.query(sql + " ORDER BY t.operator, t.typesupport", parameters)
+
+    # Typesupports and type tuples that require every one of the profiles
+    # and extensions given, as (operator, mode, tuple) rows
+    def typesupports_requiring(self, requirements):
+        requirements = sorted(set(requirements))
+        marks = ", ".join("?" * len(requirements))
+        return self.query(
+            "SELECT DISTINCT t.operator, t.mode, r.tuple "
+            "FROM tuple_requirements AS r JOIN typesupports AS t "
+            "ON t.operator = r.operator AND t.typesupport = r.typesupport "
+            f"WHERE r.requirement IN ({marks}) "
+            "GROUP BY r.operator, r.typesupport, r.tuple, r.alternative "
+            "HAVING COUNT(*) = ? "
+            "ORDER BY t.operator, t.typesupport, r.tuple",
+            requirements + [len(requirements)],
+        )
+
+    # The type tuple of a typesupport, as a dict like generated_tuples
+    def type_tuple(self, operator, mode, tuple_index=0):
+        rows = self.query(
+            "SELECT v.type_name, v.value FROM type_tuples AS v "
+            "JOIN typesupports AS t "
+            "ON t.operator = v.operator AND t.typesupport = v.typesupport "
+            "WHERE t.operator = ? AND t.mode = ? AND v.tuple = ?",
+            (operator, mode, tuple_index),
+        )
+        return {row["type_name"]: row["value"] for row in rows}
+
+    def level_limits(self, level):
+        rows = self.query(
+            "SELECT limit_name, value FROM level_limits WHERE level = ?", (level,)
+        )
+        return {row["limit_name"]: row["value"] for row in rows}
+
+    def enum_values(self, enum):
+        rows = self.query(
+            "SELECT name FROM enum_values WHERE enum = ? ORDER BY position", (enum,)
+        )
+        return [row["name"] for row in rows]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--xml",
+        required=False,
+        default=os.path.join(os.path.dirname(__file__), "..", "tosa.xml"),
+        help="Path to specification XML",
+    )
+    parser.add_argument("--db", required=True, help="Path to the SQLite database")
+    parser.add_argument(
+        "--query",
+        required=False,
+        help="Run an SQL query on the database instead of exporting",
+    )
+    args = parser.parse_args()
+
+    if args.query is not None:
+        try:
+            with TOSASpecDatabase(args.db) as db:
+                rows = db.query(args.query)
+        except (sqlite3.Error, RuntimeError) as e:
+            print(f"Failure querying {args.db}: {str(e)}")
+            exit(1)
+        for row in rows:
+            print("|".join("" if v is None else str(v) for v in row))
+        exit(0)
+
+    try:
+        spec = tosa.TOSASpec(args.xml)
+        changes = export_spec(spec, args.db)
+    except RuntimeError as e:
+        print(f"Failure exporting to {args.db}: {str(e)}")
+        exit(1)
+    print(f"Exported {changes}")
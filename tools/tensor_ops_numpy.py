@@ -0,0 +1,652 @@
+#!/usr/bin/env python3
+# Copyright (c) 2026, ARM Limited.
+# SPDX-License-Identifier: Apache-2.0
+# Vectorized NumPy implementations of the convolution and matrix multiply
+# operators. Output positions are processed in tiles: the input patches of
+# a tile are gathered (im2col) and reduced against the weights, so memory
+# use stays bounded whatever the tensor size. Integer results are exact,
+# including the REQUIRE checks on the accumulator, and floating point
+# results accumulate in the pseudocode order so they are bit exact.
+import os
+
+import numpy as np
+import pseudocode
+import tosa
+from pseudocode_interpreter import interpret_operator
+from pseudocode_interpreter import PseudocodeInterpreter
+from pseudocode_numpy import cast
+from pseudocode_numpy import ErrorIfTriggered
+from pseudocode_numpy import find_operator
+from pseudocode_numpy import NUMPY_TYPES
+from pseudocode_numpy import RequireFailed
+
+# Default memory budget of the temporary arrays of one tile
+DEFAULT_MAX_BYTES = 64 << 20
+
+
+class TensorOperationError(RuntimeError):
+    pass
+
+
+def error_if(cond, message):
+    if cond:
+        raise ErrorIfTriggered(f"ERROR_IF({message}) is true")
+
+
+def idiv_check(a, b):
+    error_if(a % b != 0, f"{a} % {b} != 0")
+    return a // b
+
+
+def is_float(ty):
+    return NUMPY_TYPES[ty][2] == "f"
+
+
+def type_range(ty):
+    width = NUMPY_TYPES[ty][1]
+    return -(1 << (width - 1)), (1 << (width - 1)) - 1
+
+
+def check_binding(binding):
+    for name, ty in binding.items():
+        if ty not in NUMPY_TYPES:
+            raise TensorOperationError(f"{name} of {ty} is not supported")
+
+
+def scalar(value):
+    return np.asarray(value).reshape(-1)[0].item()
+
+
+# Number of rows of a tile given the bytes of temporary storage per row
+def tile_rows(row_bytes, max_bytes):
+    return max(1, max_bytes // max(1, row_bytes))
+
+
+# Integer accumulation of terms in the order of their last axis. The
+# partial sums are checked against the accumulator range unless the bound
+# on the sum of absolute values shows that they cannot overflow.
+def accumulate_checked(terms, acc_t, safe):
+    if not safe:
+        lo, hi = type_range(acc_t)
+        partial = np.cumsum(terms, axis=-1)
+        if np.any(partial < lo) or np.any(partial > hi):
+            raise RequireFailed(f"partial sum overflows {acc_t}")
+    return terms.sum(axis=-1)
+
+
+def add_bias(acc, bias, out_t):
+    out = cast(acc, out_t)
+    if is_float(out_t):
+        return out + bias
+    lo, hi = type_range(out_t)
+    out = out.astype(np.int64) + bias.astype(np.int64)
+    if np.any(out < lo) or np.any(out > hi):
+        raise RequireFailed(f"bias addition overflows {out_t}")
+    return cast(out, out_t)
+
+
+# Input coordinates of a convolution: output position o reads input
+# position o * stride - pad + k * dilation for kernel position k
+def conv_coordinates(size, out_size, kernel, stride, pad, dilation):
+    o = np.arange(out_size)[:, None]
+    k = np.arange(kernel)[None, :]
+    coord = o * stride - pad + k * dilation
+    return coord, (coord >= 0) & (coord < size)
+
+
+# Input coordinates of a transposed convolution: output position o reads
+# input position (o - pad - k) / stride when it divides exactly
+def transpose_coordinates(size, out_size, kernel, stride, pad):
+    o = np.arange(out_size)[:, None]
+    k = np.arange(kernel)[None, :]
+    y = o - pad - k
+    valid = (y >= 0) & (y < size * stride) & (y % stride == 0)
+    return y // stride, valid
+
+
+# Gathers the input patches of the output positions start to stop. Returns
+# the patches [T, taps, C] in the accumulator type, with the zero point
+# subtracted and invalid positions zero, and the validity mask [T, taps].
+def gather_patches(input, coordinates, input_zp, acc_t, start, stop):
+    n = input.shape[0]
+    spatial = input.shape[1:-1]
+    out_spatial = [coord.shape[0] for coord, _ in coordinates]
+    position = np.unravel_index(np.arange(start, stop), [n] + out_spatial)
+    rank = len(spatial)
+    offset = position[0].reshape([-1] + [1] * rank)
+    valid = np.ones([1] * (rank + 1), dtype=bool)
+    for axis, (coord, mask) in enumerate(coordinates):
+        shape = [-1] + [1] * rank
+        shape[axis + 1] = coord.shape[1]
+        index = coord[position[axis + 1]].reshape(shape)
+        offset = offset * spatial[axis] + index
+        valid = valid & mask[position[axis + 1]].reshape(shape)
+    valid = np.broadcast_to(valid, offset.shape).reshape(stop - start, -1)
+    offset = np.where(valid, offset.reshape(stop - start, -1), 0)
+    dtype = NUMPY_TYPES[acc_t][0] if is_float(acc_t) else np.int64
+    patches = input.reshape(-1, input.shape[-1])[offset].astype(dtype)
+    patches = patches - np.asarray(input_zp, dtype=dtype)
+    return np.where(valid[:, :, None], patches, 0), valid
+
+
+# Sum over the kernel positions and input channels of the patches times the
+# weights. The weights are [OC, taps, C], or [taps, C, M] for depthwise
+# convolution where the result is [T, C * M].
+def reduce_patches(patches, valid, weight, acc_t, depthwise, safe, extra):
+    t = patches.shape[0]
+    if not is_float(acc_t):
+        if depthwise and safe:
+            acc = np.einsum("tkc,kcm->tcm", patches, weight)
+        elif depthwise:
+            terms = np.einsum("tkc,kcm->tcmk", patches, weight)
+            acc = accumulate_checked(terms, acc_t, safe)
+        elif safe:
+            acc = np.tensordot(patches, weight, axes=([1, 2], [1, 2]))
+        else:
+            terms = patches.reshape(t, 1, -1) * weight.reshape(1, weight.shape[0], -1)
+            acc = accumulate_checked(terms, acc_t, safe)
+        return acc.reshape(t, -1)
+
+    # Floating point: one multiply-add per term, each rounded to acc_t
+    dtype = NUMPY_TYPES[acc_t][0]
+    taps, channels = patches.shape[1:]
+    if depthwise:
+        acc = np.zeros((t, channels, weight.shape[2]), dtype=dtype)
+        for k in range(taps):
+            product = patches[:, k, :, None] * weight[None, k]
+            use = (valid[:, k] | extra)[:, None, None]
+            acc = np.where(use, acc + product, acc)
+        return acc.reshape(t, -1)
+    acc = np.zeros((t, weight.shape[0]), dtype=dtype)
+    for k in range(taps):
+        use = (valid[:, k] | extra)[:, None]
+        for c in range(channels):
+            product = patches[:, k, c, None] * weight[None, :, k, c]
+            acc = np.where(use, acc + product, acc)
+    return acc
+
+
+# Shared implementation of the convolutions. The output positions are
+# flattened over [N, O...] and processed in tiles.
+def convolve(
+    input,
+    weight,
+    bias,
+    input_zp,
+    weight_zp,
+    coordinates,
+    binding,
+    depthwise=False,
+    tosa_extra_multiplies=False,
+    max_bytes=DEFAULT_MAX_BYTES,
+):
+    acc_t = binding["acc_t"]
+    out_t = binding["out_t"]
+    dtype = NUMPY_TYPES[acc_t][0] if is_float(acc_t) else np.int64
+    weight = cast(weight, binding["weight_t"]).astype(dtype)
+    weight = weight - np.asarray(weight_zp, dtype=dtype)
+    if depthwise:
+        weight = weight.reshape(-1, weight.shape[-2], weight.shape[-1])
+        taps, channels, outputs = weight.shape
+        outputs *= channels
+    else:
+        weight = weight.reshape(weight.shape[0], -1, weight.shape[-1])
+        outputs, taps, channels = weight.shape
+    bias = cast(bias, out_t)
+    bias = np.broadcast_to(bias, (outputs,)) if bias.size == 1 else bias
+
+    safe = True
+    row_bytes = (taps * channels + outputs) * np.dtype(dtype).itemsize
+    if not is_float(acc_t):
+        in_lo, in_hi = type_range(binding["in_t"])
+        w_max = int(np.abs(weight).max()) if weight.size else 0
+        in_max = max(abs(in_lo - input_zp), abs(in_hi - input_zp))
+        terms = taps if depthwise else taps * channels
+        safe = terms * in_max * w_max <= type_range(acc_t)[1]
+        if not safe:
+            row_bytes += 2 * outputs * terms * 8
+
+    input = cast(input, binding["in_t"])
+    n = input.shape[0]
+    out_spatial = [coord.shape[0] for coord, _ in coordinates]
+    positions = int(np.prod([n] + out_spatial))
+    output = np.zeros((positions, outputs), dtype=NUMPY_TYPES[out_t][0])
+    rows = tile_rows(row_bytes, max_bytes)
+    for start in range(0, positions, rows):
+        stop = min(start + rows, positions)
+        patches, valid = gather_patches(
+            input, coordinates, input_zp, acc_t, start, stop
+        )
+        acc = reduce_patches(
+            patches, valid, weight, acc_t, depthwise, safe, tosa_extra_multiplies
+        )
+        output[start:stop] = add_bias(acc, bias, out_t)
+    return output.reshape([n] + out_spatial + [outputs])
+
+
+def check_zero_points(binding, input_zp, weight_zp, in_t="in_t", weight_t="weight_t"):
+    error_if(binding[in_t] != "i8_t" and input_zp != 0, "input_zp != 0")
+    error_if(binding[weight_t] != "i8_t" and weight_zp != 0, "weight_zp != 0")
+
+
+def check_bias(bias, outputs):
+    bc = np.asarray(bias).shape[0]
+    error_if(bc != outputs and bc != 1, f"BC {bc} != {outputs}")
+
+
+def conv_output_size(size, kernel, pad_before, pad_after, stride, dilation):
+    extent = size - 1 + pad_before + pad_after - (kernel - 1) * dilation
+    return idiv_check(extent, stride) + 1
+
+
+# Input coordinates of each spatial axis of a convolution, given the
+# spatial sizes of the input and the kernel
+def conv_geometry(sizes, kernels, pad, stride, dilation):
+    pad = [int(p) for p in pad]
+    stride = [int(s) for s in stride]
+    dilation = [int(d) for d in dilation]
+    error_if(min(pad) < 0, "pad < 0")
+    error_if(min(stride) < 1, "stride < 1")
+    error_if(min(dilation) < 1, "dilation < 1")
+    coordinates = []
+    for axis, (size, kernel) in enumerate(zip(sizes, kernels)):
+        before, after = pad[2 * axis], pad[2 * axis + 1]
+        out_size = conv_output_size(
+            size, kernel, before, after, stride[axis], dilation[axis]
+        )
+        error_if(out_size < 1, "output size < 1")
+        coordinates.append(
+            conv_coordinates(
+                size, out_size, kernel, stride[axis], before, dilation[axis]
+            )
+        )
+    return coordinates
+
+
+def transpose_geometry(sizes, kernels, out_pad, stride):
+    out_pad = [int(p) for p in out_pad]
+    stride = [int(s) for s in stride]
+    error_if(out_pad[0] <= -kernels[0] or out_pad[1] <= -kernels[0], "out_pad <= -KH")
+    error_if(out_pad[2] <= -kernels[1] or out_pad[3] <= -kernels[1], "out_pad <= -KW")
+    error_if(min(stride) < 1, "stride < 1")
+    coordinates = []
+    for axis, (size, kernel) in enumerate(zip(sizes, kernels)):
+        before, after = out_pad[2 * axis], out_pad[2 * axis + 1]
+        out_size = (size - 1) * stride[axis] + before + after + kernel
+        coordinates.append(
+            transpose_coordinates(size, out_size, kernel, stride[axis], before)
+        )
+    return coordinates
+
+
+# Coordinates of a convolution operator and whether it is depthwise, from
+# its tensor and attribute arguments
+def operator_geometry(opname, input, weight, pad=None, stride=None, **attributes):
+    sizes = input.shape[1:-1]
+    if opname == "DEPTHWISE_CONV2D":
+        return conv_geometry(sizes, weight.shape[:2], pad, stride, **attributes), True
+    if opname == "TRANSPOSE_CONV2D":
+        out_pad = attributes["out_pad"]
+        return transpose_geometry(sizes, weight.shape[1:3], out_pad, stride), False
+    if opname in ("CONV2D", "CONV3D"):
+        kernels = weight.shape[1:-1]
+        return conv_geometry(sizes, kernels, pad, stride, **attributes), False
+    raise TensorOperationError(f"{opname} is not a convolution")
+
+
+def conv_nd(
+    input,
+    weight,
+    bias,
+    input_zp,
+    weight_zp,
+    pad,
+    stride,
+    dilation,
+    binding,
+    **options,
+):
+    check_binding(binding)
+    input_zp = scalar(input_zp)
+    weight_zp = scalar(weight_zp)
+    check_zero_points(binding, input_zp, weight_zp)
+    check_bias(bias, weight.shape[0])
+    coordinates = conv_geometry(
+        input.shape[1:-1], weight.shape[1:-1], pad, stride, dilation
+    )
+    return convolve(
+        input, weight, bias, input_zp, weight_zp, coordinates, binding, **options
+    )
+
+
+def conv2d(
+    input, weight, bias, input_zp, weight_zp, pad, stride, dilation, binding, **options
+):
+    return conv_nd(
+        input,
+        weight,
+        bias,
+        input_zp,
+        weight_zp,
+        pad,
+        stride,
+        dilation,
+        binding,
+        **options,
+    )
+
+
+def conv3d(
+    input, weight, bias, input_zp, weight_zp, pad, stride, dilation, binding, **options
+):
+    return conv_nd(
+        input,
+        weight,
+        bias,
+        input_zp,
+        weight_zp,
+        pad,
+        stride,
+        dilation,
+        binding,
+        **options,
+    )
+
+
+def depthwise_conv2d(
+    input, weight, bias, input_zp, weight_zp, pad, stride, dilation, binding, **options
+):
+    check_binding(binding)
+    input_zp = scalar(input_zp)
+    weight_zp = scalar(weight_zp)
+    check_zero_points(binding, input_zp, weight_zp)
+    check_bias(bias, weight.shape[2] * weight.shape[3])
+    coordinates = conv_geometry(
+        input.shape[1:-1], weight.shape[:2], pad, stride, dilation
+    )
+    return convolve(
+        input,
+        weight,
+        bias,
+        input_zp,
+        weight_zp,
+        coordinates,
+        binding,
+        depthwise=True,
+        **options,
+    )
+
+
+def transpose_conv2d(
+    input, weight, bias, input_zp, weight_zp, out_pad, stride, binding, **options
+):
+    check_binding(binding)
+    input_zp = scalar(input_zp)
+    weight_zp = scalar(weight_zp)
+    check_zero_points(binding, input_zp, weight_zp)
+    check_bias(bias, weight.shape[0])
+    coordinates = transpose_geometry(
+        input.shape[1:-1], weight.shape[1:3], out_pad, stride
+    )
+    return convolve(
+        input, weight, bias, input_zp, weight_zp, coordinates, binding, **options
+    )
+
+
+def matmul(A, B, A_zp, B_zp, binding, max_bytes=DEFAULT_MAX_BYTES, **options):
+    check_binding(binding)
+    A_zp = scalar(A_zp)
+    B_zp = scalar(B_zp)
+    check_zero_points(binding, A_zp, B_zp, in_t="A_t", weight_t="B_t")
+    out_t = binding["out_t"]
+    dtype = NUMPY_TYPES[out_t][0] if is_float(out_t) else np.int64
+    a = cast(A, binding["A_t"]).astype(dtype) - np.asarray(A_zp, dtype=dtype)
+    b = cast(B, binding["B_t"]).astype(dtype) - np.asarray(B_zp, dtype=dtype)
+    n, h, c = a.shape
+    w = b.shape[2]
+    output = np.zeros((n, h, w), dtype=NUMPY_TYPES[out_t][0])
+
+    safe = True
+    row_bytes = (c + w) * np.dtype(dtype).itemsize
+    if not is_float(out_t):
+        a_max = int(np.abs(a).max()) if a.size else 0
+        b_max = int(np.abs(b).max()) if b.size else 0
+        safe = c * a_max * b_max <= type_range(out_t)[1]
+        if not safe:
+            row_bytes += 2 * w * c * 8
+    rows = tile_rows(row_bytes, max_bytes)
+    for i in range(n):
+        for start in range(0, h, rows):
+            stop = min(start + rows, h)
+            tile = a[i, start:stop]
+            if is_float(out_t):
+                acc = np.zeros((stop - start, w), dtype=dtype)
+                for k in range(c):
+                    acc = acc + tile[:, k, None] * b[i, k][None, :]
+            elif safe:
+                acc = tile @ b[i]
+            else:
+                terms = tile[:, None, :] * b[i].T[None, :, :]
+                acc = accumulate_checked(terms, out_t, False)
+            output[i, start:stop] = cast(acc, out_t)
+    return output
+
+
+OPERATORS = {
+    "CONV2D": conv2d,
+    "CONV3D": conv3d,
+    "DEPTHWISE_CONV2D": depthwise_conv2d,
+    "TRANSPOSE_CONV2D": transpose_conv2d,
+    "MATMUL": matmul,
+}
+
+
+# Runs an operator given its tensor and attribute arguments by name
+def run_operator(opname, binding, tensors, max_bytes=DEFAULT_MAX_BYTES, **options):
+    if opname not in OPERATORS:
+        raise TensorOperationError(f"No vectorized implementation of {opname}")
+    with np.errstate(all="ignore"):
+        return OPERATORS[opname](
+            binding=binding, max_bytes=max_bytes, **tensors, **options
+        )
+
+
+# Cross check against the literal interpretation of the pseudocode
+
+
+def random_values(rng, ty, shape, zero=False):
+    dtype, width, kind = NUMPY_TYPES[ty]
+    if zero:
+        return np.zeros(shape, dtype=dtype)
+    if kind == "f":
+        return rng.uniform(-2.0, 2.0, shape).astype(dtype)
+    lo, hi = type_range(ty)
+    return rng.integers(lo, hi, shape, endpoint=True).astype(dtype)
+
+
+def random_bias(rng, ty, shape):
+    if is_float(ty):
+        return random_values(rng, ty, shape)
+    # Mostly small enough that adding the accumulator does not overflow
+    lo, hi = type_range(ty)
+    limit = hi if rng.random() < 0.1 else hi >> 8
+    return cast(rng.integers(-limit, limit, shape, endpoint=True), ty)
+
+
+def random_zero_point(rng, ty):
+    if ty != "i8_t":
+        return random_values(rng, ty, [1], zero=True)
+    return random_values(rng, ty, [1])
+
+
+# Random padding for which the output size divides exactly
+def random_conv_geometry(rng, size, kernel):
+    while True:
+        stride = int(rng.integers(1, 3, endpoint=True))
+        dilation = int(rng.integers(1, 2, endpoint=True))
+        before = int(rng.integers(0, kernel))
+        after = int(rng.integers(0, kernel))
+        extent = size - 1 + before + after - (kernel - 1) * dilation
+        if extent >= 0 and extent % stride == 0:
+            return (before, after), stride, dilation, extent // stride + 1
+
+
+def random_case(rng, op, binding):
+    if op.name == "MATMUL":
+        n, h, c, w = rng.integers(1, 4, 4, endpoint=True)
+        tensors = {
+            "A": random_values(rng, binding["A_t"], (n, h, c)),
+            "B": random_values(rng, binding["B_t"], (n, c, w)),
+            "A_zp": random_zero_point(rng, binding["A_t"]),
+            "B_zp": random_zero_point(rng, binding["B_t"]),
+        }
+        return tensors, {}, {"output": (n, h, w)}
+
+    spatial = 3 if op.name == "CONV3D" else 2
+    n = int(rng.integers(1, 2, endpoint=True))
+    sizes = [int(s) for s in rng.integers(1, 5, spatial, endpoint=True)]
+    kernels = [int(k) for k in rng.integers(1, 3, spatial, endpoint=True)]
+    ic, oc = [int(c) for c in rng.integers(1, 3, 2, endpoint=True)]
+    in_t = binding["in_t"]
+    weight_t = binding["weight_t"]
+    if op.name == "DEPTHWISE_CONV2D":
+        weight_shape = kernels + [ic, oc]
+        outputs = ic * oc
+        zero_points = (random_zero_point(rng, in_t), random_zero_point(rng, weight_t))
+    else:
+        weight_shape = [oc] + kernels + [ic]
+        outputs = oc
+        zero_points = (
+            random_zero_point(rng, binding["in_zp_t"]),
+            random_zero_point(rng, binding["weight_zp_t"]),
+        )
+    tensors = {
+        "input": random_values(rng, in_t, [n] + sizes + [ic]),
+        "weight": random_values(rng, weight_t, weight_shape),
+        "bias": random_bias(rng, binding["out_t"], [rng.choice([1, outputs])]),
+        "input_zp": zero_points[0],
+        "weight_zp": zero_points[1],
+    }
+    attributes = {"acc_type": binding["acc_t"], "local_bound": False}
+    if op.name == "TRANSPOSE_CONV2D":
+        stride = [int(s) for s in rng.integers(1, 3, 2, endpoint=True)]
+        # Each side trims at most half the kernel, so outputs are not empty
+        out_pad = [
+            int(rng.integers(-((k - 1) // 2), 2)) for k in kernels for _ in range(2)
+        ]
+        out_shape = [
+            (size - 1) * s + out_pad[2 * i] + out_pad[2 * i + 1] + k
+            for i, (size, s, k) in enumerate(zip(sizes, stride, kernels))
+        ]
+        tensors["out_pad"] = np.array(out_pad, dtype=np.int32)
+        tensors["stride"] = np.array(stride, dtype=np.int32)
+    else:
+        geometry = [random_conv_geometry(rng, s, k) for s, k in zip(sizes, kernels)]
+        tensors["pad"] = np.array([p for g in geometry for p in g[0]], np.int32)
+        tensors["stride"] = np.array([g[1] for g in geometry], np.int32)
+        tensors["dilation"] = np.array([g[2] for g in geometry], np.int32)
+        out_shape = [g[3] for g in geometry]
+    return tensors, attributes, {"output": [n] + out_shape + [outputs]}
+
+
+# Runs a function returning its result, or the type of exception raised for
+# a REQUIRE or ERROR_IF failure
+def outcome(function, *args):
+    try:
+        return function(*args)
+    except (RequireFailed, ErrorIfTriggered) as e:
+        return type(e)
+
+
+def cross_check(interpreter, op, binding, rng, cases):
+    mismatches = []
+    for case in range(cases):
+        tensors, attributes, output_shapes = random_case(rng, op, binding)
+        expected = outcome(
+            lambda: interpret_operator(
+                interpreter, op, binding, tensors, attributes, output_shapes
+            )["output"]
+        )
+        actual = outcome(lambda: run_operator(op.name, binding, tensors))
+        if isinstance(expected, type) or isinstance(actual, type):
+            same = expected is actual
+        else:
+            same = expected.shape == actual.shape and np.array_equal(
+                expected, actual, equal_nan=True
+            )
+        if not same:
+            shapes = {name: list(np.shape(t)) for name, t in tensors.items()}
+            mismatches.append(f"case {case} {shapes}")
+    return mismatches
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--xml",
+        required=False,
+        default=os.path.join(os.path.dirname(__file__), "..", "tosa.xml"),
+        help="Path to specification XML",
+    )
+    parser.add_argument(
+        "--pseudocode",
+        required=False,
+        default=os.path.join(os.path.dirname(__file__), "..", "pseudocode"),
+        help="Path to the pseudocode directory",
+    )
+    parser.add_argument(
+        "--cross-check",
+        required=False,
+        action="store_true",
+        help="Compare random small cases with the interpreted pseudocode",
+    )
+    parser.add_argument(
+        "--operator",
+        required=False,
+        action="append",
+        default=[],
+        help="Operator to check, all vectorized operators if not given",
+    )
+    parser.add_argument(
+        "--cases",
+        required=False,
+        type=int,
+        default=5,
+        help="Number of random cases per type support",
+    )
+    parser.add_argument(
+        "--seed",
+        required=False,
+        type=int,
+        default=0,
+        help="Random seed of the generated cases",
+    )
+    args = parser.parse_args()
+
+    if not args.cross_check:
+        print("Nothing to do, use --cross-check")
+        exit(0)
+    try:
+        spec = tosa.TOSASpec(args.xml)
+        index = pseudocode.PseudocodeIndex(args.pseudocode)
+        interpreter = PseudocodeInterpreter(index, spec)
+    except (OSError, RuntimeError) as e:
+        print(f"Failure reading XML spec or pseudocode: {str(e)}")
+        exit(1)
+    rng = np.random.default_rng(args.seed)
+    failed = False
+    for opname in args.operator or list(OPERATORS):
+        op = find_operator(spec, opname)
+        for typesupport in op.typesupports:
+            for binding in typesupport.generated_tuples:
+                if any(ty not in NUMPY_TYPES for ty in binding.values()):
+                    continue
+                mismatches = cross_check(interpreter, op, binding, rng, args.cases)
+                status = "FAIL" if mismatches else "OK"
+                print(f"{status} {opname} {typesupport.mode} {binding}")
+                for mismatch in mismatches:
+                    print(f"    {mismatch}")
+                failed = failed or bool(mismatches)
+    exit(1 if failed else 0)
@@ -1,9 +1,17 @@
 #!/usr/bin/env python3
 # Copyright (c) 2023,2026, ARM Limited.
 # SPDX-License-Identifier: Apache-2.0
+import gc
+import hashlib
 import itertools
 import re
 import xml.etree.ElementTree as ET
+from collections.abc import Mapping
+from collections.abc import Sequence
+
+import spec_schema
+import spec_serialize
+import spec_trace
 
 
 TYPE_SET_VALUE_EXPANSIONS = {
@@ -54,12 +62,75 @@ def deduce_extensions(tsmap):
     return extensions
 
 
+# Requirements of each op_profile of a typesupport for one type tuple, with
+# DEDUCE-EXT replaced by the extensions the types of the tuple need
+def tuple_requirements(typesupport, tytuple):
+    deduced = None
+    for alternative, profiles in enumerate(typesupport.profiles):
+        requirements = set(profiles.split(" and "))
+        if "DEDUCE-EXT" in requirements:
+            if deduced is None:
+                deduced = deduce_extensions(tytuple)
+            requirements.discard("DEDUCE-EXT")
+            requirements.update(deduced)
+        for requirement in sorted(requirements):
+            yield alternative, requirement
+
+
 def access_elem_type(ty):
     if ty in BLOCK_SCALE_VALUE_TYPE_MAPPING:
         return "fp32_t"
     return ty
 
 
+def expand_type_set_values(values):
+    expanded = []
+    for value in values:
+        expanded.extend(TYPE_SET_VALUE_EXPANSIONS.get(value, (value,)))
+
+    deduplicated = []
+    for value in expanded:
+        if value not in deduplicated:
+            deduplicated.append(value)
+    return deduplicated
+
+
+# Number of tuples a typesupport expands to, computed from the type set
+# sizes without building the Cartesian product. Types bound with same_as
+# or access_elem_type follow another column and add no dimension.
+def typesupport_tuple_count(typesupport):
+    set_sizes = {
+        set_name: len(expand_type_set_values(values))
+        for set_name, values in typesupport.type_sets
+    }
+    count = 1
+    for ty_name, set_name in typesupport.type_bindings.items():
+        if ty_name in typesupport.type_binding_same_as:
+            continue
+        if ty_name in typesupport.type_binding_access_elem_type:
+            continue
+        count *= set_sizes[set_name]
+    return count
+
+
+def _fingerprint_parts(element):
+    yield element.tag
+    # items() rather than attrib, which would create an attribute dict on
+    # every element without attributes
+    for key, value in sorted(element.items()):
+        yield f"@{key}={value}"
+    yield (element.text or "").strip()
+    for child in element:
+        yield from _fingerprint_parts(child)
+    yield f"/{element.tag}"
+
+
+# Structural hash of an XML element. Attribute order, indentation and
+# comments do not contribute, so only semantic edits change the value.
+def xml_fingerprint(element):
+    return hashlib.sha256("\0".join(_fingerprint_parts(element)).encode()).hexdigest()
+
+
 # possible shapes: shape1, [2], [N,H,W,C]
 # returns (checkable, rank)
 # checkable is false if shape doesn't contain []
@@ -80,7 +151,142 @@ def get_rank_from_shape(shape):
         raise RuntimeError(f"Unable to parse shape {shape}")
 
 
+# One instance of each equal key tuple, type name and key list, so that the
+# typesupports naming the same types all hold the same objects
+_shared_values = {}
+
+
+def shared_value(value):
+    return _shared_values.setdefault(value, value)
+
+
+# Position of each key in a shared key tuple
+_key_positions = {}
+
+
+# One type tuple of a typesupport. It is a read-only view of one row of the
+# TOSATypeTuples holding it, used as a dict from type name to type.
+class TOSATypeTuple(Mapping):
+    __slots__ = ("table", "row")
+
+    def __init__(self, table, row):
+        self.table = table
+        self.row = row
+
+    def __getitem__(self, key):
+        column = self.table.columns[self.table.positions[key]]
+        return column[self.row] if type(column) is tuple else column
+
+    def __iter__(self):
+        return iter(self.table.keys)
+
+    def __len__(self):
+        return len(self.table.keys)
+
+    def __contains__(self, key):
+        return key in self.table.positions
+
+    # The Mapping mixins look up each key through __getitem__, these read
+    # the row the table materializes on first use
+    def keys(self):
+        return self.table.keys
+
+    def values(self):
+        return self.table.rows()[self.row]
+
+    def items(self):
+        return tuple(zip(self.table.keys, self.values()))
+
+    def get(self, key, default=None):
+        position = self.table.positions.get(key)
+        if position is None:
+            return default
+        column = self.table.columns[position]
+        return column[self.row] if type(column) is tuple else column
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+# The type tuples of a typesupport in column-major form. A column holding
+# the same type in every row is stored once, as that type. Other columns
+# are a tuple of the type of each row.
+class TOSATypeTuples(Sequence):
+    __slots__ = ("keys", "positions", "columns", "length", "_rows")
+
+    def __init__(self, tuples):
+        tuples = list(tuples)
+        self.keys = shared_value(tuple(tuples[0]))
+        if self.keys not in _key_positions:
+            _key_positions[self.keys] = {key: i for i, key in enumerate(self.keys)}
+        self.positions = _key_positions[self.keys]
+        self.length = len(tuples)
+        columns = []
+        for key in self.keys:
+            values = tuple(shared_value(tytuple[key]) for tytuple in tuples)
+            if all(value == values[0] for value in values):
+                columns.append(values[0])
+            else:
+                columns.append(values)
+        self.columns = tuple(columns)
+        self._rows = None
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.length))]
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("type tuple index out of range")
+        return TOSATypeTuple(self, index)
+
+    def __iter__(self):
+        return (TOSATypeTuple(self, row) for row in range(self.length))
+
+    def __len__(self):
+        return self.length
+
+    # Type tuples from the keys and columns of an earlier TOSATypeTuples
+    @classmethod
+    def from_columns(cls, keys, columns, length):
+        tuples = cls.__new__(cls)
+        tuples.keys = shared_value(tuple(keys))
+        if tuples.keys not in _key_positions:
+            _key_positions[tuples.keys] = {key: i for i, key in enumerate(tuples.keys)}
+        tuples.positions = _key_positions[tuples.keys]
+        tuples.length = length
+        tuples.columns = tuple(
+            (
+                tuple(shared_value(value) for value in column)
+                if isinstance(column, list)
+                else shared_value(column)
+            )
+            for column in columns
+        )
+        tuples._rows = None
+        return tuples
+
+    # The values of one type column, one per row
+    def column(self, key):
+        column = self.columns[self.positions[key]]
+        return column if isinstance(column, tuple) else (column,) * self.length
+
+    # The values of each row in key order, built when rows are first read
+    # as a whole and kept for the next pass over them
+    def rows(self):
+        if self._rows is None:
+            if self.keys:
+                self._rows = tuple(zip(*(self.column(key) for key in self.keys)))
+            else:
+                self._rows = ((),) * self.length
+        return self._rows
+
+
+# The model classes there are many of use __slots__ to leave out the
+# per-instance dict
 class TOSAOperatorArgumentCategory:
+    __slots__ = ("name", "profiles")
+
     def __init__(self, name, profiles=None):
         self.name = name
         self.profiles = profiles
@@ -120,6 +326,21 @@ class TOSALevel:
 
 
 class TOSAOperatorArgument:
+    __slots__ = (
+        "name",
+        "description",
+        "categories",
+        "type",
+        "tensor_element_type",
+        "tensor_element_scale_type",
+        "shape",
+        "levellimits",
+        "rank",
+        "optional",
+        "ctc",
+        "ctc_remove",
+    )
+
     def __init__(
         self,
         name,
@@ -151,6 +372,19 @@ class TOSAOperatorArgument:
 
 
 class TOSAOperatorDataTypeSupport:
+    __slots__ = (
+        "mode",
+        "generated_tuples",
+        "tymap",
+        "profiles",
+        "version_added",
+        "tskeys",
+        "type_sets",
+        "type_bindings",
+        "type_binding_same_as",
+        "type_binding_access_elem_type",
+    )
+
     def __init__(
         self,
         mode,
@@ -166,17 +400,19 @@ class TOSAOperatorDataTypeSupport:
         if len(generated_tuples) == 0:
             raise RuntimeError(f"Typesupport {mode} has no generated tuples")
         self.mode = mode
-        self.generated_tuples = [dict(tytuple) for tytuple in generated_tuples]
-        tuple_keys = set(self.generated_tuples[0].keys())
-        for tytuple in self.generated_tuples[1:]:
-            if set(tytuple.keys()) != tuple_keys:
-                raise RuntimeError(
-                    f"Typesupport {mode} has inconsistent generated tuple keys"
-                )
+        if not isinstance(generated_tuples, TOSATypeTuples):
+            tuple_keys = set(generated_tuples[0].keys())
+            for tytuple in generated_tuples[1:]:
+                if set(tytuple.keys()) != tuple_keys:
+                    raise RuntimeError(
+                        f"Typesupport {mode} has inconsistent generated tuple keys"
+                    )
+            generated_tuples = TOSATypeTuples(generated_tuples)
+        self.generated_tuples = generated_tuples
         self.tymap = self.generated_tuples[0]  # For fixed type_support with no Sets
         self.profiles = profiles
         self.version_added = version_added
-        self.tskeys = tskeys
+        self.tskeys = shared_value(tuple(tskeys))
         self.type_sets = list(type_sets or [])
         self.type_bindings = dict(type_bindings or {})
         self.type_binding_same_as = dict(type_binding_same_as or {})
@@ -184,11 +420,24 @@ class TOSAOperatorDataTypeSupport:
 
 
 class TOSAOperator:
-    def __init__(self, name, arguments, types, typesupports):
+    def __init__(
+        self, name, arguments, types, typesupports, fingerprint=None, xml=None
+    ):
         self.name = name
         self.arguments = arguments
         self.types = types
         self.typesupports = typesupports
+        self._fingerprint = fingerprint
+        # The XML element of the operator while the spec keeps its tree
+        self._xml = xml
+
+    # The xml_fingerprint of the operator, hashed on first use. Operators of
+    # a spec that dropped its XML tree have none.
+    @property
+    def fingerprint(self):
+        if self._fingerprint is None and self._xml is not None:
+            self._fingerprint = xml_fingerprint(self._xml)
+        return self._fingerprint
 
 
 class TOSAOperatorGroup:
@@ -198,15 +447,154 @@ class TOSAOperatorGroup:
 
 
 class TOSASpec:
-    def __init__(self, xmlpath):
-        tree = ET.parse(xmlpath)
-        self.xmlroot = tree.getroot()
+    # Without keep_xml the XML tree is dropped once the model is loaded, for
+    # users of the model alone such as long running services. Operators then
+    # have no fingerprint. With schema
+    # the parsed tree is validated against that XSD before it is loaded,
+    # unless schema_cache already holds the verdict.
+    def __init__(self, xmlpath, keep_xml=True, schema=None, schema_cache=None):
+        with spec_trace.span("parse_xml", path=str(xmlpath)):
+            if schema is None:
+                self.xmlroot = ET.parse(xmlpath).getroot()
+            else:
+                with open(xmlpath, "rb") as f:
+                    content = f.read()
+                self.xmlroot = ET.fromstring(content)
+        if schema is not None:
+            with spec_trace.span("validate_schema", schema=str(schema)):
+                spec_schema.validate_spec_xml(
+                    xmlpath, content, self.xmlroot, schema, schema_cache
+                )
         self.profiles = []
         self.profile_extensions = []
         self.levels = []
         self.operatorgroups = []
         self.enums = []
-        self.__load_spec()
+        self.__argument_categories = {}
+        with spec_trace.span("load_spec"):
+            self.__load_spec()
+        if not keep_xml:
+            self.drop_xml()
+
+    # Release the XML tree. Fingerprints of operators already asked for are
+    # kept, the others are no longer available.
+    def drop_xml(self):
+        self.xmlroot = None
+        for group in self.operatorgroups:
+            for op in group.operators:
+                op._xml = None
+
+    # The spec held in a document from spec_serialize, which has no XML tree
+    @classmethod
+    def from_document(cls, document):
+        spec_serialize.check_document(document)
+        self = cls.__new__(cls)
+        self.xmlroot = None
+        self.__argument_categories = {}
+        # Loading creates many objects and no reference cycles, so the cycle
+        # collector passes it would trigger are held off until it is done
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            with spec_trace.span("load_document"):
+                self.__load_document(document["spec"], document["tuples"])
+        finally:
+            if enabled:
+                gc.enable()
+        return self
+
+    def __load_document(self, doc, tuples_form):
+        version = doc["version"]
+        self.version_major = version["major"]
+        self.version_minor = version["minor"]
+        self.version_patch = version["patch"]
+        self.version_is_draft = version["draft"]
+        self.profiles = [
+            TOSAProfile(p["profile"], p["name"], p["description"], p["status"])
+            for p in doc["profiles"]
+        ]
+        self.profile_extensions = [
+            TOSAProfileExtension(
+                ext["name"], ext["description"], ext["status"], ext["profiles"]
+            )
+            for ext in doc["profile_extensions"]
+        ]
+        self.levels = [
+            TOSALevel(level["name"], level["description"], level["maximums"])
+            for level in doc["levels"]
+        ]
+        self.operatorgroups = [
+            TOSAOperatorGroup(
+                group["name"],
+                [
+                    self.__load_document_operator(op, tuples_form)
+                    for op in group["operators"]
+                ],
+            )
+            for group in doc["operatorgroups"]
+        ]
+        self.enums = [
+            TOSAEnum(
+                enum["name"],
+                enum["description"],
+                [
+                    (
+                        val["name"],
+                        val["value"],
+                        val["description"],
+                        [val["extension"], val["or_extension"]],
+                    )
+                    for val in enum["values"]
+                ],
+                enum["extension"],
+            )
+            for enum in doc["enums"]
+        ]
+
+    def __load_document_operator(self, op, tuples_form):
+        args = [
+            TOSAOperatorArgument(
+                arg["name"],
+                arg["description"],
+                [
+                    self.__argument_category(cat["name"], ",".join(cat["profiles"]))
+                    for cat in arg["categories"]
+                ],
+                arg["type"],
+                arg["tensor_element_type"],
+                arg["tensor_element_scale_type"],
+                arg["shape"],
+                arg["levellimits"],
+                arg["rank"],
+                arg["optional"],
+                arg["ctc"],
+                arg["ctc_remove"],
+            )
+            for arg in op["arguments"]
+        ]
+        typesupports = []
+        for ts in op["typesupports"]:
+            tuples = ts["tuples"]
+            if tuples_form == "columns":
+                tuples = TOSATypeTuples.from_columns(
+                    tuples["keys"], tuples["columns"], tuples["length"]
+                )
+            typesupports.append(
+                TOSAOperatorDataTypeSupport(
+                    ts["mode"],
+                    tuples,
+                    ts["version_added"],
+                    ts["profiles"],
+                    ts["tskeys"],
+                    [(name, values) for name, values in ts["type_sets"]],
+                    ts["type_bindings"],
+                    ts["type_binding_same_as"],
+                    ts["type_binding_access_elem_type"],
+                )
+            )
+        return TOSAOperator(
+            op["name"], args, op["types"], typesupports, op["fingerprint"]
+        )
 
     def __load_spec(self):
         self.__load_version()
@@ -266,7 +654,8 @@ class TOSASpec:
         name = group.get("name")
         operators = []
         for op in group.findall("operator"):
-            operators.append(self.__load_operator(op))
+            with spec_trace.span("load_operator", operator=op.find("name").text):
+                operators.append(self.__load_operator(op))
         return TOSAOperatorGroup(name, operators)
 
     def __extension_string(self, op_profile):
@@ -310,21 +699,26 @@ class TOSASpec:
                 tsmap[ty] = tysup.get(ty)
             type_sets = self.__load_typesupport_sets(tysup, name, tsmode)
             expanded_type_sets = self.__expand_typesupport_sets(type_sets)
-            (
-                type_bindings,
-                type_binding_same_as,
-                type_binding_access_elem_type,
-            ) = self.__load_typesupport_bindings(tysup, name, tsmode, types, type_sets)
-            generated_tuples = self.__expand_typesupport_tuples(
-                name,
-                tsmode,
-                types,
-                tsmap,
-                expanded_type_sets,
-                type_bindings,
-                type_binding_same_as,
-                type_binding_access_elem_type,
-            )
+            with spec_trace.span("validate_bindings", operator=name, mode=tsmode):
+                (
+                    type_bindings,
+                    type_binding_same_as,
+                    type_binding_access_elem_type,
+                ) = self.__load_typesupport_bindings(
+                    tysup, name, tsmode, types, type_sets
+                )
+            with spec_trace.span("expand_tuples", operator=name, mode=tsmode):
+                generated_tuples = self.__expand_typesupport_tuples(
+                    name,
+                    tsmode,
+                    types,
+                    tsmap,
+                    expanded_type_sets,
+                    type_bindings,
+                    type_binding_same_as,
+                    type_binding_access_elem_type,
+                )
+            spec_trace.count("tuples_expanded", len(generated_tuples))
             typesupports.append(
                 TOSAOperatorDataTypeSupport(
                     tsmode,
@@ -338,7 +732,7 @@ class TOSASpec:
                     type_binding_access_elem_type,
                 )
             )
-        return TOSAOperator(name, args, types, typesupports)
+        return TOSAOperator(name, args, types, typesupports, xml=op)
 
     def __load_typesupport_sets(self, tysup, op_name, mode):
         type_sets = []
@@ -360,21 +754,9 @@ class TOSASpec:
 
     def __expand_typesupport_sets(self, type_sets):
         return [
-            (set_name, self.__expand_type_set_values(values))
-            for set_name, values in type_sets
+            (set_name, expand_type_set_values(values)) for set_name, values in type_sets
         ]
 
-    def __expand_type_set_values(self, values):
-        expanded = []
-        for value in values:
-            expanded.extend(TYPE_SET_VALUE_EXPANSIONS.get(value, (value,)))
-
-        deduplicated = []
-        for value in expanded:
-            if value not in deduplicated:
-                deduplicated.append(value)
-        return deduplicated
-
     def __load_typesupport_bindings(self, tysup, op_name, mode, types, type_sets):
         # See EXPECT_TYPESUPPORT comment in tosa.xsd
         type_bindings = {}
@@ -544,7 +926,7 @@ class TOSASpec:
             r"(input|output|attribute)\(?([A-Z,]+)?\)?", arg.get("category")
         )
         for cat in cats:
-            argcats.append(TOSAOperatorArgumentCategory(cat[0], cat[1].split(",")))
+            argcats.append(self.__argument_category(cat[0], cat[1]))
 
         ctc = []
         ctc_elements = arg.find("ctc")
@@ -579,6 +961,15 @@ class TOSASpec:
             ctc_remove,
         )
 
+    # Arguments share one instance of each distinct category
+    def __argument_category(self, name, profiles):
+        key = (name, profiles)
+        if key not in self.__argument_categories:
+            self.__argument_categories[key] = TOSAOperatorArgumentCategory(
+                name, profiles.split(",")
+            )
+        return self.__argument_categories[key]
+
     def __load_enum(self, arg):
         name = arg.get("name")
         desc = arg.get("description").strip()
@@ -600,3 +991,9 @@ class TOSASpec:
         for e in self.enums:
             if e.name == name:
                 return e
+
+
+# Rebuild a spec from a file written by spec_serialize, in JSON or
+# MessagePack, without parsing the XML
+def load_serialized_spec(path):
+    return TOSASpec.from_document(spec_serialize.read_document(path))